@@ -81,8 +81,8 @@ window.CycleCountdown = (function() {
             
             // Set up API sync every 30 seconds (reduced from 10 seconds, not for display, just for accuracy)
             refreshInterval = setInterval(() => {
-                // Only refresh if not already fetching
-                if (!isFetchingData) {
+                // Only refresh if not already fetching and the dashboard stream is not pushing cycle changes
+                if (!isFetchingData && !(window.HuntarrDashboard && HuntarrDashboard.isLive())) {
                     console.log('[CycleCountdown] API sync (every 30s) to maintain accuracy...');
                     fetchAllCycleData()
                         .then((data) => {
@@ -102,6 +102,15 @@ window.CycleCountdown = (function() {
         
         // Start the refresh cycle
         startRefreshInterval();
+        
+        // Cycle starts, ends and resets arrive with the dashboard state as they happen
+        if (window.HuntarrDashboard) {
+            HuntarrDashboard.subscribe((state, changes) => {
+                if (changes.cycles && state.cycles) {
+                    applyCycleData(state.cycles);
+                }
+            });
+        }
     }
     
     // Simple lock to prevent concurrent fetches
@@ -300,6 +309,91 @@ window.CycleCountdown = (function() {
         });
     }
     
+    // Apply cycle status data (from /api/cycle/status or the dashboard stream) to the timers
+    // Returns true if at least one tracked app had valid data
+    function applyCycleData(data) {
+        let dataProcessed = false;
+        
+        // Process the data for each app
+        for (const app in data) {
+            if (trackedApps.includes(app)) {
+                // Check if data format is valid
+                if (data[app] && data[app].next_cycle) {
+                    console.log(`[CycleCountdown] Processing API data for ${app}:`, data[app]);
+                    
+                    // Convert ISO date string to Date object
+                    const nextCycleTime = new Date(data[app].next_cycle);
+                    
+                    // Validate the date format first
+                    if (isNaN(nextCycleTime.getTime())) {
+                        console.error(`[CycleCountdown] Invalid date format for ${app}:`, data[app].next_cycle);
+                        continue;
+                    }
+                    
+                    // Skip timezone validation entirely - just use the timestamp as-is
+                    // The backend sends timezone-aware timestamps that are already correct
+                    console.log(`[CycleCountdown] ${app} timestamp: ${data[app].next_cycle}, parsed: ${nextCycleTime.toISOString()}`);
+                    
+                    // Store the next cycle time without timezone validation
+                    nextCycleTimes[app] = nextCycleTime;
+                    
+                    // Clear any waiting state before updating
+                    const timerElement = document.getElementById(`${app}CycleTimer`);
+                    if (timerElement) {
+                        const timerValue = timerElement.querySelector('.timer-value');
+                        if (timerValue) {
+                            // Clear waiting/refreshing state
+                            timerValue.classList.remove('refreshing-state');
+                            timerValue.style.removeProperty('color');
+                        }
+                    }
+                    
+                    // Check the cyclelock field to determine if app is running
+                    // Default to true if missing (Docker startup behavior)
+                    const cyclelock = data[app].cyclelock !== undefined ? data[app].cyclelock : true;
+                    
+                    if (cyclelock) {
+                        // App is running a cycle - show "Running Cycle"
+                        runningCycles[app] = true;
+                        const timerElement = document.getElementById(`${app}CycleTimer`);
+                        if (timerElement) {
+                            const timerValue = timerElement.querySelector('.timer-value');
+                            if (timerValue) {
+                                timerValue.textContent = 'Running Cycle';
+                                timerValue.classList.remove('refreshing-state');
+                                timerValue.classList.add('running-state');
+                                timerValue.style.color = '#00ff88'; // Green for active
+                                console.log(`[CycleCountdown] ${app} cyclelock is true, showing Running Cycle`);
+                            }
+                        } else {
+                            console.warn(`[CycleCountdown] Timer element not found for ${app} when trying to show Running Cycle`);
+                        }
+                    } else {
+                        // App is waiting for next cycle - clear running state and show countdown
+                        if (runningCycles[app]) {
+                            console.log(`[CycleCountdown] ${app} cyclelock is false, switching to countdown`);
+                        }
+                        runningCycles[app] = false;
+                        // Update the timer display immediately for normal countdown
+                        updateTimerDisplay(app);
+                    }
+                    
+                    // Set up 1-second countdown interval if not already set
+                    setupCountdown(app);
+                    
+                    dataProcessed = true;
+                    console.log(`[CycleCountdown] Updated ${app} with next cycle: ${nextCycleTime.toISOString()}`);
+                } else {
+                    console.warn(`[CycleCountdown] Invalid API data format for ${app}:`, data[app]);
+                }
+            } else {
+                console.log(`[CycleCountdown] Skipping ${app} - not in tracked apps list`);
+            }
+        }
+        
+        return dataProcessed;
+    }
+    
     // Fetch cycle data for all apps at once
     function fetchAllCycleData() {
         // If already fetching, don't start another fetch
@@ -316,12 +410,10 @@ window.CycleCountdown = (function() {
             
             console.log(`[CycleCountdown] Fetching all cycle times from URL: ${url}`);
             
+            // Revalidate every poll; an unchanged status comes back as a 304 from the browser cache
             fetch(url, {
                 method: 'GET',
-                headers: {
-                    'Cache-Control': 'no-cache',
-                    'Pragma': 'no-cache'
-                }
+                cache: 'no-cache'
             })
             .then(response => {
                 if (!response.ok) {
@@ -341,84 +433,7 @@ window.CycleCountdown = (function() {
                     return;
                 }
                 
-                let dataProcessed = false;
-                
-                // Process the data for each app
-                for (const app in data) {
-                    if (trackedApps.includes(app)) {
-                        // Check if data format is valid
-                        if (data[app] && data[app].next_cycle) {
-                            console.log(`[CycleCountdown] Processing API data for ${app}:`, data[app]);
-                            
-                            // Convert ISO date string to Date object
-                            const nextCycleTime = new Date(data[app].next_cycle);
-                            
-                            // Validate the date format first
-                            if (isNaN(nextCycleTime.getTime())) {
-                                console.error(`[CycleCountdown] Invalid date format for ${app}:`, data[app].next_cycle);
-                                continue;
-                            }
-                            
-                            // Skip timezone validation entirely - just use the timestamp as-is
-                            // The backend sends timezone-aware timestamps that are already correct
-                            console.log(`[CycleCountdown] ${app} timestamp: ${data[app].next_cycle}, parsed: ${nextCycleTime.toISOString()}`);
-                            
-                            // Store the next cycle time without timezone validation
-                            nextCycleTimes[app] = nextCycleTime;
-                            
-                            // Clear any waiting state before updating
-                            const timerElement = document.getElementById(`${app}CycleTimer`);
-                            if (timerElement) {
-                                const timerValue = timerElement.querySelector('.timer-value');
-                                if (timerValue) {
-                                    // Clear waiting/refreshing state
-                                    timerValue.classList.remove('refreshing-state');
-                                    timerValue.style.removeProperty('color');
-                                }
-                            }
-                            
-                            // Check the cyclelock field to determine if app is running
-                            // Default to true if missing (Docker startup behavior)
-                            const cyclelock = data[app].cyclelock !== undefined ? data[app].cyclelock : true;
-                            
-                            if (cyclelock) {
-                                // App is running a cycle - show "Running Cycle"
-                                runningCycles[app] = true;
-                                const timerElement = document.getElementById(`${app}CycleTimer`);
-                                if (timerElement) {
-                                    const timerValue = timerElement.querySelector('.timer-value');
-                                    if (timerValue) {
-                                        timerValue.textContent = 'Running Cycle';
-                                        timerValue.classList.remove('refreshing-state');
-                                        timerValue.classList.add('running-state');
-                                        timerValue.style.color = '#00ff88'; // Green for active
-                                        console.log(`[CycleCountdown] ${app} cyclelock is true, showing Running Cycle`);
-                                    }
-                                } else {
-                                    console.warn(`[CycleCountdown] Timer element not found for ${app} when trying to show Running Cycle`);
-                                }
-                            } else {
-                                // App is waiting for next cycle - clear running state and show countdown
-                                if (runningCycles[app]) {
-                                    console.log(`[CycleCountdown] ${app} cyclelock is false, switching to countdown`);
-                                }
-                                runningCycles[app] = false;
-                                // Update the timer display immediately for normal countdown
-                                updateTimerDisplay(app);
-                            }
-                            
-                            // Set up 1-second countdown interval if not already set
-                            setupCountdown(app);
-                            
-                            dataProcessed = true;
-                            console.log(`[CycleCountdown] Updated ${app} with next cycle: ${nextCycleTime.toISOString()}`);
-                        } else {
-                            console.warn(`[CycleCountdown] Invalid API data format for ${app}:`, data[app]);
-                        }
-                    } else {
-                        console.log(`[CycleCountdown] Skipping ${app} - not in tracked apps list`);
-                    }
-                }
+                const dataProcessed = applyCycleData(data);
                 
                 if (dataProcessed) {
                     resolve(data);
@@ -461,10 +476,7 @@ window.CycleCountdown = (function() {
             safeSetTimeout(() => {
                 fetch(url, {
                     method: 'GET',
-                    headers: {
-                        'Cache-Control': 'no-cache',
-                        'Pragma': 'no-cache'
-                    }
+                    cache: 'no-cache'
                 })
                 .then(response => {
                     if (!response.ok) {
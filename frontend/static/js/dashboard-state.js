@@ -0,0 +1,131 @@
+/**
+ * Dashboard State for Huntarr
+ * Holds one server-sent event stream to /api/dashboard/events, merges its updates into
+ * a single state object and hands subscribers the state and the sections that changed.
+ * Falls back to polling /api/dashboard/state when the stream is refused or unavailable.
+ */
+
+window.HuntarrDashboard = (function() {
+    // Fallback polling interval when no stream is open
+    const POLL_INTERVAL = 30000;
+
+    let state = {};
+    let source = null;
+    let live = false;
+    let pollTimer = null;
+    const subscribers = [];
+
+    // Apply server changes: nested objects merge, null removes a key, anything else replaces
+    function merge(target, changes) {
+        Object.keys(changes).forEach(key => {
+            const value = changes[key];
+            if (value === null) {
+                delete target[key];
+            } else if (typeof value === 'object' && !Array.isArray(value) &&
+                       target[key] && typeof target[key] === 'object' && !Array.isArray(target[key])) {
+                merge(target[key], value);
+            } else {
+                target[key] = value;
+            }
+        });
+    }
+
+    function notify(changes) {
+        subscribers.forEach(callback => {
+            try {
+                callback(state, changes);
+            } catch (error) {
+                console.error('[Dashboard] Subscriber error:', error);
+            }
+        });
+    }
+
+    function connect() {
+        if (!window.EventSource || source) {
+            return;
+        }
+
+        source = new EventSource('./api/dashboard/events');
+
+        source.addEventListener('snapshot', event => {
+            state = JSON.parse(event.data);
+            live = true;
+            stopPolling();
+            notify(state);
+        });
+
+        source.addEventListener('update', event => {
+            const changes = JSON.parse(event.data);
+            merge(state, changes);
+            notify(changes);
+        });
+
+        source.onerror = () => {
+            live = false;
+            // CLOSED means the server refused the stream (e.g. too many connections);
+            // otherwise the browser is already reconnecting on its own
+            if (source && source.readyState === EventSource.CLOSED) {
+                source = null;
+                startPolling();
+            }
+        };
+    }
+
+    function poll() {
+        HuntarrUtils.fetchWithTimeout('./api/dashboard/state')
+            .then(response => response.json())
+            .then(data => {
+                if (data.success && data.state && !live) {
+                    state = data.state;
+                    notify(state);
+                }
+            })
+            .catch(error => {
+                console.warn('[Dashboard] Error fetching dashboard state:', error);
+            });
+        // Try the stream again; its snapshot stops polling
+        connect();
+    }
+
+    function startPolling() {
+        if (!pollTimer) {
+            pollTimer = setInterval(poll, POLL_INTERVAL);
+            poll();
+        }
+    }
+
+    function stopPolling() {
+        if (pollTimer) {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        }
+    }
+
+    return {
+        // callback(state, changes) runs for every change; changes holds only the changed sections/keys
+        subscribe: function(callback) {
+            subscribers.push(callback);
+            if (Object.keys(state).length > 0) {
+                callback(state, state);
+            }
+        },
+        // True while the event stream is open, so widgets can skip their own polling
+        isLive: function() {
+            return live;
+        },
+        getState: function() {
+            return state;
+        },
+        start: function() {
+            if (window.EventSource) {
+                connect();
+            } else {
+                startPolling();
+            }
+        }
+    };
+})();
+
+document.addEventListener('DOMContentLoaded', function() {
+    window.HuntarrDashboard.start();
+});
@@ -7,8 +7,21 @@ document.addEventListener('DOMContentLoaded', function() {
     // Initial load of hourly cap data
     loadHourlyCapData();
     
-    // Set up polling to refresh the hourly cap data every 2 minutes (reduced from 30 seconds)
-    setInterval(loadHourlyCapData, 120000);
+    // Updates arrive with the dashboard state as usage changes
+    if (window.HuntarrDashboard) {
+        HuntarrDashboard.subscribe((state, changes) => {
+            if (changes.hourly_caps && state.hourly_caps) {
+                updateHourlyCapDisplay(state.hourly_caps.caps || {}, state.hourly_caps.limits || {});
+            }
+        });
+    }
+    
+    // Set up polling to refresh the hourly cap data every 2 minutes, unless the dashboard stream is live
+    setInterval(() => {
+        if (!(window.HuntarrDashboard && HuntarrDashboard.isLive())) {
+            loadHourlyCapData();
+        }
+    }, 120000);
 });
 
 /**
@@ -8,6 +8,8 @@ const huntManagerModule = {
     currentApp: 'all',
     currentPage: 1,
     totalPages: 1,
+    // Keyset cursors by page number, taken from each page's next_cursor
+    pageCursors: {},
     pageSize: 20,
     searchQuery: '',
     isLoading: false,
@@ -57,6 +59,7 @@ const huntManagerModule = {
         this.elements.appSelect.addEventListener('change', (e) => {
             this.currentApp = e.target.value;
             this.currentPage = 1;
+            this.pageCursors = {};
             this.loadHuntHistory();
         });
         
@@ -72,6 +75,7 @@ const huntManagerModule = {
         this.elements.pageSize.addEventListener('change', (e) => {
             this.pageSize = parseInt(e.target.value);
             this.currentPage = 1;
+            this.pageCursors = {};
             this.loadHuntHistory();
         });
         
@@ -110,6 +114,7 @@ const huntManagerModule = {
     performSearch: function() {
         this.searchQuery = this.elements.searchInput.value.trim();
         this.currentPage = 1;
+        this.pageCursors = {};
         this.loadHuntHistory();
     },
     
@@ -128,7 +133,9 @@ const huntManagerModule = {
         .then(data => {
             if (response.ok) {
                 console.log(`Cleared hunt history for ${this.currentApp}`);
-                // Reload the hunt history
+                // Reload the hunt history from the first page
+                this.currentPage = 1;
+                this.pageCursors = {};
                 this.loadHuntHistory();
                 // Show success notification
                 if (huntarrUI && huntarrUI.showNotification) {
@@ -162,6 +169,11 @@ const huntManagerModule = {
             params.append('search', this.searchQuery);
         }
         
+        const cursor = this.pageCursors[this.currentPage];
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+        
         HuntarrUtils.fetchWithTimeout(`./api/hunt-manager/${this.currentApp}?${params.toString()}`)
             .then(response => response.json())
             .then(data => {
@@ -185,6 +197,9 @@ const huntManagerModule = {
     displayHuntHistory: function(data) {
         this.totalPages = data.total_pages || 1;
         this.currentPage = data.current_page || 1;
+        if (data.next_cursor) {
+            this.pageCursors[this.currentPage + 1] = data.next_cursor;
+        }
         
         // Update pagination info
         this.elements.currentPage.textContent = this.currentPage;
@@ -126,6 +126,9 @@ let huntarrUI = {
         // Setup Swaparr status polling (refresh every 30 seconds)
         this.setupSwaparrStatusPolling();
         
+        // Receive dashboard changes over a single stream
+        this.setupDashboardUpdates();
+        
         // Make dashboard visible after initialization to prevent FOUC
         setTimeout(() => {
             this.showDashboard();
@@ -1867,27 +1870,11 @@ let huntarrUI = {
         HuntarrUtils.fetchWithTimeout('./api/swaparr/status')
             .then(response => response.json())
             .then(data => {
-                const swaparrCard = document.getElementById('swaparrStatusCard');
-                if (!swaparrCard) return;
-
-                // Show/hide card based on whether Swaparr is enabled
-                if (data.enabled && data.configured) {
-                    swaparrCard.style.display = 'block';
-                    
-                    // Update persistent statistics with large number formatting (like other apps)
-                    const persistentStats = data.persistent_statistics || {};
-                    document.getElementById('swaparr-processed').textContent = this.formatLargeNumber(persistentStats.processed || 0);
-                    document.getElementById('swaparr-strikes').textContent = this.formatLargeNumber(persistentStats.strikes || 0);
-                    document.getElementById('swaparr-removals').textContent = this.formatLargeNumber(persistentStats.removals || 0);
-                    document.getElementById('swaparr-ignored').textContent = this.formatLargeNumber(persistentStats.ignored || 0);
-                    
+                if (this.renderSwaparrStatus(data)) {
                     // Setup button event handlers after content is loaded
                     setTimeout(() => {
                         this.setupSwaparrResetCycle();
                     }, 100);
-                    
-                } else {
-                    swaparrCard.style.display = 'none';
                 }
             })
             .catch(error => {
@@ -1899,6 +1886,27 @@ let huntarrUI = {
             });
     },
 
+    // Show the Swaparr card with the given status; returns true if the card is visible
+    renderSwaparrStatus: function(data) {
+        const swaparrCard = document.getElementById('swaparrStatusCard');
+        if (!swaparrCard) return false;
+
+        // Show/hide card based on whether Swaparr is enabled
+        if (data.enabled && data.configured) {
+            swaparrCard.style.display = 'block';
+            
+            // Update persistent statistics with large number formatting (like other apps)
+            const persistentStats = data.persistent_statistics || {};
+            document.getElementById('swaparr-processed').textContent = this.formatLargeNumber(persistentStats.processed || 0);
+            document.getElementById('swaparr-strikes').textContent = this.formatLargeNumber(persistentStats.strikes || 0);
+            document.getElementById('swaparr-removals').textContent = this.formatLargeNumber(persistentStats.removals || 0);
+            document.getElementById('swaparr-ignored').textContent = this.formatLargeNumber(persistentStats.ignored || 0);
+            return true;
+        }
+        swaparrCard.style.display = 'none';
+        return false;
+    },
+
     // Setup Swaparr Reset buttons
     setupSwaparrResetCycle: function() {
         // Handle header reset data button (like Live Hunts Executed)
@@ -1994,14 +2002,37 @@ let huntarrUI = {
         this.loadSwaparrStatus();
         
         // Set up polling to refresh Swaparr status every 30 seconds
-        // Only poll when home section is active to reduce unnecessary requests
+        // Only poll when home section is active and the dashboard stream is not already pushing it
         setInterval(() => {
-            if (this.currentSection === 'home') {
+            if (this.currentSection === 'home' && !(window.HuntarrDashboard && HuntarrDashboard.isLive())) {
                 this.loadSwaparrStatus();
             }
         }, 30000);
     },
     
+    // Apply pushed dashboard changes (stats, connection state, Swaparr) as they happen
+    setupDashboardUpdates: function() {
+        if (!window.HuntarrDashboard) return;
+        
+        HuntarrDashboard.subscribe((state, changes) => {
+            if (changes.stats && state.stats) {
+                // Store raw stats data globally for tooltips to access
+                window.mediaStats = state.stats;
+                this.updateStatsDisplay(state.stats);
+            }
+            if (changes.connections && state.connections) {
+                Object.keys(changes.connections).forEach(app => {
+                    if (state.connections[app]) {
+                        this.updateConnectionStatus(app, state.connections[app]);
+                    }
+                });
+            }
+            if (changes.swaparr && state.swaparr) {
+                this.renderSwaparrStatus(state.swaparr);
+            }
+        });
+    },
+    
 
     
     // User
@@ -343,7 +343,9 @@ function loadSchedules() {
                             action: schedule.action || 'pause',
                             app: schedule.app || 'global',
                             appType: schedule.appType || key, // Preserve the appType
-                            enabled: schedule.enabled !== false
+                            enabled: schedule.enabled !== false,
+                            trigger: schedule.trigger || { type: 'daily' }, // Cron/interval/once triggers set via the API
+                            misfirePolicy: schedule.misfirePolicy || 'skip'
                         };
                     });
                 } else {
@@ -445,7 +447,9 @@ function saveSchedules() {
                         action: schedule.action,
                         app: schedule.app || 'global',
                         enabled: schedule.enabled !== false,
-                        appType: appType // Store appType as a property for reference when loading
+                        appType: appType, // Store appType as a property for reference when loading
+                        trigger: schedule.trigger || { type: 'daily' },
+                        misfirePolicy: schedule.misfirePolicy || 'skip'
                     };
                 });
             }
@@ -1924,12 +1924,23 @@ const SettingsForms = {
             }
             
             settings.ssl_verify = getInputValue('#ssl_verify', true);
+            settings.persist_sessions = getInputValue('#persist_sessions', true);
+            settings.max_sessions = getInputValue('#max_sessions', 1000);
             settings.api_timeout = getInputValue('#api_timeout', 120);
+            settings.health_check_interval = getInputValue('#health_check_interval', 60);
             settings.command_wait_delay = getInputValue('#command_wait_delay', 1);
             settings.command_wait_attempts = getInputValue('#command_wait_attempts', 600);
+            settings.search_pipeline_window = getInputValue('#search_pipeline_window', 3);
+            settings.max_arr_command_queue = getInputValue('#max_arr_command_queue', 10);
+            settings.search_batch_size = getInputValue('#search_batch_size', 10);
+            settings.adaptive_cycle_sleep = getInputValue('#adaptive_cycle_sleep', false);
+            settings.adaptive_sleep_min = getInputValue('#adaptive_sleep_min', 300);
+            settings.adaptive_sleep_max = getInputValue('#adaptive_sleep_max', 7200);
             settings.minimum_download_queue_size = getInputValue('#minimum_download_queue_size', -1);
             settings.log_refresh_interval_seconds = getInputValue('#log_refresh_interval_seconds', 30);
             settings.base_url = getInputValue('#base_url', '');
+            settings.history_retention_days = getInputValue('#history_retention_days', 0);
+            settings.history_max_entries = getInputValue('#history_max_entries', 0);
             
             // Notification settings
             settings.enable_notifications = getInputValue('#enable_notifications', false);
@@ -2412,6 +2423,19 @@ const SettingsForms = {
                     </label>
                     <p class="setting-help" style="margin-left: -3ch !important;">Disable SSL certificate verification when using self-signed certificates in private networks.</p>
                 </div>
+                <div class="setting-item">
+                    <label for="persist_sessions">Remember Logins:</label>
+                    <label class="toggle-switch" style="width:40px; height:20px; display:inline-block; position:relative;">
+                        <input type="checkbox" id="persist_sessions" ${settings.persist_sessions !== false ? 'checked' : ''}>
+                        <span class="toggle-slider" style="position:absolute; cursor:pointer; top:0; left:0; right:0; bottom:0; background-color:#3d4353; border-radius:20px; transition:0.4s;"></span>
+                    </label>
+                    <p class="setting-help" style="margin-left: -3ch !important;">Keep login sessions in the database so a restart does not log everyone out</p>
+                </div>
+                <div class="setting-item">
+                    <label for="max_sessions">Max Sessions:</label>
+                    <input type="number" id="max_sessions" min="1" value="${settings.max_sessions !== undefined ? settings.max_sessions : 1000}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Most login sessions kept at once; the least recently used session is logged out first</p>
+                </div>
             </div>
             
             <div class="settings-group" style="
@@ -2428,6 +2452,11 @@ const SettingsForms = {
                     <input type="number" id="api_timeout" min="10" value="${settings.api_timeout !== undefined ? settings.api_timeout : 120}">
                     <p class="setting-help" style="margin-left: -3ch !important;">API request timeout in seconds</p>
                 </div>
+                <div class="setting-item">
+                    <label for="health_check_interval">Health Check Interval:</label>
+                    <input type="number" id="health_check_interval" min="15" value="${settings.health_check_interval !== undefined ? settings.health_check_interval : 60}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">How often each app instance's connection is checked in the background (seconds). Unreachable instances are retried less often.</p>
+                </div>
                 <div class="setting-item">
                     <label for="command_wait_delay"><a href="https://plexguide.github.io/Huntarr.io/settings/settings.html#command-wait-delay" class="info-icon" title="Learn more about command wait settings" target="_blank" rel="noopener"><i class="fas fa-info-circle"></i></a>Command Wait Delay:</label>
                     <input type="number" id="command_wait_delay" min="1" value="${settings.command_wait_delay !== undefined ? settings.command_wait_delay : 1}">
@@ -2438,6 +2467,39 @@ const SettingsForms = {
                     <input type="number" id="command_wait_attempts" min="1" value="${settings.command_wait_attempts !== undefined ? settings.command_wait_attempts : 600}">
                     <p class="setting-help" style="margin-left: -3ch !important;">Maximum number of attempts to check command status</p>
                 </div>
+                <div class="setting-item">
+                    <label for="search_pipeline_window">Searches In Flight:</label>
+                    <input type="number" id="search_pipeline_window" min="1" value="${settings.search_pipeline_window !== undefined ? settings.search_pipeline_window : 3}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Search commands kept running at once per instance; the next search is sent as soon as one completes</p>
+                </div>
+                <div class="setting-item">
+                    <label for="max_arr_command_queue">Max Arr Command Queue:</label>
+                    <input type="number" id="max_arr_command_queue" min="0" value="${settings.max_arr_command_queue !== undefined ? settings.max_arr_command_queue : 10}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Hold new searches while the Arr has this many commands waiting in its own queue. Set to 0 to disable.</p>
+                </div>
+                <div class="setting-item">
+                    <label for="search_batch_size">Search Batch Size:</label>
+                    <input type="number" id="search_batch_size" min="1" value="${settings.search_batch_size !== undefined ? settings.search_batch_size : 10}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Missing items combined into one search command. Set to 1 to search items one at a time.</p>
+                </div>
+                <div class="setting-item">
+                    <label for="adaptive_cycle_sleep">Adaptive Cycle Sleep:</label>
+                    <label class="toggle-switch" style="width:40px; height:20px; display:inline-block; position:relative;">
+                        <input type="checkbox" id="adaptive_cycle_sleep" ${settings.adaptive_cycle_sleep === true ? 'checked' : ''}>
+                        <span class="toggle-slider" style="position:absolute; cursor:pointer; top:0; left:0; right:0; bottom:0; background-color:#3d4353; border-radius:20px; transition:0.4s;"></span>
+                    </label>
+                    <p class="setting-help" style="margin-left: -3ch !important;">Sleep less between cycles while there is a backlog and hourly cap headroom, and back off while cycles find nothing or instances are down</p>
+                </div>
+                <div class="setting-item">
+                    <label for="adaptive_sleep_min">Adaptive Sleep Min:</label>
+                    <input type="number" id="adaptive_sleep_min" min="60" value="${settings.adaptive_sleep_min !== undefined ? settings.adaptive_sleep_min : 300}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Shortest sleep between cycles with adaptive sleep on (seconds)</p>
+                </div>
+                <div class="setting-item">
+                    <label for="adaptive_sleep_max">Adaptive Sleep Max:</label>
+                    <input type="number" id="adaptive_sleep_max" min="60" value="${settings.adaptive_sleep_max !== undefined ? settings.adaptive_sleep_max : 7200}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Longest sleep between cycles with adaptive sleep on (seconds)</p>
+                </div>
                 <div class="setting-item">
                     <label for="minimum_download_queue_size"><a href="https://plexguide.github.io/Huntarr.io/settings/settings.html#max-dl-queue-size" class="info-icon" title="Learn more about download queue management" target="_blank" rel="noopener"><i class="fas fa-info-circle"></i></a>Max DL Queue Size:</label>
                     <input type="number" id="minimum_download_queue_size" min="-1" value="${settings.minimum_download_queue_size !== undefined ? settings.minimum_download_queue_size : -1}">
@@ -2453,6 +2515,16 @@ const SettingsForms = {
                     <input type="text" id="base_url" value="${settings.base_url || ''}" placeholder="/huntarr">
                     <p class="setting-help" style="margin-left: -3ch !important;">Base URL path for reverse proxy (e.g., '/huntarr'). Leave empty for root path. Requires restart. Credit <a href="https://github.com/scr4tchy" target="_blank">scr4tchy</a>.</p>
                 </div>
+                <div class="setting-item">
+                    <label for="history_retention_days">History Retention:</label>
+                    <input type="number" id="history_retention_days" min="0" value="${settings.history_retention_days !== undefined ? settings.history_retention_days : 0}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Remove hunt history entries older than this many days. Lifetime counts are kept as monthly summaries. Set to 0 to keep everything.</p>
+                </div>
+                <div class="setting-item">
+                    <label for="history_max_entries">Max History Entries:</label>
+                    <input type="number" id="history_max_entries" min="0" value="${settings.history_max_entries !== undefined ? settings.history_max_entries : 0}">
+                    <p class="setting-help" style="margin-left: -3ch !important;">Maximum hunt history entries kept per app. Set to 0 for no limit.</p>
+                </div>
             </div>
 
             <div class="settings-group" style="
@@ -14,8 +14,9 @@ from src.primary.utils.logger import get_logger
 from src.primary.apps.eros import api as eros_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
+from src.primary.stats_manager import increment_stat_only, check_hourly_cap_exceeded
 from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.search_pipeline import chunk_items
 from src.primary.state import check_state_reset
 
 # Get logger for the app
@@ -147,14 +148,14 @@ def process_missing_items(
     
     eros_logger.info(f"Selected {len(items_to_search)} missing items to search.")
 
-    # Process selected items
-    for item in items_to_search:
-        # Check for stop signal before each item
+    # Process selected items, coalescing them into multi-ID search commands
+    for batch in chunk_items(items_to_search):
+        # Check for stop signal before each batch
         if stop_check():
             eros_logger.info("Stop requested during item processing. Aborting...")
             break
         
-        # Check API limit before processing each item
+        # Check API limit before each search command
         try:
             if check_hourly_cap_exceeded("eros"):
                 eros_logger.warning(f"🛑 Eros API hourly limit reached - stopping missing items processing after {items_processed} items")
@@ -168,68 +169,76 @@ def process_missing_items(
         if items_processed >= current_limit:
              eros_logger.info(f"Reached HUNT_MISSING_ITEMS limit ({current_limit}) for this cycle.")
              break
+        batch = batch[:current_limit - items_processed]
 
-        item_id = item.get("id")
-        title = item.get("title", "Unknown Title")
-        
-        # For movies, we don't use season/episode format
-        if search_mode == "movie":
-            item_info = title
-        else:
-            # If somehow using scene mode, try to format as S/E if available
-            season_number = item.get('seasonNumber')
-            episode_number = item.get('episodeNumber')
-            if season_number is not None and episode_number is not None:
-                season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                item_info = f"{title} - {season_episode}"
-            else:
+        batch_info = []  # (item id, display name) per item in the batch
+        for item in batch:
+            item_id = item.get("id")
+            title = item.get("title", "Unknown Title")
+            
+            # For movies, we don't use season/episode format
+            if search_mode == "movie":
                 item_info = title
-        
-        eros_logger.info(f"Processing missing item: \"{item_info}\" (Item ID: {item_id})")
-        
-        # Mark the item as processed BEFORE triggering any searches
-        add_processed_id("eros", instance_name, str(item_id))
-        eros_logger.debug(f"Added item ID {item_id} to processed list for {instance_name}")
+            else:
+                # If somehow using scene mode, try to format as S/E if available
+                season_number = item.get('seasonNumber')
+                episode_number = item.get('episodeNumber')
+                if season_number is not None and episode_number is not None:
+                    season_episode = f"S{season_number:02d}E{episode_number:02d}"
+                    item_info = f"{title} - {season_episode}"
+                else:
+                    item_info = title
+            
+            eros_logger.info(f"Processing missing item: \"{item_info}\" (Item ID: {item_id})")
+            
+            # Mark the item as processed BEFORE triggering any searches
+            add_processed_id("eros", instance_name, str(item_id))
+            eros_logger.debug(f"Added item ID {item_id} to processed list for {instance_name}")
+            batch_info.append((item_id, item_info))
         
         # Refresh functionality has been removed as it was identified as a performance bottleneck
         
         # Check for stop signal before searching
         if stop_check():
-            eros_logger.info(f"Stop requested before searching for {title}. Aborting...")
+            eros_logger.info(f"Stop requested before searching for {len(batch_info)} items. Aborting...")
             break
         
-        # Search for the item
-        eros_logger.info(" - Searching for missing item...")
-        search_command_id = eros_api.item_search(api_url, api_key, api_timeout, [item_id])
+        # One search command covers the whole batch
+        batch_ids = [item_id for item_id, _ in batch_info]
+        eros_logger.info(f" - Searching for {len(batch_ids)} missing items...")
+        search_command_id = eros_api.item_search(api_url, api_key, api_timeout, batch_ids)
         if search_command_id:
-            eros_logger.info(f"Triggered search command {search_command_id}. Assuming success for now.")
+            eros_logger.info(f"Triggered search command {search_command_id} for {len(batch_ids)} items. Assuming success for now.")
             
-            # Tag the movie if enabled
-            if tag_processed_items:
-                from src.primary.settings_manager import get_custom_tag
-                custom_tag = get_custom_tag("eros", "missing", "huntarr-missing")
-                try:
-                    eros_api.tag_processed_movie(api_url, api_key, api_timeout, item_id, custom_tag)
-                    eros_logger.debug(f"Tagged movie {item_id} with '{custom_tag}'")
-                except Exception as e:
-                    eros_logger.warning(f"Failed to tag movie {item_id} with '{custom_tag}': {e}")
+            for item_id, item_info in batch_info:
+                # Tag the movie if enabled
+                if tag_processed_items:
+                    from src.primary.settings_manager import get_custom_tag
+                    custom_tag = get_custom_tag("eros", "missing", "huntarr-missing")
+                    try:
+                        eros_api.tag_processed_movie(api_url, api_key, api_timeout, item_id, custom_tag)
+                        eros_logger.debug(f"Tagged movie {item_id} with '{custom_tag}'")
+                    except Exception as e:
+                        eros_logger.warning(f"Failed to tag movie {item_id} with '{custom_tag}': {e}")
+                
+                # Log to history system
+                log_processed_media("eros", item_info, item_id, instance_name, "missing")
+                eros_logger.debug(f"Logged history entry for item: {item_info}")
+                
+                items_processed += 1
+                
+                # Increment the hunted statistics for Eros; the search command
+                # already counted toward the hourly API cap, once for the whole batch
+                increment_stat_only("eros", "hunted", 1)
+                eros_logger.debug(f"Incremented eros hunted statistics by 1")
             
-            # Log to history system
-            log_processed_media("eros", item_info, item_id, instance_name, "missing")
-            eros_logger.debug(f"Logged history entry for item: {item_info}")
-            
-            items_processed += 1
             processing_done = True
-            
-            # Increment the hunted statistics for Eros
-            increment_stat("eros", "hunted", 1)
-            eros_logger.debug(f"Incremented eros hunted statistics by 1")
 
             # Log progress
             current_limit = app_settings.get("hunt_missing_items", app_settings.get("hunt_missing_scenes", 1))
             eros_logger.info(f"Processed {items_processed}/{current_limit} missing items this cycle.")
         else:
-            eros_logger.warning(f"Failed to trigger search command for item ID {item_id}.")
+            eros_logger.warning(f"Failed to trigger search command for item IDs {batch_ids}.")
             # Do not mark as processed if search couldn't be triggered
             continue
     
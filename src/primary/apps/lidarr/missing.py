@@ -12,9 +12,10 @@ import json
 from typing import Dict, Any, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.lidarr import api as lidarr_api
-from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
+from src.primary.stats_manager import increment_stat, increment_stat_only, check_hourly_cap_exceeded
 from src.primary.stateful_manager import is_processed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.search_pipeline import chunk_items
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import check_state_reset
 import json
@@ -328,21 +329,30 @@ def process_missing_albums(
                 success = add_processed_id("lidarr", instance_name, str(album_id))
                 lidarr_logger.debug(f"Added album ID {album_id} to processed list for {instance_name}, success: {success}")
             
-            # Now trigger the search
-            command_id = lidarr_api.search_albums(api_url, api_key, api_timeout, album_ids_to_search)
-            if command_id:
+            # Now trigger the search, coalescing the albums into multi-ID commands
+            tagged_artists = set()  # Track which artists we've already tagged
+            for batch_ids in chunk_items(album_ids_to_search):
+                if stop_check():
+                    lidarr_logger.warning("Shutdown requested before next album search trigger.")
+                    break
+                
+                command_id = lidarr_api.search_albums(api_url, api_key, api_timeout, batch_ids)
+                if not command_id:
+                    lidarr_logger.warning(f"Failed to trigger album search for IDs {batch_ids} on {instance_name}.")
+                    continue
+                
                 # Log after successful search
-                lidarr_logger.debug(f"Album search command triggered with ID: {command_id} for albums: [{', '.join(album_details_log)}]")
-                increment_stat("lidarr", "hunted") # Changed from "missing" to "hunted"
-                processed_count += len(album_ids_to_search) # Count albums searched
-                processed_artists_or_albums.update(album_ids_to_search)
+                batch_log = [album_details_log[album_ids_to_search.index(album_id)] for album_id in batch_ids]
+                lidarr_logger.debug(f"Album search command triggered with ID: {command_id} for albums: [{', '.join(batch_log)}]")
+                increment_stat_only("lidarr", "hunted", len(batch_ids))  # One per album; the command already counted toward the API cap
+                processed_count += len(batch_ids) # Count albums searched
+                processed_artists_or_albums.update(batch_ids)
                 
                 # Tag artists if enabled (from albums)
                 if tag_processed_items:
                     from src.primary.settings_manager import get_custom_tag
                     custom_tag = get_custom_tag("lidarr", "missing", "huntarr-missing")
-                    tagged_artists = set()  # Track which artists we've already tagged
-                    for album_id in album_ids_to_search:
+                    for album_id in batch_ids:
                         album_info = missing_items_dict.get(album_id)
                         if album_info:
                             artist_id = album_info.get('artistId')
@@ -355,7 +365,7 @@ def process_missing_albums(
                                     lidarr_logger.warning(f"Failed to tag artist {artist_id} with '{custom_tag}': {e}")
                 
                 # Log to history system
-                for album_id in album_ids_to_search:
+                for album_id in batch_ids:
                     album_info = missing_items_dict.get(album_id)
                     if album_info:
                         # Get title and artist name for the history entry
@@ -365,9 +375,7 @@ def process_missing_albums(
                         log_processed_media("lidarr", media_name, album_id, instance_name, "missing")
                         lidarr_logger.debug(f"Logged history entry for album: {media_name}")
                 
-                time.sleep(command_wait_delay) # Basic delay after the single command
-            else:
-                lidarr_logger.warning(f"Failed to trigger album search for IDs {album_ids_to_search} on {instance_name}.")
+                time.sleep(command_wait_delay) # Basic delay after each search command
 
     except Exception as e:
         lidarr_logger.error(f"An error occurred during missing album processing for {instance_name}: {e}", exc_info=True)
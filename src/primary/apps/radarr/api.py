@@ -377,7 +377,7 @@ def check_connection(api_url: str, api_key: str, api_timeout: int) -> bool:
 def wait_for_command(api_url: str, api_key: str, api_timeout: int, command_id: int, 
                     delay_seconds: int = 1, max_attempts: int = 600) -> bool:
     """
-    Wait for a command to complete.
+    Wait for a command to complete using the instance's shared command tracker.
     
     Args:
         api_url: The base URL of the Radarr API
@@ -388,22 +388,11 @@ def wait_for_command(api_url: str, api_key: str, api_timeout: int, command_id: i
         max_attempts: Maximum number of status check attempts
         
     Returns:
-        True if the command completed successfully, False if timed out
+        True if the command completed successfully, False if it failed or timed out
     """
-    attempts = 0
-    while attempts < max_attempts:
-        response = arr_request(api_url, api_key, api_timeout, f"command/{command_id}")
-        if response and 'state' in response:
-            state = response['state']
-            if state == "completed":
-                return True
-            elif state == "failed":
-                radarr_logger.error(f"Command {command_id} failed")
-                return False
-        time.sleep(delay_seconds)
-        attempts += 1
-    radarr_logger.warning(f"Timed out waiting for command {command_id} to complete")
-    return False
+    from src.primary.utils.command_tracker import wait_for_command as wait_for_tracked_command
+    return wait_for_tracked_command("radarr", api_url, api_key, api_timeout, command_id,
+                                    delay_seconds, max_attempts, "Command")
 
 def get_or_create_tag(api_url: str, api_key: str, api_timeout: int, tag_label: str) -> Optional[int]:
     """
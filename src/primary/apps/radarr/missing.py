@@ -15,6 +15,7 @@ from src.primary.stats_manager import increment_stat_only, check_hourly_cap_exce
 from src.primary.stateful_manager import is_processed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import load_settings, get_advanced_setting
+from src.primary.utils.search_pipeline import SearchPipeline, chunk_items
 
 # Get logger for the app
 radarr_logger = get_logger("radarr")
@@ -206,13 +207,33 @@ def process_missing_movies(
             year = movie.get("year", "Unknown Year")
             radarr_logger.info(f"  {idx+1}. {movie_title} ({year}) - ID: {movie_id}")
     
-    # Process each movie
-    for movie in movies_to_process:
-        if stop_check():
+    def record_search(success, movie):
+        """Record a searched movie in history and stats once its command has resolved"""
+        nonlocal movies_processed
+        movie_id = movie.get("id")
+        movie_title = movie.get("title", "Unknown Title")
+        if success is False:
+            radarr_logger.warning(f"Search command for movie '{movie_title}' did not complete successfully")
+            return
+        
+        # Log to history system
+        year = movie.get("year", "Unknown Year")
+        media_name = f"{movie_title} ({year})"
+        log_processed_media("radarr", media_name, movie_id, instance_name, "missing")
+        radarr_logger.debug(f"Logged history entry for movie: {media_name}")
+        
+        increment_stat_only("radarr", "hunted")
+        movies_processed += 1
+    
+    # Search the movies in multi-ID batches, keeping a bounded number of searches in flight
+    pipeline = SearchPipeline("radarr", api_url, api_key, api_timeout,
+                              command_wait_delay, command_wait_attempts, stop_check)
+    for batch in chunk_items(movies_to_process):
+        if not pipeline.wait_for_slot():
             radarr_logger.info("Stop requested during processing. Aborting...")
             break
         
-        # Check API limit before processing each movie
+        # Check API limit before each search command
         try:
             if check_hourly_cap_exceeded("radarr"):
                 radarr_logger.warning(f"🛑 Radarr API hourly limit reached - stopping missing movies processing after {movies_processed} movies")
@@ -221,43 +242,42 @@ def process_missing_movies(
             radarr_logger.error(f"Error checking hourly API cap: {e}")
             # Continue processing if cap check fails - safer than stopping
             
-        movie_id = movie.get("id")
-        movie_title = movie.get("title", "Unknown Title")
+        movie_ids = [movie.get("id") for movie in batch]
+        batch_titles = ", ".join(f"'{movie.get('title', 'Unknown Title')}'" for movie in batch)
         
         # Refresh functionality has been removed as it was identified as a performance bottleneck
         
-        # Search for the movie
-        radarr_logger.info(f"Searching for movie '{movie_title}' (ID: {movie_id})...")
-        search_success = radarr_api.movie_search(api_url, api_key, api_timeout, [movie_id])
+        # One search command covers the whole batch
+        radarr_logger.info(f"Searching for {len(batch)} movies: {batch_titles} (IDs: {movie_ids})...")
+        command_id = radarr_api.movie_search(api_url, api_key, api_timeout, movie_ids)
         
-        if search_success:
-            radarr_logger.info(f"Successfully triggered search for movie '{movie_title}'")
-            
-            # Tag the movie if enabled
-            if tag_processed_items:
-                from src.primary.settings_manager import get_custom_tag
-                custom_tag = get_custom_tag("radarr", "missing", "huntarr-missing")
-                try:
-                    radarr_api.tag_processed_movie(api_url, api_key, api_timeout, movie_id, custom_tag)
-                    radarr_logger.debug(f"Tagged movie {movie_id} with '{custom_tag}'")
-                except Exception as e:
-                    radarr_logger.warning(f"Failed to tag movie {movie_id} with '{custom_tag}': {e}")
-            
-            # Immediately add to processed IDs to prevent duplicate processing
-            success = add_processed_id("radarr", instance_name, str(movie_id))
-            radarr_logger.debug(f"Added processed ID: {movie_id}, success: {success}")
+        if command_id:
+            radarr_logger.info(f"Successfully triggered search for {len(batch)} movies")
+            processed_any = True
             
-            # Log to history system
-            year = movie.get("year", "Unknown Year")
-            media_name = f"{movie_title} ({year})"
-            log_processed_media("radarr", media_name, movie_id, instance_name, "missing")
-            radarr_logger.debug(f"Logged history entry for movie: {media_name}")
+            for movie in batch:
+                movie_id = movie.get("id")
+                
+                # Tag the movie if enabled
+                if tag_processed_items:
+                    from src.primary.settings_manager import get_custom_tag
+                    custom_tag = get_custom_tag("radarr", "missing", "huntarr-missing")
+                    try:
+                        radarr_api.tag_processed_movie(api_url, api_key, api_timeout, movie_id, custom_tag)
+                        radarr_logger.debug(f"Tagged movie {movie_id} with '{custom_tag}'")
+                    except Exception as e:
+                        radarr_logger.warning(f"Failed to tag movie {movie_id} with '{custom_tag}': {e}")
+                
+                # Immediately add to processed IDs to prevent duplicate processing
+                success = add_processed_id("radarr", instance_name, str(movie_id))
+                radarr_logger.debug(f"Added processed ID: {movie_id}, success: {success}")
             
-            increment_stat_only("radarr", "hunted")
-            movies_processed += 1
-            processed_any = True
+            # History and stats follow once the command resolves
+            pipeline.submit_batch(command_id, record_search, batch, "MoviesSearch")
         else:
-            radarr_logger.warning(f"Failed to trigger search for movie '{movie_title}'")
+            radarr_logger.warning(f"Failed to trigger search for movies {batch_titles}")
+    
+    pipeline.finish()
     
     radarr_logger.info(f"Finished processing missing movies. Processed {movies_processed} of {len(movies_to_process)} selected movies.")
     return processed_any
\ No newline at end of file
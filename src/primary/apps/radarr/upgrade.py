@@ -14,6 +14,7 @@ from src.primary.stats_manager import increment_stat, increment_stat_only, check
 from src.primary.stateful_manager import is_processed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import get_advanced_setting, load_settings
+from src.primary.utils.search_pipeline import SearchPipeline
 from src.primary.utils.date_utils import parse_date
 
 # Get logger for the app
@@ -143,8 +144,30 @@ def process_cutoff_upgrades(
     processed_count = 0
     processed_something = False
     
+    def record_search(success, movie):
+        """Record an upgrade search in history and stats once its command has resolved"""
+        nonlocal processed_count
+        movie_id = movie.get("id")
+        movie_title = movie.get("title")
+        movie_year = movie.get("year")
+        if success is False:
+            radarr_logger.warning(f"Upgrade search command for \"{movie_title}\" did not complete successfully")
+            return
+        
+        increment_stat_only("radarr", "upgraded")
+        
+        # Log to history so the upgrade appears in the history UI
+        media_name = f"{movie_title} ({movie_year})"
+        log_processed_media("radarr", media_name, movie_id, instance_name, "upgrade")
+        radarr_logger.debug(f"Logged quality upgrade to history for movie ID {movie_id}")
+        
+        processed_count += 1
+    
+    # Keep a bounded number of upgrade searches in flight
+    pipeline = SearchPipeline("radarr", api_url, api_key, api_timeout,
+                              command_wait_delay, command_wait_attempts, stop_check)
     for movie in movies_to_process:
-        if stop_check():
+        if not pipeline.wait_for_slot():
             radarr_logger.info("Stop signal received, aborting Radarr upgrade cycle.")
             break
         
@@ -167,12 +190,12 @@ def process_cutoff_upgrades(
         
         # Search for cutoff upgrade
         radarr_logger.info(f"  - Searching for quality upgrade...")
-        search_result = radarr_api.movie_search(api_url, api_key, api_timeout, [movie_id])
+        command_id = radarr_api.movie_search(api_url, api_key, api_timeout, [movie_id])
         
-        if search_result:
+        if command_id:
             radarr_logger.info(f"  - Successfully triggered search for quality upgrade.")
             add_processed_id("radarr", instance_name, str(movie_id))
-            increment_stat_only("radarr", "upgraded")
+            processed_something = True
             
             # Tag the movie if enabled
             if tag_processed_items:
@@ -184,16 +207,13 @@ def process_cutoff_upgrades(
                 except Exception as e:
                     radarr_logger.warning(f"Failed to tag movie {movie_id} with '{custom_tag}': {e}")
             
-            # Log to history so the upgrade appears in the history UI
-            media_name = f"{movie_title} ({movie_year})"
-            log_processed_media("radarr", media_name, movie_id, instance_name, "upgrade")
-            radarr_logger.debug(f"Logged quality upgrade to history for movie ID {movie_id}")
-            
-            processed_count += 1
-            processed_something = True
+            # History and stats follow once the command resolves
+            pipeline.submit(command_id, record_search, movie, "MoviesSearch")
         else:
             radarr_logger.warning(f"  - Failed to trigger search for quality upgrade.")
-            
+    
+    pipeline.finish()
+    
     # Log final status
     radarr_logger.info(f"Completed processing {processed_count} movies for quality upgrades.")
     
@@ -15,6 +15,7 @@ from src.primary.utils.history_utils import log_processed_media
 from src.primary.stats_manager import increment_stat, increment_stat_only, check_hourly_cap_exceeded
 from src.primary.stateful_manager import is_processed, add_processed_id
 from src.primary.apps.sonarr import api as sonarr_api
+from src.primary.utils.search_pipeline import SearchPipeline
 
 # Get logger for the Sonarr app
 sonarr_logger = get_logger("sonarr")
@@ -194,18 +195,45 @@ def process_missing_seasons_packs_mode(
         for idx, season in enumerate(seasons_to_process):
             sonarr_logger.info(f"  {idx+1}. {season['series_title']} - Season {season['season_number']} ({season['episode_count']} missing episodes) (Series ID: {season['series_id']})")
     
+    def record_search(success, season):
+        """Record a season pack in history and stats once its search command has resolved"""
+        series_id = season['series_id']
+        season_number = season['season_number']
+        series_title = season['series_title']
+        episode_count = season['episode_count']
+        if success is False:
+            sonarr_logger.warning(f"Season search command for {series_title} - Season {season_number} did not complete successfully")
+            return
+        
+        season_id = f"{series_id}_{season_number}"
+        
+        # Log to history system
+        media_name = f"{series_title} - Season {season_number} (contains {episode_count} missing episodes)"
+        log_processed_media("sonarr", media_name, season_id, instance_name, "missing")
+        sonarr_logger.debug(f"Logged history entry for season pack: {media_name}")
+        
+        # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
+        # The API call is already tracked in search_season(), so we only increment stats here
+        for i in range(episode_count):
+            increment_stat_only("sonarr", "hunted")
+        sonarr_logger.debug(f"Incremented sonarr hunted statistics for {episode_count} episodes in season pack (API call already tracked separately)")
+    
+    # Keep a bounded number of season searches in flight
+    pipeline = SearchPipeline("sonarr", api_url, api_key, api_timeout,
+                              command_wait_delay, command_wait_attempts, stop_check)
+    searches_queued = 0
     for season in unprocessed_seasons:
-        if processed_count >= hunt_missing_items:
+        if searches_queued >= hunt_missing_items:
             break
             
-        if stop_check():
+        if not pipeline.wait_for_slot():
             sonarr_logger.info("Stop signal received, halting processing.")
             break
         
         # Check API limit before processing each season
         try:
             if check_hourly_cap_exceeded("sonarr"):
-                sonarr_logger.warning(f"🛑 Sonarr API hourly limit reached - stopping season pack processing after {processed_count} seasons")
+                sonarr_logger.warning(f"🛑 Sonarr API hourly limit reached - stopping season pack processing after {searches_queued} seasons")
                 break
         except Exception as e:
             sonarr_logger.error(f"Error checking hourly API cap: {e}")
@@ -232,37 +260,24 @@ def process_missing_seasons_packs_mode(
             success = add_processed_id("sonarr", instance_name, season_id)
             sonarr_logger.debug(f"Added season ID {season_id} to processed list for {instance_name}, success: {success}")
             
-                    # Tag the series if enabled
-        if tag_processed_items:
-            from src.primary.settings_manager import get_custom_tag
-            custom_tag = get_custom_tag("sonarr", "missing", "huntarr-missing")
-            try:
-                sonarr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
-                sonarr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
-            except Exception as e:
-                sonarr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
-            
-            # Log to history system
-            media_name = f"{series_title} - Season {season_number} (contains {episode_count} missing episodes)"
-            log_processed_media("sonarr", media_name, season_id, instance_name, "missing")
-            sonarr_logger.debug(f"Logged history entry for season pack: {media_name}")
-            
-            # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
-            # The API call is already tracked in search_season(), so we only increment stats here
-            for i in range(episode_count):
-                increment_stat_only("sonarr", "hunted")
-            sonarr_logger.debug(f"Incremented sonarr hunted statistics for {episode_count} episodes in season pack (API call already tracked separately)")
+            # Tag the series if enabled
+            if tag_processed_items:
+                from src.primary.settings_manager import get_custom_tag
+                custom_tag = get_custom_tag("sonarr", "missing", "huntarr-missing")
+                try:
+                    sonarr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
+                    sonarr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
+                except Exception as e:
+                    sonarr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
             
-            # Wait for command to complete if configured
-            if command_wait_delay > 0 and command_wait_attempts > 0:
-                if wait_for_command(
-                    api_url, api_key, api_timeout, command_id, 
-                    command_wait_delay, command_wait_attempts, "Season Search", stop_check
-                ):
-                    pass
+            # History and stats follow once the command resolves
+            pipeline.submit(command_id, record_search, season, "Season Search")
+            searches_queued += 1
         else:
             sonarr_logger.error(f"Failed to trigger search for {series_title}.")
     
+    pipeline.finish()
+    
     sonarr_logger.info(f"Processed {processed_count} missing season packs for Sonarr.")
     return processed_any
 
@@ -591,65 +606,3 @@ def process_missing_episodes_mode(
     sonarr_logger.info(f"Processed {processed_count} individual missing episodes for Sonarr.")
     sonarr_logger.warning("Episodes mode processing complete - consider using Season Packs mode for better efficiency")
     return processed_any
-
-def wait_for_command(
-    api_url: str,
-    api_key: str,
-    api_timeout: int,
-    command_id: int,
-    wait_delay: int,
-    max_attempts: int,
-    command_name: str = "Command",
-    stop_check: Callable[[], bool] = lambda: False
-) -> bool:
-    """
-    Wait for a Sonarr command to complete or timeout.
-    
-    Args:
-        api_url: The Sonarr API URL
-        api_key: The Sonarr API key
-        api_timeout: API request timeout
-        command_id: The ID of the command to monitor
-        wait_delay: Seconds to wait between status checks
-        max_attempts: Maximum number of status check attempts
-        command_name: Name of the command (for logging)
-        stop_check: Optional function to check if operation should be aborted
-        
-    Returns:
-        True if command completed successfully, False otherwise
-    """
-    if wait_delay <= 0 or max_attempts <= 0:
-        sonarr_logger.debug(f"Not waiting for command to complete (wait_delay={wait_delay}, max_attempts={max_attempts})")
-        return True  # Return as if successful since we're not checking
-    
-    sonarr_logger.debug(f"Waiting for {command_name} to complete (command ID: {command_id}). Checking every {wait_delay}s for up to {max_attempts} attempts")
-    
-    # Wait for command completion
-    attempts = 0
-    while attempts < max_attempts:
-        if stop_check():
-            sonarr_logger.info(f"Stopping wait for {command_name} due to stop request")
-            return False
-            
-        command_status = sonarr_api.get_command_status(api_url, api_key, api_timeout, command_id)
-        if not command_status:
-            sonarr_logger.warning(f"Failed to get status for {command_name} (ID: {command_id}), attempt {attempts+1}")
-            attempts += 1
-            time.sleep(wait_delay)
-            continue
-            
-        status = command_status.get('status')
-        if status == 'completed':
-            sonarr_logger.debug(f"Sonarr {command_name} (ID: {command_id}) completed successfully")
-            return True
-        elif status in ['failed', 'aborted']:
-            sonarr_logger.warning(f"Sonarr {command_name} (ID: {command_id}) {status}")
-            return False
-        
-        sonarr_logger.debug(f"Sonarr {command_name} (ID: {command_id}) status: {status}, attempt {attempts+1}/{max_attempts}")
-        
-        attempts += 1
-        time.sleep(wait_delay)
-    
-    sonarr_logger.error(f"Sonarr command '{command_name}' (ID: {command_id}) timed out after {max_attempts} attempts.")
-    return False
\ No newline at end of file
@@ -12,6 +12,7 @@ from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
 from src.primary.stateful_manager import is_processed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import get_advanced_setting, load_settings
+from src.primary.utils.search_pipeline import SearchPipeline
 
 # Get logger for the Sonarr app
 sonarr_logger = get_logger("sonarr")
@@ -188,9 +189,79 @@ def process_upgrade_seasons_mode(
     for idx, (series_id, season_number, episode_count, series_title) in enumerate(seasons_to_process):
         sonarr_logger.info(f" {idx+1}. {series_title} - Season {season_number} - {episode_count} cutoff unmet episodes")
     
-    # Process each selected season
+    def record_search(success, details):
+        """Record a search once its command has completed"""
+        nonlocal processed_any
+        series_id, season_number, series_title, episode_ids = details
+        if success is not False:
+            # Mark as processed once the search completed (or was still running at a stop)
+            processed_any = True
+            sonarr_logger.info(f"Successfully triggered season pack search for {series_title} Season {season_number} with {len(episode_ids)} cutoff unmet episodes")
+            
+            # Tag the series if enabled
+            if tag_processed_items:
+                from src.primary.settings_manager import get_custom_tag
+                custom_tag = get_custom_tag("sonarr", "upgrade", "huntarr-upgraded")
+                try:
+                    sonarr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
+                    sonarr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
+                except Exception as e:
+                    sonarr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
+            
+            # Log this as a season pack upgrade in the history
+            log_season_pack_upgrade(api_url, api_key, api_timeout, series_id, season_number, instance_name)
+            
+            # CRITICAL FIX: Mark the season as processed at the season level to prevent reprocessing
+            season_id = f"{series_id}_{season_number}"
+            add_processed_id("sonarr", instance_name, season_id)
+            sonarr_logger.debug(f"Marked season ID {season_id} as processed for upgrades ({series_title} - Season {season_number})")
+            
+            # We'll increment stats individually for each episode instead of in batch
+            # increment_stat("sonarr", "upgraded", len(episode_ids))
+            # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
+            
+            # Mark episodes as processed using stateful management
+            for episode_id in episode_ids:
+                add_processed_id("sonarr", instance_name, str(episode_id))
+                sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
+                
+                # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
+                # The API call is already tracked in search_season(), so we only increment stats here
+                from src.primary.stats_manager import increment_stat_only
+                increment_stat_only("sonarr", "upgraded")
+                sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id} (API call already tracked separately)")
+                
+                # Find the episode information for history logging
+                # We need to get the episode details from the API to include proper info in history
+                try:
+                    episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
+                    if episode_details:
+                        series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
+                        episode_title = episode_details.get('title', 'Unknown Episode')
+                        season_number = episode_details.get('seasonNumber', 'Unknown Season')
+                        episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
+                        
+                        try:
+                            season_episode = f"S{season_number:02d}E{episode_number:02d}"
+                        except (ValueError, TypeError):
+                            season_episode = f"S{season_number}E{episode_number}"
+                            
+                        # Record the upgrade in history with quality upgrade identifier
+                        media_name = f"{series_title} - {season_episode} - {episode_title}"
+                        # Skip logging individual episodes since we log the season pack
+                        if not skip_episode_history:
+                            log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
+                        sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
+                except Exception as e:
+                    sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
+        else:
+            sonarr_logger.warning(f"Season pack search command for {series_title} Season {season_number} did not complete successfully")
+    
+    # Process each selected season, keeping a bounded number of searches in flight
+    pipeline = SearchPipeline("sonarr", api_url, api_key, api_timeout,
+                              command_wait_delay, command_wait_attempts, stop_check)
     for series_id, season_number, _, series_title in seasons_to_process:
-        if stop_check():
+        if not pipeline.wait_for_slot():
             sonarr_logger.info("Stop requested during upgrade processing.")
             break
         
@@ -219,76 +290,13 @@ def process_upgrade_seasons_mode(
         search_command_id = sonarr_api.search_season(api_url, api_key, api_timeout, series_id, season_number)
         
         if search_command_id:
-            # Wait for search command to complete
-            if wait_for_command(
-                api_url, api_key, api_timeout, search_command_id,
-                command_wait_delay, command_wait_attempts, "Episode Upgrade Search", stop_check
-            ):
-                # Mark as processed if search command completed successfully
-                processed_any = True
-                sonarr_logger.info(f"Successfully triggered season pack search for {series_title} Season {season_number} with {len(episode_ids)} cutoff unmet episodes")
-                
-                # Tag the series if enabled
-                if tag_processed_items:
-                    from src.primary.settings_manager import get_custom_tag
-                    custom_tag = get_custom_tag("sonarr", "upgrade", "huntarr-upgraded")
-                    try:
-                        sonarr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
-                        sonarr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
-                    except Exception as e:
-                        sonarr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
-                
-                # Log this as a season pack upgrade in the history
-                log_season_pack_upgrade(api_url, api_key, api_timeout, series_id, season_number, instance_name)
-                
-                # CRITICAL FIX: Mark the season as processed at the season level to prevent reprocessing
-                season_id = f"{series_id}_{season_number}"
-                add_processed_id("sonarr", instance_name, season_id)
-                sonarr_logger.debug(f"Marked season ID {season_id} as processed for upgrades ({series_title} - Season {season_number})")
-                
-                # We'll increment stats individually for each episode instead of in batch
-                # increment_stat("sonarr", "upgraded", len(episode_ids))
-                # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
-                
-                # Mark episodes as processed using stateful management
-                for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
-                    # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
-                    # The API call is already tracked in search_season(), so we only increment stats here
-                    from src.primary.stats_manager import increment_stat_only
-                    increment_stat_only("sonarr", "upgraded")
-                    sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id} (API call already tracked separately)")
-                    
-                    # Find the episode information for history logging
-                    # We need to get the episode details from the API to include proper info in history
-                    try:
-                        episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
-                        if episode_details:
-                            series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
-                            episode_title = episode_details.get('title', 'Unknown Episode')
-                            season_number = episode_details.get('seasonNumber', 'Unknown Season')
-                            episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
-                            
-                            try:
-                                season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                            except (ValueError, TypeError):
-                                season_episode = f"S{season_number}E{episode_number}"
-                                
-                            # Record the upgrade in history with quality upgrade identifier
-                            media_name = f"{series_title} - {season_episode} - {episode_title}"
-                            # Skip logging individual episodes since we log the season pack
-                            if not skip_episode_history:
-                                log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
-                            sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
-                    except Exception as e:
-                        sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
-            else:
-                sonarr_logger.warning(f"Season pack search command for {series_title} Season {season_number} did not complete successfully")
+            # Record the search once its command completes; the pipeline bounds searches in flight
+            pipeline.submit(search_command_id, record_search, (series_id, season_number, series_title, episode_ids), "Episode Upgrade Search")
         else:
             sonarr_logger.error(f"Failed to trigger season pack search command for {series_title} Season {season_number}")
     
+    pipeline.finish()
+    
     sonarr_logger.info("Finished quality cutoff upgrades processing cycle (season mode) for Sonarr.")
     return processed_any
 
@@ -374,9 +382,69 @@ def process_upgrade_shows_mode(
     for idx, (series_id, sample_count, series_title) in enumerate(series_to_process):
         sonarr_logger.info(f" {idx+1}. {series_title} - {sample_count} cutoff unmet episodes found in sample")
     
-    # Process each selected series
+    def record_search(success, details):
+        """Record a search once its command has completed"""
+        nonlocal processed_any
+        series_id, series_title, episode_ids = details
+        if success is not False:
+            # Mark as processed once the search completed (or was still running at a stop)
+            processed_any = True
+            sonarr_logger.info(f"Successfully processed {len(episode_ids)} cutoff unmet episodes in {series_title}")
+            
+            # Tag the series if enabled
+            if tag_processed_items:
+                from src.primary.settings_manager import get_custom_tag
+                custom_tag = get_custom_tag("sonarr", "upgrade", "huntarr-upgraded")
+                try:
+                    sonarr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
+                    sonarr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
+                except Exception as e:
+                    sonarr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
+            
+            # We'll increment stats individually for each episode instead of in batch
+            # increment_stat("sonarr", "upgraded", len(episode_ids))
+            # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
+            
+            # Mark episodes as processed using stateful management
+            for episode_id in episode_ids:
+                add_processed_id("sonarr", instance_name, str(episode_id))
+                sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
+                
+                # Increment stats for this episode (consistent with Radarr's approach)
+                increment_stat("sonarr", "upgraded")
+                sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id}")
+                
+                # Find the episode information for history logging
+                # We need to get the episode details from the API to include proper info in history
+                try:
+                    episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
+                    if episode_details:
+                        series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
+                        episode_title = episode_details.get('title', 'Unknown Episode')
+                        season_number = episode_details.get('seasonNumber', 'Unknown Season')
+                        episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
+                        
+                        try:
+                            season_episode = f"S{season_number:02d}E{episode_number:02d}"
+                        except (ValueError, TypeError):
+                            season_episode = f"S{season_number}E{episode_number}"
+                            
+                        # Record the upgrade in history with quality upgrade identifier
+                        media_name = f"{series_title} - {season_episode} - {episode_title}"
+                        # Skip logging individual episodes since we log the season pack
+                        if not skip_episode_history:
+                            log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
+                        sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
+                except Exception as e:
+                    sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
+        else:
+            sonarr_logger.warning(f"Episode upgrade search command for {series_title} did not complete successfully")
+    
+    # Process each selected series, keeping a bounded number of searches in flight
+    pipeline = SearchPipeline("sonarr", api_url, api_key, api_timeout,
+                              command_wait_delay, command_wait_attempts, stop_check)
     for series_id, _, series_title in series_to_process:
-        if stop_check(): 
+        if not pipeline.wait_for_slot():
             sonarr_logger.info("Stop requested before processing next series.")
             break
             
@@ -412,66 +480,13 @@ def process_upgrade_shows_mode(
         search_command_id = sonarr_api.search_episode(api_url, api_key, api_timeout, episode_ids)
         
         if search_command_id:
-            # Wait for search command to complete
-            if wait_for_command(
-                api_url, api_key, api_timeout, search_command_id,
-                command_wait_delay, command_wait_attempts, "Episode Upgrade Search", stop_check
-            ):
-                # Mark as processed if search command completed successfully
-                processed_any = True
-                sonarr_logger.info(f"Successfully processed {len(episode_ids)} cutoff unmet episodes in {series_title}")
-                
-                # Tag the series if enabled
-                if tag_processed_items:
-                    from src.primary.settings_manager import get_custom_tag
-                    custom_tag = get_custom_tag("sonarr", "upgrade", "huntarr-upgraded")
-                    try:
-                        sonarr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
-                        sonarr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
-                    except Exception as e:
-                        sonarr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
-                
-                # We'll increment stats individually for each episode instead of in batch
-                # increment_stat("sonarr", "upgraded", len(episode_ids))
-                # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
-                
-                # Mark episodes as processed using stateful management
-                for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
-                    # Increment stats for this episode (consistent with Radarr's approach)
-                    increment_stat("sonarr", "upgraded")
-                    sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id}")
-                    
-                    # Find the episode information for history logging
-                    # We need to get the episode details from the API to include proper info in history
-                    try:
-                        episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
-                        if episode_details:
-                            series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
-                            episode_title = episode_details.get('title', 'Unknown Episode')
-                            season_number = episode_details.get('seasonNumber', 'Unknown Season')
-                            episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
-                            
-                            try:
-                                season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                            except (ValueError, TypeError):
-                                season_episode = f"S{season_number}E{episode_number}"
-                                
-                            # Record the upgrade in history with quality upgrade identifier
-                            media_name = f"{series_title} - {season_episode} - {episode_title}"
-                            # Skip logging individual episodes since we log the season pack
-                            if not skip_episode_history:
-                                log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
-                            sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
-                    except Exception as e:
-                        sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
-            else:
-                sonarr_logger.warning(f"Episode upgrade search command for {series_title} did not complete successfully")
+            # Record the search once its command completes; the pipeline bounds searches in flight
+            pipeline.submit(search_command_id, record_search, (series_id, series_title, episode_ids), "Episode Upgrade Search")
         else:
             sonarr_logger.error(f"Failed to trigger upgrade search command for {series_title}")
     
+    pipeline.finish()
+    
     sonarr_logger.info("Finished quality cutoff upgrades processing cycle (show mode) for Sonarr.")
     return processed_any
 
@@ -549,15 +564,45 @@ def process_upgrade_episodes_mode(
     
     # Process each episode individually
     processed_count = 0
+    searches_queued = 0
+    
+    def record_search(success, details):
+        """Record a search once its command has completed"""
+        nonlocal processed_any, processed_count
+        episode_id, series_title, season_episode, episode_title = details
+        if success is not False:
+            processed_any = True
+            processed_count += 1
+            
+            # Mark episode as processed
+            added = add_processed_id("sonarr", instance_name, str(episode_id))
+            sonarr_logger.debug(f"Added episode ID {episode_id} to processed list for upgrades, success: {added}")
+            
+            # Log to history system
+            media_name = f"{series_title} - {season_episode} - {episode_title}"
+            log_processed_media("sonarr", media_name, str(episode_id), instance_name, "upgrade")
+            sonarr_logger.debug(f"Logged upgrade to history for episode: {media_name}")
+            
+            # Increment statistics
+            increment_stat("sonarr", "upgraded")
+            sonarr_logger.debug(f"Incremented sonarr upgraded statistics for episode {episode_id}")
+            
+            # Note: No tagging is performed in episodes mode as it would be inefficient
+            # and could overwhelm the API with individual episode tag operations
+        else:
+            sonarr_logger.warning(f"Episode upgrade search command for {series_title} - {season_episode} did not complete successfully")
+    
+    pipeline = SearchPipeline("sonarr", api_url, api_key, api_timeout,
+                              command_wait_delay, command_wait_attempts, stop_check)
     for episode in episodes_to_process:
-        if stop_check():
+        if not pipeline.wait_for_slot():
             sonarr_logger.info("Stop requested. Aborting episode upgrade processing.")
             break
         
         # Check API limit before processing each episode
         try:
             if check_hourly_cap_exceeded("sonarr"):
-                sonarr_logger.warning(f"🛑 Sonarr API hourly limit reached - stopping episode upgrade processing after {processed_count} episodes")
+                sonarr_logger.warning(f"🛑 Sonarr API hourly limit reached - stopping episode upgrade processing after {searches_queued} episodes")
                 break
         except Exception as e:
             sonarr_logger.error(f"Error checking hourly API cap: {e}")
@@ -581,116 +626,14 @@ def process_upgrade_episodes_mode(
         search_successful = sonarr_api.search_episode(api_url, api_key, api_timeout, [episode_id])
         
         if search_successful:
-            # Wait for command to complete if configured
-            if command_wait_delay > 0 and command_wait_attempts > 0:
-                if wait_for_command(
-                    api_url, api_key, api_timeout, search_successful,
-                    command_wait_delay, command_wait_attempts, "Episode Upgrade Search", stop_check
-                ):
-                    processed_any = True
-                    processed_count += 1
-                    
-                    # Mark episode as processed
-                    success = add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Added episode ID {episode_id} to processed list for upgrades, success: {success}")
-                    
-                    # Log to history system
-                    media_name = f"{series_title} - {season_episode} - {episode_title}"
-                    log_processed_media("sonarr", media_name, str(episode_id), instance_name, "upgrade")
-                    sonarr_logger.debug(f"Logged upgrade to history for episode: {media_name}")
-                    
-                    # Increment statistics
-                    increment_stat("sonarr", "upgraded")
-                    sonarr_logger.debug(f"Incremented sonarr upgraded statistics for episode {episode_id}")
-                    
-                    # Note: No tagging is performed in episodes mode as it would be inefficient
-                    # and could overwhelm the API with individual episode tag operations
-                else:
-                    sonarr_logger.warning(f"Episode upgrade search command for {series_title} - {season_episode} did not complete successfully")
-            else:
-                # No command waiting configured, consider it successful
-                processed_any = True
-                processed_count += 1
-                
-                # Mark episode as processed
-                success = add_processed_id("sonarr", instance_name, str(episode_id))
-                sonarr_logger.debug(f"Added episode ID {episode_id} to processed list for upgrades, success: {success}")
-                
-                # Log to history system
-                media_name = f"{series_title} - {season_episode} - {episode_title}"
-                log_processed_media("sonarr", media_name, str(episode_id), instance_name, "upgrade")
-                sonarr_logger.debug(f"Logged upgrade to history for episode: {media_name}")
-                
-                # Increment statistics
-                increment_stat("sonarr", "upgraded")
-                sonarr_logger.debug(f"Incremented sonarr upgraded statistics for episode {episode_id}")
+            # Record the search once its command completes; the pipeline bounds searches in flight
+            pipeline.submit(search_successful, record_search, (episode_id, series_title, season_episode, episode_title), "Episode Upgrade Search")
+            searches_queued += 1
         else:
             sonarr_logger.error(f"Failed to trigger upgrade search for episode: {series_title} - {season_episode}")
     
+    pipeline.finish()
+    
     sonarr_logger.info(f"Processed {processed_count} individual episode upgrades for Sonarr.")
     sonarr_logger.warning("Episodes mode upgrade processing complete - consider using Season Packs mode for better efficiency")
     return processed_any
-
-def wait_for_command(
-    api_url: str,
-    api_key: str,
-    api_timeout: int,
-    command_id: Union[int, str],
-    wait_delay: int,
-    max_attempts: int,
-    command_name: str = "Command",
-    stop_check: Callable[[], bool] = lambda: False
-) -> bool:
-    """
-    Wait for a Sonarr command to complete or timeout.
-    
-    Args:
-        api_url: The Sonarr API URL
-        api_key: The Sonarr API key
-        api_timeout: API request timeout
-        command_id: The ID of the command to monitor
-        wait_delay: Seconds to wait between status checks
-        max_attempts: Maximum number of status check attempts
-        command_name: Name of the command (for logging)
-        stop_check: Optional function to check if operation should be aborted
-        
-    Returns:
-        True if command completed successfully, False otherwise
-    """
-    if wait_delay <= 0 or max_attempts <= 0:
-        sonarr_logger.debug(f"Not waiting for command to complete (wait_delay={wait_delay}, max_attempts={max_attempts})")
-        return True  # Return as if successful since we're not checking
-    
-    sonarr_logger.debug(f"Waiting for {command_name} to complete (command ID: {command_id}). Checking every {wait_delay}s for up to {max_attempts} attempts")
-    
-    # Wait for command completion
-    attempts = 0
-    while attempts < max_attempts:
-        if stop_check():
-            sonarr_logger.info(f"Stopping wait for {command_name} due to stop request")
-            return False
-            
-        command_status = sonarr_api.get_command_status(api_url, api_key, api_timeout, command_id)
-        
-        if command_status is None: 
-            sonarr_logger.warning(
-                f"Failed to get status for {command_name} (ID: {command_id}), attempt {attempts+1}. "
-                f"Command may have already completed or the ID is no longer valid."
-            )
-            return False # Stop polling if command ID is not found or error occurs
-            
-        status = command_status.get('status')
-        if status == 'completed':
-            sonarr_logger.debug(f"Sonarr {command_name} (ID: {command_id}) completed successfully")
-            return True
-        elif status in ['failed', 'aborted']:
-            sonarr_logger.warning(f"Sonarr {command_name} (ID: {command_id}) {status}")
-            return False
-        
-        sonarr_logger.debug(f"Sonarr {command_name} (ID: {command_id}) status: {status}, attempt {attempts+1}/{max_attempts}")
-        
-        attempts += 1
-        time.sleep(wait_delay)
-    
-    sonarr_logger.error(f"Sonarr command '{command_name}' (ID: {command_id}) timed out after {max_attempts} attempts.")
-    return False
\ No newline at end of file
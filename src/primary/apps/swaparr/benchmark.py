@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the compiled Swaparr rule set.
+Runs a synthetic queue through the compiled matcher and through the previous
+per-item linear scans, and reports items per second for both.
+
+Usage: python -m src.primary.apps.swaparr.benchmark [--items 10000] [--patterns 500]
+"""
+
+import argparse
+import random
+import string
+import time
+
+from src.primary.apps.swaparr.rules import (
+    SwaparrRules,
+    DEFAULT_MALICIOUS_EXTENSIONS,
+    DEFAULT_SUSPICIOUS_PATTERNS,
+    DEFAULT_BLOCKED_QUALITIES,
+    IMPORT_FAILURE_INDICATORS,
+    parse_size_string_to_bytes
+)
+
+
+def build_settings(extra_patterns):
+    """Swaparr settings with every rule enabled and large user blocklists"""
+    rng = random.Random(42)
+
+    def random_words(count, length):
+        return ["".join(rng.choice(string.ascii_lowercase) for _ in range(length)) for _ in range(count)]
+
+    return {
+        "malicious_file_detection": True,
+        "malicious_extensions": DEFAULT_MALICIOUS_EXTENSIONS + [f".{w}" for w in random_words(extra_patterns, 5)],
+        "suspicious_patterns": DEFAULT_SUSPICIOUS_PATTERNS + random_words(extra_patterns, 9),
+        "quality_based_removal": True,
+        "blocked_quality_patterns": DEFAULT_BLOCKED_QUALITIES + random_words(extra_patterns, 8),
+        "failed_import_detection": True,
+        "ignore_above_size": "25GB",
+        "max_download_time": "2h"
+    }
+
+
+def build_queue(count):
+    """Synthetic parsed queue items, mostly clean with a few rule hits"""
+    rng = random.Random(7)
+    statuses = ["downloading", "downloading", "downloading", "queued", "warning", "completed"]
+    errors = ["", "", "", "", "Import failed, path not found", "No files found are eligible for import"]
+    tags = ["2160p.WEB-DL", "1080p.BluRay", "720p.HDTV", "1080p.HDCAM", "WEBRip.x264", "DVDScr"]
+    items = []
+    for i in range(count):
+        items.append({
+            "id": i,
+            "name": f"Some.Release.Title.{i}.{rng.choice(tags)}-GROUP{'.exe' if i % 997 == 0 else ''}",
+            "size": rng.randint(1, 40) * 1024 * 1024 * 1024,
+            "status": rng.choice(statuses),
+            "eta": rng.randint(0, 20000),
+            "error_message": rng.choice(errors)
+        })
+    return items
+
+
+def evaluate_linear(items, settings):
+    """The previous per-item behaviour: re-read settings, lowercase per check, scan every pattern"""
+    hits = 0
+    for item in items:
+        if item["size"] >= parse_size_string_to_bytes(settings.get("ignore_above_size", "25GB")):
+            continue
+        name = item.get("name", "").lower()
+        if any(ext.lower() in name for ext in settings.get("malicious_extensions", [])):
+            hits += 1
+            continue
+        name = item.get("name", "").lower()
+        if any(p.lower() in name for p in settings.get("suspicious_patterns", [])):
+            hits += 1
+            continue
+        name = item.get("name", "").lower()
+        if any(q.lower() in name for q in settings.get("blocked_quality_patterns", [])):
+            hits += 1
+            continue
+        error_message = item.get("error_message", "").lower()
+        status = item.get("status", "").lower()
+        if any(p in error_message or p in status for p in IMPORT_FAILURE_INDICATORS):
+            hits += 1
+    return hits
+
+
+def evaluate_compiled(items, rules):
+    """One pass per item over the compiled rule set"""
+    hits = 0
+    for item in items:
+        if item["size"] >= rules.max_size_bytes:
+            continue
+        name = item["name"].lower()
+        if rules.check_malicious(name)[0] or rules.check_quality(name)[0]:
+            hits += 1
+            continue
+        if rules.check_failed_import(item["error_message"].lower(), item["status"])[0]:
+            hits += 1
+    return hits
+
+
+def run(item_count=10000, extra_patterns=500):
+    settings = build_settings(extra_patterns)
+    items = build_queue(item_count)
+
+    started = time.perf_counter()
+    rules = SwaparrRules(settings)
+    compile_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled_hits = evaluate_compiled(items, rules)
+    compiled_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    linear_hits = evaluate_linear(items, settings)
+    linear_time = time.perf_counter() - started
+
+    print(f"Queue items: {item_count}, patterns per list: ~{extra_patterns}")
+    print(f"Compile rules:   {compile_time * 1000:8.2f} ms (once per settings version)")
+    print(f"Compiled rules:  {compiled_time * 1000:8.2f} ms  {item_count / compiled_time:12,.0f} items/s  ({compiled_hits} hits)")
+    print(f"Linear scans:    {linear_time * 1000:8.2f} ms  {item_count / linear_time:12,.0f} items/s  ({linear_hits} hits)")
+    print(f"Speedup:         {linear_time / compiled_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the compiled Swaparr rule set")
+    parser.add_argument("--items", type=int, default=10000, help="Synthetic queue size")
+    parser.add_argument("--patterns", type=int, default=500, help="Extra random patterns per blocklist")
+    args = parser.parse_args()
+    run(args.items, args.patterns)
@@ -0,0 +1,201 @@
+"""
+Swaparr decision engine.
+Pure evaluation of one parsed queue item against the compiled rules and its strike
+entry. No API calls, database access or statistics happen here: the caller applies
+the returned decision, so the same logic drives live processing and offline replay.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+# Decision actions
+ACTION_NONE = "none"        # Nothing to do
+ACTION_IGNORE = "ignore"    # Skipped by a rule (size, delay profile, recently queued)
+ACTION_MONITOR = "monitor"  # Queued item now being watched
+ACTION_STRIKE = "strike"    # Strike added, below the limit
+ACTION_REMOVE = "remove"    # Remove the download from the queue and client
+
+# Queued items are left alone for this long after Swaparr first sees them
+QUEUED_GRACE_SECONDS = 3600
+
+
+def generate_item_hash(item):
+    """Generate a unique hash for an item based on its name and size.
+    This helps track items across restarts even if their queue ID changes."""
+    hash_input = f"{item['name']}_{item['size']}"
+    return hashlib.md5(hash_input.encode('utf-8')).hexdigest()
+
+
+def _new_strike_entry(item, now):
+    return {
+        "strikes": 0,
+        "name": item["name"],
+        "first_strike_time": now,
+        "last_strike_time": None
+    }
+
+
+def _decision(item, item_id, item_hash, action, category=None, state="Normal", reason=None,
+              strike_entry=None, trigger_search=False, mark_strike=False, strike_added=False,
+              session_stat=None, persistent_stat=None, detail=None, success_message=None):
+    return {
+        "item": item,
+        "item_id": item_id,
+        "item_hash": item_hash,
+        "action": action,
+        "category": category,
+        "state": state,
+        "reason": reason,
+        "strike_entry": strike_entry,
+        "trigger_search": trigger_search,
+        "mark_strike": mark_strike,
+        "strike_added": strike_added,
+        "session_stat": session_stat,
+        "persistent_stat": persistent_stat,
+        "detail": detail,
+        "success_message": success_message
+    }
+
+
+def evaluate_item(item: Dict[str, Any], strike_entry: Optional[Dict[str, Any]], rules,
+                  removed_time: Optional[float], now: float) -> Dict[str, Any]:
+    """
+    Decide what Swaparr should do with one queue item.
+
+    Args:
+        item: Parsed queue item (see handler.parse_queue_items)
+        strike_entry: The item's current strike row, or None if it has none
+        rules: Compiled SwaparrRules
+        removed_time: Epoch time the item was previously removed within the TTL, or None
+        now: Evaluation time as epoch seconds
+
+    Returns:
+        Decision dict. 'strike_entry' is the item's updated strike row when it changed
+        (a new dict; the input is never modified), otherwise None. Removals carry the
+        reason to record, whether to trigger a search, and the stats to count on success.
+    """
+    item_id = str(item["id"])
+    item_hash = generate_item_hash(item)
+    name = item["name"]
+    status = item["status"]
+    # Lowercase once; every rule below matches against these
+    item_name_lower = (name or "").lower()
+    error_lower = (item.get("error_message") or "").lower()
+
+    # Previously removed downloads that reappear are removed again without a search
+    if removed_time is not None:
+        days_since_removal = int((now - removed_time) // 86400)
+        return _decision(item, item_id, item_hash, ACTION_REMOVE, "reappeared", "Reappeared",
+                         detail=f"Found previously removed download that reappeared: {name} (removed {days_since_removal} days ago)",
+                         success_message=f"Re-removed previously removed download: {name}")
+
+    # Skip large files if configured
+    if item["size"] >= rules.max_size_bytes:
+        return _decision(item, item_id, item_hash, ACTION_IGNORE, "size", "Ignored (Size)",
+                         detail=f"Ignoring large download: {name} ({item['size']} bytes > {rules.max_size_bytes} bytes)")
+
+    # Delayed items respect delay profiles
+    if status == "delay":
+        return _decision(item, item_id, item_hash, ACTION_IGNORE, "delay", "Ignored (Delayed)",
+                         detail=f"Ignoring delayed download: {name}")
+
+    # Only truly queued items are skipped, not those with metadata issues
+    metadata_issue = "metadata" in status or "metadata" in error_lower
+
+    if status == "queued" and not metadata_issue:
+        if strike_entry and strike_entry.get("first_strike_time"):
+            if now - strike_entry["first_strike_time"] < QUEUED_GRACE_SECONDS:
+                return _decision(item, item_id, item_hash, ACTION_IGNORE, "recently_queued", "Ignored (Recently Queued)",
+                                 detail=f"Ignoring recently queued download: {name}")
+        else:
+            # Start the grace period from now
+            entry = dict(strike_entry) if strike_entry else _new_strike_entry(item, now)
+            entry["first_strike_time"] = now
+            return _decision(item, item_id, item_hash, ACTION_MONITOR, "queued", "Monitoring (Queued)",
+                             strike_entry=entry, detail=f"Monitoring new queued download: {name}")
+
+    # Malicious files FIRST - immediate removal without strikes
+    is_malicious, malicious_reason = rules.check_malicious(item_name_lower)
+    if is_malicious:
+        return _decision(item, item_id, item_hash, ACTION_REMOVE, "malicious", f"Malicious: {malicious_reason}",
+                         reason=f"Malicious: {malicious_reason}", trigger_search=rules.research_removed,
+                         session_stat="malicious_removed", persistent_stat="malicious_removals",
+                         detail=f"MALICIOUS CONTENT DETECTED: {name} - {malicious_reason}",
+                         success_message=f"Successfully removed malicious download: {name}")
+
+    # Quality-based removal SECOND - immediate removal without strikes
+    is_quality_blocked, quality_reason = rules.check_quality(item_name_lower)
+    if is_quality_blocked:
+        return _decision(item, item_id, item_hash, ACTION_REMOVE, "quality", f"Quality: {quality_reason}",
+                         reason=f"Quality: {quality_reason}", trigger_search=rules.research_removed,
+                         session_stat="quality_removed", persistent_stat="quality_removals",
+                         detail=f"QUALITY-BASED REMOVAL: {name} - {quality_reason}",
+                         success_message=f"Successfully removed quality-blocked download: {name}")
+
+    # Everything past this point is tracked in strike data
+    new_entry = None
+    if strike_entry is None:
+        new_entry = strike_entry = _new_strike_entry(item, now)
+
+    # Age-based removal THIRD - immediate removal without strikes
+    is_age_expired, age_reason = rules.check_age(strike_entry.get("first_strike_time"), now)
+    if is_age_expired:
+        return _decision(item, item_id, item_hash, ACTION_REMOVE, "age", f"Age: {age_reason}",
+                         reason=f"Age: {age_reason}", strike_entry=new_entry, trigger_search=rules.research_removed,
+                         mark_strike=True, session_stat="age_removed", persistent_stat="age_removals",
+                         detail=f"AGE-BASED REMOVAL: {name} - {age_reason}",
+                         success_message=f"Successfully removed age-expired download: {name}")
+
+    # Failed imports FOURTH - immediate removal, always re-searched
+    is_import_failed, import_reason = rules.check_failed_import(error_lower, status)
+    if is_import_failed:
+        return _decision(item, item_id, item_hash, ACTION_REMOVE, "failed_import", f"Failed Import: {import_reason}",
+                         reason=f"Failed Import: {import_reason}", strike_entry=new_entry, trigger_search=True,
+                         session_stat="import_failed_removed", persistent_stat="import_failed_removals",
+                         detail=f"FAILED IMPORT DETECTED: {name} - {import_reason}",
+                         success_message=f"Successfully removed failed import: {name}")
+
+    # Strike if metadata issue, eta too long, or no progress (eta = 0 and not queued)
+    strike_reason = None
+    if metadata_issue:
+        strike_reason = "Metadata"
+    elif item["eta"] >= rules.max_download_seconds:
+        strike_reason = "ETA too long"
+    elif item["eta"] == 0 and status not in ["queued", "delay"]:
+        strike_reason = "No progress"
+
+    if not strike_reason:
+        return _decision(item, item_id, item_hash, ACTION_NONE, strike_entry=new_entry)
+
+    entry = dict(strike_entry)
+    entry["strikes"] = (entry.get("strikes") or 0) + 1
+    entry["last_strike_time"] = now
+    if entry.get("first_strike_time") is None:
+        entry["first_strike_time"] = now
+    current_strikes = entry["strikes"]
+    detail = f"Added strike ({current_strikes}/{rules.max_strikes}) to {name} - Reason: {strike_reason}"
+
+    if current_strikes >= rules.max_strikes:
+        return _decision(item, item_id, item_hash, ACTION_REMOVE, "max_strikes", f"Max Strikes: {strike_reason}",
+                         reason=strike_reason, strike_entry=entry, trigger_search=rules.research_removed,
+                         mark_strike=True, strike_added=True, detail=detail,
+                         success_message=f"Successfully removed {name} after {rules.max_strikes} strikes")
+
+    return _decision(item, item_id, item_hash, ACTION_STRIKE, "strike", f"Striked ({current_strikes}/{rules.max_strikes})",
+                     reason=strike_reason, strike_entry=entry, strike_added=True, detail=detail)
+
+
+def needs_strike_check(item: Dict[str, Any], strike_entry: Optional[Dict[str, Any]], rules) -> bool:
+    """
+    Whether an item from a last known queue is worth re-evaluating on the strike sweep:
+    it already has strikes, or its last known state would earn one.
+    """
+    if strike_entry and strike_entry.get("strikes") and not strike_entry.get("removed"):
+        return True
+    status = item.get("status") or ""
+    if status == "delay":
+        return False
+    if "metadata" in status or "metadata" in (item.get("error_message") or "").lower():
+        return True
+    eta = item.get("eta") or 0
+    return eta >= rules.max_download_seconds or (eta == 0 and status != "queued")
@@ -12,20 +12,47 @@ Improvements in this version:
 
 import os
 import json
+import math
 import time
-import hashlib
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import requests
 from typing import Dict, List, Any, Optional
 
 from src.primary.utils.logger import get_logger
-from src.primary.settings_manager import load_settings
+from src.primary.settings_manager import load_settings, get_settings_snapshot
 from src.primary.utils.database import get_database
-from src.primary.apps.swaparr.stats_manager import increment_swaparr_stat
+from src.primary.apps.swaparr.stats_manager import increment_swaparr_stat, flush_swaparr_stats
+from src.primary.apps.swaparr.removed_index import get_removed_index
+from src.primary.apps.swaparr.live_queue import update_view, take_pending_refreshes, get_view_items
+from src.primary.apps.swaparr.engine import (
+    evaluate_item,
+    generate_item_hash,
+    needs_strike_check,
+    ACTION_IGNORE,
+    ACTION_MONITOR,
+    ACTION_REMOVE
+)
+from src.primary.apps.swaparr.rules import (
+    get_compiled_rules,
+    parse_size_string_to_bytes,
+    parse_time_string_to_seconds
+)
 
 # Create logger
 swaparr_logger = get_logger("swaparr")
 
+# Concurrency limits for a Swaparr cycle
+MAX_CONCURRENT_INSTANCES = 4  # Default for the max_concurrent_instances setting
+MAX_CONCURRENT_PAGES = 4  # Queue pages fetched in parallel per instance
+QUEUE_PAGE_SIZE = 100
+
+# Shared HTTP session so concurrent instance scans reuse pooled connections
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 # Enhanced statistics tracking
 SWAPARR_STATS = {
     'total_processed': 0,
@@ -39,238 +66,72 @@ SWAPARR_STATS = {
     'apps_processed': set(),
     'session_start_time': datetime.utcnow().isoformat()
 }
+_session_stats_lock = threading.Lock()
+
+def increment_session_stat(stat_key, count=1):
+    """Increment a session statistic; instances are scanned concurrently"""
+    with _session_stats_lock:
+        SWAPARR_STATS[stat_key] = SWAPARR_STATS.get(stat_key, 0) + count
 
 def reset_session_stats():
     """Reset session statistics"""
     global SWAPARR_STATS
-    SWAPARR_STATS.update({
-        'total_processed': 0,
-        'strikes_added': 0,
-        'downloads_removed': 0,
-        'malicious_removed': 0,
-        'items_ignored': 0,
-        'api_calls_made': 0,
-        'errors_encountered': 0,
-        'apps_processed': set(),
-        'session_start_time': datetime.utcnow().isoformat()
-    })
+    with _session_stats_lock:
+        SWAPARR_STATS.update({
+            'total_processed': 0,
+            'strikes_added': 0,
+            'downloads_removed': 0,
+            'malicious_removed': 0,
+            'items_ignored': 0,
+            'api_calls_made': 0,
+            'errors_encountered': 0,
+            'apps_processed': set(),
+            'session_start_time': datetime.utcnow().isoformat()
+        })
     swaparr_logger.info("Reset Swaparr session statistics")
 
 def get_session_stats():
     """Get current session statistics"""
-    stats_copy = SWAPARR_STATS.copy()
+    with _session_stats_lock:
+        stats_copy = SWAPARR_STATS.copy()
     stats_copy['apps_processed'] = list(stats_copy['apps_processed'])  # Convert set to list for JSON
     return stats_copy
 
-def load_strike_data(app_name):
-    """Load strike data for a specific app from database"""
+def load_strike_data(app_name, instance_name, queue_ids=None):
+    """Load strike rows for a specific app instance from database (queue_ids: item ids in its current queue)"""
     try:
         db = get_database()
-        return db.get_swaparr_strike_data(app_name)
+        return db.get_swaparr_strikes(app_name, instance_name, queue_ids)
     except Exception as e:
-        swaparr_logger.error(f"Error loading strike data for {app_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
+        swaparr_logger.error(f"Error loading strike data for {app_name}/{instance_name}: {str(e)}")
+        increment_session_stat('errors_encountered')
         return {}
 
-def save_strike_data(app_name, strike_data):
-    """Save strike data for a specific app to database"""
-    try:
-        db = get_database()
-        db.set_swaparr_strike_data(app_name, strike_data)
-    except Exception as e:
-        swaparr_logger.error(f"Error saving strike data for {app_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
-
-def load_removed_items(app_name):
-    """Load list of permanently removed items from database"""
+def save_strike_data(app_name, instance_name, strike_data, changed_ids):
+    """Upsert the strike rows that changed during this run"""
+    if not changed_ids:
+        return
     try:
         db = get_database()
-        return db.get_swaparr_removed_items(app_name)
+        db.upsert_swaparr_strikes(app_name, instance_name, {item_id: strike_data[item_id] for item_id in changed_ids})
     except Exception as e:
-        swaparr_logger.error(f"Error loading removed items for {app_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
-        return {}
+        swaparr_logger.error(f"Error saving strike data for {app_name}/{instance_name}: {str(e)}")
+        increment_session_stat('errors_encountered')
 
-def save_removed_items(app_name, removed_items):
-    """Save list of permanently removed items to database"""
+def save_removed_item(app_name, instance_name, item, item_hash, reason):
+    """Record a single removed download so it is removed again if it reappears"""
     try:
-        db = get_database()
-        db.set_swaparr_removed_items(app_name, removed_items)
+        get_removed_index().add(app_name, instance_name, item_hash, item["name"], item["size"], reason)
     except Exception as e:
-        swaparr_logger.error(f"Error saving removed items for {app_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
-
-def generate_item_hash(item):
-    """Generate a unique hash for an item based on its name and size.
-    This helps track items across restarts even if their queue ID changes."""
-    hash_input = f"{item['name']}_{item['size']}"
-    return hashlib.md5(hash_input.encode('utf-8')).hexdigest()
-
-def check_for_malicious_files(item, settings):
-    """Check if download contains malicious file types"""
-    if not settings.get('malicious_file_detection', False):
-        return False, None
-    
-    # Use user-defined malicious extensions from settings
-    malicious_extensions = settings.get('malicious_extensions', [
-        '.lnk', '.exe', '.bat', '.cmd', '.scr', '.pif', '.com', 
-        '.zipx', '.jar', '.vbs', '.js', '.jse', '.wsf', '.wsh'
-    ])
-    
-    # Use user-defined suspicious patterns from settings
-    suspicious_patterns = settings.get('suspicious_patterns', [
-        'password.txt', 'readme.txt', 'install.exe', 'setup.exe',
-        'keygen', 'crack', 'patch.exe', 'activator'
-    ])
-    
-    item_name = item.get('name', '').lower()
-    
-    # Check for malicious extensions in the title/name
-    for ext in malicious_extensions:
-        if ext.lower() in item_name:
-            swaparr_logger.warning(f"Malicious file detected in '{item_name}': contains {ext}")
-            return True, f"Contains malicious file type: {ext}"
-    
-    # Check for suspicious patterns
-    for pattern in suspicious_patterns:
-        if pattern.lower() in item_name:
-            swaparr_logger.warning(f"Suspicious content detected in '{item_name}': contains {pattern}")
-            return True, f"Contains suspicious content: {pattern}"
-    
-    return False, None
-
-def check_age_based_removal(item, strike_data, settings):
-    """Check if download should be removed based on age"""
-    if not settings.get('age_based_removal', False):
-        return False, None
-    
-    max_age_days = settings.get('max_age_days', 7)
-    item_id = str(item.get('id', ''))
-    
-    # Check if we have strike data for this item
-    if item_id not in strike_data or not strike_data[item_id].get('first_strike_time'):
-        return False, None
-    
-    try:
-        first_strike = datetime.fromisoformat(strike_data[item_id]['first_strike_time'].replace('Z', '+00:00'))
-        age_days = (datetime.utcnow() - first_strike).days
-        
-        if age_days >= max_age_days:
-            swaparr_logger.warning(f"Age-based removal triggered for '{item['name']}': {age_days} days old (max: {max_age_days})")
-            return True, f"Too old: {age_days} days (max: {max_age_days})"
-    except (ValueError, KeyError) as e:
-        swaparr_logger.error(f"Error parsing first strike time for item {item_id}: {e}")
-    
-    return False, None
-
-def check_quality_based_removal(item, settings):
-    """Check if download should be removed based on quality"""
-    if not settings.get('quality_based_removal', False):
-        return False, None
-    
-    # Use user-defined blocked quality patterns from settings
-    blocked_qualities = settings.get('blocked_quality_patterns', [
-        'cam', 'camrip', 'hdcam', 'ts', 'telesync', 'tc', 'telecine',
-        'r6', 'dvdscr', 'dvdscreener', 'workprint', 'wp'
-    ])
-    
-    item_name = item.get('name', '').lower()
-    
-    # Check for blocked quality patterns
-    for quality in blocked_qualities:
-        if quality.lower() in item_name:
-            swaparr_logger.warning(f"Quality-based removal triggered for '{item['name']}': contains blocked quality '{quality}'")
-            return True, f"Blocked quality: {quality}"
-    
-    return False, None
-
-def check_for_failed_imports(item, settings):
-    """Check if download has failed import based on error patterns"""
-    if not settings.get("failed_import_detection", False):
-        return False, ""
-    
-    error_message = item.get("error_message", "").lower()
-    status = item.get("status", "").lower()
-    
-    # Common import failure indicators
-    import_failure_indicators = [
-        "import failed", "unable to import", "import error",
-        "no files found", "path not found", "access denied",
-        "disk full", "permission denied", "invalid path",
-        "file not found", "directory not found", "cannot import",
-        "import unsuccessful", "failed to import", "import aborted",
-        "insufficient space", "read-only", "network error",
-        "timeout", "connection lost", "corrupted", "invalid format",
-        "no space left", "operation not permitted", "input/output error"
-    ]
-    
-    # Check error message and status for failure patterns
-    for pattern in import_failure_indicators:
-        if pattern in error_message or pattern in status:
-            return True, f"Import failure detected: {pattern}"
-    
-    # Also check for specific status values that indicate import failures
-    failed_statuses = ["failed", "error", "warning"]
-    if status in failed_statuses and ("import" in error_message or "file" in error_message or "path" in error_message):
-        return True, f"Import failure status: {status}"
-    
-    return False, ""
-
-def parse_time_string_to_seconds(time_string):
-    """Parse a time string like '2h', '30m', '1d' to seconds"""
-    if not time_string:
-        return 7200  # Default 2 hours
-    
-    unit = time_string[-1].lower()
-    try:
-        value = int(time_string[:-1])
-    except ValueError:
-        swaparr_logger.error(f"Invalid time string: {time_string}, using default 2 hours")
-        return 7200
-    
-    if unit == 'd':
-        return value * 86400  # Days to seconds
-    elif unit == 'h':
-        return value * 3600   # Hours to seconds
-    elif unit == 'm':
-        return value * 60     # Minutes to seconds
-    else:
-        swaparr_logger.error(f"Unknown time unit in: {time_string}, using default 2 hours")
-        return 7200
-
-def parse_size_string_to_bytes(size_string):
-    """Parse a size string like '25GB', '1TB' to bytes"""
-    if not size_string:
-        return 25 * 1024 * 1024 * 1024  # Default 25GB
-    
-    # Extract the numeric part and unit
-    unit = ""
-    for i in range(len(size_string) - 1, -1, -1):
-        if not size_string[i].isalpha():
-            value = float(size_string[:i+1])
-            unit = size_string[i+1:].upper()
-            break
-    else:
-        swaparr_logger.error(f"Invalid size string: {size_string}, using default 25GB")
-        return 25 * 1024 * 1024 * 1024
-    
-    # Convert to bytes based on unit
-    if unit == 'B':
-        return int(value)
-    elif unit == 'KB':
-        return int(value * 1024)
-    elif unit == 'MB':
-        return int(value * 1024 * 1024)
-    elif unit == 'GB':
-        return int(value * 1024 * 1024 * 1024)
-    elif unit == 'TB':
-        return int(value * 1024 * 1024 * 1024 * 1024)
-    else:
-        swaparr_logger.error(f"Unknown size unit in: {size_string}, using default 25GB")
-        return 25 * 1024 * 1024 * 1024
+        swaparr_logger.error(f"Error saving removed item for {app_name}/{instance_name}: {str(e)}")
+        increment_session_stat('errors_encountered')
 
 def get_queue_items(app_name, api_url, api_key, api_timeout=120):
-    """Get download queue items from a Starr app API with pagination support"""
+    """
+    Get download queue items from a Starr app API with pagination support.
+    Returns None when the queue could not be fetched in full, so callers keep their
+    last view of the queue instead of treating missing items as gone.
+    """
     api_version_map = {
         "radarr": "v3",
         "sonarr": "v3",
@@ -281,44 +142,46 @@ def get_queue_items(app_name, api_url, api_key, api_timeout=120):
     }
     
     api_version = api_version_map.get(app_name, "v3")
-    all_records = []
-    page = 1
-    page_size = 100  # Request a large page size to reduce API calls
-    
-    while True:
-        # Add pagination parameters
-        queue_url = f"{api_url.rstrip('/')}/api/{api_version}/queue?page={page}&pageSize={page_size}"
-        headers = {'X-Api-Key': api_key}
-        
-        try:
-            SWAPARR_STATS['api_calls_made'] += 1
-            response = requests.get(queue_url, headers=headers, timeout=api_timeout)
-            response.raise_for_status()
-            queue_data = response.json()
-            
-            if api_version in ["v3"]:  # Radarr, Sonarr, Whisparr, Eros use v3
-                records = queue_data.get("records", [])
-                total_records = queue_data.get("totalRecords", 0)
-            else:  # Lidarr, Readarr use v1 - but they also use the records structure
-                records = queue_data.get("records", [])
-                total_records = queue_data.get("totalRecords", len(records))
-            
-            # Add this page's records to our collection
-            all_records.extend(records)
-            
-            # If we've fetched all records or there are no more, break the loop
-            if len(all_records) >= total_records or len(records) == 0:
-                break
-            
-            # Otherwise, move to the next page
-            page += 1
-            
-        except requests.exceptions.RequestException as e:
-            swaparr_logger.error(f"Error fetching queue for {app_name} (page {page}): {str(e)}")
-            SWAPARR_STATS['errors_encountered'] += 1
-            break
+    queue_url = f"{api_url.rstrip('/')}/api/{api_version}/queue"
+    headers = {'X-Api-Key': api_key}
+    
+    def fetch_page(page):
+        increment_session_stat('api_calls_made')
+        response = session.get(queue_url, headers=headers, timeout=api_timeout,
+                               params={"page": page, "pageSize": QUEUE_PAGE_SIZE})
+        response.raise_for_status()
+        return response.json()
     
-    swaparr_logger.info(f"Fetched {len(all_records)} queue items for {app_name} using {page} API calls")
+    # The first page tells us how many records there are; the rest are fetched in parallel
+    try:
+        queue_data = fetch_page(1)
+    except requests.exceptions.RequestException as e:
+        swaparr_logger.error(f"Error fetching queue for {app_name} (page 1): {str(e)}")
+        increment_session_stat('errors_encountered')
+        return None
+    
+    all_records = list(queue_data.get("records", []))
+    total_records = queue_data.get("totalRecords", len(all_records))
+    total_pages = max(1, math.ceil(total_records / QUEUE_PAGE_SIZE)) if all_records else 1
+    
+    failed_pages = 0
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PAGES, total_pages - 1),
+                                thread_name_prefix=f"SwaparrQueue-{app_name}") as executor:
+            futures = [(page, executor.submit(fetch_page, page)) for page in range(2, total_pages + 1)]
+            for page, future in futures:
+                try:
+                    all_records.extend(future.result().get("records", []))
+                except requests.exceptions.RequestException as e:
+                    swaparr_logger.error(f"Error fetching queue for {app_name} (page {page}): {str(e)}")
+                    increment_session_stat('errors_encountered')
+                    failed_pages += 1
+    
+    if failed_pages:
+        swaparr_logger.warning(f"Skipping {app_name} queue: {failed_pages} of {total_pages} pages could not be fetched")
+        return None
+    
+    swaparr_logger.info(f"Fetched {len(all_records)} queue items for {app_name} using {total_pages} API calls")
     
     # Normalize the response based on app type
     if app_name in ["radarr", "whisparr", "eros"]:
@@ -376,7 +239,8 @@ def parse_queue_items(records, item_type, app_name):
             "size": record.get("size", 0),
             "status": record.get("status", "unknown").lower(),
             "eta": eta_seconds,
-            "error_message": record.get("errorMessage", "")
+            "error_message": record.get("errorMessage", ""),
+            "download_id": record.get("downloadId")
         })
     
     return queue_items
@@ -468,8 +332,8 @@ def trigger_search_for_item(app_name, api_url, api_key, item, api_timeout=120):
             return False
         
         # Execute the search command
-        SWAPARR_STATS['api_calls_made'] += 1
-        response = requests.post(search_url, headers=headers, json=payload, timeout=api_timeout)
+        increment_session_stat('api_calls_made')
+        response = session.post(search_url, headers=headers, json=payload, timeout=api_timeout)
         response.raise_for_status()
         
         swaparr_logger.info(f"Successfully triggered search for {item.get('name', 'unknown')} in {app_name}")
@@ -477,7 +341,7 @@ def trigger_search_for_item(app_name, api_url, api_key, item, api_timeout=120):
         
     except requests.exceptions.RequestException as e:
         swaparr_logger.error(f"Error triggering search for {item.get('name', 'unknown')} in {app_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
+        increment_session_stat('errors_encountered')
         return False
 
 def delete_download(app_name, api_url, api_key, download_id, remove_from_client=True, item=None, trigger_search=False, api_timeout=120):
@@ -496,12 +360,11 @@ def delete_download(app_name, api_url, api_key, download_id, remove_from_client=
     headers = {'X-Api-Key': api_key}
     
     try:
-        SWAPARR_STATS['api_calls_made'] += 1
-        response = requests.delete(delete_url, headers=headers, timeout=api_timeout)
+        increment_session_stat('api_calls_made')
+        response = session.delete(delete_url, headers=headers, timeout=api_timeout)
         response.raise_for_status()
         swaparr_logger.info(f"Successfully removed download {download_id} from {app_name}")
-        SWAPARR_STATS['downloads_removed'] += 1
-        increment_swaparr_stat("removals", 1)  # Track removals in persistent system
+        increment_session_stat('downloads_removed')
         
         # Trigger search if requested and item data is available
         if trigger_search and item:
@@ -515,12 +378,57 @@ def delete_download(app_name, api_url, api_key, download_id, remove_from_client=
         return True
     except requests.exceptions.RequestException as e:
         swaparr_logger.error(f"Error removing download {download_id} from {app_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
+        increment_session_stat('errors_encountered')
         return False
 
-def process_stalled_downloads(app_name, instance_name, instance_data, settings):
-    """Process stalled downloads for a specific app instance."""
+class InstanceActionQueue:
+    """
+    Runs removals and re-searches for one instance in order on a dedicated worker,
+    so scanning never waits on the Arr API and a slow instance only delays itself.
+    Success callbacks run on the scanning thread when the queue is drained.
+    """
+    
+    def __init__(self, app_name, instance_name):
+        self.app_name = app_name
+        self.instance_name = instance_name
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"SwaparrActions-{app_name}")
+        self._pending = []
+    
+    def submit(self, fn, *args, on_success=None, **kwargs):
+        """Queue an action; on_success is called after drain() if the action returns True"""
+        self._pending.append((self._executor.submit(fn, *args, **kwargs), on_success))
+    
+    def drain(self):
+        """Wait for every queued action and run the success callbacks. Returns the number that succeeded."""
+        succeeded = 0
+        try:
+            for future, on_success in self._pending:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    swaparr_logger.error(f"Queued action failed for {self.app_name} instance {self.instance_name}: {str(e)}")
+                    increment_session_stat('errors_encountered')
+                    continue
+                if result:
+                    succeeded += 1
+                    if on_success:
+                        on_success()
+        finally:
+            self._pending.clear()
+            self._executor.shutdown(wait=True)
+        return succeeded
+
+def process_stalled_downloads(app_name, instance_name, instance_data, settings, rules=None, queue_items=None):
+    """
+    Process stalled downloads for a specific app instance.
+    
+    Rules and thresholds come from the compiled rule set for the current Swaparr
+    settings version unless an explicit SwaparrRules is passed in. When queue_items
+    is given (webhook-driven refresh) only those items are evaluated; otherwise the
+    full queue is fetched and the instance's live queue view is reconciled with it.
+    """
     swaparr_logger.info(f"Checking download queue for {app_name} instance: {instance_name}")
+    actions = None
     
     try:
         # Check if instance has Swaparr enabled
@@ -529,329 +437,230 @@ def process_stalled_downloads(app_name, instance_name, instance_data, settings):
             return 0  # Return 0 processed
         
         # Check for disabled setting during processing (every 10 items to avoid excessive I/O)
-        current_swaparr_settings = load_settings("swaparr")
+        current_swaparr_settings = get_settings_snapshot("swaparr")
         if not current_swaparr_settings or not current_swaparr_settings.get("enabled", False):
             swaparr_logger.warning(f"Swaparr was disabled during download processing for {app_name} instance: {instance_name}. Stopping processing.")
             return 0
         
-        # Get the download queue
-        queue_response = get_queue_items(app_name, instance_data["api_url"], instance_data["api_key"])
-        queue_items = queue_response
-        
-        swaparr_logger.info(f"Found {len(queue_items)} downloads in queue for {app_name} instance: {instance_name}")
+        # Get the download queue, unless a webhook refresh already supplied the changed items
+        if queue_items is None:
+            queue_items = get_queue_items(app_name, instance_data["api_url"], instance_data["api_key"])
+            if queue_items is None:
+                swaparr_logger.warning(f"Could not fetch the queue for {app_name} instance: {instance_name}; skipping this run")
+                return 0
+            update_view(app_name, instance_name, queue_items)
+            swaparr_logger.info(f"Found {len(queue_items)} downloads in queue for {app_name} instance: {instance_name}")
+        else:
+            swaparr_logger.info(f"Evaluating {len(queue_items)} changed downloads for {app_name} instance: {instance_name}")
         
         if len(queue_items) == 0:
             swaparr_logger.info(f"No downloads to process for {app_name} instance: {instance_name}")
             return 0
         
-        # Load strike data and removed items for this app
-        strike_data = load_strike_data(app_name)
-        removed_items = load_removed_items(app_name)
+        if rules is None:
+            rules = get_compiled_rules()
+        dry_run = rules.dry_run
+        
+        # Load strike rows for this instance; removed hashes come from the shared TTL index
+        strike_data = load_strike_data(app_name, instance_name, [str(item["id"]) for item in queue_items])
+        removed_index = get_removed_index()
+        removed_index.prune_storage()
+        changed_strikes = set()  # Item ids whose strike rows need an upsert
+        
+        # Removals and re-searches run on this instance's action queue
+        actions = InstanceActionQueue(app_name, instance_name)
+        
+        def removal_callback(decision):
+            """Build the bookkeeping to run once a queued removal has succeeded"""
+            item = decision["item"]
+            item_id = decision["item_id"]
+            def on_success():
+                swaparr_logger.info(decision["success_message"])
+                # Mark as removed to prevent reappearance
+                save_removed_item(app_name, instance_name, item, decision["item_hash"], decision["reason"])
+                if decision["mark_strike"]:
+                    # Keep the item in strike data for reference but mark as removed
+                    strike_entry = strike_data[item_id]
+                    strike_entry["removed"] = True
+                    strike_entry["removed_time"] = time.time()
+                    changed_strikes.add(item_id)
+                if decision["session_stat"]:
+                    increment_session_stat(decision["session_stat"])
+                increment_swaparr_stat("removals", 1, app_name, instance_name)  # Track removals in persistent system
+                if decision["persistent_stat"]:
+                    increment_swaparr_stat(decision["persistent_stat"], 1, app_name, instance_name)
+            return on_success
         
         # Process each queue item
         items_processed_this_run = 0
         for item in queue_items:
             # Check if Swaparr has been disabled during processing (every 10 items to avoid excessive I/O)
             if items_processed_this_run % 10 == 0:
-                current_swaparr_settings = load_settings("swaparr")
+                current_swaparr_settings = get_settings_snapshot("swaparr")
                 if not current_swaparr_settings or not current_swaparr_settings.get("enabled", False):
                     swaparr_logger.warning(f"Swaparr was disabled during download processing for {app_name} instance: {instance_name}. Stopping after processing {items_processed_this_run} items.")
                     break
             
-            item_id = str(item["id"])
-            item_state = "Normal"
-            item_hash = generate_item_hash(item)
-            
-            SWAPARR_STATS['total_processed'] += 1
-            if not settings.get("dry_run", False):
-                increment_swaparr_stat("processed", 1)  # Track processed items in persistent system
+            increment_session_stat('total_processed')
+            if not dry_run:
+                increment_swaparr_stat("processed", 1, app_name, instance_name)  # Track processed items in persistent system
             items_processed_this_run += 1
             
-            # Check if this item has been previously removed
-            if item_hash in removed_items:
-                last_removed_date = datetime.fromisoformat(removed_items[item_hash]["removed_time"].replace('Z', '+00:00'))
-                days_since_removal = (datetime.utcnow() - last_removed_date).days
-                
-                # Re-remove it automatically if it's been less than 7 days since last removal
-                if days_since_removal < 7:
-                    swaparr_logger.warning(f"Found previously removed download that reappeared: {item['name']} (removed {days_since_removal} days ago)")
-                    
-                    if not settings.get("dry_run", False):
-                        # Don't trigger search for re-removed items (they were already searched before)
-                        if delete_download(app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, False):
-                            swaparr_logger.info(f"Re-removed previously removed download: {item['name']}")
-                            # Update the removal time
-                            removed_items[item_hash]["removed_time"] = datetime.utcnow().isoformat()
-                            # Note: Swaparr uses its own statistics system (SWAPARR_STATS), not the hunting stats manager
-                    else:
-                        swaparr_logger.info(f"DRY RUN: Would have re-removed previously removed download: {item['name']}")
-                    
-                    item_state = "Re-removed" if not settings.get("dry_run", False) else "Would Re-remove (Dry Run)"
-                    continue
-            
-            # Skip large files if configured
-            max_size = parse_size_string_to_bytes(settings.get("ignore_above_size", "25GB"))
-            if item["size"] >= max_size:
-                swaparr_logger.debug(f"Ignoring large download: {item['name']} ({item['size']} bytes > {max_size} bytes)")
-                item_state = "Ignored (Size)"
-                SWAPARR_STATS['items_ignored'] += 1
-                if not settings.get("dry_run", False):
-                    increment_swaparr_stat("ignored", 1)  # Track ignored items in persistent system
-                continue
-            
-            # Handle delayed items - we'll skip these (respects delay profiles)
-            if item["status"] == "delay":
-                swaparr_logger.debug(f"Ignoring delayed download: {item['name']}")
-                item_state = "Ignored (Delayed)"
-                SWAPARR_STATS['items_ignored'] += 1
-                if not settings.get("dry_run", False):
-                    increment_swaparr_stat("ignored", 1)  # Track ignored items in persistent system
-                continue
-            
-            # Special handling for "queued" status
-            # We only skip truly queued items, not those with metadata issues
-            metadata_issue = "metadata" in item["status"].lower() or "metadata" in item["error_message"].lower()
-            
-            if item["status"] == "queued" and not metadata_issue:
-                # For regular queued items, check how long they've been in strike data
-                if item_id in strike_data and "first_strike_time" in strike_data[item_id]:
-                    first_strike = datetime.fromisoformat(strike_data[item_id]["first_strike_time"].replace('Z', '+00:00'))
-                    if (datetime.utcnow() - first_strike) < timedelta(hours=1):
-                        # Skip if it's been less than 1 hour since first seeing it
-                        swaparr_logger.debug(f"Ignoring recently queued download: {item['name']}")
-                        item_state = "Ignored (Recently Queued)"
-                        SWAPARR_STATS['items_ignored'] += 1
-                        if not settings.get("dry_run", False):
-                            increment_swaparr_stat("ignored", 1)  # Track ignored items in persistent system
-                        continue
-                else:
-                    # Initialize with first strike time for queued items
-                    if item_id not in strike_data:
-                        strike_data[item_id] = {
-                            "strikes": 0,
-                            "name": item["name"],
-                            "first_strike_time": datetime.utcnow().isoformat(),
-                            "last_strike_time": None
-                        }
-                    swaparr_logger.debug(f"Monitoring new queued download: {item['name']}")
-                    item_state = "Monitoring (Queued)"
-                    continue
+            item_id = str(item["id"])
+            removed_time = removed_index.get(app_name, instance_name, generate_item_hash(item))
+            decision = evaluate_item(item, strike_data.get(item_id), rules, removed_time, time.time())
             
-            # Check for malicious files FIRST - immediate removal without strikes
-            is_malicious, malicious_reason = check_for_malicious_files(item, settings)
-            if is_malicious:
-                swaparr_logger.error(f"MALICIOUS CONTENT DETECTED: {item['name']} - {malicious_reason}")
-                
-                if not settings.get("dry_run", False):
-                    # Check if re-search is enabled for malicious removals
-                    trigger_search = settings.get("research_removed", False)
-                    if delete_download(app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, trigger_search):
-                        swaparr_logger.info(f"Successfully removed malicious download: {item['name']}")
-                        
-                        # Mark as removed to prevent reappearance
-                        removed_items[item_hash] = {
-                            "name": item["name"],
-                            "removed_time": datetime.utcnow().isoformat(),
-                            "reason": f"Malicious: {malicious_reason}",
-                            "size": item["size"]
-                        }
-                        save_removed_items(app_name, removed_items)
-                        
-                        item_state = f"REMOVED (Malicious: {malicious_reason})"
-                        
-                        # Track malicious removal statistics
-                        SWAPARR_STATS['malicious_removed'] = SWAPARR_STATS.get('malicious_removed', 0) + 1
-                        increment_swaparr_stat("malicious_removals", 1)
-                else:
-                    swaparr_logger.info(f"DRY RUN: Would remove malicious download: {item['name']} - {malicious_reason}")
-                    item_state = f"Would Remove (Malicious: {malicious_reason})"
-                
-                continue  # Skip to next item - don't process further
+            if decision["strike_entry"] is not None:
+                strike_data[item_id] = decision["strike_entry"]
+                changed_strikes.add(item_id)
             
-            # Check for quality-based removal SECOND - immediate removal without strikes  
-            is_quality_blocked, quality_reason = check_quality_based_removal(item, settings)
-            if is_quality_blocked:
-                swaparr_logger.warning(f"QUALITY-BASED REMOVAL: {item['name']} - {quality_reason}")
-                
-                if not settings.get("dry_run", False):
-                    # Check if re-search is enabled for quality-based removals
-                    trigger_search = settings.get("research_removed", False)
-                    if delete_download(app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, trigger_search):
-                        swaparr_logger.info(f"Successfully removed quality-blocked download: {item['name']}")
-                        
-                        # Mark as removed to prevent reappearance
-                        removed_items[item_hash] = {
-                            "name": item["name"],
-                            "removed_time": datetime.utcnow().isoformat(),
-                            "reason": f"Quality: {quality_reason}",
-                            "size": item["size"]
-                        }
-                        save_removed_items(app_name, removed_items)
-                        
-                        item_state = f"REMOVED (Quality: {quality_reason})"
-                        
-                        # Track quality removal statistics
-                        SWAPARR_STATS['quality_removed'] = SWAPARR_STATS.get('quality_removed', 0) + 1
-                        increment_swaparr_stat("quality_removals", 1)
-                else:
-                    swaparr_logger.info(f"DRY RUN: Would remove quality-blocked download: {item['name']} - {quality_reason}")
-                    item_state = f"Would Remove (Quality: {quality_reason})"
-                
-                continue  # Skip to next item - don't process further
+            action = decision["action"]
+            item_state = decision["state"]
             
-            # Initialize strike count if not already in strike data
-            if item_id not in strike_data:
-                strike_data[item_id] = {
-                    "strikes": 0,
-                    "name": item["name"],
-                    "first_strike_time": datetime.utcnow().isoformat(),
-                    "last_strike_time": None
-                }
+            if action in (ACTION_IGNORE, ACTION_MONITOR):
+                swaparr_logger.debug(decision["detail"])
+                if action == ACTION_IGNORE:
+                    increment_session_stat('items_ignored')
+                    if not dry_run:
+                        increment_swaparr_stat("ignored", 1, app_name, instance_name)  # Track ignored items in persistent system
             
-            # Check for age-based removal THIRD - immediate removal without strikes
-            is_age_expired, age_reason = check_age_based_removal(item, strike_data, settings)
-            if is_age_expired:
-                swaparr_logger.warning(f"AGE-BASED REMOVAL: {item['name']} - {age_reason}")
-                
-                if not settings.get("dry_run", False):
-                    # Check if re-search is enabled for age-based removals
-                    trigger_search = settings.get("research_removed", False)
-                    if delete_download(app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, trigger_search):
-                        swaparr_logger.info(f"Successfully removed age-expired download: {item['name']}")
-                        
-                        # Mark as removed to prevent reappearance
-                        removed_items[item_hash] = {
-                            "name": item["name"],
-                            "removed_time": datetime.utcnow().isoformat(),
-                            "reason": f"Age: {age_reason}",
-                            "size": item["size"]
-                        }
-                        save_removed_items(app_name, removed_items)
-                        
-                        # Keep the item in strike data for reference but mark as removed
-                        strike_data[item_id]["removed"] = True
-                        strike_data[item_id]["removed_time"] = datetime.utcnow().isoformat()
-                        
-                        item_state = f"REMOVED (Age: {age_reason})"
-                        
-                        # Track age removal statistics
-                        SWAPARR_STATS['age_removed'] = SWAPARR_STATS.get('age_removed', 0) + 1
-                        increment_swaparr_stat("age_removals", 1)
-                else:
-                    swaparr_logger.info(f"DRY RUN: Would remove age-expired download: {item['name']} - {age_reason}")
-                    item_state = f"Would Remove (Age: {age_reason})"
-                
-                continue  # Skip to next item - don't process further
+            if decision["strike_added"]:
+                swaparr_logger.info(decision["detail"])
+                increment_session_stat('strikes_added')
+                if not dry_run:
+                    increment_swaparr_stat("strikes", 1, app_name, instance_name)  # Track strikes in persistent system
             
-            # Check for failed imports FOURTH - immediate removal and re-search
-            is_import_failed, import_reason = check_for_failed_imports(item, settings)
-            if is_import_failed:
-                swaparr_logger.warning(f"FAILED IMPORT DETECTED: {item['name']} - {import_reason}")
-                
-                if not settings.get("dry_run", False):
-                    # Always trigger search for failed imports (this is the main purpose)
-                    trigger_search = True
-                    if delete_download(app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, trigger_search):
-                        swaparr_logger.info(f"Successfully removed failed import: {item['name']}")
-                        
-                        # Mark as removed to prevent reappearance
-                        removed_items[item_hash] = {
-                            "name": item["name"],
-                            "removed_time": datetime.utcnow().isoformat(),
-                            "reason": f"Failed Import: {import_reason}",
-                            "size": item["size"]
-                        }
-                        save_removed_items(app_name, removed_items)
-                        
-                        item_state = f"REMOVED (Failed Import: {import_reason})"
-                        
-                        # Track failed import removal statistics
-                        SWAPARR_STATS['import_failed_removed'] = SWAPARR_STATS.get('import_failed_removed', 0) + 1
-                        increment_swaparr_stat("import_failed_removals", 1)
+            if action == ACTION_REMOVE:
+                if decision["category"] == "malicious":
+                    swaparr_logger.error(decision["detail"])
+                elif decision["category"] == "max_strikes":
+                    swaparr_logger.warning(f"Max strikes reached for {item['name']}, removing download")
                 else:
-                    swaparr_logger.info(f"DRY RUN: Would remove failed import: {item['name']} - {import_reason}")
-                    item_state = f"Would Remove (Failed Import: {import_reason})"
-                
-                continue  # Skip to next item - don't process further
-            
-            # Check if download should be striked
-            should_strike = False
-            strike_reason = ""
-            
-            # Strike if metadata issue, eta too long, or no progress (eta = 0 and not queued)
-            if metadata_issue:
-                should_strike = True
-                strike_reason = "Metadata"
-            elif item["eta"] >= parse_time_string_to_seconds(settings.get("max_download_time", "2h")):
-                should_strike = True
-                strike_reason = "ETA too long"
-            elif item["eta"] == 0 and item["status"] not in ["queued", "delay"]:
-                should_strike = True
-                strike_reason = "No progress"
-            
-            # If we should strike this item, add a strike
-            if should_strike:
-                strike_data[item_id]["strikes"] += 1
-                strike_data[item_id]["last_strike_time"] = datetime.utcnow().isoformat()
+                    swaparr_logger.warning(decision["detail"])
                 
-                if strike_data[item_id]["first_strike_time"] is None:
-                    strike_data[item_id]["first_strike_time"] = datetime.utcnow().isoformat()
-                
-                current_strikes = strike_data[item_id]["strikes"]
-                swaparr_logger.info(f"Added strike ({current_strikes}/{settings.get('max_strikes', 3)}) to {item['name']} - Reason: {strike_reason}")
-                SWAPARR_STATS['strikes_added'] += 1
-                if not settings.get("dry_run", False):
-                    increment_swaparr_stat("strikes", 1)  # Track strikes in persistent system
-                
-                # If max strikes reached, remove the download
-                if current_strikes >= settings.get('max_strikes', 3):
-                    swaparr_logger.warning(f"Max strikes reached for {item['name']}, removing download")
-                    
-                    if not settings.get("dry_run", False):
-                        # Check if re-search is enabled for strike-based removals
-                        trigger_search = settings.get("research_removed", False)
-                        if delete_download(app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, trigger_search):
-                            swaparr_logger.info(f"Successfully removed {item['name']} after {settings.get('max_strikes', 3)} strikes")
-                            
-                            # Keep the item in strike data for reference but mark as removed
-                            strike_data[item_id]["removed"] = True
-                            strike_data[item_id]["removed_time"] = datetime.utcnow().isoformat()
-                            
-                            # Add to removed items list for persistent tracking
-                            removed_items[item_hash] = {
-                                "name": item["name"],
-                                "size": item["size"],
-                                "removed_time": datetime.utcnow().isoformat(),
-                                "reason": strike_reason
-                            }
-                            
-                            # Note: Swaparr uses its own statistics system (SWAPARR_STATS), not the hunting stats manager
-                    else:
-                        swaparr_logger.info(f"DRY RUN: Would have removed {item['name']} after {settings.get('max_strikes', 3)} strikes")
-                    
-                    item_state = "Removed" if not settings.get("dry_run", False) else "Would Remove (Dry Run)"
+                if not dry_run:
+                    actions.submit(delete_download, app_name, instance_data["api_url"], instance_data["api_key"], item["id"], True, item, decision["trigger_search"],
+                                   on_success=removal_callback(decision))
+                    item_state = f"REMOVAL QUEUED ({item_state})"
                 else:
-                    item_state = f"Striked ({current_strikes}/{settings.get('max_strikes', 3)})"
+                    swaparr_logger.info(f"DRY RUN: Would remove download: {item['name']} - {item_state}")
+                    item_state = f"Would Remove ({item_state})"
             
             swaparr_logger.debug(f"Processed download: {item['name']} - State: {item_state}")
         
-        # Save updated strike data
-        save_strike_data(app_name, strike_data)
+        # Wait for queued removals so their bookkeeping lands in this run's strike upsert
+        removed_count = actions.drain()
+        if removed_count:
+            swaparr_logger.info(f"Completed {removed_count} queued removals for {app_name} instance: {instance_name}")
         
-        # Save updated removed items list
-        save_removed_items(app_name, removed_items)
+        # Upsert only the strike rows touched in this run
+        save_strike_data(app_name, instance_name, strike_data, changed_strikes)
         
         # Update last run time
-        SWAPARR_STATS['last_run_time'] = datetime.utcnow().isoformat()
+        with _session_stats_lock:
+            SWAPARR_STATS['last_run_time'] = datetime.utcnow().isoformat()
         
+        stats = get_session_stats()
         swaparr_logger.info(f"Finished processing {items_processed_this_run} downloads for {app_name} instance: {instance_name}")
-        swaparr_logger.info(f"Session stats - Strikes: {SWAPARR_STATS['strikes_added']}, Removed: {SWAPARR_STATS['downloads_removed']}, Ignored: {SWAPARR_STATS['items_ignored']}, API calls: {SWAPARR_STATS['api_calls_made']}")
+        swaparr_logger.info(f"Session stats - Strikes: {stats['strikes_added']}, Removed: {stats['downloads_removed']}, Ignored: {stats['items_ignored']}, API calls: {stats['api_calls_made']}")
         
         return items_processed_this_run
     except Exception as e:
         swaparr_logger.error(f"Error processing {app_name} instance {instance_name}: {str(e)}")
-        SWAPARR_STATS['errors_encountered'] += 1
+        increment_session_stat('errors_encountered')
+        if actions:
+            actions.drain()
+        return 0
+
+def run_swaparr_changes():
+    """
+    Refresh the instances that webhooks marked stale and evaluate only the queue items
+    that are new or changed since the instance's last fetch.
+
+    Returns:
+        Number of queue items evaluated
+    """
+    from src.primary.apps.swaparr import get_configured_instances
+    
+    pending = take_pending_refreshes()
+    if not pending:
+        return 0
+    
+    settings = load_settings("swaparr")
+    if not settings or not settings.get("enabled", False):
+        return 0
+    
+    instances = get_configured_instances()
+    evaluated = 0
+    for app_name, instance_name in pending:
+        instance_data = next((inst for inst in instances.get(app_name, [])
+                              if inst.get("instance_name") == instance_name), None)
+        if not instance_data or not instance_data.get("swaparr_enabled", False):
+            swaparr_logger.debug(f"Ignoring webhook refresh for {app_name} instance '{instance_name}' - not a Swaparr-enabled instance")
+            continue
+        
+        try:
+            queue_items = get_queue_items(app_name, instance_data["api_url"], instance_data["api_key"])
+        except Exception as e:
+            swaparr_logger.error(f"Error refreshing queue for {app_name} instance {instance_name}: {str(e)}")
+            increment_session_stat('errors_encountered')
+            continue
+        if queue_items is None:
+            continue
+        
+        changed_items = update_view(app_name, instance_name, queue_items)
+        swaparr_logger.debug(f"Webhook refresh for {app_name} instance '{instance_name}': {len(changed_items)} of {len(queue_items)} queue items changed")
+        if changed_items:
+            evaluated += process_stalled_downloads(app_name, instance_name, instance_data, settings, queue_items=changed_items)
+    
+    flush_swaparr_stats()
+    return evaluated
+
+def run_swaparr_strike_sweep():
+    """
+    Re-check the items that are already striked or looked stalled at the last fetch, so
+    stuck downloads keep collecting strikes between webhook reconcile sweeps. Only
+    instances with such items are fetched; their changed items are evaluated as well.
+
+    Returns:
+        Number of queue items evaluated
+    """
+    from src.primary.apps.swaparr import get_configured_instances
+    
+    settings = load_settings("swaparr")
+    if not settings or not settings.get("enabled", False):
         return 0
+    
+    rules = get_compiled_rules()
+    evaluated = 0
+    for app_name, app_instances in get_configured_instances().items():
+        for instance_data in app_instances:
+            if not instance_data.get("swaparr_enabled", False):
+                continue
+            instance_name = instance_data.get("instance_name", "Unknown")
+            
+            view_items = get_view_items(app_name, instance_name)
+            if not view_items:
+                continue
+            strike_data = load_strike_data(app_name, instance_name)
+            candidate_ids = {str(item["id"]) for item in view_items
+                             if needs_strike_check(item, strike_data.get(str(item["id"])), rules)}
+            if not candidate_ids:
+                continue
+            
+            queue_items = get_queue_items(app_name, instance_data["api_url"], instance_data["api_key"])
+            if queue_items is None:
+                continue
+            changed_ids = {str(item["id"]) for item in update_view(app_name, instance_name, queue_items)}
+            to_evaluate = [item for item in queue_items
+                           if str(item["id"]) in candidate_ids or str(item["id"]) in changed_ids]
+            swaparr_logger.debug(f"Strike sweep for {app_name} instance '{instance_name}': re-checking {len(to_evaluate)} of {len(queue_items)} queue items")
+            if to_evaluate:
+                evaluated += process_stalled_downloads(app_name, instance_name, instance_data, settings,
+                                                       rules=rules, queue_items=to_evaluate)
+    
+    flush_swaparr_stats()
+    return evaluated
 
 def run_swaparr():
     """Run Swaparr cycle to check for stalled downloads in all configured Starr app instances"""
@@ -881,10 +690,8 @@ def run_swaparr():
     
     swaparr_logger.info(f"Found {swaparr_enabled_count} Swaparr-enabled instances out of {total_instances} total configured Starr app instances")
     
-    # Process stalled downloads for each app type and instance
-    processed_instances = 0
-    swaparr_enabled_instances = 0
-    
+    # Collect the Swaparr-enabled instances, then scan them concurrently with a bounded pool
+    enabled_instances = []
     for app_name, app_instances in instances.items():
         for app_settings in app_instances:
             # Debug log the swaparr_enabled status
@@ -897,23 +704,31 @@ def run_swaparr():
                 swaparr_logger.debug(f"Skipping {app_name} instance '{instance_name}' - Swaparr not enabled for this instance")
                 continue
             
-            swaparr_enabled_instances += 1
-            swaparr_logger.info(f"Processing {app_name} instance '{instance_name}' - Swaparr enabled")
-            
-            # Check if Swaparr has been disabled during processing
-            current_settings = load_settings("swaparr")
-            if not current_settings or not current_settings.get("enabled", False):
-                swaparr_logger.warning(f"Swaparr was disabled during processing. Ending cycle early after processing {processed_instances}/{swaparr_enabled_instances} Swaparr-enabled instances.")
-                return
-            
-            try:
-                items_processed = process_stalled_downloads(app_name, app_settings.get('instance_name', 'Unknown'), app_settings, current_settings)
-                processed_instances += 1
-                swaparr_logger.debug(f"Processed {items_processed} items from {app_name} instance '{app_settings.get('instance_name', 'Unknown')}'")
-            except Exception as e:
-                swaparr_logger.error(f"Error processing {app_name} instance {app_settings.get('instance_name', 'Unknown')}: {str(e)}")
-                SWAPARR_STATS['errors_encountered'] += 1
-                processed_instances += 1
+            enabled_instances.append((app_name, instance_name, app_settings))
+    
+    def scan_instance(app_name, instance_name, app_settings):
+        # Check if Swaparr has been disabled while this instance was waiting for a worker
+        current_settings = load_settings("swaparr")
+        if not current_settings or not current_settings.get("enabled", False):
+            swaparr_logger.warning(f"Swaparr was disabled during processing. Skipping {app_name} instance '{instance_name}'.")
+            return False
+        
+        swaparr_logger.info(f"Processing {app_name} instance '{instance_name}' - Swaparr enabled")
+        try:
+            items_processed = process_stalled_downloads(app_name, instance_name, app_settings, current_settings)
+            swaparr_logger.debug(f"Processed {items_processed} items from {app_name} instance '{instance_name}'")
+        except Exception as e:
+            swaparr_logger.error(f"Error processing {app_name} instance {instance_name}: {str(e)}")
+            increment_session_stat('errors_encountered')
+        return True
+    
+    max_workers = max(1, min(int(settings.get("max_concurrent_instances", MAX_CONCURRENT_INSTANCES)), len(enabled_instances)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SwaparrScan") as executor:
+        results = list(executor.map(lambda args: scan_instance(*args), enabled_instances))
+    processed_instances = sum(1 for scanned in results if scanned)
+    
+    # Write this cycle's counters in one batch
+    flush_swaparr_stats()
     
     stats = get_session_stats()
     swaparr_logger.info(f"=== SWAPARR cycle completed. Processed {processed_instances} Swaparr-enabled app instances. ===")
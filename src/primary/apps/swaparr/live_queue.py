@@ -0,0 +1,157 @@
+"""
+Live per-instance queue view for webhook-driven Swaparr.
+Sonarr/Radarr webhooks (grab, import, failure events) mark an instance's view as
+stale or drop finished downloads from it. The Swaparr loop then refreshes only the
+instances that had events and evaluates only the queue items that changed, while
+the timer runs as a slow reconciliation sweep. Items that are already striked or look
+stalled are re-checked on the normal Swaparr interval so max-strike removal keeps pace.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.primary.utils.logger import get_logger
+
+swaparr_logger = get_logger("swaparr")
+
+# Events after which the queue has new or changed items and the view must be refreshed
+REFRESH_EVENTS = {"Grab", "ManualInteractionRequired", "DownloadFailed"}
+# Events after which a download has left the queue; the view is updated without an API call
+FINISHED_EVENTS = {"Download", "DownloadFolderImported", "ImportComplete", "DownloadIgnored"}
+
+
+def _fingerprint(item: Dict[str, Any]) -> Tuple:
+    """Fields whose change makes a queue item worth re-evaluating (ETA drifts constantly, so it is left out)"""
+    return item.get("status"), item.get("error_message"), item.get("size")
+
+
+class LiveQueueView:
+    """Last known queue of one Arr instance, keyed by queue item id"""
+
+    def __init__(self, app_name: str, instance_name: str):
+        self.app_name = app_name
+        self.instance_name = instance_name
+        self.items: Dict[Any, Dict[str, Any]] = {}
+        self.fingerprints: Dict[Any, Tuple] = {}
+        self.last_synced: Optional[float] = None
+        self.last_event: Optional[float] = None
+        self.last_event_type: Optional[str] = None
+        self.events_received = 0
+
+    def apply_snapshot(self, queue_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replace the view with a fresh queue and return the items that are new or changed"""
+        changed = []
+        items = {}
+        fingerprints = {}
+        for item in queue_items:
+            item_id = item.get("id")
+            fingerprint = _fingerprint(item)
+            if self.fingerprints.get(item_id) != fingerprint:
+                changed.append(item)
+            items[item_id] = item
+            fingerprints[item_id] = fingerprint
+        self.items = items
+        self.fingerprints = fingerprints
+        self.last_synced = time.time()
+        return changed
+
+    def drop_download(self, download_id: str) -> int:
+        """Remove every queue record of a finished download and return how many were dropped"""
+        dropped = [item_id for item_id, item in self.items.items() if item.get("download_id") == download_id]
+        for item_id in dropped:
+            self.items.pop(item_id, None)
+            self.fingerprints.pop(item_id, None)
+        return len(dropped)
+
+
+_views: Dict[Tuple[str, str], LiveQueueView] = {}
+_pending_refresh = set()
+_views_lock = threading.Lock()
+_events_available = threading.Event()
+
+
+def _get_view(app_name: str, instance_name: str) -> LiveQueueView:
+    """Get or create the view for an instance (caller holds the lock)"""
+    key = (app_name, instance_name)
+    if key not in _views:
+        _views[key] = LiveQueueView(app_name, instance_name)
+    return _views[key]
+
+
+def handle_webhook_event(app_name: str, instance_name: str, payload: Dict[str, Any]) -> str:
+    """
+    Apply an Arr webhook payload to the instance's live queue view.
+
+    Returns:
+        The action taken: 'refresh', 'dropped', 'test' or 'ignored'
+    """
+    event_type = payload.get("eventType", "")
+    download_id = payload.get("downloadId")
+
+    with _views_lock:
+        view = _get_view(app_name, instance_name)
+        view.events_received += 1
+        view.last_event = time.time()
+        view.last_event_type = event_type
+
+        if event_type == "Test":
+            return "test"
+
+        if event_type in FINISHED_EVENTS and download_id:
+            dropped = view.drop_download(download_id)
+            swaparr_logger.debug(f"Webhook {event_type} for {app_name}/{instance_name}: dropped {dropped} queue records")
+            return "dropped"
+
+        if event_type in REFRESH_EVENTS:
+            _pending_refresh.add((app_name, instance_name))
+            _events_available.set()
+            swaparr_logger.debug(f"Webhook {event_type} for {app_name}/{instance_name}: queue refresh scheduled")
+            return "refresh"
+
+    return "ignored"
+
+
+def wait_for_events(timeout: float) -> bool:
+    """Block until a webhook schedules a refresh or the timeout passes. Returns True if one did."""
+    if _events_available.wait(timeout):
+        _events_available.clear()
+        return True
+    return False
+
+
+def take_pending_refreshes() -> List[Tuple[str, str]]:
+    """Return and clear the (app, instance) pairs that webhooks marked stale"""
+    with _views_lock:
+        pending = sorted(_pending_refresh)
+        _pending_refresh.clear()
+        return pending
+
+
+def update_view(app_name: str, instance_name: str, queue_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Store a freshly fetched queue for an instance and return the items that changed since the last fetch"""
+    with _views_lock:
+        return _get_view(app_name, instance_name).apply_snapshot(queue_items)
+
+
+def get_view_items(app_name: str, instance_name: str) -> List[Dict[str, Any]]:
+    """The last known queue items of an instance (empty if it has not been fetched yet)"""
+    with _views_lock:
+        view = _views.get((app_name, instance_name))
+        return list(view.items.values()) if view else []
+
+
+def get_live_queue_status() -> Dict[str, Dict[str, Any]]:
+    """Per-instance view sizes and webhook activity for the status API"""
+    with _views_lock:
+        status = {}
+        for (app_name, instance_name), view in _views.items():
+            status.setdefault(app_name, {})[instance_name] = {
+                "queue_items": len(view.items),
+                "events_received": view.events_received,
+                "last_event_type": view.last_event_type,
+                "last_event": view.last_event,
+                "last_synced": view.last_synced,
+                "refresh_pending": (app_name, instance_name) in _pending_refresh
+            }
+        return status
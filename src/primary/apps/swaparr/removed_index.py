@@ -0,0 +1,160 @@
+"""
+Expiring index of downloads removed by Swaparr.
+Hashes of removed downloads are kept in memory in removal-time order with epoch
+timestamps, so expiry is a pop from the front and a lookup is one dict access.
+The swaparr_removed_items table is the on-disk form: only rows inside the TTL
+are loaded at startup, and expired rows are pruned from it periodically.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.primary.utils.logger import get_logger
+from src.primary.utils.database import get_database
+
+swaparr_logger = get_logger("swaparr")
+
+# Previously removed downloads that reappear within this window are removed again
+REMOVED_ITEM_TTL = 7 * 86400
+# Upper bound on hashes held in memory; the oldest are evicted first
+REMOVED_INDEX_MAX_ENTRIES = 50000
+# Seconds between deletions of expired rows from the database
+REMOVED_INDEX_PRUNE_INTERVAL = 3600
+
+
+class RemovedItemIndex:
+    """Thread-safe TTL index of (app, instance, item hash) -> epoch removal time"""
+
+    def __init__(self, ttl: int = REMOVED_ITEM_TTL, max_entries: int = REMOVED_INDEX_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # Oldest removal first
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._last_prune = 0.0
+        self._metrics = {
+            "loaded": 0,
+            "added": 0,
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evicted": 0,
+            "pruned_from_disk": 0
+        }
+
+    def _ensure_loaded(self):
+        """Load unexpired rows from the database on first use (caller holds the lock)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            rows = get_database().load_swaparr_removed_index(time.time() - self.ttl)
+        except Exception as e:
+            swaparr_logger.error(f"Error loading Swaparr removed-item index: {str(e)}")
+            return
+        for app_name, instance_name, item_hash, removed_time in rows:
+            self._entries[(app_name, instance_name, item_hash)] = removed_time
+        self._metrics["loaded"] = len(self._entries)
+        self._evict_over_capacity()
+        swaparr_logger.debug(f"Loaded {len(self._entries)} removed-item hashes for Swaparr")
+
+    def _expire(self, now: float):
+        """Drop entries older than the TTL from the front of the index (caller holds the lock)"""
+        cutoff = now - self.ttl
+        while self._entries:
+            key, removed_time = next(iter(self._entries.items()))
+            if removed_time >= cutoff:
+                break
+            del self._entries[key]
+            self._metrics["expired"] += 1
+
+    def _evict_over_capacity(self):
+        """Evict the oldest entries beyond max_entries (caller holds the lock)"""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._metrics["evicted"] += 1
+
+    def get(self, app_name: str, instance_name: str, item_hash: str) -> Optional[float]:
+        """
+        Return the epoch time an item was removed from an instance, or None if it was
+        not removed within the TTL. Rows migrated without an instance match any instance.
+        """
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            self._expire(now)
+            removed_time = self._entries.get((app_name, instance_name, item_hash))
+            if removed_time is None:
+                removed_time = self._entries.get((app_name, "", item_hash))
+            self._metrics["hits" if removed_time is not None else "misses"] += 1
+            return removed_time
+
+    def add(self, app_name: str, instance_name: str, item_hash: str, item_name: str = None,
+            size: int = None, reason: str = None) -> float:
+        """Record (or refresh) a removal in memory and in the database. Returns the removal time."""
+        removed_time = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            key = (app_name, instance_name, item_hash)
+            self._entries.pop(key, None)
+            self._entries[key] = removed_time
+            self._metrics["added"] += 1
+            self._expire(removed_time)
+            self._evict_over_capacity()
+
+        get_database().upsert_swaparr_removed_item(app_name, instance_name, item_hash, item_name, size, reason, removed_time)
+        return removed_time
+
+    def clear(self, app_name: str = None):
+        """Forget removals for one app, or for all apps"""
+        with self._lock:
+            if app_name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == app_name]:
+                    del self._entries[key]
+
+    def prune_storage(self, force: bool = False) -> int:
+        """Delete expired rows from the database, at most once per prune interval unless forced"""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_prune < REMOVED_INDEX_PRUNE_INTERVAL:
+                return 0
+            self._last_prune = now
+            self._expire(now)
+
+        try:
+            pruned = get_database().prune_swaparr_removed_items(now - self.ttl)
+        except Exception as e:
+            swaparr_logger.error(f"Error pruning expired Swaparr removed items: {str(e)}")
+            return 0
+        with self._lock:
+            self._metrics["pruned_from_disk"] += pruned
+        if pruned:
+            swaparr_logger.info(f"Pruned {pruned} expired Swaparr removed-item rows")
+        return pruned
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Entry count, capacity and counters for the status API"""
+        with self._lock:
+            self._ensure_loaded()
+            self._expire(time.time())
+            metrics = dict(self._metrics)
+            metrics.update(entries=len(self._entries), max_entries=self.max_entries, ttl_seconds=self.ttl)
+            return metrics
+
+
+_removed_index = None
+_removed_index_lock = threading.Lock()
+
+
+def get_removed_index() -> RemovedItemIndex:
+    """Get the process-wide removed-item index"""
+    global _removed_index
+    if _removed_index is None:
+        with _removed_index_lock:
+            if _removed_index is None:
+                _removed_index = RemovedItemIndex()
+    return _removed_index
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Offline replay of recorded Arr queue snapshots through the Swaparr decision engine.
+Each file in the snapshot directory is a saved /api/v3/queue (or v1) response - either
+one paged response with 'records' or a plain list of records - and files are replayed
+in name order as consecutive Swaparr cycles. Strikes and removals are simulated in
+memory; nothing is sent to an Arr and nothing is written to the database.
+
+Usage: python -m src.primary.apps.swaparr.replay SNAPSHOT_DIR [--app sonarr]
+           [--settings swaparr.json] [--interval 900] [--verbose]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+
+from src.primary.apps.swaparr.engine import evaluate_item, generate_item_hash, ACTION_NONE, ACTION_REMOVE
+from src.primary.apps.swaparr.handler import parse_queue_items
+from src.primary.apps.swaparr.removed_index import REMOVED_ITEM_TTL
+from src.primary.apps.swaparr.rules import SwaparrRules
+
+DEFAULT_SETTINGS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                     "default_configs", "swaparr.json")
+
+ITEM_TYPES = {
+    "radarr": "movie",
+    "sonarr": "series",
+    "lidarr": "album",
+    "readarr": "book"
+}
+
+
+def load_settings_file(path=None):
+    """Default Swaparr settings, overlaid with a settings JSON file if one is given"""
+    with open(DEFAULT_SETTINGS_PATH) as f:
+        settings = json.load(f)
+    if path:
+        with open(path) as f:
+            settings.update(json.load(f))
+    return settings
+
+
+def load_snapshots(snapshot_dir, app_name):
+    """Parsed queue items for each snapshot file, in file name order"""
+    snapshots = []
+    for file_name in sorted(os.listdir(snapshot_dir)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(snapshot_dir, file_name)) as f:
+            data = json.load(f)
+        records = data.get("records", []) if isinstance(data, dict) else data
+        snapshots.append((file_name, parse_queue_items(records, ITEM_TYPES.get(app_name, "series"), app_name)))
+    return snapshots
+
+
+def replay(snapshots, rules, interval=900, start_time=None, on_decision=None):
+    """
+    Run snapshots through the decision engine as consecutive cycles.
+
+    Args:
+        snapshots: List of (label, parsed queue items)
+        rules: Compiled SwaparrRules
+        interval: Simulated seconds between snapshots
+        start_time: Simulated epoch time of the first snapshot (defaults to now)
+        on_decision: Optional callback(label, decision) for every decision
+
+    Returns:
+        Dict with per-snapshot action counts, removal counts by category,
+        items evaluated and evaluation time in seconds
+    """
+    now = start_time if start_time is not None else time.time()
+    strike_data = {}
+    removed = {}  # item hash -> simulated removal time
+    per_snapshot = []
+    removals = Counter()
+    evaluated = 0
+    elapsed = 0.0
+
+    for label, queue_items in snapshots:
+        actions = Counter()
+        started = time.perf_counter()
+        for item in queue_items:
+            removed_time = removed.get(generate_item_hash(item))
+            if removed_time is not None and now - removed_time > REMOVED_ITEM_TTL:
+                removed_time = None
+            decision = evaluate_item(item, strike_data.get(str(item["id"])), rules, removed_time, now)
+            if decision["strike_entry"] is not None:
+                strike_data[decision["item_id"]] = decision["strike_entry"]
+            if decision["action"] == ACTION_REMOVE:
+                removed[decision["item_hash"]] = now
+                removals[decision["category"]] += 1
+                if decision["mark_strike"]:
+                    strike_data[decision["item_id"]]["removed"] = True
+            actions[decision["action"]] += 1
+            if on_decision:
+                on_decision(label, decision)
+        elapsed += time.perf_counter() - started
+        evaluated += len(queue_items)
+        per_snapshot.append((label, len(queue_items), actions))
+        now += interval
+
+    return {
+        "snapshots": per_snapshot,
+        "removals": removals,
+        "evaluated": evaluated,
+        "elapsed": elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Arr queue snapshots through the Swaparr decision engine")
+    parser.add_argument("snapshot_dir", help="Directory of saved /queue JSON responses, replayed in file name order")
+    parser.add_argument("--app", default="sonarr", choices=sorted(ITEM_TYPES), help="Arr app the snapshots came from")
+    parser.add_argument("--settings", help="Swaparr settings JSON overlaid on the defaults")
+    parser.add_argument("--interval", type=int, help="Simulated seconds between snapshots (defaults to sleep_duration)")
+    parser.add_argument("--verbose", action="store_true", help="Print every decision other than 'none'")
+    args = parser.parse_args()
+
+    settings = load_settings_file(args.settings)
+    rules = SwaparrRules(settings)
+    interval = args.interval or settings.get("sleep_duration", 900)
+    snapshots = load_snapshots(args.snapshot_dir, args.app)
+    if not snapshots:
+        print(f"No .json snapshots found in {args.snapshot_dir}")
+        return
+
+    def print_decision(label, decision):
+        if decision["action"] != ACTION_NONE:
+            print(f"  [{label}] {decision['action']:<8} {decision['item']['name']} - {decision['state']}")
+
+    result = replay(snapshots, rules, interval, on_decision=print_decision if args.verbose else None)
+
+    for label, item_count, actions in result["snapshots"]:
+        summary = ", ".join(f"{action}={count}" for action, count in sorted(actions.items()))
+        print(f"{label}: {item_count} items ({summary})")
+    print(f"Removals by reason: {dict(result['removals']) or 'none'}")
+    elapsed = result["elapsed"]
+    rate = result["evaluated"] / elapsed if elapsed else float("inf")
+    print(f"Evaluated {result['evaluated']} items across {len(snapshots)} snapshots in {elapsed * 1000:.2f} ms ({rate:,.0f} items/s)")
+
+
+if __name__ == "__main__":
+    main()
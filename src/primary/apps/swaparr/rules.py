@@ -0,0 +1,238 @@
+"""
+Compiled rule set for Swaparr.
+Pattern lists and thresholds from the Swaparr settings are compiled once per
+settings version, so each queue item is checked with one regex search per rule
+instead of re-reading settings and scanning every pattern.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.primary.utils.logger import get_logger
+from src.primary.settings_manager import get_settings_snapshot, get_settings_version
+
+swaparr_logger = get_logger("swaparr")
+
+DEFAULT_MALICIOUS_EXTENSIONS = [
+    '.lnk', '.exe', '.bat', '.cmd', '.scr', '.pif', '.com',
+    '.zipx', '.jar', '.vbs', '.js', '.jse', '.wsf', '.wsh'
+]
+
+DEFAULT_SUSPICIOUS_PATTERNS = [
+    'password.txt', 'readme.txt', 'install.exe', 'setup.exe',
+    'keygen', 'crack', 'patch.exe', 'activator'
+]
+
+DEFAULT_BLOCKED_QUALITIES = [
+    'cam', 'camrip', 'hdcam', 'ts', 'telesync', 'tc', 'telecine',
+    'r6', 'dvdscr', 'dvdscreener', 'workprint', 'wp'
+]
+
+# Common import failure indicators
+IMPORT_FAILURE_INDICATORS = [
+    "import failed", "unable to import", "import error",
+    "no files found", "path not found", "access denied",
+    "disk full", "permission denied", "invalid path",
+    "file not found", "directory not found", "cannot import",
+    "import unsuccessful", "failed to import", "import aborted",
+    "insufficient space", "read-only", "network error",
+    "timeout", "connection lost", "corrupted", "invalid format",
+    "no space left", "operation not permitted", "input/output error"
+]
+
+# Status values that indicate an import failure when the error mentions files or paths
+FAILED_STATUSES = ("failed", "error", "warning")
+FAILED_STATUS_HINTS = re.compile("import|file|path")
+
+
+def parse_time_string_to_seconds(time_string):
+    """Parse a time string like '2h', '30m', '1d' to seconds"""
+    if not time_string:
+        return 7200  # Default 2 hours
+
+    unit = time_string[-1].lower()
+    try:
+        value = int(time_string[:-1])
+    except ValueError:
+        swaparr_logger.error(f"Invalid time string: {time_string}, using default 2 hours")
+        return 7200
+
+    if unit == 'd':
+        return value * 86400  # Days to seconds
+    elif unit == 'h':
+        return value * 3600   # Hours to seconds
+    elif unit == 'm':
+        return value * 60     # Minutes to seconds
+    else:
+        swaparr_logger.error(f"Unknown time unit in: {time_string}, using default 2 hours")
+        return 7200
+
+
+def parse_size_string_to_bytes(size_string):
+    """Parse a size string like '25GB', '1TB' to bytes"""
+    if not size_string:
+        return 25 * 1024 * 1024 * 1024  # Default 25GB
+
+    # Extract the numeric part and unit
+    unit = ""
+    for i in range(len(size_string) - 1, -1, -1):
+        if not size_string[i].isalpha():
+            value = float(size_string[:i+1])
+            unit = size_string[i+1:].upper()
+            break
+    else:
+        swaparr_logger.error(f"Invalid size string: {size_string}, using default 25GB")
+        return 25 * 1024 * 1024 * 1024
+
+    # Convert to bytes based on unit
+    if unit == 'B':
+        return int(value)
+    elif unit == 'KB':
+        return int(value * 1024)
+    elif unit == 'MB':
+        return int(value * 1024 * 1024)
+    elif unit == 'GB':
+        return int(value * 1024 * 1024 * 1024)
+    elif unit == 'TB':
+        return int(value * 1024 * 1024 * 1024 * 1024)
+    else:
+        swaparr_logger.error(f"Unknown size unit in: {size_string}, using default 25GB")
+        return 25 * 1024 * 1024 * 1024
+
+
+def _trie_pattern(words) -> str:
+    """
+    Build one regex for a set of literal words from a prefix trie, so the engine follows
+    a single branch per character instead of trying every alternative at every position.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a word
+
+    def build(node):
+        branches = []
+        single_chars = []
+        for char in sorted(key for key in node if key):
+            child = node[char]
+            if list(child) == [""]:
+                single_chars.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + build(child))
+        if single_chars:
+            branches.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A word may end here while longer words continue; prefer the longer match
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+class PatternSet:
+    """A list of substring patterns compiled into one trie-shaped regex"""
+
+    def __init__(self, patterns: Iterable[str]):
+        # Keep the first spelling of each pattern for reporting, in configured order
+        self.originals: Dict[str, str] = {}
+        for pattern in patterns or []:
+            if isinstance(pattern, str) and pattern and pattern.lower() not in self.originals:
+                self.originals[pattern.lower()] = pattern
+        self.regex = re.compile(_trie_pattern(self.originals)) if self.originals else None
+
+    def search(self, text_lower: str) -> Optional[str]:
+        """Return the configured pattern found in already-lowercased text, or None"""
+        if self.regex is None or not text_lower:
+            return None
+        match = self.regex.search(text_lower)
+        return self.originals[match.group(0)] if match else None
+
+    def __len__(self):
+        return len(self.originals)
+
+
+class SwaparrRules:
+    """Swaparr removal rules and thresholds, parsed and compiled from one settings dict"""
+
+    def __init__(self, settings):
+        settings = settings or {}
+        self.dry_run = settings.get("dry_run", False)
+        self.research_removed = settings.get("research_removed", False)
+        self.max_strikes = settings.get("max_strikes", 3)
+        self.max_size_bytes = parse_size_string_to_bytes(settings.get("ignore_above_size", "25GB"))
+        self.max_download_seconds = parse_time_string_to_seconds(settings.get("max_download_time", "2h"))
+
+        self.malicious_enabled = settings.get("malicious_file_detection", False)
+        self.malicious_extensions = PatternSet(settings.get("malicious_extensions", DEFAULT_MALICIOUS_EXTENSIONS))
+        self.suspicious_patterns = PatternSet(settings.get("suspicious_patterns", DEFAULT_SUSPICIOUS_PATTERNS))
+
+        self.quality_enabled = settings.get("quality_based_removal", False)
+        self.blocked_qualities = PatternSet(settings.get("blocked_quality_patterns", DEFAULT_BLOCKED_QUALITIES))
+
+        self.age_enabled = settings.get("age_based_removal", False)
+        self.max_age_days = settings.get("max_age_days", 7)
+
+        self.failed_import_enabled = settings.get("failed_import_detection", False)
+        self.import_failures = PatternSet(IMPORT_FAILURE_INDICATORS)
+
+    def check_malicious(self, name_lower: str) -> Tuple[bool, Optional[str]]:
+        """Check a lowercased download name for malicious file types or suspicious content"""
+        if not self.malicious_enabled:
+            return False, None
+        ext = self.malicious_extensions.search(name_lower)
+        if ext:
+            return True, f"Contains malicious file type: {ext}"
+        pattern = self.suspicious_patterns.search(name_lower)
+        if pattern:
+            return True, f"Contains suspicious content: {pattern}"
+        return False, None
+
+    def check_quality(self, name_lower: str) -> Tuple[bool, Optional[str]]:
+        """Check a lowercased download name for blocked quality patterns"""
+        if not self.quality_enabled:
+            return False, None
+        quality = self.blocked_qualities.search(name_lower)
+        if quality:
+            return True, f"Blocked quality: {quality}"
+        return False, None
+
+    def check_age(self, first_strike_time: Optional[float], now: float) -> Tuple[bool, Optional[str]]:
+        """Check whether an item first seen at first_strike_time has exceeded max_age_days"""
+        if not self.age_enabled or not first_strike_time:
+            return False, None
+        age_days = int((now - first_strike_time) // 86400)
+        if age_days >= self.max_age_days:
+            return True, f"Too old: {age_days} days (max: {self.max_age_days})"
+        return False, None
+
+    def check_failed_import(self, error_lower: str, status_lower: str) -> Tuple[bool, str]:
+        """Check a lowercased error message and status for import failure patterns"""
+        if not self.failed_import_enabled:
+            return False, ""
+        pattern = self.import_failures.search(error_lower) or self.import_failures.search(status_lower)
+        if pattern:
+            return True, f"Import failure detected: {pattern}"
+        if status_lower in FAILED_STATUSES and FAILED_STATUS_HINTS.search(error_lower):
+            return True, f"Import failure status: {status_lower}"
+        return False, ""
+
+
+_rules_lock = threading.Lock()
+_compiled_rules = {"version": None, "rules": None}
+
+
+def get_compiled_rules() -> SwaparrRules:
+    """Return the rules compiled from the current Swaparr settings, recompiling only when they change"""
+    version = get_settings_version("swaparr")
+    with _rules_lock:
+        if _compiled_rules["version"] != version or _compiled_rules["rules"] is None:
+            rules = SwaparrRules(get_settings_snapshot("swaparr"))
+            _compiled_rules.update(version=version, rules=rules)
+            swaparr_logger.debug(
+                f"Compiled Swaparr rules for settings version {version}: "
+                f"{len(rules.malicious_extensions) + len(rules.suspicious_patterns)} malicious, "
+                f"{len(rules.blocked_qualities)} quality patterns"
+            )
+        return _compiled_rules["rules"]
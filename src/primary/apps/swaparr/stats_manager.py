@@ -1,19 +1,33 @@
 #!/usr/bin/env python3
 """
 Swaparr Statistics Manager
-Handles tracking, storing, and retrieving Swaparr-specific statistics
-Now uses SQLite database instead of JSON files for better performance and reliability.
+Keeps Swaparr counters in memory, per app and instance, and writes them to the
+database in batches. Lifetime totals are loaded once; after that increments and
+status reads never touch the database, and recent per-minute buckets give rates.
 """
 
 import threading
+import time
+from collections import Counter, deque
 from typing import Dict, Any
 from src.primary.utils.logger import get_logger
 from src.primary.utils.database import get_database
 
 logger = get_logger("swaparr_stats")
 
-# Lock for thread-safe operations
-swaparr_stats_lock = threading.Lock()
+# Counters accepted by increment_swaparr_stat
+VALID_STATS = (
+    "processed", "strikes", "removals", "ignored",
+    "malicious_removals", "quality_removals", "age_removals", "import_failed_removals"
+)
+
+# Pending increments are written once either limit is reached (and at the end of each cycle)
+FLUSH_INTERVAL = 30  # seconds
+FLUSH_THRESHOLD = 500  # increments
+
+# Per-minute buckets kept for rates
+RATE_WINDOW_MINUTES = 60
+ITEMS_RATE_MINUTES = 15  # items/min is averaged over this many recent minutes
 
 def get_default_swaparr_stats() -> Dict[str, int]:
     """Get the default Swaparr stats structure"""
@@ -24,100 +38,208 @@ def get_default_swaparr_stats() -> Dict[str, int]:
         "ignored": 0
     }
 
-def load_swaparr_stats() -> Dict[str, int]:
-    """
-    Load Swaparr statistics from the database
-    
-    Returns:
-        Dictionary containing Swaparr statistics
-    """
-    try:
-        db = get_database()
-        stats = db.get_swaparr_stats()
-        
-        # Ensure all expected keys are present
-        default_stats = get_default_swaparr_stats()
-        for key in default_stats:
-            if key not in stats:
-                stats[key] = default_stats[key]
-        
-        logger.debug(f"Loaded Swaparr stats from database: {stats}")
-        return stats
-    except Exception as e:
-        logger.error(f"Error loading Swaparr stats from database: {e}")
-        return get_default_swaparr_stats()
 
-def save_swaparr_stats(stats: Dict[str, int]) -> bool:
-    """
-    Save Swaparr statistics to the database
-    
-    Args:
-        stats: Dictionary containing Swaparr statistics
-        
-    Returns:
-        True if successful, False otherwise
-    """
-    try:
+class SwaparrCounters:
+    """Thread-safe lifetime, session and recent-rate counters keyed by (app, instance)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._totals = Counter()  # Lifetime totals across instances
+        self._instance_totals = {}  # (app, instance) -> Counter of lifetime totals
+        self._session = {}  # (app, instance) -> Counter since start or reset
+        self._buckets = {}  # (app, instance) -> deque of [minute, Counter]
+        self._pending_totals = Counter()
+        self._pending_instances = Counter()  # (app, instance, stat) -> delta
+        self._pending_count = 0
+        self._last_flush = time.time()
+        self._session_start = time.time()
+
+    def _ensure_loaded(self):
+        """Load lifetime totals from the database on first use (caller holds the lock)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            db = get_database()
+            self._totals.update(db.get_swaparr_stats())
+            for app_name, instance_name, stat_key, value in db.get_swaparr_instance_stats():
+                self._instance_totals.setdefault((app_name, instance_name), Counter())[stat_key] = value
+        except Exception as e:
+            logger.error(f"Error loading Swaparr stats from database: {e}")
+
+    def increment(self, stat_type: str, count: int, app_name: str, instance_name: str) -> bool:
+        now = time.time()
+        key = (app_name or "", instance_name or "")
+        with self._lock:
+            self._ensure_loaded()
+            self._totals[stat_type] += count
+            self._instance_totals.setdefault(key, Counter())[stat_type] += count
+            self._session.setdefault(key, Counter())[stat_type] += count
+
+            minute = int(now // 60)
+            buckets = self._buckets.setdefault(key, deque())
+            if not buckets or buckets[-1][0] != minute:
+                buckets.append([minute, Counter()])
+                while buckets and buckets[0][0] <= minute - RATE_WINDOW_MINUTES:
+                    buckets.popleft()
+            buckets[-1][1][stat_type] += count
+
+            self._pending_totals[stat_type] += count
+            self._pending_instances[key + (stat_type,)] += count
+            self._pending_count += 1
+            flush_due = self._pending_count >= FLUSH_THRESHOLD or now - self._last_flush >= FLUSH_INTERVAL
+
+        if flush_due:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write pending increments in one transaction. Returns the number of rows updated."""
+        with self._lock:
+            if not self._pending_count:
+                self._last_flush = time.time()
+                return 0
+            totals = dict(self._pending_totals)
+            instances = [(app, inst, stat, delta) for (app, inst, stat), delta in self._pending_instances.items()]
+            self._pending_totals.clear()
+            self._pending_instances.clear()
+            self._pending_count = 0
+            self._last_flush = time.time()
+
+        try:
+            get_database().apply_swaparr_stat_deltas(totals, instances)
+        except Exception as e:
+            logger.error(f"Error flushing Swaparr stats to database: {e}")
+            # Put the deltas back so the next flush retries them
+            with self._lock:
+                self._pending_totals.update(totals)
+                for app, inst, stat, delta in instances:
+                    self._pending_instances[(app, inst, stat)] += delta
+                self._pending_count += len(instances)
+            return 0
+        logger.debug(f"Flushed {len(totals)} Swaparr totals and {len(instances)} instance counters")
+        return len(totals) + len(instances)
+
+    def _rates(self, buckets, now):
+        """items/min and removals/hour from recent buckets (caller holds the lock)"""
+        minute = int(now // 60)
+        # Average over the time actually observed when the session is younger than the window
+        observed_minutes = max(1, int((now - self._session_start) // 60) + 1)
+        items_minutes = min(ITEMS_RATE_MINUTES, observed_minutes)
+        removal_minutes = min(RATE_WINDOW_MINUTES, observed_minutes)
+        processed = sum(counts["processed"] for bucket_minute, counts in buckets if bucket_minute > minute - items_minutes)
+        removals = sum(counts["removals"] for bucket_minute, counts in buckets if bucket_minute > minute - removal_minutes)
+        return {
+            "items_per_minute": round(processed / items_minutes, 2),
+            "removals_per_hour": round(removals * 60 / removal_minutes, 2)
+        }
+
+    def get_totals(self) -> Dict[str, int]:
+        """Lifetime totals across all instances"""
+        with self._lock:
+            self._ensure_loaded()
+            stats = get_default_swaparr_stats()
+            stats.update(self._totals)
+            return stats
+
+    def get_breakdown(self) -> Dict[str, Any]:
+        """Per app and instance lifetime totals, session counts and rates, plus overall rates"""
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            breakdown = {}
+            all_buckets = []
+            for key in set(self._instance_totals) | set(self._session):
+                app_name, instance_name = key
+                buckets = self._buckets.get(key, ())
+                all_buckets.extend(buckets)
+                breakdown.setdefault(app_name, {})[instance_name or "legacy"] = {
+                    "lifetime": dict(self._instance_totals.get(key, {})),
+                    "session": dict(self._session.get(key, {})),
+                    "rates": self._rates(buckets, now)
+                }
+            return {
+                "rates": self._rates(all_buckets, now),
+                "session_start_time": self._session_start,
+                "pending_writes": self._pending_count,
+                "instances": breakdown
+            }
+
+    def reset(self) -> bool:
+        """Zero every counter in memory and in the database"""
+        with self._lock:
+            self._loaded = True
+            self._totals.clear()
+            self._instance_totals.clear()
+            self._session.clear()
+            self._buckets.clear()
+            self._pending_totals.clear()
+            self._pending_instances.clear()
+            self._pending_count = 0
+            self._session_start = time.time()
         db = get_database()
-        for stat_key, value in stats.items():
-            db.set_swaparr_stat(stat_key, value)
-        
-        logger.debug(f"Saved Swaparr stats to database: {stats}")
+        for stat_key in VALID_STATS:
+            db.set_swaparr_stat(stat_key, 0)
+        db.clear_swaparr_instance_stats()
         return True
-    except Exception as e:
-        logger.error(f"Error saving Swaparr stats to database: {e}")
-        return False
 
-def increment_swaparr_stat(stat_type: str, count: int = 1) -> bool:
+
+_counters = SwaparrCounters()
+
+def increment_swaparr_stat(stat_type: str, count: int = 1, app_name: str = None, instance_name: str = None) -> bool:
     """
-    Increment a Swaparr statistic by the specified count
-    
+    Increment a Swaparr statistic by the specified count (in memory; written in batches)
+
     Args:
-        stat_type: Type of stat to increment ('processed', 'strikes', 'removals', 'ignored')
+        stat_type: Type of stat to increment (one of VALID_STATS)
         count: Amount to increment by (default 1)
-        
+        app_name: App the event belongs to, for the per-instance breakdown
+        instance_name: Instance the event belongs to
+
     Returns:
         True if successful, False otherwise
     """
-    valid_stats = ['processed', 'strikes', 'removals', 'ignored']
-    if stat_type not in valid_stats:
-        logger.error(f"Invalid Swaparr stat type: {stat_type}. Valid types: {valid_stats}")
+    if stat_type not in VALID_STATS:
+        logger.error(f"Invalid Swaparr stat type: {stat_type}. Valid types: {list(VALID_STATS)}")
         return False
-    
-    with swaparr_stats_lock:
-        try:
-            db = get_database()
-            db.increment_swaparr_stat(stat_type, count)
-            logger.debug(f"Incremented Swaparr {stat_type} by {count}")
-            return True
-        except Exception as e:
-            logger.error(f"Error incrementing Swaparr {stat_type}: {e}")
-            return False
+    return _counters.increment(stat_type, count, app_name, instance_name)
+
+def flush_swaparr_stats() -> int:
+    """Write pending Swaparr counter increments to the database"""
+    return _counters.flush()
 
 def get_swaparr_stats() -> Dict[str, int]:
     """
     Get current Swaparr statistics
-    
+
+    Returns:
+        Dictionary containing lifetime Swaparr statistics
+    """
+    return _counters.get_totals()
+
+def get_swaparr_stats_breakdown() -> Dict[str, Any]:
+    """
+    Get per-instance Swaparr statistics with rates
+
     Returns:
-        Dictionary containing current Swaparr statistics
+        Dictionary with overall rates and, per app and instance, lifetime totals,
+        session counts, items per minute and removals per hour
     """
-    with swaparr_stats_lock:
-        return load_swaparr_stats()
+    return _counters.get_breakdown()
 
 def reset_swaparr_stats() -> bool:
     """
     Reset all Swaparr statistics to zero
-    
+
     Returns:
         True if successful, False otherwise
     """
-    with swaparr_stats_lock:
-        try:
-            default_stats = get_default_swaparr_stats()
-            success = save_swaparr_stats(default_stats)
-            if success:
-                logger.info("Reset all Swaparr statistics to zero")
-            return success
-        except Exception as e:
-            logger.error(f"Error resetting Swaparr stats: {e}")
-            return False 
\ No newline at end of file
+    try:
+        success = _counters.reset()
+        if success:
+            logger.info("Reset all Swaparr statistics to zero")
+        return success
+    except Exception as e:
+        logger.error(f"Error resetting Swaparr stats: {e}")
+        return False
@@ -6,24 +6,49 @@ Enhanced with better statistics tracking and status reporting.
 from flask import Blueprint, request, jsonify
 import os
 import json
+import hmac
 from src.primary.utils.logger import get_logger
-from src.primary.settings_manager import load_settings, save_settings
+from src.primary.settings_manager import load_settings, save_settings, get_settings_version
 from src.primary.apps.swaparr.handler import (
     process_stalled_downloads, 
     get_session_stats, 
     reset_session_stats
 )
 from src.primary.apps.swaparr import get_configured_instances, is_configured
-from src.primary.apps.swaparr.stats_manager import get_swaparr_stats, reset_swaparr_stats
+from src.primary.apps.swaparr.stats_manager import get_swaparr_stats, get_swaparr_stats_breakdown, reset_swaparr_stats
+from src.primary.apps.swaparr.removed_index import get_removed_index
+from src.primary.apps.swaparr.live_queue import handle_webhook_event, get_live_queue_status
 from src.primary.utils.database import get_database
+from src.primary.utils.http_cache import cached_json_response, ttl_version
 
 # Create the blueprint directly in this file
 swaparr_bp = Blueprint('swaparr', __name__)
 swaparr_logger = get_logger("swaparr")
 
+# The status payload mixes database counts, live queue state and time-based rates with
+# no single change counter, so it is snapshotted for a few seconds. Any POST to these
+# routes (settings, resets, webhooks, runs) starts a new snapshot straight away.
+STATUS_SNAPSHOT_TTL = 5
+_status_generation = 0
+
+@swaparr_bp.after_request
+def _invalidate_status_snapshot(response):
+    global _status_generation
+    if request.method == 'POST':
+        _status_generation += 1
+    return response
+
+def get_status_version():
+    """Version of the status payload (moves every STATUS_SNAPSHOT_TTL seconds and on any change)"""
+    return (ttl_version(STATUS_SNAPSHOT_TTL), _status_generation, get_settings_version("swaparr"))
+
 @swaparr_bp.route('/status', methods=['GET'])
 def get_status():
     """Get Swaparr status and comprehensive statistics"""
+    return cached_json_response("swaparr-status", get_status_version(), build_status_payload)
+
+def build_status_payload():
+    """Swaparr status and statistics as served by /api/swaparr/status"""
     settings = load_settings("swaparr")
     enabled = settings.get("enabled", False)
     configured = is_configured()
@@ -48,32 +73,8 @@ def get_status():
                 app_stats = {"error": None}
                 
                 try:
-                    # Load strike data from database
-                    strike_data = db.get_swaparr_strike_data(app_name)
-                    
-                    total_items = len(strike_data)
-                    removed_items = sum(1 for item in strike_data.values() if item.get("removed", False))
-                    striked_items = sum(1 for item in strike_data.values() 
-                                      if item.get("strikes", 0) > 0 and not item.get("removed", False))
-                    
-                    app_stats.update({
-                        "total_tracked": total_items,
-                        "currently_striked": striked_items,
-                        "removed_via_strikes": removed_items
-                    })
-                    
-                    # Load removed items data from database
-                    removed_data = db.get_swaparr_removed_items(app_name)
-                    
-                    app_stats["total_removed"] = len(removed_data)
-                    
-                    # Get removal reasons breakdown
-                    reasons = {}
-                    for item in removed_data.values():
-                        reason = item.get("reason", "Unknown")
-                        reasons[reason] = reasons.get(reason, 0) + 1
-                    app_stats["removal_reasons"] = reasons
-                        
+                    # Strike and removal counts are aggregated in SQL, overall and per instance
+                    app_stats.update(db.get_swaparr_strike_summary(app_name))
                 except Exception as e:
                     swaparr_logger.error(f"Error reading statistics for {app_name}: {str(e)}")
                     app_stats["error"] = str(e)
@@ -86,8 +87,9 @@ def get_status():
     # Get session statistics
     session_stats = get_session_stats()
     
-    # Get persistent statistics
+    # Get persistent statistics (served from memory) and per-instance rates
     swaparr_persistent_stats = get_swaparr_stats()
+    stats_breakdown = get_swaparr_stats_breakdown()
     
     # Get configured instances info
     instances_info = {}
@@ -104,7 +106,7 @@ def get_status():
                 for instance in app_instances
             ]
     
-    return jsonify({
+    return {
         "enabled": enabled,
         "configured": configured,
         "total_instances": sum(len(instances) for instances in instances_info.values()),
@@ -118,8 +120,13 @@ def get_status():
         "app_statistics": app_statistics,
         "session_statistics": session_stats,
         "persistent_statistics": swaparr_persistent_stats,
+        "rates": stats_breakdown["rates"],
+        "instance_statistics": stats_breakdown["instances"],
+        "removed_index": get_removed_index().get_metrics(),
+        "webhook_enabled": settings.get("webhook_enabled", False),
+        "live_queues": get_live_queue_status(),
         "configured_instances": instances_info
-    })
+    }
 
 @swaparr_bp.route('/settings', methods=['GET'])
 def get_settings():
@@ -167,12 +174,13 @@ def reset_strikes():
             files_reset = []
             
             # Reset strikes
-            db.set_swaparr_strike_data(app_name, {})
+            db.clear_swaparr_strikes(app_name)
             files_reset.append("strikes")
             
             # Optionally reset removed items
             if reset_removed:
-                db.set_swaparr_removed_items(app_name, {})
+                db.clear_swaparr_removed_items(app_name)
+                get_removed_index().clear(app_name)
                 files_reset.append("removed_items")
             
             swaparr_logger.info(f"Reset {', '.join(files_reset)} for {app_name}")
@@ -194,12 +202,13 @@ def reset_strikes():
                 files_reset = []
                 
                 # Reset strikes
-                db.set_swaparr_strike_data(app_name, {})
+                db.clear_swaparr_strikes(app_name)
                 files_reset.append("strikes")
                 
                 # Optionally reset removed items
                 if reset_removed:
-                    db.set_swaparr_removed_items(app_name, {})
+                    db.clear_swaparr_removed_items(app_name)
+                    get_removed_index().clear(app_name)
                     files_reset.append("removed_items")
                 
                 apps_reset.append(f"{app_name} ({', '.join(files_reset)})")
@@ -306,6 +315,8 @@ def test_configuration():
                     from src.primary.apps.swaparr.handler import get_queue_items
                     
                     queue_items = get_queue_items(app_name, api_url, api_key, 30)  # Short timeout for test
+                    if queue_items is None:
+                        raise Exception("Could not fetch the download queue")
                     
                     test_results[app_name].append({
                         "instance": instance_name,
@@ -339,6 +350,35 @@ def test_configuration():
             "message": f"Test failed with error: {str(e)}"
         }), 500
 
+@swaparr_bp.route('/webhook/<app_name>', methods=['POST'])
+def receive_webhook(app_name):
+    """
+    Receive a Sonarr/Radarr/Lidarr/Readarr webhook and update that instance's live queue view.
+    Configure the Arr connection URL as /api/swaparr/webhook/<app>?instance=<name>&apikey=<the Arr's API key>;
+    the key may also be sent in an X-Api-Key header.
+    """
+    instance_name = request.args.get("instance", "")
+    supplied_key = request.headers.get("X-Api-Key") or request.args.get("apikey", "")
+    
+    instance_data = next((inst for inst in get_configured_instances().get(app_name, [])
+                          if inst.get("instance_name") == instance_name), None)
+    if not instance_data or not supplied_key or not hmac.compare_digest(
+            supplied_key.encode("utf-8"), str(instance_data.get("api_key", "")).encode("utf-8")):
+        swaparr_logger.warning(f"Rejected Swaparr webhook for {app_name} instance '{instance_name}': unknown instance or API key mismatch")
+        return jsonify({"success": False, "message": "Unknown instance or invalid API key"}), 401
+    
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"success": False, "message": "Expected a JSON webhook payload"}), 400
+    
+    settings = load_settings("swaparr")
+    if not settings.get("enabled", False) or not settings.get("webhook_enabled", False):
+        # Acknowledge so the Arr does not mark the connection as failing
+        return jsonify({"success": True, "action": "ignored", "message": "Swaparr webhooks are disabled"})
+    
+    action = handle_webhook_event(app_name, instance_name, payload)
+    return jsonify({"success": True, "action": action})
+
 @swaparr_bp.route('/run', methods=['POST'])
 def manual_run():
     """Manually trigger a Swaparr run"""
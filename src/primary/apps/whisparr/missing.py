@@ -14,8 +14,9 @@ from src.primary.utils.logger import get_logger
 from src.primary.apps.whisparr import api as whisparr_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
+from src.primary.stats_manager import increment_stat_only, check_hourly_cap_exceeded
 from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.search_pipeline import chunk_items
 from src.primary.state import check_state_reset
 
 # Get logger for the app
@@ -141,14 +142,14 @@ def process_missing_items(
     
     whisparr_logger.info(f"Selected {len(items_to_search)} missing items to search.")
 
-    # Process selected items
-    for item in items_to_search:
-        # Check for stop signal before each item
+    # Process selected items, coalescing them into multi-ID search commands
+    for batch in chunk_items(items_to_search):
+        # Check for stop signal before each batch
         if stop_check():
             whisparr_logger.info("Stop requested during item processing. Aborting...")
             break
         
-        # Check API limit before processing each item
+        # Check API limit before each search command
         try:
             if check_hourly_cap_exceeded("whisparr"):
                 whisparr_logger.warning(f"🛑 Whisparr API hourly limit reached - stopping missing items processing after {items_processed} items")
@@ -162,59 +163,72 @@ def process_missing_items(
         if items_processed >= current_limit:
              whisparr_logger.info(f"Reached HUNT_MISSING_ITEMS limit ({current_limit}) for this cycle.")
              break
+        batch = batch[:current_limit - items_processed]
 
-        item_id = item.get("id")
-        title = item.get("title", "Unknown Title")
-        season_episode = f"S{item.get('seasonNumber', 0):02d}E{item.get('episodeNumber', 0):02d}"
-        
-        whisparr_logger.info(f"Processing missing item: \"{title}\" - {season_episode} (Item ID: {item_id})")
+        batch_ids = []
+        for item in batch:
+            item_id = item.get("id")
+            title = item.get("title", "Unknown Title")
+            season_episode = f"S{item.get('seasonNumber', 0):02d}E{item.get('episodeNumber', 0):02d}"
+            
+            whisparr_logger.info(f"Processing missing item: \"{title}\" - {season_episode} (Item ID: {item_id})")
+            
+            # Mark the item as processed BEFORE triggering any searches
+            add_processed_id("whisparr", instance_name, str(item_id))
+            whisparr_logger.debug(f"Added item ID {item_id} to processed list for {instance_name}")
+            batch_ids.append(item_id)
         
         # Refresh functionality has been removed as it was identified as a performance bottleneck
         
-        # Mark the item as processed BEFORE triggering any searches
-        add_processed_id("whisparr", instance_name, str(item_id))
-        whisparr_logger.debug(f"Added item ID {item_id} to processed list for {instance_name}")
-        
         # Check for stop signal before searching
         if stop_check():
-            whisparr_logger.info(f"Stop requested before searching for {title}. Aborting...")
+            whisparr_logger.info(f"Stop requested before searching for {len(batch_ids)} items. Aborting...")
             break
         
-        # Search for the item
-        whisparr_logger.info(" - Searching for missing item...")
-        search_command_id = whisparr_api.item_search(api_url, api_key, api_timeout, [item_id])
+        # One search command covers the whole batch
+        whisparr_logger.info(f" - Searching for {len(batch_ids)} missing items...")
+        search_command_id = whisparr_api.item_search(api_url, api_key, api_timeout, batch_ids)
         if search_command_id:
-            whisparr_logger.info(f"Triggered search command {search_command_id}. Assuming success for now.")
-            
-            # Tag the series if enabled
-            if tag_processed_items:
-                from src.primary.settings_manager import get_custom_tag
-                custom_tag = get_custom_tag("whisparr", "missing", "huntarr-missing")
-                series_id = item.get('seriesId')
-                if series_id:
-                    try:
-                        whisparr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
-                        whisparr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
-                    except Exception as e:
-                        whisparr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
+            whisparr_logger.info(f"Triggered search command {search_command_id} for {len(batch_ids)} items. Assuming success for now.")
             
-            # Log to history system
-            media_name = f"{title} - {season_episode}"
-            log_processed_media("whisparr", media_name, item_id, instance_name, "missing")
-            whisparr_logger.debug(f"Logged history entry for item: {media_name}")
+            tagged_series = set()  # Series share one tag; tag each only once per batch
+            for item in batch:
+                item_id = item.get("id")
+                title = item.get("title", "Unknown Title")
+                season_episode = f"S{item.get('seasonNumber', 0):02d}E{item.get('episodeNumber', 0):02d}"
+                
+                # Tag the series if enabled
+                if tag_processed_items:
+                    from src.primary.settings_manager import get_custom_tag
+                    custom_tag = get_custom_tag("whisparr", "missing", "huntarr-missing")
+                    series_id = item.get('seriesId')
+                    if series_id and series_id not in tagged_series:
+                        tagged_series.add(series_id)
+                        try:
+                            whisparr_api.tag_processed_series(api_url, api_key, api_timeout, series_id, custom_tag)
+                            whisparr_logger.debug(f"Tagged series {series_id} with '{custom_tag}'")
+                        except Exception as e:
+                            whisparr_logger.warning(f"Failed to tag series {series_id} with '{custom_tag}': {e}")
+                
+                # Log to history system
+                media_name = f"{title} - {season_episode}"
+                log_processed_media("whisparr", media_name, item_id, instance_name, "missing")
+                whisparr_logger.debug(f"Logged history entry for item: {media_name}")
+                
+                items_processed += 1
+                
+                # Increment the hunted statistics for Whisparr; the search command
+                # already counted toward the hourly API cap, once for the whole batch
+                increment_stat_only("whisparr", "hunted", 1)
+                whisparr_logger.debug(f"Incremented whisparr hunted statistics by 1")
             
-            items_processed += 1
             processing_done = True
-            
-            # Increment the hunted statistics for Whisparr
-            increment_stat("whisparr", "hunted", 1)
-            whisparr_logger.debug(f"Incremented whisparr hunted statistics by 1")
 
             # Log progress
             current_limit = app_settings.get("hunt_missing_items", app_settings.get("hunt_missing_scenes", 1))
             whisparr_logger.info(f"Processed {items_processed}/{current_limit} missing items this cycle.")
         else:
-            whisparr_logger.warning(f"Failed to trigger search command for item ID {item_id}.")
+            whisparr_logger.warning(f"Failed to trigger search command for item IDs {batch_ids}.")
             # Do not mark as processed if search couldn't be triggered
             continue
     
@@ -19,12 +19,17 @@ import re # Import the re module for regex
 import requests
 import uuid
 import sqlite3
+import ipaddress
+import functools
+import threading
 from typing import Dict, Any, Optional, Tuple, Union
 from flask import request, redirect, url_for, session
 from .utils.logger import logger # Ensure logger is imported
 
 # Database setup
-from src.primary.utils.database import get_database
+from src.primary.utils.database import get_database, register_user_listener
+from src.primary.settings_manager import get_settings_snapshot, register_settings_listener
+from src.primary.utils.session_store import SessionStore
 
 # Session settings
 SESSION_EXPIRY = 60 * 60 * 24 * 7  # 1 week in seconds
@@ -35,12 +40,73 @@ PLEX_CLIENT_IDENTIFIER = None  # Will be generated on first use
 PLEX_PRODUCT_NAME = "Huntarr"
 PLEX_VERSION = "1.0"
 
-# Store active sessions
-active_sessions = {}
+# Store active sessions (bounded, swept in the background, optionally persisted)
+active_sessions = SessionStore(SESSION_EXPIRY)
 
 # Store active Plex PINs
 active_plex_pins = {}
 
+# Networks treated as local by Local Bypass Mode, parsed once
+LOCAL_NETWORKS = tuple(ipaddress.ip_network(network) for network in (
+    "127.0.0.1/32",    # localhost
+    "::1/128",         # localhost IPv6
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16"
+))
+
+# In-memory answers for the per-request auth check ("user_exists", "bypass_flags"),
+# dropped when a user is created or general settings change
+_auth_cache = {}
+_auth_cache_generation = 0  # Bumped on invalidation so a lookup racing it is not cached
+_auth_cache_lock = threading.Lock()
+
+def _cached_auth_value(key: str, loader):
+    """Return the cached value for key, computing it with loader() on a miss"""
+    value = _auth_cache.get(key)
+    if value is not None:
+        return value
+    generation = _auth_cache_generation
+    value = loader()
+    with _auth_cache_lock:
+        if generation == _auth_cache_generation:
+            _auth_cache[key] = value
+    return value
+
+def invalidate_auth_cache(key: str = None):
+    """Drop one cached auth value, or all of them"""
+    global _auth_cache_generation
+    with _auth_cache_lock:
+        _auth_cache_generation += 1
+        if key:
+            _auth_cache.pop(key, None)
+        else:
+            _auth_cache.clear()
+
+def _on_settings_changed(app_name, version):
+    if app_name == "general":
+        invalidate_auth_cache("bypass_flags")
+
+register_user_listener(lambda: invalidate_auth_cache("user_exists"))
+register_settings_listener(_on_settings_changed)
+
+def _load_bypass_flags() -> Tuple[bool, bool]:
+    """(local_access_bypass, proxy_auth_bypass) from general settings"""
+    general_settings = get_settings_snapshot("general")
+    return (bool(general_settings.get("local_access_bypass", False)),
+            bool(general_settings.get("proxy_auth_bypass", False)))
+
+@functools.lru_cache(maxsize=1024)
+def _is_local_address(address: str) -> bool:
+    """True if address is in LOCAL_NETWORKS (IPv4-mapped IPv6 addresses count as IPv4)"""
+    try:
+        ip = ipaddress.ip_address(address.strip())
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return any(ip in network for network in LOCAL_NETWORKS)
+
 # --- Helper functions for user data ---
 def get_user_data(username: str = None) -> Dict[str, Any]:
     """Load user data from the database."""
@@ -156,9 +222,8 @@ def validate_password_strength(password: str) -> Optional[str]:
     return None
 
 def user_exists() -> bool:
-    """Check if a user has been created"""
-    db = get_database()
-    return db.user_exists()
+    """Check if a user has been created (cached until a user is created)"""
+    return _cached_auth_value("user_exists", lambda: get_database().user_exists())
 
 def create_user(username: str, password: str) -> bool:
     """Create a new user"""
@@ -241,42 +306,16 @@ def verify_user(username: str, password: str, otp_code: str = None) -> Tuple[boo
 
 def create_session(username: str) -> str:
     """Create a new session for an authenticated user"""
-    session_id = secrets.token_hex(32)
     # Store the actual username, not the hash
-    
-    # Store session data
-    active_sessions[session_id] = {
-        "username": username, # Store actual username
-        "created_at": time.time(),
-        "expires_at": time.time() + SESSION_EXPIRY
-    }
-    
-    return session_id
+    return active_sessions.create(username)
 
 def verify_session(session_id: str) -> bool:
-    """Verify if a session is valid"""
-    if not session_id or session_id not in active_sessions:
-        return False
-        
-    session_data = active_sessions[session_id]
-    
-    # Check if session has expired
-    if session_data.get("expires_at", 0) < time.time():
-        # Clean up expired session
-        del active_sessions[session_id]
-        return False
-        
-    # Extend session expiry
-    active_sessions[session_id]["expires_at"] = time.time() + SESSION_EXPIRY
-    return True
+    """Verify if a session is valid (and extend its expiry)"""
+    return active_sessions.verify(session_id)
 
 def get_username_from_session(session_id: str) -> Optional[str]:
     """Get the username from a session"""
-    if not session_id or session_id not in active_sessions:
-        return None
-    
-    # Return the stored username
-    return active_sessions[session_id].get("username")
+    return active_sessions.get_username(session_id)
 
 def authenticate_request():
     """Flask route decorator to check if user is authenticated"""
@@ -292,6 +331,7 @@ def authenticate_request():
     favicon_path = "/favicon.ico"
     health_check_path = "/api/health"
     ping_path = "/ping"
+    swaparr_webhook_path = "/api/swaparr/webhook/"  # Arr webhooks authenticate with the instance API key in the route
 
     # Check if this is a commonly polled API endpoint to reduce log verbosity
     is_polling_endpoint = any(endpoint in request.path for endpoint in [
@@ -307,8 +347,8 @@ def authenticate_request():
             logger.debug(f"Allowing setup/user page access for path: {request.path}")
         return None
 
-    # Skip authentication for static files, API setup, health check path, ping, and github sponsors
-    if request.path.startswith((static_path, api_setup_path)) or request.path in (favicon_path, health_check_path, ping_path, '/api/github_sponsors', '/api/sponsors/init'):
+    # Skip authentication for static files, API setup, Swaparr webhooks, health check path, ping, and github sponsors
+    if request.path.startswith((static_path, api_setup_path, swaparr_webhook_path)) or request.path in (favicon_path, health_check_path, ping_path, '/api/github_sponsors', '/api/sponsors/init'):
         return None
     
     # If no user exists, redirect to setup
@@ -323,26 +363,11 @@ def authenticate_request():
             logger.debug(f"Skipping authentication for login/plex path '{request.path}'")
         return None
     
-    # Load general settings
+    # Bypass flags come from memory; refreshed when general settings change
     local_access_bypass = False
     proxy_auth_bypass = False
     try:
-        # Force reload settings from disk to ensure we have the latest
-        from src.primary.settings_manager import load_settings
-        from src.primary import settings_manager
-        
-        # Ensure we're getting fresh settings by clearing any cache
-        if hasattr(settings_manager, 'settings_cache'):
-            settings_manager.settings_cache = {}
-            
-        settings = load_settings("general")  # Specify 'general' as the app_type
-        general_settings = settings
-        local_access_bypass = general_settings.get("local_access_bypass", False)
-        proxy_auth_bypass = general_settings.get("proxy_auth_bypass", False)
-        
-        # Log settings only for non-polling endpoints to reduce spam
-        if not is_polling_endpoint:
-            pass  # Removed verbose auth setting logs
+        local_access_bypass, proxy_auth_bypass = _cached_auth_value("bypass_flags", _load_bypass_flags)
     except Exception as e:
         logger.error(f"Error loading authentication bypass settings: {e}", exc_info=True)
     
@@ -352,33 +377,8 @@ def authenticate_request():
         return None
     
     remote_addr = request.remote_addr
-    if not is_polling_endpoint:
-        pass  # IP address debug removed to reduce log spam
     
     if local_access_bypass:
-        # Common local network IP ranges
-        local_networks = [
-            '127.0.0.1',      # localhost
-            '::1',            # localhost IPv6
-            '10.',            # 10.0.0.0/8
-            '172.16.',        # 172.16.0.0/12
-            '172.17.',
-            '172.18.',
-            '172.19.',
-            '172.20.',
-            '172.21.',
-            '172.22.',
-            '172.23.',
-            '172.24.',
-            '172.25.',
-            '172.26.',
-            '172.27.',
-            '172.28.',
-            '172.29.',
-            '172.30.',
-            '172.31.',
-            '192.168.'        # 192.168.0.0/16
-        ]
         is_local = False
         
         # Check if request is coming through a proxy
@@ -387,19 +387,11 @@ def authenticate_request():
             logger.debug(f"X-Forwarded-For header detected: {forwarded_for}")
             # Take the first IP in the chain which is typically the client's real IP
             possible_client_ip = forwarded_for.split(',')[0].strip()
-            
-            # Check if this forwarded IP is a local network IP
-            for network in local_networks:
-                if possible_client_ip == network or (network.endswith('.') and possible_client_ip.startswith(network)):
-                    is_local = True
-                    break
+            is_local = _is_local_address(possible_client_ip)
         
         # Check if direct remote_addr is a local network IP if not already determined
-        if not is_local:
-            for network in local_networks:
-                if remote_addr == network or (network.endswith('.') and remote_addr.startswith(network)):
-                    is_local = True
-                    break
+        if not is_local and remote_addr:
+            is_local = _is_local_address(remote_addr)
                     
         if is_local:
             if not is_polling_endpoint:
@@ -445,8 +437,7 @@ def authenticate_request():
 
 def logout(session_id: str):
     """Log out the current user by invalidating their session"""
-    if session_id and session_id in active_sessions:
-        del active_sessions[session_id]
+    active_sessions.revoke(session_id)
     
     # Clear the session cookie in Flask context (if available, otherwise handled by route)
     # session.pop(SESSION_COOKIE_NAME, None) # This might be better handled solely in the route
@@ -22,6 +22,7 @@ __version__ = "1.0.0" # Consider updating this based on changes
 
 # Set up logging first
 from src.primary.utils.logger import setup_main_logger, get_logger # Import get_logger
+from src.primary.utils.timezone_utils import get_user_timezone
 logger = setup_main_logger()
 
 # Import necessary modules
@@ -29,6 +30,7 @@ from src.primary import config, settings_manager
 # Removed keys_manager import as settings_manager handles API details
 from src.primary.state import check_state_reset, calculate_reset_time
 from src.primary.stats_manager import check_hourly_cap_exceeded
+from src.primary.connection_monitor import start_connection_monitor, stop_connection_monitor, is_instance_reachable
 # Instance list generator has been removed
 from src.primary.scheduler_engine import start_scheduler, stop_scheduler
 # Legacy JSON migration removed - all data now stored in database
@@ -46,13 +48,14 @@ swaparr_thread = None
 
 # Instance list generator has been removed
 
-def _get_user_timezone():
-    """Get the user's selected timezone from general settings"""
+def _get_search_count(app_type: str) -> Optional[int]:
+    """Lifetime hunted + upgraded count for an app (None if stats are unavailable)"""
     try:
-        from src.primary.utils.timezone_utils import get_user_timezone
-        return get_user_timezone()
+        from src.primary.stats_manager import get_stats
+        app_stats = get_stats().get(app_type, {})
+        return app_stats.get("hunted", 0) + app_stats.get("upgraded", 0)
     except Exception:
-        return pytz.UTC
+        return None
 
 def app_specific_loop(app_type: str) -> None:
     """
@@ -61,8 +64,6 @@ def app_specific_loop(app_type: str) -> None:
     Args:
         app_type: The type of Arr application (sonarr, radarr, lidarr, readarr)
     """
-    from src.primary.cycle_tracker import update_next_cycle
-    
     app_logger = get_logger(app_type)
     app_logger.info(f"=== [{app_type.upper()}] Thread starting ===")
 
@@ -70,7 +71,6 @@ def app_specific_loop(app_type: str) -> None:
     process_missing = None
     process_upgrades = None
     get_queue_size = None
-    check_connection = None
     get_instances_func = None # Default: No multi-instance function found
     hunt_missing_setting = ""
     hunt_upgrade_setting = ""
@@ -88,7 +88,6 @@ def app_specific_loop(app_type: str) -> None:
         except AttributeError:
             get_instances_func = None # Explicitly set to None if not found
 
-        check_connection = getattr(api_module, 'check_connection')
         get_queue_size = getattr(api_module, 'get_download_queue_size', lambda api_url, api_key, api_timeout: 0) # Default if not found
 
         if app_type == "sonarr":
@@ -228,6 +227,11 @@ def app_specific_loop(app_type: str) -> None:
         # Process each instance dictionary returned by get_configured_instances
         processed_any_items = False
         enabled_instances = []
+        # Cycle outcome for adaptive pacing
+        instances_attempted = 0
+        instances_connected = 0
+        search_quota = 0
+        searches_before = _get_search_count(app_type)
         
         for instance_details in instances_to_process:
             if stop_event.is_set():
@@ -247,14 +251,16 @@ def app_specific_loop(app_type: str) -> None:
             if not api_url or not api_key:
                 app_logger.warning(f"Missing API URL or Key for instance '{instance_name}'. Skipping.")
                 continue
+            instances_attempted += 1
             try:
-                # Use instance details for connection check
-                app_logger.debug(f"Checking connection to {app_type} instance '{instance_name}' at {api_url} with timeout {api_timeout}s")
-                connected = check_connection(api_url, api_key, api_timeout=api_timeout)
+                # Use the health monitor's latest result; it probes inline only if that result is not current
+                connected, health = is_instance_reachable(app_type, instance_name, api_url, api_key, api_timeout)
                 if not connected:
-                    app_logger.warning(f"Failed to connect to {app_type} instance '{instance_name}' at {api_url}. Skipping.")
+                    reason = health.get("error") if health else None
+                    app_logger.warning(f"Failed to connect to {app_type} instance '{instance_name}' at {api_url}{f' ({reason})' if reason else ''}. Skipping.")
                     continue
                 app_logger.info(f"Successfully connected to {app_type} instance: {instance_name}")
+                instances_connected += 1
             except Exception as e:
                 app_logger.error(f"Error connecting to {app_type} instance '{instance_name}': {e}", exc_info=True)
                 continue # Skip this instance if connection fails
@@ -300,6 +306,7 @@ def app_specific_loop(app_type: str) -> None:
 
             hunt_missing_enabled = hunt_missing_value > 0
             hunt_upgrade_enabled = hunt_upgrade_value > 0
+            search_quota += max(0, hunt_missing_value) + max(0, hunt_upgrade_value)
             
             # Debug logging for per-instance hunt values
             app_logger.info(f"Instance '{instance_name}' - Missing: {hunt_missing_value} (enabled: {hunt_missing_enabled}), Upgrade: {hunt_upgrade_value} (enabled: {hunt_upgrade_enabled})")
@@ -461,15 +468,30 @@ def app_specific_loop(app_type: str) -> None:
             # Swaparr uses its own state management for strikes and removed downloads
             app_logger.debug(f"Swaparr uses its own strike/removal tracking, not the hunting state manager")
             
-        # Calculate sleep duration (use configured or default value)
+        # Calculate sleep duration (configured value, or the adaptive pacing choice)
         sleep_seconds = app_settings.get("sleep_duration", 900)  # Default to 15 minutes
+        try:
+            from src.primary.cycle_pacing import choose_cycle_sleep
+            from src.primary.stats_manager import get_hourly_cap_status
+            searches_after = _get_search_count(app_type)
+            searched = max(0, searches_after - searches_before) if None not in (searches_before, searches_after) else 0
+            sleep_seconds, sleep_reason = choose_cycle_sleep(
+                app_type, sleep_seconds,
+                instances=instances_attempted,
+                connected=instances_connected,
+                searched=searched,
+                quota=search_quota,
+                cap_remaining=get_hourly_cap_status(app_type).get("remaining")
+            )
+        except Exception as e:
+            app_logger.warning(f"Adaptive sleep unavailable for {app_type}, using sleep_duration: {e}")
                 
         # Sleep with periodic checks for reset file
         # Calculate and format the time when the next cycle will begin
         # Use user's selected timezone for all time operations
         
         # Get user's selected timezone
-        user_tz = _get_user_timezone()
+        user_tz = get_user_timezone()
         
         # Get current time in user's timezone - remove microseconds for clean timestamps
         now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
@@ -481,11 +503,7 @@ def app_specific_loop(app_type: str) -> None:
         app_logger.info(f"Next cycle will begin at {next_cycle_time.strftime('%Y-%m-%d %H:%M:%S')} ({user_tz})")
         app_logger.info(f"Sleep duration: {sleep_seconds} seconds")
         
-        # Update cycle tracking with user timezone time
-        next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
-        update_next_cycle(app_type, next_cycle_naive)
-        
-        # Mark cycle as ended (set cyclelock to False) and update next cycle time
+        # Mark cycle as ended (set cyclelock to False) and update next cycle time in one write
         # Use user's timezone for internal storage consistency
         try:
             from src.primary.cycle_tracker import end_cycle
@@ -636,6 +654,12 @@ def shutdown_threads():
         else:
             logger.info("Swaparr thread stopped")
     
+    # Stop the connection health monitor
+    try:
+        stop_connection_monitor()
+    except Exception as e:
+        logger.error(f"Error stopping connection health monitor: {e}")
+    
     # Stop the scheduler engine
     try:
         logger.info("Stopping schedule action engine...")
@@ -649,6 +673,14 @@ def shutdown_threads():
         if thread.is_alive():
             thread.join(timeout=10.0)
     
+    # Stop history retention and commit any queued hunt history entries
+    try:
+        from src.primary.history_manager import stop_history_retention, stop_history_writer
+        stop_history_retention()
+        stop_history_writer()
+    except Exception as e:
+        logger.error(f"Error stopping history writer: {e}")
+    
     logger.info("All app threads stopped.")
 
 def hourly_cap_scheduler_loop():
@@ -704,9 +736,10 @@ def swaparr_app_loop():
     swaparr_logger.info("Swaparr thread started")
     
     try:
-        from src.primary.apps.swaparr.handler import run_swaparr
+        from src.primary.apps.swaparr.handler import run_swaparr, run_swaparr_changes, run_swaparr_strike_sweep
+        from src.primary.apps.swaparr.live_queue import wait_for_events
         from src.primary.settings_manager import load_settings
-        from src.primary.cycle_tracker import start_cycle, end_cycle, update_next_cycle
+        from src.primary.cycle_tracker import start_cycle, end_cycle
         
         while not stop_event.is_set():
             try:
@@ -721,11 +754,17 @@ def swaparr_app_loop():
                     else:
                         break
                 
-                # Get sleep duration from settings
-                sleep_duration = swaparr_settings.get("sleep_duration", 900)
+                # Get sleep duration from settings; with webhooks feeding changes the timer is only a reconcile
+                # sweep, while striked or stalled items are still re-checked every sleep_duration
+                webhook_enabled = swaparr_settings.get("webhook_enabled", False)
+                strike_interval = swaparr_settings.get("sleep_duration", 900)
+                if webhook_enabled:
+                    sleep_duration = swaparr_settings.get("webhook_reconcile_interval", 3600)
+                else:
+                    sleep_duration = strike_interval
                 
                 # Get user's timezone
-                user_tz = _get_user_timezone()
+                user_tz = get_user_timezone()
                 
                 # Calculate next cycle time in user's timezone
                 now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
@@ -748,7 +787,6 @@ def swaparr_app_loop():
                 # End cycle tracking
                 next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
                 end_cycle("swaparr", next_cycle_naive)
-                update_next_cycle("swaparr", next_cycle_naive)
                 
                 # Sleep duration and next cycle info (like other apps)
                 swaparr_logger.debug(f"Current time ({user_tz}): {now_user_tz.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -758,6 +796,8 @@ def swaparr_app_loop():
                 # Sleep with responsiveness to stop events and reset requests (like other apps)
                 elapsed = 0
                 wait_interval = 5  # Check every 5 seconds for responsiveness
+                next_log = 30
+                next_strike_sweep = strike_interval
                 while elapsed < sleep_duration and not stop_event.is_set():
                     # Check for database reset request (same logic as other apps)
                     try:
@@ -779,13 +819,33 @@ def swaparr_app_loop():
                         swaparr_logger.info("Stop event detected during sleep. Breaking out of sleep cycle.")
                         break
                     
-                    # Sleep for a short interval
-                    stop_event.wait(wait_interval)
-                    elapsed += wait_interval
+                    # Sleep for a short interval, waking early to handle webhook-driven queue changes
+                    if webhook_enabled:
+                        wait_started = time.monotonic()
+                        if wait_for_events(wait_interval):
+                            try:
+                                run_swaparr_changes()
+                            except Exception as e:
+                                swaparr_logger.error(f"Error processing webhook queue changes: {e}", exc_info=True)
+                        elapsed += time.monotonic() - wait_started
+                        
+                        # Keep striking stuck downloads at the normal pace between reconcile sweeps
+                        if elapsed >= next_strike_sweep and elapsed < sleep_duration:
+                            next_strike_sweep += strike_interval
+                            wait_started = time.monotonic()
+                            try:
+                                run_swaparr_strike_sweep()
+                            except Exception as e:
+                                swaparr_logger.error(f"Error during Swaparr strike sweep: {e}", exc_info=True)
+                            elapsed += time.monotonic() - wait_started
+                    else:
+                        stop_event.wait(wait_interval)
+                        elapsed += wait_interval
                     
                     # Log progress every 30 seconds (like other apps)
-                    if elapsed > 0 and elapsed % 30 == 0:
-                        swaparr_logger.debug(f"Still sleeping, {sleep_duration - elapsed} seconds remaining before next cycle...")
+                    if elapsed >= next_log:
+                        next_log += 30
+                        swaparr_logger.debug(f"Still sleeping, {int(sleep_duration - elapsed)} seconds remaining before next cycle...")
                     
             except Exception as e:
                 swaparr_logger.error(f"Unexpected error in Swaparr loop: {e}", exc_info=True)
@@ -795,6 +855,13 @@ def swaparr_app_loop():
     except Exception as e:
         swaparr_logger.error(f"Fatal error in Swaparr thread: {e}", exc_info=True)
     
+    # Write any counters still pending from the last cycle
+    try:
+        from src.primary.apps.swaparr.stats_manager import flush_swaparr_stats
+        flush_swaparr_stats()
+    except Exception as e:
+        swaparr_logger.error(f"Error flushing Swaparr stats on shutdown: {e}")
+    
     swaparr_logger.info("Swaparr thread stopped")
 
 # The instance list generator loop has been removed as it's no longer needed
@@ -860,6 +927,13 @@ def start_huntarr():
     except Exception as e:
         logger.error(f"Failed to start Swaparr thread: {e}")
         
+    # Start hunt history retention
+    try:
+        from src.primary.history_manager import start_history_retention
+        start_history_retention()
+    except Exception as e:
+        logger.error(f"Failed to start history retention: {e}")
+        
     # Start the scheduler engine
     try:
         start_scheduler()
@@ -867,6 +941,12 @@ def start_huntarr():
     except Exception as e:
         logger.error(f"Failed to start schedule action engine: {e}")
         
+    # Start the connection health monitor
+    try:
+        start_connection_monitor()
+    except Exception as e:
+        logger.error(f"Failed to start connection health monitor: {e}")
+        
     # Configuration logging has been disabled to reduce log spam
     # Settings are loaded and used internally without verbose logging
 
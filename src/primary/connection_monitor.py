@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Connection health monitor for Huntarr
+Probes every configured *arr instance in the background, several at a time, and keeps
+the latest result (reachable, latency, reported version) in memory. Healthy instances
+are re-checked every health_check_interval seconds and unreachable ones with
+exponential backoff. /api/status and the hunt loop read these results instead of
+probing inline, and a settings change for an app re-checks its instances at once.
+"""
+
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+import requests
+
+from src.primary.utils.logger import get_logger
+from src.primary.settings_manager import get_advanced_setting, get_ssl_verify_setting, register_settings_listener
+from src.primary.dashboard_state import record_connections
+
+logger = get_logger("huntarr")
+
+MONITORED_APPS = ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']
+# system/status lives under a different API version per app
+API_VERSIONS = {"sonarr": "v3", "radarr": "v3", "lidarr": "v1", "readarr": "v1", "whisparr": "v3", "eros": "v3"}
+
+DEFAULT_CHECK_INTERVAL = 60
+MIN_CHECK_INTERVAL = 15
+# An unreachable instance waits interval * 2^(failures - 1) before its next probe, up to this long
+MAX_BACKOFF = 900
+PROBE_TIMEOUT = 10
+MAX_PARALLEL_PROBES = 8
+
+_lock = threading.Lock()
+_targets: Dict[Tuple[str, str], Tuple[str, str]] = {}  # (app, instance name) -> (api_url, api_key)
+_health: Dict[Tuple[str, str], Dict[str, Any]] = {}    # (app, instance name) -> latest result
+_wake_event = threading.Event()
+_stop_event = threading.Event()
+_monitor_thread = None
+
+
+def get_check_interval() -> int:
+    """Seconds between checks of a healthy instance (health_check_interval setting)"""
+    try:
+        return max(MIN_CHECK_INTERVAL, int(get_advanced_setting("health_check_interval", DEFAULT_CHECK_INTERVAL)))
+    except (TypeError, ValueError):
+        return DEFAULT_CHECK_INTERVAL
+
+
+def probe_instance(app_type: str, api_url: str, api_key: str, timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+    """
+    Fetch an instance's system status once.
+
+    Returns:
+        Dict with connected, latency_ms, version and error (None when connected)
+    """
+    result = {"connected": False, "latency_ms": None, "version": None, "error": None}
+    url = f"{api_url.rstrip('/')}/api/{API_VERSIONS.get(app_type, 'v3')}/system/status"
+    started = time.perf_counter()
+    try:
+        response = requests.get(url, headers={"X-Api-Key": api_key}, timeout=timeout,
+                                verify=get_ssl_verify_setting())
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        response.raise_for_status()
+        status = response.json()
+        version = status.get("version") if isinstance(status, dict) else None
+        if not version:
+            result["error"] = "Unexpected system status response"
+        elif app_type == "whisparr" and not str(version).startswith("2"):
+            # Whisparr V3 instances belong under Eros
+            result["error"] = f"Expected Whisparr 2.x, found {version}"
+        else:
+            result["connected"] = True
+            result["version"] = str(version)
+    except requests.exceptions.Timeout:
+        result["error"] = f"Timed out after {timeout}s"
+    except requests.exceptions.RequestException as e:
+        result["error"] = str(e)[:200]
+    except ValueError:
+        result["error"] = "Invalid JSON in system status response"
+    return result
+
+
+def _load_targets() -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """Every configured, enabled instance of the monitored apps"""
+    targets = {}
+    for app_type in MONITORED_APPS:
+        try:
+            instances = importlib.import_module(f'src.primary.apps.{app_type}').get_configured_instances()
+        except Exception as e:
+            logger.error(f"Health monitor could not load {app_type} instances: {e}")
+            # Keep checking what was configured before
+            targets.update({key: target for key, target in _targets.items() if key[0] == app_type})
+            continue
+        for instance in instances:
+            api_url, api_key = instance.get("api_url"), instance.get("api_key")
+            if api_url and api_key:
+                targets[(app_type, instance.get("instance_name", "Default"))] = (api_url, api_key)
+    return targets
+
+
+def _refresh_targets():
+    """Reload the instance list; results for removed or re-pointed instances are dropped"""
+    targets = _load_targets()
+    with _lock:
+        _targets.clear()
+        _targets.update(targets)
+        for key in list(_health):
+            if _targets.get(key) != _health[key]["target"]:
+                del _health[key]
+
+
+def _record(key: Tuple[str, str], target: Tuple[str, str], outcome: Dict[str, Any]):
+    """Store a probe result and schedule the instance's next check"""
+    app_type, instance_name = key
+    now = time.time()
+    interval = get_check_interval()
+    with _lock:
+        if _targets.get(key, target) != target:
+            return  # Re-pointed while the probe ran; the new target gets its own check
+        previous = _health.get(key)
+        failures = 0 if outcome["connected"] else (previous["failures"] if previous else 0) + 1
+        delay = interval if outcome["connected"] else min(interval * 2 ** (failures - 1), MAX_BACKOFF)
+        _health[key] = dict(outcome,
+                            target=target,
+                            failures=failures,
+                            checked_at=now,
+                            last_success=now if outcome["connected"] else (previous or {}).get("last_success"),
+                            next_check=now + delay)
+
+    was_connected = previous["connected"] if previous else None
+    if outcome["connected"] and was_connected is False:
+        logger.info(f"{app_type} instance '{instance_name}' is reachable again ({outcome['latency_ms']} ms)")
+    elif not outcome["connected"] and was_connected is not False:
+        logger.warning(f"{app_type} instance '{instance_name}' is unreachable: {outcome['error']}")
+
+
+def _publish(app_types):
+    """Share the latest results with the dashboard state"""
+    with _lock:
+        results = {app_type: {} for app_type in app_types}
+        for (app_type, instance_name) in _targets:
+            if app_type in results:
+                health = _health.get((app_type, instance_name))
+                results[app_type][instance_name] = bool(health and health["connected"])
+    for app_type, app_results in results.items():
+        record_connections(app_type, app_results)
+
+
+def run_checks(force: bool = False) -> int:
+    """
+    Probe every instance that is due (or all of them with force), concurrently.
+
+    Returns:
+        Number of instances probed
+    """
+    _refresh_targets()
+    now = time.time()
+    with _lock:
+        due = [(key, target) for key, target in _targets.items()
+               if force or key not in _health or _health[key]["next_check"] <= now]
+
+    if due:
+        try:
+            timeout = min(PROBE_TIMEOUT, int(get_advanced_setting("api_timeout", 120)))
+        except (TypeError, ValueError):
+            timeout = PROBE_TIMEOUT
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_PROBES, len(due)),
+                                thread_name_prefix="HealthProbe") as executor:
+            outcomes = executor.map(lambda item: probe_instance(item[0][0], *item[1], timeout=timeout), due)
+            for (key, target), outcome in zip(due, outcomes):
+                _record(key, target, outcome)
+
+    _publish(MONITORED_APPS)
+    return len(due)
+
+
+def _seconds_until_next_check() -> float:
+    with _lock:
+        next_checks = [health["next_check"] for health in _health.values()]
+        pending = any(key not in _health for key in _targets)
+    if pending:
+        return 0
+    if not next_checks:
+        return get_check_interval()
+    return max(0, min(next_checks) - time.time())
+
+
+def _monitor_loop():
+    logger.info("Connection health monitor started")
+    while not _stop_event.is_set():
+        try:
+            run_checks()
+        except Exception as e:
+            logger.error(f"Error in connection health monitor: {e}")
+        # Sleep until the next instance is due, or until settings change
+        _wake_event.wait(max(1, min(_seconds_until_next_check(), get_check_interval())))
+        _wake_event.clear()
+    logger.info("Connection health monitor stopped")
+
+
+def _on_settings_changed(app_name, version):
+    if app_name in MONITORED_APPS:
+        request_check(app_name)
+    elif app_name == "general":
+        # Interval, timeout or SSL verification may have changed
+        _wake_event.set()
+
+
+def request_check(app_type: Optional[str] = None):
+    """Make an app's instances (or all instances) due for a check now"""
+    with _lock:
+        for key, health in _health.items():
+            if app_type is None or key[0] == app_type:
+                health["next_check"] = 0
+    _wake_event.set()
+
+
+def start_connection_monitor():
+    """Start the background health monitor thread"""
+    global _monitor_thread
+    if _monitor_thread and _monitor_thread.is_alive():
+        return
+    _stop_event.clear()
+    register_settings_listener(_on_settings_changed)
+    _monitor_thread = threading.Thread(target=_monitor_loop, name="ConnectionMonitor", daemon=True)
+    _monitor_thread.start()
+
+
+def stop_connection_monitor():
+    """Stop the background health monitor thread"""
+    if not _monitor_thread or not _monitor_thread.is_alive():
+        return
+    _stop_event.set()
+    _wake_event.set()
+    _monitor_thread.join(timeout=PROBE_TIMEOUT + 5)
+    if _monitor_thread.is_alive():
+        logger.warning("Connection health monitor did not stop gracefully")
+
+
+def _public(health: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: health[field] for field in
+            ("connected", "latency_ms", "version", "error", "failures", "checked_at", "last_success", "next_check")}
+
+
+def get_app_health(app_type: str) -> Dict[str, Any]:
+    """
+    Latest results for every configured instance of an app (no probing).
+
+    Returns:
+        Dict with total_configured, connected_count and instances (name -> result, None if not checked yet)
+    """
+    with _lock:
+        loaded = bool(_targets) or bool(_health)
+    if not loaded:
+        # Monitor not running yet; still report the configured instances
+        _refresh_targets()
+    with _lock:
+        instances = {}
+        for (app, instance_name) in _targets:
+            if app == app_type:
+                health = _health.get((app, instance_name))
+                instances[instance_name] = _public(health) if health else None
+    return {
+        "total_configured": len(instances),
+        "connected_count": sum(1 for health in instances.values() if health and health["connected"]),
+        "instances": instances
+    }
+
+
+def is_instance_reachable(app_type: str, instance_name: str, api_url: str, api_key: str,
+                          api_timeout: float = PROBE_TIMEOUT) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Whether an instance is reachable, from the monitor's latest result while it is current.
+    An instance that has no current result (not checked yet, re-pointed, or the monitor
+    has fallen behind its schedule) is probed inline and the result is recorded.
+
+    Returns:
+        (connected, result)
+    """
+    key = (app_type, instance_name)
+    target = (api_url, api_key)
+    with _lock:
+        health = _health.get(key)
+        if health and health["target"] == target and time.time() <= health["next_check"] + get_check_interval():
+            return health["connected"], _public(health)
+
+    try:
+        timeout = min(PROBE_TIMEOUT, float(api_timeout))
+    except (TypeError, ValueError):
+        timeout = PROBE_TIMEOUT
+    outcome = probe_instance(app_type, api_url, api_key, timeout=timeout)
+    with _lock:
+        _targets.setdefault(key, target)
+    _record(key, target, outcome)
+    _publish([app_type])
+    with _lock:
+        health = _health.get(key)
+        return outcome["connected"], (_public(health) if health else None)
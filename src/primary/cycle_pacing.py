@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Adaptive cycle pacing for Huntarr
+Picks how long an app sleeps between cycles. With adaptive sleep off this is the
+app's sleep_duration. With it on, the interval shortens while cycles use their whole
+search quota and the hourly cap has room for more, backs off while cycles find
+nothing new or every instance is unreachable, and always stays within the user's
+adaptive_sleep_min / adaptive_sleep_max bounds.
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional
+from src.primary.utils.logger import get_logger
+from src.primary.settings_manager import get_advanced_setting
+
+logger = get_logger("huntarr")
+
+# Reasons reported through /api/cycle/status
+REASON_FIXED = "fixed"                      # Adaptive sleep disabled
+REASON_NORMAL = "normal"                    # Some work found, but not a full quota
+REASON_BACKLOG = "backlog"                  # Full quota searched and the hourly cap has room
+REASON_CAP_LIMITED = "hourly_cap_limited"   # Backlog, but the hourly cap has no room for another cycle
+REASON_IDLE = "no_new_items"                # Cycles keep finding nothing to search
+REASON_UNREACHABLE = "instances_unreachable"  # No instance could be reached
+
+# Each consecutive busy cycle halves the interval, each idle or unreachable one doubles it
+SHORTEN_FACTOR = 0.5
+BACKOFF_FACTOR = 2
+# Streaks stop compounding after this many cycles (the bounds cap the interval anyway)
+MAX_STREAK = 6
+
+_lock = threading.Lock()
+_pacing: Dict[str, Dict[str, Any]] = {}  # app -> last decision and streaks
+
+
+def get_sleep_bounds() -> tuple:
+    """(minimum, maximum) cycle sleep in seconds from the adaptive sleep settings"""
+    try:
+        minimum = max(60, int(get_advanced_setting("adaptive_sleep_min", 300)))
+        maximum = int(get_advanced_setting("adaptive_sleep_max", 7200))
+    except (TypeError, ValueError):
+        minimum, maximum = 300, 7200
+    return minimum, max(minimum, maximum)
+
+
+def choose_cycle_sleep(app_type: str, base_sleep: int, instances: int, connected: int,
+                       searched: int, quota: int, cap_remaining: Optional[int]) -> tuple:
+    """
+    Decide how long to sleep after a cycle.
+
+    Args:
+        app_type: App the cycle ran for
+        base_sleep: The app's sleep_duration setting
+        instances: Instances the cycle tried to process
+        connected: Instances that answered the connection check
+        searched: Searches the cycle issued (hunted + upgraded)
+        quota: Searches the cycle was allowed (sum of the instances' hunt values)
+        cap_remaining: Searches left in the current hourly cap, None if unknown
+
+    Returns:
+        (sleep seconds, reason)
+    """
+    with _lock:
+        state = _pacing.setdefault(app_type, {"busy_streak": 0, "idle_streak": 0, "down_streak": 0})
+
+        if not get_advanced_setting("adaptive_cycle_sleep", False):
+            state.update(busy_streak=0, idle_streak=0, down_streak=0)
+            seconds, reason = int(base_sleep), REASON_FIXED
+            minimum = maximum = None
+        else:
+            minimum, maximum = get_sleep_bounds()
+            if instances and not connected:
+                state.update(busy_streak=0, idle_streak=0,
+                             down_streak=min(state["down_streak"] + 1, MAX_STREAK))
+                seconds = base_sleep * BACKOFF_FACTOR ** state["down_streak"]
+                reason = REASON_UNREACHABLE
+            elif searched <= 0 and cap_remaining == 0:
+                # Nothing searched because the cap is spent, not because nothing was found
+                state.update(busy_streak=0, idle_streak=0, down_streak=0)
+                seconds, reason = base_sleep, REASON_CAP_LIMITED
+            elif searched <= 0:
+                state.update(busy_streak=0, down_streak=0,
+                             idle_streak=min(state["idle_streak"] + 1, MAX_STREAK))
+                # The first empty cycle keeps the normal interval; repeats back off
+                seconds = base_sleep * BACKOFF_FACTOR ** (state["idle_streak"] - 1)
+                reason = REASON_IDLE
+            elif quota > 0 and searched >= quota:
+                state.update(idle_streak=0, down_streak=0)
+                if cap_remaining is None or cap_remaining >= quota:
+                    state["busy_streak"] = min(state["busy_streak"] + 1, MAX_STREAK)
+                    seconds = base_sleep * SHORTEN_FACTOR ** state["busy_streak"]
+                    reason = REASON_BACKLOG
+                else:
+                    state["busy_streak"] = 0
+                    seconds, reason = base_sleep, REASON_CAP_LIMITED
+            else:
+                state.update(busy_streak=0, idle_streak=0, down_streak=0)
+                seconds, reason = base_sleep, REASON_NORMAL
+            seconds = int(min(maximum, max(minimum, seconds)))
+
+        state.update({
+            "sleep_seconds": seconds,
+            "reason": reason,
+            "adaptive": reason != REASON_FIXED,
+            "base_sleep": int(base_sleep),
+            "min_sleep": minimum,
+            "max_sleep": maximum,
+            "last_cycle": {
+                "instances": instances,
+                "connected": connected,
+                "searched": searched,
+                "quota": quota,
+                "cap_remaining": cap_remaining
+            },
+            "decided_at": time.time()
+        })
+
+    if reason != REASON_FIXED:
+        logger.info(f"{app_type} adaptive sleep: {seconds}s ({reason}; searched {searched}/{quota}, "
+                    f"{connected}/{instances} instances reachable)")
+    return seconds, reason
+
+
+def get_pacing_status(app_type: str) -> Optional[Dict[str, Any]]:
+    """The last pacing decision for an app, or None before its first cycle ends"""
+    with _lock:
+        state = _pacing.get(app_type)
+        if not state or "sleep_seconds" not in state:
+            return None
+        return {
+            "sleep_seconds": state["sleep_seconds"],
+            "reason": state["reason"],
+            "adaptive": state["adaptive"],
+            "base_sleep": state["base_sleep"],
+            "min_sleep": state["min_sleep"],
+            "max_sleep": state["max_sleep"],
+            "last_cycle": dict(state["last_cycle"]),
+            "decided_at": state["decided_at"]
+        }
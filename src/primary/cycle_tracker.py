@@ -1,182 +1,144 @@
 #!/usr/bin/env python3
 """
 Cycle Tracker for Huntarr
-Manages cycle timing and sleep data for all apps
-Now uses SQLite database instead of JSON files for better performance and reliability.
+Manages cycle timing and sleep data for all apps.
+Cycle state lives in memory per app: it is loaded from the database once, every
+state change is written back with a single upsert, and status reads (the dashboard
+polls /api/sleep.json and /api/cycle/status every few seconds) never touch SQLite.
 """
 
 import datetime
 import threading
 from typing import Dict, Any, Optional
 from src.primary.utils.logger import get_logger
+from src.primary.utils.timezone_utils import get_user_timezone
 from src.primary.utils.database import get_database
+from src.primary.cycle_pacing import get_pacing_status
 
 logger = get_logger("cycle_tracker")
 
 # Lock for thread-safe operations
 _lock = threading.Lock()
 
-def _get_user_timezone():
-    """Get the user's configured timezone"""
+# app -> {"next_cycle_time", "cycle_lock", "last_cycle_start", "last_cycle_end"}
+_cycles: Dict[str, Dict[str, Any]] = {}
+_loaded = False
+_version = 0  # Bumped on every state change so API responses can be cached per version
+
+def _ensure_loaded():
+    """Load cycle state from the database on first use (caller holds the lock)"""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    try:
+        _cycles.update(get_database().get_sleep_data())
+    except Exception as e:
+        logger.error(f"Error loading cycle data from database: {e}")
+
+def _to_user_time(value: datetime.datetime, user_tz) -> str:
+    """ISO timestamp in the user's timezone without microseconds (naive values are taken as user time)"""
+    if value.tzinfo is None:
+        value = user_tz.localize(value)
+    elif value.tzinfo != user_tz:
+        value = value.astimezone(user_tz)
+    return value.replace(microsecond=0).isoformat()
+
+def _update(app_type: str, **changes) -> Dict[str, Any]:
+    """Apply changes to an app's cycle state and write it with one upsert (caller holds the lock)"""
+    global _version
+    _ensure_loaded()
+    state = _cycles.setdefault(app_type, {
+        "next_cycle_time": None,
+        "cycle_lock": True,
+        "last_cycle_start": None,
+        "last_cycle_end": None
+    })
+    state.update(changes)
+    _version += 1
     try:
-        from src.primary.settings_manager import load_settings
-        general_settings = load_settings("general")
-        timezone_str = general_settings.get("timezone", "UTC")
-        
-        import pytz
-        return pytz.timezone(timezone_str)
+        get_database().upsert_sleep_data(app_type, state["next_cycle_time"], state["cycle_lock"],
+                                         state["last_cycle_start"], state["last_cycle_end"])
     except Exception as e:
-        logger.warning(f"Error getting user timezone, defaulting to UTC: {e}")
-        import pytz
-        return pytz.UTC
+        # Memory stays authoritative; the next state change writes it again
+        logger.error(f"Error saving cycle data for {app_type}: {e}")
+    return state
+
+def _status_entry(app_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "next_cycle": data.get("next_cycle_time"),
+        "updated_at": data.get("last_cycle_end") or data.get("last_cycle_start"),
+        "cyclelock": data.get("cycle_lock", True),
+        "pacing": get_pacing_status(app_type)
+    }
+
+def get_cycle_version() -> int:
+    """Return the current cycle state version (bumped on every change)"""
+    return _version
 
 def update_sleep_json(app_type: str, next_cycle_time: datetime.datetime, cyclelock: bool = None) -> None:
     """
-    Update the sleep/cycle data in the database
-    
+    Update the sleep/cycle data for an app
+
     Args:
         app_type: The type of app (sonarr, radarr, etc.)
         next_cycle_time: When the next cycle will begin
         cyclelock: If provided, sets the cycle lock state (True = running, False = waiting)
     """
     try:
-        logger.debug(f"Updating sleep data for {app_type}, cyclelock: {cyclelock}")
-        
-        # Ensure next_cycle_time is timezone-aware and in user's selected timezone
-        user_tz = _get_user_timezone()
-        
-        if next_cycle_time.tzinfo is None:
-            # If naive datetime, assume it's in user's timezone
-            next_cycle_time = user_tz.localize(next_cycle_time)
-        elif next_cycle_time.tzinfo != user_tz:
-            # Convert to user's timezone if it's in a different timezone
-            next_cycle_time = next_cycle_time.astimezone(user_tz)
-        
-        # Remove microseconds for clean timestamps
-        next_cycle_time = next_cycle_time.replace(microsecond=0)
-        
-        # Calculate current time in user's timezone for consistency
-        now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
-        
-        # Store in database
-        db = get_database()
-        
-        # Get current data to preserve existing values
-        current_data = db.get_sleep_data(app_type)
-        
-        # Determine cyclelock value
-        if cyclelock is None:
-            # If not explicitly set, preserve existing value or default to True (cycle starting)
-            cyclelock = current_data.get('cycle_lock', True)
-        
-        # Update the database
-        db.set_sleep_data(
-            app_type=app_type,
-            next_cycle_time=next_cycle_time.isoformat(),
-            cycle_lock=cyclelock,
-            last_cycle_start=current_data.get('last_cycle_start'),
-            last_cycle_end=current_data.get('last_cycle_end')
-        )
-        
-        logger.info(f"Updated sleep data for {app_type}: next_cycle={next_cycle_time.isoformat()}, cyclelock={cyclelock}")
-        
+        next_cycle = _to_user_time(next_cycle_time, get_user_timezone())
+        with _lock:
+            changes = {"next_cycle_time": next_cycle}
+            if cyclelock is not None:
+                changes["cycle_lock"] = cyclelock
+            state = _update(app_type, **changes)
+        logger.debug(f"Updated sleep data for {app_type}: next_cycle={next_cycle}, cyclelock={state['cycle_lock']}")
     except Exception as e:
         logger.error(f"Error updating sleep data for {app_type}: {e}")
 
 def update_next_cycle(app_type: str, next_cycle_time: datetime.datetime) -> None:
     """
     Update the next cycle time for an app
-    
+
     Args:
         app_type: The type of app (sonarr, radarr, etc.)
         next_cycle_time: When the next cycle will begin
     """
-    with _lock:
-        # Get user's timezone for consistent timestamp formatting
-        user_tz = _get_user_timezone()
-        
-        # Ensure next_cycle_time is timezone-aware and in user's timezone
-        if next_cycle_time.tzinfo is None:
-            # If naive datetime, assume it's in user's timezone
-            next_cycle_time = user_tz.localize(next_cycle_time)
-        elif next_cycle_time.tzinfo != user_tz:
-            # Convert to user's timezone if it's in a different timezone
-            next_cycle_time = next_cycle_time.astimezone(user_tz)
-        
-        # Remove microseconds for clean timestamps
-        next_cycle_time = next_cycle_time.replace(microsecond=0)
-        
-        # Update database
-        update_sleep_json(app_type, next_cycle_time)
+    update_sleep_json(app_type, next_cycle_time)
 
 def get_cycle_status(app_type: Optional[str] = None) -> Dict[str, Any]:
     """
-    Get the cycle status for all apps or a specific app
-    
+    Get the cycle status for all apps or a specific app (served from memory)
+
     Args:
         app_type: Optional app type to filter for
-    
+
     Returns:
         Dict with cycle status information including cyclelock status
     """
     with _lock:
-        try:
-            db = get_database()
-            
-            if app_type:
-                # Return data for a specific app
-                data = db.get_sleep_data(app_type)
-                if data:
-                    return {
-                        "app": app_type,
-                        "next_cycle": data.get("next_cycle_time"),
-                        "updated_at": data.get("last_cycle_end") or data.get("last_cycle_start"),
-                        "cyclelock": data.get("cycle_lock", True)
-                    }
-                else:
-                    return {
-                        "app": app_type,
-                        "error": f"No cycle data available for {app_type}"
-                    }
-            else:
-                # Return data for all apps
-                all_data = db.get_sleep_data()
-                result = {}
-                for app, data in all_data.items():
-                    result[app] = {
-                        "next_cycle": data.get("next_cycle_time"),
-                        "updated_at": data.get("last_cycle_end") or data.get("last_cycle_start"),
-                        "cyclelock": data.get("cycle_lock", True)
-                    }
-                return result
-        except Exception as e:
-            logger.error(f"Error getting cycle status: {e}")
-            return {"error": str(e)}
+        _ensure_loaded()
+        if app_type:
+            data = _cycles.get(app_type)
+            if data:
+                return dict(_status_entry(app_type, data), app=app_type)
+            return {
+                "app": app_type,
+                "error": f"No cycle data available for {app_type}"
+            }
+        return {app: _status_entry(app, data) for app, data in _cycles.items()}
 
 def start_cycle(app_type: str) -> None:
     """
     Mark that a cycle has started for an app (set cyclelock to True)
-    
+
     Args:
         app_type: The app that is starting a cycle
     """
     try:
-        db = get_database()
-        current_data = db.get_sleep_data(app_type)
-        
-        # Get current time for last_cycle_start
-        user_tz = _get_user_timezone()
-        now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
-        
-        # Update with cycle started
-        db.set_sleep_data(
-            app_type=app_type,
-            next_cycle_time=current_data.get('next_cycle_time'),
-            cycle_lock=True,
-            last_cycle_start=now_user_tz.isoformat(),
-            last_cycle_end=current_data.get('last_cycle_end')
-        )
-        
+        now_user_tz = datetime.datetime.now(get_user_timezone()).replace(microsecond=0)
+        with _lock:
+            _update(app_type, cycle_lock=True, last_cycle_start=now_user_tz.isoformat())
         logger.info(f"Started cycle for {app_type} (cyclelock = True)")
     except Exception as e:
         logger.error(f"Error starting cycle for {app_type}: {e}")
@@ -184,77 +146,46 @@ def start_cycle(app_type: str) -> None:
 def end_cycle(app_type: str, next_cycle_time: datetime.datetime) -> None:
     """
     Mark that a cycle has ended for an app (set cyclelock to False) and update next cycle time
-    
+
     Args:
         app_type: The app that finished its cycle
         next_cycle_time: When the next cycle will begin
     """
     try:
-        logger.info(f"Ending cycle for {app_type}, next cycle at {next_cycle_time.isoformat()}")
-        
-        db = get_database()
-        current_data = db.get_sleep_data(app_type)
-        
-        # Get current time for last_cycle_end
-        user_tz = _get_user_timezone()
+        user_tz = get_user_timezone()
         now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
-        
-        # Ensure next_cycle_time is timezone-aware
-        if next_cycle_time.tzinfo is None:
-            next_cycle_time = user_tz.localize(next_cycle_time)
-        elif next_cycle_time.tzinfo != user_tz:
-            next_cycle_time = next_cycle_time.astimezone(user_tz)
-        
-        next_cycle_time = next_cycle_time.replace(microsecond=0)
-        
-        # Update with cycle ended
-        db.set_sleep_data(
-            app_type=app_type,
-            next_cycle_time=next_cycle_time.isoformat(),
-            cycle_lock=False,
-            last_cycle_start=current_data.get('last_cycle_start'),
-            last_cycle_end=now_user_tz.isoformat()
-        )
-        
-        logger.info(f"Ended cycle for {app_type} (cyclelock = False)")
+        next_cycle = _to_user_time(next_cycle_time, user_tz)
+        with _lock:
+            _update(app_type, next_cycle_time=next_cycle, cycle_lock=False,
+                    last_cycle_end=now_user_tz.isoformat())
+        logger.info(f"Ended cycle for {app_type}, next cycle at {next_cycle} (cyclelock = False)")
     except Exception as e:
         logger.error(f"Error ending cycle for {app_type}: {e}")
 
 def reset_cycle(app_type: str) -> bool:
     """
-    Reset the cycle for a specific app (delete its cycle data and set cyclelock to True)
-    
+    Reset the cycle for a specific app (clear its cycle data and set cyclelock to True)
+
     Args:
         app_type: The app to reset
-    
+
     Returns:
         True if successful, False otherwise
     """
-    with _lock:
-        try:
-            db = get_database()
-            
-            # Get current time
-            user_tz = _get_user_timezone()
-            now = datetime.datetime.now(user_tz).replace(microsecond=0)
-            future_time = now + datetime.timedelta(minutes=15)  # Default 15 minutes
-            
+    try:
+        now = datetime.datetime.now(get_user_timezone()).replace(microsecond=0)
+        future_time = now + datetime.timedelta(minutes=15)  # Default 15 minutes
+        with _lock:
             # Reset the app's data - set cyclelock to True (cycle should start)
-            db.set_sleep_data(
-                app_type=app_type,
-                next_cycle_time=future_time.isoformat(),
-                cycle_lock=True,
-                last_cycle_start=None,
-                last_cycle_end=None
-            )
-            
-            logger.info(f"Reset cycle for {app_type} - set cyclelock to True")
-            return True
-        except Exception as e:
-            logger.error(f"Error resetting cycle for {app_type}: {e}")
-            return False
+            _update(app_type, next_cycle_time=future_time.isoformat(), cycle_lock=True,
+                    last_cycle_start=None, last_cycle_end=None)
+        logger.info(f"Reset cycle for {app_type} - set cyclelock to True")
+        return True
+    except Exception as e:
+        logger.error(f"Error resetting cycle for {app_type}: {e}")
+        return False
 
-# Legacy compatibility functions - these maintain the old API but use database
+# Legacy compatibility functions
 def ensure_all_apps_have_cyclelock():
     """Legacy function for compatibility - no longer needed with database"""
     logger.debug("ensure_all_apps_have_cyclelock called - no action needed with database")
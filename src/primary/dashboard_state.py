@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Dashboard state for Huntarr
+The home page shows stats, hourly caps, cycle status, Swaparr status and per-app
+connection state. Each is a section with its own version: a section is rebuilt only
+when its version moves, and the combined version changes whenever any section does,
+so /api/dashboard/state can be served from a snapshot and the dashboard event stream
+can push just the keys that changed.
+"""
+
+import threading
+from typing import Dict, Any, Tuple
+from src.primary.utils.logger import get_logger
+
+logger = get_logger("huntarr")
+
+HOURLY_CAP_APPS = ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']
+
+_lock = threading.Lock()
+_sections: Dict[str, Tuple[Any, Any]] = {}  # section -> (version, value)
+
+# Latest connection check results: app -> {instance name: connected}
+_connections: Dict[str, Dict[str, bool]] = {}
+_connections_version = 0
+
+
+def record_connections(app_type: str, results: Dict[str, bool]) -> None:
+    """
+    Publish the outcome of checking every instance of an app.
+
+    Args:
+        app_type: The app whose instances were checked
+        results: Instance name -> whether it answered
+    """
+    global _connections_version
+    with _lock:
+        if _connections.get(app_type) != results:
+            _connections[app_type] = dict(results)
+            _connections_version += 1
+
+
+def _build_connections() -> Dict[str, Any]:
+    with _lock:
+        return {
+            app: {
+                "total_configured": len(results),
+                "connected_count": sum(1 for connected in results.values() if connected),
+                "instances": dict(results)
+            }
+            for app, results in _connections.items()
+        }
+
+
+def _stats_version():
+    from src.primary.stats_manager import get_stats_version
+    return get_stats_version()
+
+
+def _build_stats():
+    from src.primary.stats_manager import get_stats
+    return get_stats()
+
+
+def _hourly_caps_version():
+    from src.primary.stats_manager import get_hourly_caps_version
+    from src.primary.settings_manager import get_settings_version
+    return (get_hourly_caps_version(),) + tuple(get_settings_version(app) for app in HOURLY_CAP_APPS)
+
+
+def _build_hourly_caps():
+    from src.primary.stats_manager import load_hourly_caps
+    from src.primary.settings_manager import get_settings_snapshot
+    return {
+        "caps": load_hourly_caps(),
+        "limits": {app: get_settings_snapshot(app).get("hourly_cap", 20) for app in HOURLY_CAP_APPS}
+    }
+
+
+def _cycles_version():
+    from src.primary.cycle_tracker import get_cycle_version
+    return get_cycle_version()
+
+
+def _build_cycles():
+    from src.primary.cycle_tracker import get_cycle_status
+    return get_cycle_status()
+
+
+def _swaparr_version():
+    from src.primary.apps.swaparr_routes import get_status_version
+    return get_status_version()
+
+
+def _build_swaparr():
+    from src.primary.apps.swaparr_routes import build_status_payload
+    return build_status_payload()
+
+
+# (section, version function, builder)
+SECTIONS = (
+    ("stats", _stats_version, _build_stats),
+    ("hourly_caps", _hourly_caps_version, _build_hourly_caps),
+    ("cycles", _cycles_version, _build_cycles),
+    ("swaparr", _swaparr_version, _build_swaparr),
+    ("connections", lambda: _connections_version, _build_connections),
+)
+
+
+def get_dashboard_version() -> tuple:
+    """Combined version of every section; changes whenever any section does"""
+    return tuple(version() for _, version, _ in SECTIONS)
+
+
+def get_dashboard_state() -> Dict[str, Any]:
+    """
+    The full dashboard state, rebuilding only sections whose version moved.
+
+    Returns:
+        Dict of section name -> section data (a section that fails to build is None)
+    """
+    state = {}
+    for name, version_func, builder in SECTIONS:
+        version = version_func()
+        with _lock:
+            cached = _sections.get(name)
+        if cached is not None and cached[0] == version:
+            state[name] = cached[1]
+            continue
+        try:
+            value = builder()
+        except Exception as e:
+            logger.error(f"Error building dashboard section '{name}': {e}")
+            state[name] = None
+            continue
+        with _lock:
+            _sections[name] = (version, value)
+        state[name] = value
+    return state
+
+
+def diff_state(old: Any, new: Any) -> Dict[str, Any]:
+    """
+    Changes that turn one state into another, nested down to the keys that differ.
+    A removed key is reported as None, and non-dict values are replaced whole.
+
+    Returns:
+        Dict of changes (empty when nothing changed)
+    """
+    changes = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if previous == value and key in old:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            changes[key] = diff_state(previous, value)
+        else:
+            changes[key] = value
+    for key in old:
+        if key not in new:
+            changes[key] = None
+    return changes
@@ -5,9 +5,11 @@ Handles storing and retrieving processed media history using manager.db
 """
 
 import time
+import queue
 from datetime import datetime
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 # Create a logger
@@ -27,16 +29,269 @@ history_locks = {
     "swaparr": threading.Lock()
 }
 
+# Background history writer: the hunt path only enqueues, a single writer thread
+# commits entries in batches and notifications go through their own worker pool
+HISTORY_BATCH_SIZE = 100  # Maximum entries committed per transaction
+HISTORY_FLUSH_INTERVAL = 0.5  # Seconds to wait for more entries before committing a batch
+NOTIFICATION_WORKERS = 2  # Concurrent notification senders
+HISTORY_WRITE_RETRIES = 8  # Attempts per batch before it is given up (e.g. database locked by a VACUUM)
+HISTORY_RETRY_MAX_DELAY = 30  # Cap on the backoff between attempts, in seconds
+
+_history_queue = queue.Queue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+_writer_stop_event = threading.Event()
+_notification_executor = None
+
+def _get_notification_executor():
+    """Get (or lazily create) the worker pool used to send history notifications"""
+    global _notification_executor
+    if _notification_executor is None:
+        _notification_executor = ThreadPoolExecutor(max_workers=NOTIFICATION_WORKERS,
+                                                    thread_name_prefix="HistoryNotify")
+    return _notification_executor
+
+def _send_notification(entry):
+    """Send a notification for a committed history entry (runs on the notification pool)"""
+    try:
+        # Import here to avoid circular imports
+        from src.primary.notification_manager import send_history_notification
+        send_history_notification(entry)
+    except Exception as e:
+        logger.error(f"Failed to send notification for history entry: {e}")
+
+def _write_batch(batch):
+    """Commit a batch of queued entries, retrying with backoff, and hand them off for notification"""
+    for attempt in range(1, HISTORY_WRITE_RETRIES + 1):
+        try:
+            manager_db = get_manager_database()
+            created = manager_db.add_hunt_history_entries(batch)
+            break
+        except Exception as e:
+            if attempt == HISTORY_WRITE_RETRIES:
+                logger.error(f"Database error writing {len(batch)} history entries, giving up after {attempt} attempts: {e}")
+                return
+            delay = min(HISTORY_FLUSH_INTERVAL * 2 ** attempt, HISTORY_RETRY_MAX_DELAY)
+            logger.warning(f"Database error writing {len(batch)} history entries (attempt {attempt}), retrying in {delay}s: {e}")
+            time.sleep(delay)
+    
+    executor = _get_notification_executor()
+    for entry in created:
+        logger.info(f"Added history entry for {entry['app_type']}-{entry['instance_name']}: {entry['processed_info']}")
+        try:
+            executor.submit(_send_notification, entry)
+        except RuntimeError:
+            # Executor already shut down during exit
+            _send_notification(entry)
+
+def _history_writer_loop():
+    """Drain the history queue, committing entries in batches"""
+    logger.debug("History writer thread started")
+    while True:
+        try:
+            first = _history_queue.get(timeout=HISTORY_FLUSH_INTERVAL)
+        except queue.Empty:
+            if _writer_stop_event.is_set():
+                break
+            continue
+        
+        batch = [first]
+        done_events = []
+        deadline = time.time() + HISTORY_FLUSH_INTERVAL
+        while len(batch) < HISTORY_BATCH_SIZE:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_history_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        # Flush markers are threading.Events; everything else is an entry
+        entries = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                done_events.append(item)
+            else:
+                entries.append(item)
+        
+        if entries:
+            _write_batch(entries)
+        for event in done_events:
+            event.set()
+        for _ in batch:
+            _history_queue.task_done()
+    logger.debug("History writer thread stopped")
+
+def _ensure_writer_running():
+    """Start the history writer thread if it is not already running"""
+    global _writer_thread
+    if _writer_thread and _writer_thread.is_alive():
+        return
+    with _writer_lock:
+        if _writer_thread and _writer_thread.is_alive():
+            return
+        _writer_stop_event.clear()
+        _writer_thread = threading.Thread(target=_history_writer_loop, name="HistoryWriter", daemon=True)
+        _writer_thread.start()
+
+def flush_history(timeout=10.0):
+    """
+    Block until every history entry queued so far has been committed
+    
+    Parameters:
+    - timeout: float - Maximum seconds to wait
+    
+    Returns:
+    - bool - True if the queue was flushed within the timeout
+    """
+    if not _writer_thread or not _writer_thread.is_alive():
+        return _history_queue.empty()
+    done = threading.Event()
+    _history_queue.put(done)
+    return done.wait(timeout)
+
+def stop_history_writer(timeout=10.0):
+    """Flush pending history entries and stop the writer thread and notification pool"""
+    global _notification_executor
+    flush_history(timeout)
+    _writer_stop_event.set()
+    if _writer_thread and _writer_thread.is_alive():
+        _writer_thread.join(timeout=timeout)
+    if _notification_executor is not None:
+        _notification_executor.shutdown(wait=False)
+        _notification_executor = None
+    logger.info("History writer stopped")
+
+# Retention: trims hunt_history per app by age and row count, rolling removed
+# rows into monthly summaries (see ManagerDatabase.apply_history_retention)
+HISTORY_RETENTION_INTERVAL = 3600  # Seconds between retention passes
+
+_retention_thread = None
+_retention_stop_event = threading.Event()
+
+def get_retention_policy(app_type):
+    """
+    Get the effective retention policy for an app
+    
+    General settings provide history_retention_days and history_max_entries;
+    history_retention_overrides may override either per app, e.g.
+    {"sonarr": {"max_age_days": 90, "max_entries": 50000}}. 0 means unlimited.
+    
+    Returns:
+    - dict with max_age_days and max_entries
+    """
+    from src.primary.settings_manager import get_advanced_setting
+    max_age_days = get_advanced_setting("history_retention_days", 0)
+    max_entries = get_advanced_setting("history_max_entries", 0)
+    overrides = get_advanced_setting("history_retention_overrides", {}) or {}
+    app_override = overrides.get(app_type) or {}
+    
+    try:
+        return {
+            "max_age_days": max(0, int(app_override.get("max_age_days", max_age_days) or 0)),
+            "max_entries": max(0, int(app_override.get("max_entries", max_entries) or 0))
+        }
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Invalid history retention settings for {app_type}: {e}")
+        return {"max_age_days": 0, "max_entries": 0}
+
+def apply_history_retention(app_type=None):
+    """
+    Apply the configured retention policy to one app or all apps
+    
+    Parameters:
+    - app_type: str - The app type, or None/"all" for every app
+    
+    Returns:
+    - dict - Rows removed per app type
+    """
+    app_types = list(history_locks) if not app_type or app_type == "all" else [app_type]
+    results = {}
+    
+    # Make sure queued entries are counted against the limits
+    flush_history()
+    manager_db = get_manager_database()
+    
+    for current_app in app_types:
+        policy = get_retention_policy(current_app)
+        if not policy["max_age_days"] and not policy["max_entries"]:
+            continue
+        try:
+            results[current_app] = manager_db.apply_history_retention(current_app, **policy)
+        except Exception as e:
+            logger.error(f"Error applying history retention for {current_app}: {e}")
+    
+    return results
+
+def _retention_enabled():
+    """True when any app has an age or row-count limit configured"""
+    return any(policy["max_age_days"] or policy["max_entries"]
+               for policy in (get_retention_policy(app_type) for app_type in history_locks))
+
+def _history_retention_loop():
+    """Periodically apply history retention until stopped"""
+    logger.debug("History retention thread started")
+    while not _retention_stop_event.is_set():
+        try:
+            apply_history_retention()
+            # One-off conversion of databases created before incremental auto-vacuum, only
+            # once retention is in use (the full VACUUM locks the database while it runs)
+            if _retention_enabled():
+                get_manager_database().enable_incremental_vacuum()
+        except Exception as e:
+            logger.error(f"Unexpected error in history retention: {e}")
+        _retention_stop_event.wait(HISTORY_RETENTION_INTERVAL)
+    logger.debug("History retention thread stopped")
+
+def start_history_retention():
+    """Start the background history retention thread"""
+    global _retention_thread
+    if _retention_thread and _retention_thread.is_alive():
+        logger.info("History retention thread already running")
+        return
+    _retention_stop_event.clear()
+    _retention_thread = threading.Thread(target=_history_retention_loop, name="HistoryRetention", daemon=True)
+    _retention_thread.start()
+    logger.info("History retention thread started")
+
+def stop_history_retention(timeout=5.0):
+    """Stop the background history retention thread"""
+    _retention_stop_event.set()
+    if _retention_thread and _retention_thread.is_alive():
+        _retention_thread.join(timeout=timeout)
+
+def get_history_summary(app_type=None):
+    """
+    Get lifetime hunt counts, including entries already removed by retention
+    
+    Parameters:
+    - app_type: str - The app type, or None/"all" for every app
+    
+    Returns:
+    - dict keyed by app type with total, by_operation and archived_months
+    """
+    try:
+        flush_history()
+        return get_manager_database().get_history_summary(app_type)
+    except Exception as e:
+        logger.error(f"Database error getting history summary: {e}")
+        return {}
+
 def add_history_entry(app_type, entry_data):
     """
-    Add a history entry for processed media
+    Queue a history entry for processed media
+    
+    The entry is committed by the background history writer in a batch and the
+    notification is sent from the notification pool, so this never blocks on
+    the database or on notification targets.
     
     Parameters:
     - app_type: str - The app type (sonarr, radarr, etc)
     - entry_data: dict - Entry data containing id, name, operation_type, instance_name
     
     Returns:
-    - dict - The created history entry or None if failed
+    - dict - The queued history entry (id is assigned on commit) or None if invalid
     """
     if app_type not in history_locks:
         logger.error(f"Invalid app type: {app_type}")
@@ -45,41 +300,28 @@ def add_history_entry(app_type, entry_data):
     # Extract instance name from entry data
     instance_name = entry_data.get("instance_name", "Default")
     
-    logger.debug(f"Adding history entry for {app_type} with instance_name: '{instance_name}'")
+    logger.debug(f"Queueing history entry for {app_type} with instance_name: '{instance_name}'")
     
-    # Thread-safe database operation
-    with history_locks[app_type]:
-        try:
-            manager_db = get_manager_database()
-            entry = manager_db.add_hunt_history_entry(
-                app_type=app_type,
-                instance_name=instance_name,
-                media_id=entry_data["id"],
-                processed_info=entry_data["name"],
-                operation_type=entry_data.get("operation_type", "missing"),
-                discovered=False  # Default to false - will be updated by discovery tracker
-            )
-            
-            # Add additional fields for compatibility
-            entry["app_type"] = app_type  # Include app_type in the entry for display in UI
-            
-            logger.info(f"Added history entry for {app_type}-{instance_name}: {entry_data['name']}")
-            
-            # Send notification about this history entry
-            try:
-                # Import here to avoid circular imports
-                from src.primary.notification_manager import send_history_notification
-                send_history_notification(entry)
-            except Exception as e:
-                logger.error(f"Failed to send notification for history entry: {e}")
-            
-            return entry
-            
-        except Exception as e:
-            logger.error(f"Database error adding history entry for {app_type}: {e}")
-            return None
+    try:
+        entry = {
+            "id": None,
+            "app_type": app_type,  # Include app_type in the entry for display in UI
+            "instance_name": instance_name,
+            "media_id": entry_data["id"],
+            "processed_info": entry_data["name"],
+            "operation_type": entry_data.get("operation_type", "missing"),
+            "discovered": False,  # Default to false - will be updated by discovery tracker
+            "date_time": int(time.time())
+        }
+    except KeyError as e:
+        logger.error(f"Missing field {e} in history entry for {app_type}")
+        return None
+    
+    _ensure_writer_running()
+    _history_queue.put(entry)
+    return entry
 
-def get_history(app_type, search_query=None, page=1, page_size=20):
+def get_history(app_type, search_query=None, page=1, page_size=20, cursor=None):
     """
     Get history entries for an app
     
@@ -88,13 +330,14 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
     - search_query: str - Optional search query to filter results
     - page: int - Page number (1-based)
     - page_size: int - Number of entries per page
+    - cursor: str - Optional keyset cursor (next_cursor of the previous page)
     
     Returns:
-    - dict with entries, total_entries, and total_pages
+    - dict with entries, total_entries, total_pages and next_cursor
     """
     if app_type not in history_locks and app_type != "all":
         logger.error(f"Invalid app type: {app_type}")
-        return {"entries": [], "total_entries": 0, "total_pages": 0, "current_page": 1}
+        return {"entries": [], "total_entries": 0, "total_pages": 0, "current_page": 1, "next_cursor": None}
     
     try:
         manager_db = get_manager_database()
@@ -102,7 +345,8 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
             app_type=app_type,
             search_query=search_query,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor
         )
         
         logger.debug(f"Retrieved {len(result['entries'])} history entries for {app_type} (page {page})")
@@ -110,7 +354,7 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
         
     except Exception as e:
         logger.error(f"Database error getting history for {app_type}: {e}")
-        return {"entries": [], "total_entries": 0, "total_pages": 0, "current_page": 1}
+        return {"entries": [], "total_entries": 0, "total_pages": 0, "current_page": 1, "next_cursor": None}
 
 def clear_history(app_type):
     """
@@ -127,6 +371,8 @@ def clear_history(app_type):
         return False
     
     try:
+        # Commit anything still queued so it is cleared as well
+        flush_history()
         manager_db = get_manager_database()
         manager_db.clear_hunt_history(app_type)
         logger.info(f"Successfully cleared hunt history for {app_type}")
@@ -158,6 +404,9 @@ def handle_instance_rename(app_type, old_instance_name, new_instance_name):
     
     logger.info(f"Handling instance rename for {app_type}: {old_instance_name} -> {new_instance_name}")
     
+    # Commit queued entries first so they are renamed too
+    flush_history()
+    
     # Thread-safe operation
     with history_locks[app_type]:
         try:
@@ -169,5 +418,87 @@ def handle_instance_rename(app_type, old_instance_name, new_instance_name):
             logger.error(f"Database error renaming instance history: {e}")
             return False
 
+# Field order used by history exports; imports accept the same fields
+HISTORY_EXPORT_FIELDS = ["app_type", "instance_name", "media_id", "processed_info",
+                         "operation_type", "discovered", "date_time"]
+
+def export_history(app_type="all", instance_name=None):
+    """
+    Iterate over history entries for export, oldest first
+    
+    Parameters:
+    - app_type: str - The app type (sonarr, radarr, etc) or "all"
+    - instance_name: str - Optional instance to restrict the export to
+    
+    Returns:
+    - generator of entry dicts with the HISTORY_EXPORT_FIELDS keys
+    """
+    flush_history()
+    return get_manager_database().iter_hunt_history(app_type, instance_name)
+
+def _normalize_history_record(record, app_type=None, instance_name=None, target_instance=None):
+    """Convert an imported NDJSON/CSV record into a hunt_history entry, or None if it is unusable"""
+    entry_app = record.get("app_type") or app_type
+    if entry_app not in history_locks:
+        return None
+    if app_type and app_type != "all" and entry_app != app_type:
+        return None
+    
+    entry_instance = target_instance or record.get("instance_name") or instance_name
+    media_id = record.get("media_id")
+    processed_info = record.get("processed_info")
+    if not entry_instance or media_id in (None, "") or not processed_info:
+        return None
+    
+    try:
+        date_time = int(float(record.get("date_time") or time.time()))
+    except (TypeError, ValueError):
+        return None
+    
+    discovered = record.get("discovered", False)
+    if isinstance(discovered, str):
+        discovered = discovered.strip().lower() in ("1", "true", "yes")
+    
+    return {
+        "app_type": entry_app,
+        "instance_name": entry_instance,
+        "media_id": str(media_id),
+        "processed_info": processed_info,
+        "operation_type": record.get("operation_type") or "missing",
+        "discovered": bool(discovered),
+        "date_time": date_time
+    }
+
+def import_history(records, app_type=None, instance_name=None, target_instance=None):
+    """
+    Import exported history entries in large transactions
+    
+    Parameters:
+    - records: iterable of dict - Parsed NDJSON/CSV records
+    - app_type: str - Default app type for records without one; other apps are skipped
+    - instance_name: str - Default instance name for records without one
+    - target_instance: str - Import every record under this instance name instead
+    
+    Returns:
+    - dict with received, inserted and skipped counts
+    """
+    skipped = 0
+    
+    def entries():
+        nonlocal skipped
+        for record in records:
+            entry = _normalize_history_record(record, app_type, instance_name, target_instance)
+            if entry is None:
+                skipped += 1
+                continue
+            yield entry
+    
+    flush_history()
+    result = get_manager_database().import_hunt_history(entries())
+    result["received"] += skipped
+    result["skipped"] = skipped
+    logger.info(f"Imported {result['inserted']} history entries ({skipped} skipped)")
+    return result
+
 # No longer need to run synchronization on module import since we're using database
 logger.info("History manager initialized with database backend")
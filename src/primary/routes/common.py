@@ -19,6 +19,7 @@ from ..auth import (
     user_exists, create_user, generate_2fa_secret, verify_2fa_code, is_2fa_enabled # Add missing auth imports
 )
 from ..utils.logger import logger # Ensure logger is imported
+from ..utils.http_cache import cached_json_response
 from .. import settings_manager # Import settings_manager
 
 
@@ -43,29 +44,16 @@ def logo_files(filename):
 
 @common_bp.route('/api/sleep.json', methods=['GET'])
 def api_get_sleep_json():
-    """API endpoint to serve sleep/cycle data from the database for frontend access"""
+    """API endpoint to serve sleep/cycle data for frontend access (from the in-memory cycle tracker)"""
     try:
-        from src.primary.utils.database import get_database
-        
-        db = get_database()
-        sleep_data = db.get_sleep_data()
-        
-        # Convert database format to frontend format
-        frontend_data = {}
-        for app_type, data in sleep_data.items():
-            frontend_data[app_type] = {
-                "next_cycle": data.get("next_cycle_time"),
-                "updated_at": data.get("last_cycle_end") or data.get("last_cycle_start"),
-                "cyclelock": data.get("cycle_lock", True)
-            }
+        from src.primary.cycle_tracker import get_cycle_status, get_cycle_version
         
         # Add CORS headers to allow any origin to access this resource
-        response = jsonify(frontend_data)
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        return response
+        return cached_json_response("sleep.json", get_cycle_version(), get_cycle_status,
+                                    headers={'Access-Control-Allow-Origin': '*'})
         
     except Exception as e:
-        logger.error(f"Error serving sleep data from database: {e}")
+        logger.error(f"Error serving sleep data: {e}")
         # Return empty object instead of error to prevent UI breaking
         response = jsonify({})
         response.headers.add('Access-Control-Allow-Origin', '*')
@@ -476,14 +464,11 @@ def get_stats_api():
     """API endpoint to get media statistics"""
     try:
         # Import here to avoid circular imports
-        from ..stats_manager import get_stats
-        
-        # Get stats from stats_manager
-        stats = get_stats()
-        logger.debug(f"Retrieved stats for API response: {stats}")
+        from ..stats_manager import get_stats, get_stats_version
         
-        # Return success response with stats
-        return jsonify({"success": True, "stats": stats})
+        # Stats are only re-read from the database after they change
+        return cached_json_response("stats", get_stats_version(),
+                                    lambda: {"success": True, "stats": get_stats()})
     except Exception as e:
         logger.error(f"Error retrieving stats: {e}", exc_info=True)
         return jsonify({"success": False, "error": str(e)}), 500
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Dashboard API Routes
+One snapshot of everything the home page shows, plus a server-sent event stream
+that sends that snapshot once and then pushes only what changes.
+"""
+
+import json
+import threading
+import time
+from flask import Blueprint, jsonify, request, Response
+
+from src.primary.dashboard_state import get_dashboard_state, get_dashboard_version, diff_state
+from src.primary.utils.http_cache import cached_json_response
+from src.primary.utils.logger import get_logger
+
+logger = get_logger("web_server")
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+# Each stream holds a Waitress worker thread (8 in total), so only a few may be open;
+# clients beyond that fall back to polling /api/dashboard/state
+MAX_DASHBOARD_STREAMS = 4
+# How often an open stream compares section versions (in-memory, no database reads)
+STREAM_CHECK_INTERVAL = 1
+STREAM_KEEPALIVE_INTERVAL = 15
+# Streams end after this long; the browser reconnects and receives a fresh snapshot
+STREAM_MAX_AGE = 300
+RECONNECT_DELAY_MS = 3000
+
+_active_streams = 0
+_streams_lock = threading.Lock()
+
+
+def _event(name: str, data) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+@dashboard_bp.route('/api/dashboard/state', methods=['GET'])
+def get_state():
+    """Everything the dashboard shows, as one snapshot"""
+    try:
+        return cached_json_response("dashboard-state", get_dashboard_version(),
+                                    lambda: {"success": True, "state": get_dashboard_state()})
+    except Exception as e:
+        logger.error(f"Error building dashboard state: {e}")
+        return jsonify({"success": False, "error": "Failed to build dashboard state"}), 500
+
+
+@dashboard_bp.route('/api/dashboard/events', methods=['GET'])
+def stream_events():
+    """Server-sent events: a 'snapshot' of the dashboard state, then an 'update' per change"""
+    global _active_streams
+    with _streams_lock:
+        if _active_streams >= MAX_DASHBOARD_STREAMS:
+            logger.debug(f"Too many dashboard streams ({_active_streams}); rejecting {request.remote_addr}")
+            return Response("event: error\ndata: Too many active connections\n\n",
+                            mimetype='text/event-stream', status=429)
+        _active_streams += 1
+
+    def release():
+        global _active_streams
+        with _streams_lock:
+            _active_streams -= 1
+
+    def generate():
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+            version = get_dashboard_version()
+            state = get_dashboard_state()
+            yield _event("snapshot", state)
+
+            started = last_sent = time.time()
+            while time.time() - started < STREAM_MAX_AGE:
+                time.sleep(STREAM_CHECK_INTERVAL)
+                current_version = get_dashboard_version()
+                if current_version != version:
+                    version = current_version
+                    new_state = get_dashboard_state()
+                    changes = diff_state(state, new_state)
+                    state = new_state
+                    if changes:
+                        yield _event("update", changes)
+                        last_sent = time.time()
+                        continue
+                if time.time() - last_sent >= STREAM_KEEPALIVE_INTERVAL:
+                    yield ": keepalive\n\n"
+                    last_sent = time.time()
+        except Exception as e:
+            logger.error(f"Dashboard stream error: {e}")
+
+    response = Response(generate(), mimetype='text/event-stream')
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable nginx buffering if using nginx
+    return response
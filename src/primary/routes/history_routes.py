@@ -1,11 +1,88 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 import logging
 
-from src.primary.history_manager import get_history, clear_history, add_history_entry
+from src.primary.history_manager import get_history, clear_history, add_history_entry, get_history_summary, apply_history_retention
+from src.primary.history_manager import export_history, import_history, HISTORY_EXPORT_FIELDS
+from src.primary.utils.bulk_transfer import resolve_format, serialize_records, parse_records, MIME_TYPES
 
 logger = logging.getLogger("huntarr")
 history_blueprint = Blueprint('history', __name__)
 
+@history_blueprint.route('/summary', methods=['GET'])
+def get_history_summary_route():
+    """Get lifetime hunt counts per app, including entries removed by retention"""
+    try:
+        app_type = request.args.get('app', 'all')
+        return jsonify(get_history_summary(app_type)), 200
+    except Exception as e:
+        logger.error(f"Error getting history summary: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@history_blueprint.route('/retention', methods=['POST'])
+def run_history_retention():
+    """Apply the configured history retention now"""
+    try:
+        data = request.get_json(silent=True) or {}
+        app_type = data.get('app', 'all')
+        
+        valid_app_types = ["all", "sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]
+        if app_type not in valid_app_types:
+            return jsonify({"error": f"Invalid app type: {app_type}"}), 400
+        
+        results = apply_history_retention(app_type)
+        return jsonify({"success": True, "results": results}), 200
+    except Exception as e:
+        logger.error(f"Error applying history retention: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@history_blueprint.route('/export', methods=['GET'])
+def export_history_route():
+    """Stream hunt history as NDJSON or CSV, optionally for one app and instance"""
+    app_type = request.args.get('app', 'all')
+    instance_name = request.args.get('instance') or None
+    fmt = resolve_format(request.args.get('format'))
+    if fmt is None:
+        return jsonify({"error": "Format must be ndjson or csv"}), 400
+    
+    valid_app_types = ["all", "sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]
+    if app_type not in valid_app_types:
+        return jsonify({"error": f"Invalid app type: {app_type}"}), 400
+    
+    try:
+        records = export_history(app_type, instance_name)
+        response = Response(stream_with_context(serialize_records(records, HISTORY_EXPORT_FIELDS, fmt)),
+                            mimetype=MIME_TYPES[fmt])
+        filename = "-".join(part for part in ("hunt-history", app_type, instance_name) if part)
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+        return response
+    except Exception as e:
+        logger.error(f"Error exporting history: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@history_blueprint.route('/import', methods=['POST'])
+def import_history_route():
+    """Import hunt history from an NDJSON or CSV request body (app, instance and target_instance as in the stateful import)"""
+    app_type = request.args.get('app') or None
+    instance_name = request.args.get('instance') or None
+    target_instance = request.args.get('target_instance') or None
+    fmt = resolve_format(request.args.get('format'), request.content_type)
+    if fmt is None:
+        return jsonify({"error": "Format must be ndjson or csv"}), 400
+    
+    valid_app_types = ["all", "sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]
+    if app_type and app_type not in valid_app_types:
+        return jsonify({"error": f"Invalid app type: {app_type}"}), 400
+    
+    try:
+        result = import_history(parse_records(request.stream, fmt), app_type, instance_name, target_instance)
+        return jsonify(dict(result, success=True)), 200
+    except ValueError as e:
+        logger.warning(f"Rejected history import: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error importing history: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @history_blueprint.route('/<app_type>', methods=['GET'])
 def get_app_history(app_type):
     """Get history entries for a specific app or all apps"""
@@ -13,6 +90,7 @@ def get_app_history(app_type):
         search_query = request.args.get('search', '')
         page = int(request.args.get('page', 1))
         page_size = int(request.args.get('page_size', 20))
+        cursor = request.args.get('cursor') or None
         
         # Validate page_size to be one of the allowed values
         allowed_page_sizes = [10, 20, 30, 50, 100, 250, 1000]
@@ -24,7 +102,7 @@ def get_app_history(app_type):
         if app_type not in valid_app_types:
             return jsonify({"error": f"Invalid app type: {app_type}"}), 400
         
-        result = get_history(app_type, search_query, page, page_size)
+        result = get_history(app_type, search_query, page, page_size, cursor)
         return jsonify(result), 200
     
     except Exception as e:
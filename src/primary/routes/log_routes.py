@@ -7,6 +7,8 @@ Replaces file-based log reading with database queries
 from flask import Blueprint, jsonify, request
 from src.primary.utils.logs_database import get_logs_database
 from src.primary.utils.logger import get_logger
+from src.primary.utils.http_cache import cached_json_response
+from src.primary.utils.timezone_utils import get_timezone_name
 from datetime import datetime
 import pytz
 
@@ -43,61 +45,66 @@ def get_logs(app_type):
         offset = int(request.args.get('offset', 0))
         search = request.args.get('search')
         
-        # Handle 'all' app type by getting logs from all apps
-        if app_type == 'all':
-            # Get logs from all app types
-            logs = logs_db.get_logs(
-                app_type=None,  # None means all app types
-                level=level,
-                limit=limit,
-                offset=offset,
-                search=search
-            )
-        else:
-            # Map 'system' to actual app type in database
-            db_app_type = 'system' if app_type == 'system' else app_type
+        def build():
+            # Handle 'all' app type by getting logs from all apps
+            if app_type == 'all':
+                # Get logs from all app types
+                logs = logs_db.get_logs(
+                    app_type=None,  # None means all app types
+                    level=level,
+                    limit=limit,
+                    offset=offset,
+                    search=search
+                )
+            else:
+                # Map 'system' to actual app type in database
+                db_app_type = 'system' if app_type == 'system' else app_type
             
-            # Get logs from specific app type
-            logs = logs_db.get_logs(
-                app_type=db_app_type,
-                level=level,
-                limit=limit,
-                offset=offset,
-                search=search
-            )
-        
-        # Format logs for frontend (same format as file-based logs)
-        formatted_logs = []
-        for log in logs:
-            # Convert timestamp to user timezone
-            display_timestamp = _convert_timestamp_to_user_timezone(log['timestamp'])
+                # Get logs from specific app type
+                logs = logs_db.get_logs(
+                    app_type=db_app_type,
+                    level=level,
+                    limit=limit,
+                    offset=offset,
+                    search=search
+                )
             
-            # Format as the frontend expects: timestamp|level|app_type|message
-            formatted_log = f"{display_timestamp}|{log['level']}|{log['app_type']}|{log['message']}"
-            formatted_logs.append(formatted_log)
-        
-        # Get total count for pagination
-        if app_type == 'all':
-            total_count = logs_db.get_log_count(
-                app_type=None,  # None means all app types
-                level=level,
-                search=search
-            )
-        else:
-            db_app_type = 'system' if app_type == 'system' else app_type
-            total_count = logs_db.get_log_count(
-                app_type=db_app_type,
-                level=level,
-                search=search
-            )
-        
-        return jsonify({
-            'success': True,
-            'logs': formatted_logs,
-            'total': total_count,
-            'offset': offset,
-            'limit': limit
-        })
+            # Format logs for frontend (same format as file-based logs)
+            formatted_logs = []
+            for log in logs:
+                # Convert timestamp to user timezone
+                display_timestamp = _convert_timestamp_to_user_timezone(log['timestamp'])
+            
+                # Format as the frontend expects: timestamp|level|app_type|message
+                formatted_log = f"{display_timestamp}|{log['level']}|{log['app_type']}|{log['message']}"
+                formatted_logs.append(formatted_log)
+            
+            # Get total count for pagination
+            if app_type == 'all':
+                total_count = logs_db.get_log_count(
+                    app_type=None,  # None means all app types
+                    level=level,
+                    search=search
+                )
+            else:
+                db_app_type = 'system' if app_type == 'system' else app_type
+                total_count = logs_db.get_log_count(
+                    app_type=db_app_type,
+                    level=level,
+                    search=search
+                )
+            
+            return {
+                'success': True,
+                'logs': formatted_logs,
+                'total': total_count,
+                'offset': offset,
+                'limit': limit
+            }
+            
+        # Re-query only after new log lines arrive (or the display timezone changes)
+        key = ('logs', app_type, level, limit, offset, search)
+        return cached_json_response(key, (logs_db.version, get_timezone_name()), build)
         
     except Exception as e:
         logger.error(f"Error getting logs for {app_type}: {e}")
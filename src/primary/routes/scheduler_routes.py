@@ -11,7 +11,7 @@ from flask import Blueprint, jsonify, request, Response
 from datetime import datetime
 
 # Import the scheduler engine to get execution history
-from src.primary.scheduler_engine import get_execution_history
+from src.primary.scheduler_engine import get_execution_history, get_next_fire_times
 
 # Import database
 from src.primary.utils.database import get_database
@@ -64,6 +64,27 @@ def get_scheduler_history():
         scheduler_logger.error(error_msg)
         return jsonify({"error": error_msg}), 500
 
+@scheduler_api.route('/api/scheduler/next', methods=['GET'])
+def get_scheduler_next_fires():
+    """Return the next fire time of every active schedule"""
+    try:
+        next_fires = get_next_fire_times()
+        upcoming = min((s["next_fire"] for s in next_fires.values() if s["next_fire"]), default=None)
+        response = Response(json.dumps({
+            "success": True,
+            "schedules": next_fires,
+            "next_fire": upcoming,
+            "timestamp": datetime.now().isoformat()
+        }))
+        response.headers['Content-Type'] = 'application/json'
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        return response
+    
+    except Exception as e:
+        error_msg = f"Error getting next schedule times: {str(e)}"
+        scheduler_logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
 # API route for instance list generation has been removed
 
 @scheduler_api.route('/api/scheduler/save', methods=['POST'])
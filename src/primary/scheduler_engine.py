@@ -10,6 +10,7 @@ import threading
 import datetime
 import time
 import traceback
+import heapq
 from typing import Dict, List, Any
 import collections
 
@@ -17,20 +18,32 @@ import collections
 from src.primary.settings_manager import clear_cache, load_settings, save_settings
 
 from src.primary.utils.logger import get_logger
+from src.primary.utils.timezone_utils import get_user_timezone
 # Add import for stateful_manager's check_expiration
 from src.primary.stateful_manager import check_expiration as check_stateful_expiration
 
 # Import database
-from src.primary.utils.database import get_database
+from src.primary.utils.database import get_database, register_schedule_listener
+from src.primary.settings_manager import register_settings_listener
+from src.primary.scheduler_triggers import (
+    build_trigger, TriggerError, WEEKDAYS, MAX_CATCH_UP_RUNS,
+    MISFIRE_POLICIES, MISFIRE_SKIP, MISFIRE_RUN_ALL
+)
 
 # Initialize logger
 scheduler_logger = get_logger("scheduler")
 
 # Scheduler constants
-SCHEDULE_CHECK_INTERVAL = 60  # Check schedule every minute
+STATEFUL_CHECK_INTERVAL = 60  # Check stateful management expiration every minute
+MISFIRE_GRACE_SECONDS = 240  # A fire later than this (e.g. after downtime) is a misfire
 
-# Track last executed actions to prevent duplicates
-last_executed_actions = {}
+# Compiled schedules: id -> {"entry", "trigger", "misfire_policy", "next_fire", "catch_up_left"}
+_compiled_schedules = {}
+# Min-heap of (next fire epoch, schedule id); entries whose time no longer matches are stale
+_schedule_heap = []
+_schedule_lock = threading.Lock()
+_rebuild_needed = threading.Event()
+_wake_event = threading.Event()  # Set to wake the loop early (schedule change or stop)
 
 # Track execution history for logging
 max_history_entries = 50
@@ -39,15 +52,6 @@ execution_history = collections.deque(maxlen=max_history_entries)
 stop_event = threading.Event()
 scheduler_thread = None
 
-def _get_user_timezone():
-    """Get the user's selected timezone from general settings"""
-    try:
-        from src.primary.utils.timezone_utils import get_user_timezone
-        return get_user_timezone()
-    except Exception:
-        import pytz
-        return pytz.UTC
-
 def load_schedule():
     """Load the schedule configuration from database"""
     try:
@@ -63,7 +67,7 @@ def load_schedule():
 def add_to_history(action_entry, status, message):
     """Add an action execution to the history log"""
     # Use user's selected timezone for display
-    user_tz = _get_user_timezone()
+    user_tz = get_user_timezone()
     now = datetime.datetime.now(user_tz)
     time_str = now.strftime("%Y-%m-%d %H:%M:%S")
     
@@ -88,19 +92,8 @@ def execute_action(action_entry):
     """Execute a scheduled action"""
     action_type = action_entry.get("action")
     app_type = action_entry.get("app")
-    app_id = action_entry.get("id")
     
-    # Generate a unique key for this action to track execution
-    user_tz = _get_user_timezone()
-    current_date = datetime.datetime.now(user_tz).strftime("%Y-%m-%d")
-    execution_key = f"{app_id}_{current_date}"
-    
-    # Check if this action was already executed today
-    if execution_key in last_executed_actions:
-        message = f"Action {app_id} for {app_type} already executed today, skipping"
-        scheduler_logger.debug(message)
-        add_to_history(action_entry, "skipped", message)
-        return False  # Already executed
+    # Duplicate runs are prevented by the persisted last fire time (see run_due_schedules)
     
     # Helper function to extract base app name from app identifiers like "radarr-all"
     def get_base_app_name(app_identifier):
@@ -314,8 +307,6 @@ def execute_action(action_entry):
                 add_to_history(action_entry, "error", error_message)
                 return False
         
-        # Mark this action as executed for today
-        last_executed_actions[execution_key] = datetime.datetime.now(user_tz)
         return True
     
     except Exception as e:
@@ -323,55 +314,8 @@ def execute_action(action_entry):
         scheduler_logger.error(traceback.format_exc())
         return False
 
-def should_execute_schedule(schedule_entry):
-    """Check if a schedule entry should be executed now"""
-    schedule_id = schedule_entry.get("id", "unknown")
-    
-    # Debug log the schedule we're checking
-    scheduler_logger.debug(f"Checking if schedule {schedule_id} should be executed")
-    
-    # Get user's selected timezone for consistent timing
-    user_tz = _get_user_timezone()
-    
-    # Log exact system time for debugging with timezone info
-    exact_time = datetime.datetime.now(user_tz)
-    timezone_name = str(user_tz)
-    time_with_tz = f"{exact_time.strftime('%Y-%m-%d %H:%M:%S.%f')} {timezone_name}"
-    scheduler_logger.debug(f"EXACT CURRENT TIME: {time_with_tz}")
-    
-    if not schedule_entry.get("enabled", True):
-        scheduler_logger.debug(f"Schedule {schedule_id} is disabled, skipping")
-        return False
-    
-    # Check if specific days are configured
-    days = schedule_entry.get("days", [])
-    scheduler_logger.debug(f"Schedule {schedule_id} days: {days}")
-    
-    # Get today's day of week in lowercase (respects user timezone)
-    current_day = datetime.datetime.now(user_tz).strftime("%A").lower()  # e.g., 'monday'
-    
-    # Debug what's being compared
-    scheduler_logger.debug(f"CRITICAL DEBUG - Today: '{current_day}', Schedule days: {days}")
-    
-    # If days array is empty, treat as "run every day"
-    if not days:
-        scheduler_logger.debug(f"Schedule {schedule_id} has no days specified, treating as 'run every day'")
-    else:
-        # Make sure all day comparisons are done with lowercase strings
-        lowercase_days = [str(day).lower() for day in days]
-        
-        # If today is not in the schedule days, skip this schedule
-        if current_day not in lowercase_days:
-            scheduler_logger.debug(f"FAILURE: Schedule {schedule_id} not configured to run on {current_day}, skipping")
-            return False
-        else:
-            scheduler_logger.debug(f"SUCCESS: Schedule {schedule_id} IS configured to run on {current_day}")
-
-    
-    # Get current time with second-level precision for accurate timing (in user's timezone)
-    current_time = datetime.datetime.now(user_tz)
-    
-    # Extract scheduled time from different possible formats
+def _parse_schedule_time(schedule_entry):
+    """Return (hour, minute) from the flat, nested or "HH:MM" formats, or None if invalid"""
     try:
         # First try the flat format
         schedule_hour = schedule_entry.get("hour")
@@ -390,140 +334,225 @@ def should_execute_schedule(schedule_entry):
                 schedule_hour = int(time_parts[0])
                 schedule_minute = int(time_parts[1]) if len(time_parts) > 1 else 0
         
-        # Convert to integers to ensure proper comparison
         schedule_hour = int(schedule_hour)
         schedule_minute = int(schedule_minute)
     except (TypeError, ValueError, IndexError):
-        scheduler_logger.warning(f"Invalid schedule time format in entry: {schedule_entry}")
-        return False
-    
-    # Add detailed logging for time debugging
-    time_debug_str = f"{current_time.hour:02d}:{current_time.minute:02d}:{current_time.second:02d}"
-    if timezone_name:
-        time_debug_str += f" {timezone_name}"
-    
-    scheduler_logger.debug(f"Schedule {schedule_id} time: {schedule_hour:02d}:{schedule_minute:02d}, " 
-                         f"current time: {time_debug_str}")
-    
-    # ===== STRICT TIME COMPARISON - PREVENT EARLY EXECUTION =====
-    
-    # If current hour is BEFORE scheduled hour, NEVER execute
-    if current_time.hour < schedule_hour:
-        scheduler_logger.debug(f"BLOCKED EXECUTION: Current hour {current_time.hour} is BEFORE scheduled hour {schedule_hour}")
-        return False
-    
-    # If same hour but current minute is BEFORE scheduled minute, NEVER execute
-    if current_time.hour == schedule_hour and current_time.minute < schedule_minute:
-        scheduler_logger.debug(f"BLOCKED EXECUTION: Current minute {current_time.minute} is BEFORE scheduled minute {schedule_minute}")
-        return False
-    
-    # ===== 4-MINUTE EXECUTION WINDOW =====
-    
-    # We're in the scheduled hour and minute, or later - check 4-minute window
-    if current_time.hour == schedule_hour:
-        # Execute if we're in the scheduled minute or up to 3 minutes after the scheduled minute
-        if current_time.minute >= schedule_minute and current_time.minute < schedule_minute + 4:
-            scheduler_logger.info(f"EXECUTING: Current time {current_time.hour:02d}:{current_time.minute:02d} is within the 4-minute window after {schedule_hour:02d}:{schedule_minute:02d}")
-            return True
-    
-    # Handle hour rollover case (e.g., scheduled for 6:59, now it's 7:00, 7:01, or 7:02)
-    if current_time.hour == schedule_hour + 1:
-        # Only apply if scheduled minute was in the last 3 minutes of the hour (57-59)
-        # and current minute is in the first (60 - schedule_minute) minutes of the next hour
-        if schedule_minute >= 57 and current_time.minute < (60 - schedule_minute):
-            scheduler_logger.info(f"EXECUTING: Hour rollover within 4-minute window after {schedule_hour:02d}:{schedule_minute:02d}")
-            return True
-    
-    # We've missed the 4-minute window
-    scheduler_logger.debug(f"MISSED WINDOW: Current time {current_time.hour:02d}:{current_time.minute:02d} " 
-                        f"is past the 4-minute window for {schedule_hour:02d}:{schedule_minute:02d}")
-    return False
+        return None
+    if not (0 <= schedule_hour <= 23 and 0 <= schedule_minute <= 59):
+        return None
+    return schedule_hour, schedule_minute
 
-def check_and_execute_schedules():
-    """Check all schedules and execute those that should run now"""
-    try:
-        # Get user timezone for consistent logging
-        user_tz = _get_user_timezone()
-        
-        # Format time in user timezone
-        current_time = datetime.datetime.now(user_tz).strftime("%Y-%m-%d %H:%M:%S")
-        scheduler_logger.debug(f"Checking schedules at {current_time} ({user_tz})")
-        
-        # Load schedules from database
-        # Loading schedules debug removed to reduce log spam
-        
-        # Load the schedule
-        schedule_data = load_schedule()
-        if not schedule_data:
-            return
-        
-        # Log schedule data summary
-        schedule_summary = {app: len(schedules) for app, schedules in schedule_data.items()}
-        scheduler_logger.debug(f"Loaded schedules: {schedule_summary}")
+def compile_schedule(schedule_entry, user_tz, now):
+    """
+    Parse a schedule entry once into its trigger and first fire time.
+    
+    Args:
+        schedule_entry: Schedule dict as returned by the database
+        user_tz: Timezone wall-clock times are in
+        now: Current epoch seconds
         
-        # Add to history that we've checked schedules
-        add_to_history({"action": "check"}, "debug", f"Checking schedules at {current_time}")
+    Returns:
+        Dict with entry, trigger, misfire_policy, next_fire and catch_up_left,
+        or None if the entry is disabled or invalid
+    """
+    if not schedule_entry.get("enabled", True):
+        return None
+    
+    trigger_config = schedule_entry.get("trigger")
+    weekdays = None
+    parsed_time = (0, 0)
+    if not trigger_config or trigger_config.get("type", "daily") == "daily":
+        parsed_time = _parse_schedule_time(schedule_entry)
+        if parsed_time is None:
+            scheduler_logger.warning(f"Invalid schedule time format in entry: {schedule_entry}")
+            return None
+        # If days array is empty, treat as "run every day"
+        days = schedule_entry.get("days", [])
+        weekdays = {WEEKDAYS.index(str(day).lower()) for day in days if str(day).lower() in WEEKDAYS} if days else None
+        if days and not weekdays:
+            scheduler_logger.warning(f"Schedule {schedule_entry.get('id')} has no valid days: {days}")
+            return None
+    
+    last_fired = schedule_entry.get("lastFired")
+    try:
+        trigger = build_trigger(trigger_config, parsed_time[0], parsed_time[1], weekdays, user_tz,
+                                anchor=last_fired or schedule_entry.get("updatedAt") or now)
+    except TriggerError as e:
+        scheduler_logger.warning(f"Invalid trigger for schedule {schedule_entry.get('id')}: {e}")
+        return None
+    
+    misfire_policy = schedule_entry.get("misfirePolicy") or MISFIRE_SKIP
+    if misfire_policy not in MISFIRE_POLICIES:
+        scheduler_logger.warning(f"Unknown misfire policy '{misfire_policy}' for schedule {schedule_entry.get('id')}, using '{MISFIRE_SKIP}'")
+        misfire_policy = MISFIRE_SKIP
+    
+    # Continue from the last persisted fire (or, if it never fired, from when it was saved)
+    # so fires missed while stopped are seen and a restart right after a fire does not repeat it
+    baseline = last_fired or min(schedule_entry.get("updatedAt") or now, now)
+    next_fire = trigger.next_fire(baseline, user_tz)
+    return {
+        "entry": schedule_entry,
+        "trigger": trigger,
+        "misfire_policy": misfire_policy,
+        "next_fire": next_fire,
+        "catch_up_left": MAX_CATCH_UP_RUNS
+    }
+
+def _on_schedules_changed(*_):
+    """Schedule or timezone change: recompile on the scheduler thread"""
+    _rebuild_needed.set()
+    _wake_event.set()
+
+def _on_settings_changed(app_name, version):
+    # The timezone lives in general settings; fire times depend on it
+    if app_name == "general":
+        _on_schedules_changed()
+
+def rebuild_schedule_heap(now=None):
+    """Reload schedules from the database and compile them into a min-heap of next-fire times"""
+    global _schedule_heap
+    now = time.time() if now is None else now
+    user_tz = get_user_timezone()
+    schedule_data = load_schedule()
+    
+    compiled_schedules = {}
+    heap = []
+    for app_type, schedules in schedule_data.items():
+        for schedule_entry in schedules:
+            schedule_entry["appType"] = app_type
+            compiled = compile_schedule(schedule_entry, user_tz, now)
+            if compiled is None:
+                continue
+            schedule_id = schedule_entry.get("id") or f"{app_type}_{len(compiled_schedules)}"
+            compiled_schedules[schedule_id] = compiled
+            if compiled["next_fire"] is not None:
+                heap.append((compiled["next_fire"], schedule_id))
+    heapq.heapify(heap)
+    
+    with _schedule_lock:
+        _compiled_schedules.clear()
+        _compiled_schedules.update(compiled_schedules)
+        _schedule_heap = heap
+    scheduler_logger.debug(f"Compiled {len(compiled_schedules)} active schedules; next fire at "
+                           f"{datetime.datetime.fromtimestamp(heap[0][0], user_tz) if heap else 'never'}")
+
+def _record_fire(schedule_id, compiled, fire_at):
+    """Persist the fire time so restarts neither repeat nor lose it"""
+    compiled["entry"]["lastFired"] = fire_at
+    try:
+        get_database().set_schedule_last_fired(schedule_id, fire_at)
+    except Exception as e:
+        scheduler_logger.error(f"Error saving last fire time for schedule {schedule_id}: {e}")
+
+def run_due_schedules(now=None):
+    """Execute every schedule whose fire time has passed, applying its misfire policy, and queue its next fire"""
+    now = time.time() if now is None else now
+    user_tz = None
+    while True:
+        with _schedule_lock:
+            if not _schedule_heap or _schedule_heap[0][0] > now:
+                return
+            fire_at, schedule_id = heapq.heappop(_schedule_heap)
+            compiled = _compiled_schedules.get(schedule_id)
+            if compiled is None or compiled["next_fire"] != fire_at:
+                continue  # Stale heap entry from before a rebuild
         
-        # Initialize counter for schedules found
-        schedules_found = 0
+        user_tz = user_tz or get_user_timezone()
+        schedule_entry = compiled["entry"]
+        trigger = compiled["trigger"]
+        policy = compiled["misfire_policy"]
+        late_by = now - fire_at
+        fire_label = datetime.datetime.fromtimestamp(fire_at, user_tz).strftime('%Y-%m-%d %H:%M:%S')
         
-        # Check for schedules to execute
-        for app_type, schedules in schedule_data.items():
-            for schedule_entry in schedules:
-                schedules_found += 1
-                if should_execute_schedule(schedule_entry):
-                    # Check if we already executed this entry in the last 5 minutes
-                    entry_id = schedule_entry.get("id")
-                    if entry_id and entry_id in last_executed_actions:
-                        last_time = last_executed_actions[entry_id]
-                        now = datetime.datetime.now(user_tz)
-                        delta = (now - last_time).total_seconds() / 60  # Minutes
-                        
-                        if delta < 5:  # Don't re-execute if less than 5 minutes have passed
-                            scheduler_logger.info(f"Skipping recently executed schedule '{entry_id}' ({delta:.1f} minutes ago)")
-                            add_to_history(
-                                schedule_entry, 
-                                "skipped", 
-                                f"Already executed {delta:.1f} minutes ago"
-                            )
-                            continue
-                    
-                    # Execute the action
-                    schedule_entry["appType"] = app_type
-                    execute_action(schedule_entry)
-                    
-                    # Update last executed time
-                    if entry_id:
-                        last_executed_actions[entry_id] = datetime.datetime.now(user_tz)
+        # Where the next fire is searched from: run_all walks through every missed fire
+        # (up to MAX_CATCH_UP_RUNS); the other policies resume from now
+        next_after = now
+        if late_by <= MISFIRE_GRACE_SECONDS:
+            scheduler_logger.info(f"EXECUTING: Schedule {schedule_id} ({trigger.describe()}) due at {fire_label} ({late_by:.1f}s late)")
+            execute_action(schedule_entry)
+        elif policy == MISFIRE_SKIP:
+            message = f"Missed fire at {fire_label} by {late_by / 60:.1f} minutes, skipping (misfire policy '{policy}')"
+            scheduler_logger.warning(f"Schedule {schedule_id}: {message}")
+            add_to_history(schedule_entry, "skipped", message)
+        else:
+            scheduler_logger.info(f"CATCH-UP: Schedule {schedule_id} missed fire at {fire_label}, running now (misfire policy '{policy}')")
+            add_to_history(schedule_entry, "info", f"Catching up missed fire at {fire_label}")
+            execute_action(schedule_entry)
+            if policy == MISFIRE_RUN_ALL:
+                compiled["catch_up_left"] -= 1
+                if compiled["catch_up_left"] > 0:
+                    next_after = fire_at
+                else:
+                    scheduler_logger.warning(f"Schedule {schedule_id}: caught up {MAX_CATCH_UP_RUNS} missed fires, skipping the rest")
         
-        # No need to log anything when no schedules are found, as this is expected
-    
-    except Exception as e:
-        error_msg = f"Error checking schedules: {e}"
-        scheduler_logger.error(error_msg)
-        scheduler_logger.error(traceback.format_exc())
-        add_to_history({"action": "check"}, "error", error_msg)
+        _record_fire(schedule_id, compiled, fire_at)
+        next_fire = trigger.next_fire(next_after, user_tz)
+        with _schedule_lock:
+            if _compiled_schedules.get(schedule_id) is compiled:
+                compiled["next_fire"] = next_fire
+                if next_fire is not None:
+                    heapq.heappush(_schedule_heap, (next_fire, schedule_id))
+
+def get_next_fire_times():
+    """
+    Next fire time of every active schedule.
+    
+    Returns:
+        Dict of schedule id -> {"next_fire": epoch, "next_fire_iso": ISO time in the user's
+        timezone, "last_fired", "trigger", "misfire_policy", "action", "app", "appType"}
+    """
+    user_tz = get_user_timezone()
+    with _schedule_lock:
+        compiled_schedules = list(_compiled_schedules.items())
+    next_fires = {}
+    for schedule_id, compiled in compiled_schedules:
+        entry = compiled["entry"]
+        next_fire = compiled["next_fire"]
+        next_fires[schedule_id] = {
+            "next_fire": next_fire,
+            "next_fire_iso": datetime.datetime.fromtimestamp(next_fire, user_tz).isoformat() if next_fire else None,
+            "last_fired": entry.get("lastFired"),
+            "trigger": compiled["trigger"].describe(),
+            "misfire_policy": compiled["misfire_policy"],
+            "action": entry.get("action"),
+            "app": entry.get("app"),
+            "appType": entry.get("appType")
+        }
+    return next_fires
 
 def scheduler_loop():
-    """Main scheduler loop - runs in a background thread"""
+    """Main scheduler loop - sleeps until the next schedule or stateful check is due"""
     scheduler_logger.info("Scheduler loop started.")
+    _rebuild_needed.set()
+    next_stateful_check = 0
     while not stop_event.is_set():
         try:
-            # Check for stateful management expiration first
-            # Stateful management check debug removed to reduce log spam
-            check_stateful_expiration() # Call the imported function
+            now = time.time()
+            if now >= next_stateful_check:
+                # Check for stateful management expiration
+                check_stateful_expiration() # Call the imported function
+                next_stateful_check = now + STATEFUL_CHECK_INTERVAL
+            
+            if _rebuild_needed.is_set():
+                _rebuild_needed.clear()
+                rebuild_schedule_heap(now)
             
-            # Schedule execution debug removed to reduce log spam
-            check_and_execute_schedules()
+            run_due_schedules(time.time())
             
-            # Sleep until the next check
-            stop_event.wait(SCHEDULE_CHECK_INTERVAL)
+            # Sleep until the earliest of the next fire, the next stateful check or a change
+            with _schedule_lock:
+                next_fire = _schedule_heap[0][0] if _schedule_heap else next_stateful_check
+            timeout = min(next_fire, next_stateful_check) - time.time()
+            if timeout > 0:
+                _wake_event.wait(timeout)
+            _wake_event.clear()
             
         except Exception as e:
             scheduler_logger.error(f"Error in scheduler loop: {e}")
             scheduler_logger.error(traceback.format_exc())
+            add_to_history({"action": "check"}, "error", f"Error running schedules: {e}")
             # Sleep briefly to avoid rapidly repeating errors
-            time.sleep(5)
+            stop_event.wait(5)
     
     scheduler_logger.info("Scheduler loop stopped")
 
@@ -542,6 +571,10 @@ def start_scheduler():
     # Reset the stop event
     stop_event.clear()
     
+    # Recompile only when schedules (or the timezone) change
+    register_schedule_listener(_on_schedules_changed)
+    register_settings_listener(_on_settings_changed)
+    
     # Create and start the scheduler thread
     scheduler_thread = threading.Thread(target=scheduler_loop, name="SchedulerEngine", daemon=True)
     scheduler_thread.start()
@@ -567,6 +600,7 @@ def stop_scheduler():
     
     # Signal the thread to stop
     stop_event.set()
+    _wake_event.set()
     
     # Wait for the thread to terminate (with timeout)
     scheduler_thread.join(timeout=5.0)
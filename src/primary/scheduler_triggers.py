@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Schedule triggers for the Huntarr scheduler engine.
+A trigger computes the next fire time after a given moment: daily (the classic
+hour/minute/days schedule), cron expressions (5 fields, or 6 with seconds first),
+fixed intervals and one-shot times. Misfire policies decide what happens to fires
+missed while Huntarr was not running.
+"""
+
+import datetime
+import math
+from typing import Optional
+
+# Misfire policies
+MISFIRE_SKIP = "skip"          # Drop missed fires and wait for the next one
+MISFIRE_RUN_ONCE = "run_once"  # Run once to catch up, however many fires were missed
+MISFIRE_RUN_ALL = "run_all"    # Run every missed fire, oldest first
+MISFIRE_POLICIES = (MISFIRE_SKIP, MISFIRE_RUN_ONCE, MISFIRE_RUN_ALL)
+
+# run_all never replays more than this many missed fires
+MAX_CATCH_UP_RUNS = 100
+
+# Cron searches give up after this many years without a match (e.g. "0 0 31 2 *")
+CRON_SEARCH_YEARS = 5
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_CRON_DAY_NAMES = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+_CRON_MONTH_NAMES = {name: index + 1 for index, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+
+
+class TriggerError(ValueError):
+    """Raised for a trigger definition that cannot be parsed"""
+
+
+def _localize(user_tz, naive: datetime.datetime) -> datetime.datetime:
+    return user_tz.localize(naive) if hasattr(user_tz, "localize") else naive.replace(tzinfo=user_tz)
+
+
+def _parse_cron_field(field: str, low: int, high: int, names=None) -> set:
+    """Expand one cron field ("*", "*/5", "1-5", "mon-fri", "0,30", "10-50/10") to a set of values"""
+    values = set()
+    for part in field.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            if not step_str.isdigit() or int(step_str) < 1:
+                raise TriggerError(f"Invalid cron step in '{field}'")
+            step = int(step_str)
+        if part in ("*", "?"):
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = _cron_value(start_str, names), _cron_value(end_str, names)
+        else:
+            start = _cron_value(part, names)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise TriggerError(f"Cron field '{field}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _cron_value(value: str, names=None) -> int:
+    if names and value in names:
+        return names[value]
+    if not value.isdigit():
+        raise TriggerError(f"Invalid cron value '{value}'")
+    return int(value)
+
+
+class CronTrigger:
+    """Cron expression: [second] minute hour day-of-month month day-of-week"""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) == 5:
+            fields = ["0"] + fields
+        if len(fields) != 6:
+            raise TriggerError(f"Cron expression needs 5 or 6 fields: '{expression}'")
+        self.expression = expression
+        self.seconds = sorted(_parse_cron_field(fields[0], 0, 59))
+        self.minutes = _parse_cron_field(fields[1], 0, 59)
+        self.hours = _parse_cron_field(fields[2], 0, 23)
+        self.days = _parse_cron_field(fields[3], 1, 31)
+        self.months = _parse_cron_field(fields[4], 1, 12, _CRON_MONTH_NAMES)
+        # Cron weekdays count from Sunday = 0; 7 is also Sunday
+        cron_weekdays = _parse_cron_field(fields[5], 0, 7, _CRON_DAY_NAMES)
+        self.weekdays = {(day - 1) % 7 for day in cron_weekdays}  # Python weekday(): Monday = 0
+        self._any_day = fields[3] in ("*", "?")
+        self._any_weekday = fields[5] in ("*", "?")
+
+    def _day_matches(self, day: datetime.date) -> bool:
+        if day.month not in self.months:
+            return False
+        # Standard cron: when both day fields are restricted, either may match
+        if self._any_day:
+            return day.weekday() in self.weekdays
+        if self._any_weekday:
+            return day.day in self.days
+        return day.day in self.days or day.weekday() in self.weekdays
+
+    def next_fire(self, after: float, user_tz) -> Optional[float]:
+        start = datetime.datetime.fromtimestamp(math.floor(after) + 1, user_tz).replace(tzinfo=None)
+        day = start.date()
+        last_day = day + datetime.timedelta(days=366 * CRON_SEARCH_YEARS)
+        while day <= last_day:
+            if self._day_matches(day):
+                first_second = start.hour * 3600 + start.minute * 60 + start.second if day == start.date() else 0
+                for hour in sorted(self.hours):
+                    if (hour + 1) * 3600 <= first_second:
+                        continue
+                    for minute in sorted(self.minutes):
+                        minute_start = hour * 3600 + minute * 60
+                        if minute_start + 60 <= first_second:
+                            continue
+                        for second in self.seconds:
+                            if minute_start + second < first_second:
+                                continue
+                            naive = datetime.datetime.combine(day, datetime.time(hour, minute, second))
+                            fire_at = _localize(user_tz, naive).timestamp()
+                            if fire_at > after:
+                                return fire_at
+            day += datetime.timedelta(days=1)
+        return None
+
+    def describe(self) -> str:
+        return f"cron '{self.expression}'"
+
+
+class DailyTrigger(CronTrigger):
+    """The classic schedule: a wall-clock time on some (or every) day of the week"""
+
+    def __init__(self, hour: int, minute: int, weekdays: Optional[set] = None):
+        if weekdays:
+            # Python weekday (Monday = 0) to cron weekday (Sunday = 0)
+            day_field = ",".join(str((day + 1) % 7) for day in sorted(weekdays))
+        else:
+            day_field = "*"
+        super().__init__(f"{minute} {hour} * * {day_field}")
+        self.hour = hour
+        self.minute = minute
+
+    def describe(self) -> str:
+        return f"daily at {self.hour:02d}:{self.minute:02d}"
+
+
+class IntervalTrigger:
+    """Fires every N seconds, aligned to an anchor so fire times do not drift"""
+
+    def __init__(self, seconds: float, anchor: float):
+        if seconds <= 0:
+            raise TriggerError(f"Interval must be positive: {seconds}")
+        self.seconds = seconds
+        self.anchor = anchor
+
+    def next_fire(self, after: float, user_tz=None) -> Optional[float]:
+        if after < self.anchor:
+            return self.anchor
+        periods = math.floor((after - self.anchor) / self.seconds) + 1
+        return self.anchor + periods * self.seconds
+
+    def describe(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+class OneShotTrigger:
+    """Fires once at a fixed time"""
+
+    def __init__(self, fire_at: float):
+        self.fire_at = fire_at
+
+    def next_fire(self, after: float, user_tz=None) -> Optional[float]:
+        return self.fire_at if self.fire_at > after else None
+
+    def describe(self) -> str:
+        return f"once at {datetime.datetime.fromtimestamp(self.fire_at).isoformat()}"
+
+
+def _parse_time_point(value, user_tz) -> float:
+    """Epoch seconds from a number or an ISO time (naive ISO times are in the user's timezone)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise TriggerError(f"Invalid time '{value}'")
+    if parsed.tzinfo is None:
+        parsed = _localize(user_tz, parsed)
+    return parsed.timestamp()
+
+
+def build_trigger(trigger_config: Optional[dict], hour: int, minute: int, weekdays: Optional[set],
+                  user_tz, anchor: float):
+    """
+    Build the trigger for a schedule.
+
+    Args:
+        trigger_config: The schedule's trigger dict, e.g. {"type": "cron", "cron": "*/15 * * * *"},
+            {"type": "interval", "seconds": 3600, "start": "2025-01-01T00:00"} or
+            {"type": "once", "at": "2025-06-01T08:30:00"}; None or {"type": "daily"} for
+            the classic schedule
+        hour, minute, weekdays: The classic schedule fields
+        user_tz: Timezone wall-clock times are in
+        anchor: Epoch seconds interval triggers count from when they have no start
+
+    Returns:
+        A trigger with next_fire(after, user_tz) and describe()
+    """
+    trigger_type = (trigger_config or {}).get("type", "daily")
+    if trigger_type == "daily":
+        return DailyTrigger(hour, minute, weekdays)
+    if trigger_type == "cron":
+        return CronTrigger(str(trigger_config.get("cron", "")))
+    if trigger_type == "interval":
+        try:
+            seconds = float(trigger_config.get("seconds") or 0) + 60 * float(trigger_config.get("minutes") or 0)
+        except (TypeError, ValueError):
+            raise TriggerError(f"Invalid interval: {trigger_config}")
+        start = trigger_config.get("start")
+        return IntervalTrigger(seconds, _parse_time_point(start, user_tz) if start else anchor)
+    if trigger_type == "once":
+        return OneShotTrigger(_parse_time_point(trigger_config.get("at"), user_tz))
+    raise TriggerError(f"Unknown trigger type '{trigger_type}'")
+
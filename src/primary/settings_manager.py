@@ -9,8 +9,9 @@ import os
 import json
 import pathlib
 import logging
-import time
-from typing import Dict, Any, Optional, List
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping
 
 # Create a simple logger for settings_manager
 logging.basicConfig(level=logging.INFO)
@@ -25,20 +26,70 @@ DEFAULT_CONFIGS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'd
 # Known app types
 KNOWN_APP_TYPES = ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros", "swaparr", "general"]
 
-# Add a settings cache with timestamps to avoid excessive database reads
-settings_cache = {}  # Format: {app_name: {'timestamp': timestamp, 'data': settings_dict}}
-CACHE_TTL = 5  # Cache time-to-live in seconds
+# Versioned, change-notified settings store. Settings stay in memory until
+# save_settings() (or clear_cache()) bumps the app's version, so hot paths never
+# re-read SQLite or re-parse JSON. Snapshots are deeply frozen and shared.
+_settings_snapshots = {}  # Format: {app_name: {'version': int, 'data': MappingProxyType}}
+_settings_versions = {}  # Format: {app_name: int}
+_settings_listeners = []  # Callables invoked as listener(app_name, version) on change
+_settings_lock = threading.RLock()
+
+def _freeze(value):
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value):
+    """Recursively convert a frozen snapshot value back into plain dicts/lists."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+def get_settings_version(app_name: str) -> int:
+    """Return the current settings version for an app (bumped on every change)."""
+    return _settings_versions.get(app_name, 0)
+
+def register_settings_listener(listener) -> None:
+    """Register a callable invoked as listener(app_name, version) whenever settings change."""
+    with _settings_lock:
+        if listener not in _settings_listeners:
+            _settings_listeners.append(listener)
+
+def unregister_settings_listener(listener) -> None:
+    """Remove a previously registered settings listener."""
+    with _settings_lock:
+        if listener in _settings_listeners:
+            _settings_listeners.remove(listener)
+
+def _notify_settings_changed(app_name: str) -> None:
+    """Bump the version for an app, drop its snapshot and notify listeners."""
+    with _settings_lock:
+        version = _settings_versions.get(app_name, 0) + 1
+        _settings_versions[app_name] = version
+        _settings_snapshots.pop(app_name, None)
+        listeners = list(_settings_listeners)
+    for listener in listeners:
+        try:
+            listener(app_name, version)
+        except Exception as e:
+            settings_logger.warning(f"Settings listener failed for {app_name}: {e}")
 
 def clear_cache(app_name=None):
-    """Clear the settings cache for a specific app or all apps."""
-    global settings_cache
+    """Invalidate the in-memory settings for a specific app or all apps."""
     if app_name:
-        if app_name in settings_cache:
-            settings_logger.debug(f"Clearing cache for {app_name}")
-            settings_cache.pop(app_name, None)
+        settings_logger.debug(f"Clearing cache for {app_name}")
+        _notify_settings_changed(app_name)
     else:
         settings_logger.debug("Clearing entire settings cache")
-        settings_cache = {}
+        with _settings_lock:
+            app_names = set(_settings_snapshots) | set(KNOWN_APP_TYPES)
+        for name in app_names:
+            _notify_settings_changed(name)
 
 def get_default_config_path(app_name: str) -> pathlib.Path:
     """Get the path to the default config file for a specific app."""
@@ -91,35 +142,43 @@ def _ensure_config_exists(app_name: str) -> None:
         settings_logger.error(f"Database error for {app_name}: {e}")
         raise
 
-def load_settings(app_type, use_cache=True):
+def get_settings_snapshot(app_type: str) -> Mapping[str, Any]:
     """
-    Load settings for a specific app type from database
+    Get a read-only snapshot of the settings for an app type.
+    
+    The snapshot is shared between all readers and stays valid until the app's
+    settings version changes, so it is the cheapest way to read settings on hot paths.
     
     Args:
-        app_type: The app type to load settings for
-        use_cache: Whether to use the cached settings if available and recent
+        app_type: The app type to get settings for
         
     Returns:
-        Dict containing the app settings
+        A read-only mapping of the app settings (nested dicts/lists are frozen too)
     """
-    global settings_cache
-    
+    entry = _settings_snapshots.get(app_type)
+    if entry is not None and entry['version'] == _settings_versions.get(app_type, 0):
+        return entry['data']
+    
+    with _settings_lock:
+        # Another thread may have loaded it while we were waiting for the lock
+        entry = _settings_snapshots.get(app_type)
+        if entry is not None and entry['version'] == _settings_versions.get(app_type, 0):
+            return entry['data']
+        
+        current_settings = _load_settings_from_database(app_type)
+        snapshot = _freeze(current_settings)
+        _settings_snapshots[app_type] = {
+            'version': _settings_versions.get(app_type, 0),
+            'data': snapshot
+        }
+        return snapshot
+
+def _load_settings_from_database(app_type: str) -> Dict[str, Any]:
+    """Read settings for an app type from the database, filling in missing defaults."""
     # Only log unexpected app types that are not 'general'
     if app_type not in KNOWN_APP_TYPES and app_type != "general":
         settings_logger.warning(f"load_settings called with unexpected app_type: {app_type}")
     
-    # Check if we have a valid cache entry
-    if use_cache and app_type in settings_cache:
-        cache_entry = settings_cache[app_type]
-        cache_age = time.time() - cache_entry.get('timestamp', 0)
-        
-        if cache_age < CACHE_TTL:
-            settings_logger.debug(f"Using cached settings for {app_type} (age: {cache_age:.1f}s)")
-            return cache_entry['data']
-        else:
-            settings_logger.debug(f"Cache expired for {app_type} (age: {cache_age:.1f}s)")
-    
-    # No valid cache entry, load from database
     current_settings = {}
     
     try:
@@ -166,14 +225,29 @@ def load_settings(app_type, use_cache=True):
         settings_logger.info(f"Added missing default keys to {app_type} settings")
         save_settings(app_type, current_settings)
     
-    # Update cache
-    settings_cache[app_type] = {
-        'timestamp': time.time(),
-        'data': current_settings
-    }
-        
     return current_settings
 
+def load_settings(app_type, use_cache=True):
+    """
+    Load settings for a specific app type
+    
+    Settings are served from the in-memory store and only re-read from the
+    database after they change. The returned dict is a private copy, so callers
+    may modify it (e.g. before passing it to save_settings) without affecting
+    other readers. Read-only callers should prefer get_settings_snapshot().
+    
+    Args:
+        app_type: The app type to load settings for
+        use_cache: Whether to use the in-memory settings; False forces a database read
+        
+    Returns:
+        Dict containing the app settings
+    """
+    if not use_cache:
+        clear_cache(app_type)
+    
+    return _thaw(get_settings_snapshot(app_type))
+
 def save_settings(app_name: str, settings_data: Dict[str, Any]) -> bool:
     """Save settings for a specific app to database."""
     if app_name not in KNOWN_APP_TYPES:
@@ -246,7 +320,7 @@ def save_settings(app_name: str, settings_data: Dict[str, Any]) -> bool:
         return False
     
     if success:
-        # Clear cache for this app to ensure fresh reads
+        # Bump the settings version so readers pick up the new values
         clear_cache(app_name)
         
         # If general settings were saved, also clear timezone cache
@@ -262,8 +336,8 @@ def save_settings(app_name: str, settings_data: Dict[str, Any]) -> bool:
 
 def get_setting(app_name: str, key: str, default: Optional[Any] = None) -> Any:
     """Get a specific setting value for an app."""
-    settings = load_settings(app_name)
-    return settings.get(key, default)
+    settings = get_settings_snapshot(app_name)
+    return _thaw(settings.get(key, default))
 
 def get_api_url(app_name: str) -> Optional[str]:
     """Get the API URL for a specific app."""
@@ -290,10 +364,10 @@ def get_configured_apps() -> List[str]:
         if app_name == 'general':
             continue  # Skip general settings
             
-        settings = load_settings(app_name)
+        settings = get_settings_snapshot(app_name)
         
         # First check if there are valid instances configured (multi-instance mode)
-        if "instances" in settings and isinstance(settings["instances"], list) and settings["instances"]:
+        if "instances" in settings and isinstance(settings["instances"], tuple) and settings["instances"]:
             for instance in settings["instances"]:
                 if instance.get("enabled", True) and instance.get("api_url") and instance.get("api_key"):
                     configured.append(app_name)
@@ -320,6 +394,10 @@ def apply_timezone(timezone: str) -> bool:
         # Set TZ environment variable
         os.environ['TZ'] = timezone
         
+        # TZ is a fallback of the cached user timezone; drop the cached value
+        from src.primary.utils.timezone_utils import clear_timezone_cache
+        clear_timezone_cache()
+        
         # Create symlink for localtime (common approach in containers)
         zoneinfo_path = f"/usr/share/zoneinfo/{timezone}"
         if os.path.exists(zoneinfo_path):
@@ -441,14 +519,26 @@ def initialize_timezone_from_env():
 # Add a list of known advanced settings for clarity and documentation
 ADVANCED_SETTINGS = [
     "api_timeout", 
+    "health_check_interval",  # Seconds between background connection checks of each instance
     "command_wait_delay", 
     "command_wait_attempts", 
+    "search_pipeline_window",  # Search commands kept in flight per instance
+    "max_arr_command_queue",  # Hold new searches while the Arr has this many commands queued
+    "search_batch_size",  # IDs coalesced into one search command
+    "adaptive_cycle_sleep",  # Pace cycles by backlog and recent yield instead of a fixed sleep
+    "adaptive_sleep_min",  # Shortest adaptive cycle sleep (seconds)
+    "adaptive_sleep_max",  # Longest adaptive cycle sleep (seconds)
     "minimum_download_queue_size",
     "log_refresh_interval_seconds",
     "stateful_management_hours",
     "hourly_cap",
     "ssl_verify",  # Add SSL verification setting
-    "base_url"     # Add base URL setting
+    "persist_sessions",  # Keep login sessions across restarts (sessions table)
+    "max_sessions",  # Hard cap on live login sessions
+    "base_url",    # Add base URL setting
+    "history_retention_days",  # Hunt history retention by age (0 = keep all)
+    "history_max_entries",  # Hunt history retention by row count per app (0 = unlimited)
+    "history_retention_overrides"  # Per-app retention overrides
 ]
 
 def get_advanced_setting(setting_name, default_value=None):
@@ -469,8 +559,8 @@ def get_advanced_setting(setting_name, default_value=None):
     if setting_name not in ADVANCED_SETTINGS:
         settings_logger.warning(f"get_advanced_setting called with unknown setting: {setting_name}")
     
-    general_settings = load_settings("general")
-    return general_settings.get(setting_name, default_value)
+    general_settings = get_settings_snapshot("general")
+    return _thaw(general_settings.get(setting_name, default_value))
 
 def get_ssl_verify_setting():
     """
@@ -493,7 +583,7 @@ def get_custom_tag(app_name: str, tag_type: str, default: str) -> str:
     Returns:
         str: The custom tag or the default if not found
     """
-    settings = load_settings(app_name)
+    settings = get_settings_snapshot(app_name)
     custom_tags = settings.get("custom_tags", {})
     return custom_tags.get(tag_type, default)
 
@@ -15,6 +15,7 @@ from src.primary.utils.database import get_database
 
 # Get the logger at module level
 from src.primary.utils.logger import get_logger
+from src.primary.utils.timezone_utils import get_user_timezone
 logger = get_logger("huntarr")
 
 # Legacy get_state_file_path function removed - all state management now uses direct database calls
@@ -129,16 +130,6 @@ def clear_processed_ids(app_type: str) -> None:
     except Exception as e:
         logger.error(f"Error clearing processed IDs for {app_type}: {e}")
 
-def _get_user_timezone():
-    """Get the user's selected timezone from general settings"""
-    try:
-        from src.primary.utils.timezone_utils import get_user_timezone
-        return get_user_timezone()
-    except Exception as e:
-        logger.warning(f"Could not get user timezone, defaulting to UTC: {e}")
-        import pytz
-        return pytz.UTC
-
 def calculate_reset_time(app_type: str) -> str:
     """
     Calculate when the next state reset will occur.
@@ -158,7 +149,7 @@ def calculate_reset_time(app_type: str) -> str:
     last_reset = get_last_reset_time(app_type)
     
     # Get user's timezone for consistent time display
-    user_tz = _get_user_timezone()
+    user_tz = get_user_timezone()
     
     # Convert last reset to user timezone (assuming it was stored as naive UTC)
     import pytz
@@ -8,7 +8,7 @@ Now uses SQLite database instead of JSON files for better performance and reliab
 import time
 import datetime
 import logging
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Iterable, Iterator
 
 # Create logger for stateful_manager
 stateful_logger = logging.getLogger("stateful_manager")
@@ -22,6 +22,7 @@ APP_TYPES = ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]
 # Import database
 from src.primary.utils.database import get_database
 from src.primary.settings_manager import get_advanced_setting
+from src.primary.utils.timezone_utils import get_user_timezone
 
 def initialize_lock_file() -> None:
     """Initialize the lock file with the current timestamp if it doesn't exist."""
@@ -248,6 +249,59 @@ def is_processed(app_type: str, instance_name: str, media_id: str) -> bool:
         stateful_logger.error(f"Error checking if processed for {app_type}/{instance_name}, ID:{media_id}: {e}")
         return False
 
+# Field order used by processed-ID exports; imports need app_type, instance_name and media_id
+PROCESSED_ID_EXPORT_FIELDS = ["app_type", "instance_name", "media_id", "created_at"]
+
+def export_processed_ids(app_type: str = None, instance_name: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over processed media IDs for export, in the order they were recorded.
+    
+    Args:
+        app_type: Optional app type to restrict the export to
+        instance_name: Optional instance name to restrict the export to
+        
+    Returns:
+        Iterator of dicts with the PROCESSED_ID_EXPORT_FIELDS keys
+    """
+    db = get_database()
+    return db.iter_processed_ids(app_type, instance_name)
+
+def import_processed_ids(records: Iterable[Dict[str, Any]], app_type: str = None,
+                         instance_name: str = None, target_instance: str = None) -> Dict[str, int]:
+    """
+    Bulk import processed media IDs, e.g. to seed a new instance so it does not
+    re-hunt a library that another instance already worked through.
+    
+    Args:
+        records: Parsed NDJSON/CSV records
+        app_type: Default app type for records without one; records for other apps are skipped
+        instance_name: Default instance name for records without one
+        target_instance: Import every record under this instance name instead
+        
+    Returns:
+        Dict with received, inserted and skipped counts
+    """
+    skipped = 0
+    
+    def rows():
+        nonlocal skipped
+        for record in records:
+            record_app = record.get("app_type") or app_type
+            record_instance = target_instance or record.get("instance_name") or instance_name
+            media_id = record.get("media_id")
+            if (record_app not in APP_TYPES or (app_type and record_app != app_type)
+                    or not record_instance or media_id in (None, "")):
+                skipped += 1
+                continue
+            yield record_app, record_instance, media_id
+    
+    db = get_database()
+    result = db.add_processed_ids_bulk(rows())
+    result["received"] += skipped
+    result["skipped"] = skipped
+    stateful_logger.info(f"Imported {result['inserted']} processed IDs ({skipped} skipped)")
+    return result
+
 def get_stateful_management_info() -> Dict[str, Any]:
     """Get information about the stateful management system."""
     lock_info = get_lock_info()
@@ -300,16 +354,6 @@ def get_state_management_summary(app_type: str, instance_name: str) -> Dict[str,
             "has_processed_items": False
         }
 
-def _get_user_timezone():
-    """Get the user's selected timezone from general settings"""
-    try:
-        from src.primary.utils.timezone_utils import get_user_timezone
-        return get_user_timezone()
-    except Exception as e:
-        stateful_logger.warning(f"Could not get user timezone, defaulting to UTC: {e}")
-        import pytz
-        return pytz.UTC
-
 def get_next_reset_time() -> Optional[str]:
     """
     Get the next state management reset time as a formatted string in user's timezone.
@@ -322,7 +366,7 @@ def get_next_reset_time() -> Optional[str]:
         from src.primary.state import get_last_reset_time
         
         # Get user's timezone
-        user_tz = _get_user_timezone()
+        user_tz = get_user_timezone()
         
         # Get reset interval in hours
         reset_interval = get_advanced_setting("stateful_management_hours", DEFAULT_HOURS)
@@ -4,13 +4,18 @@ Stateful Management API Routes
 Handles API endpoints for stateful management
 """
 
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 import json
 from src.primary.stateful_manager import (
     get_stateful_management_info,
     reset_stateful_management,
-    update_lock_expiration
+    update_lock_expiration,
+    export_processed_ids,
+    import_processed_ids,
+    PROCESSED_ID_EXPORT_FIELDS,
+    APP_TYPES
 )
+from src.primary.utils.bulk_transfer import resolve_format, serialize_records, parse_records, MIME_TYPES
 from src.primary.utils.logger import get_logger
 
 # Create logger
@@ -113,3 +118,61 @@ def update_expiration():
         response.headers['Content-Type'] = 'application/json'
         response.headers['Access-Control-Allow-Origin'] = '*'
         return response
+
+def _json_response(data, status=200):
+    """Build a JSON response with the CORS header used by the stateful API."""
+    response = Response(json.dumps(data), status=status)
+    response.headers['Content-Type'] = 'application/json'
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+@stateful_api.route('/export', methods=['GET'])
+def export_ids():
+    """Stream processed media IDs as NDJSON or CSV, optionally for one app and instance."""
+    app_type = request.args.get('app') or None
+    instance_name = request.args.get('instance') or None
+    fmt = resolve_format(request.args.get('format'))
+    if fmt is None:
+        return _json_response({"success": False, "message": "Format must be ndjson or csv"}, 400)
+    if app_type and app_type not in APP_TYPES:
+        return _json_response({"success": False, "message": f"Invalid app type: {app_type}"}, 400)
+    
+    try:
+        records = export_processed_ids(app_type, instance_name)
+        response = Response(stream_with_context(serialize_records(records, PROCESSED_ID_EXPORT_FIELDS, fmt)),
+                            mimetype=MIME_TYPES[fmt])
+        filename = "-".join(part for part in ("processed-ids", app_type, instance_name) if part)
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        return response
+    except Exception as e:
+        stateful_logger.error(f"Error exporting processed IDs: {e}")
+        return _json_response({"success": False, "message": f"Error exporting processed IDs: {str(e)}"}, 500)
+
+@stateful_api.route('/import', methods=['POST'])
+def import_ids():
+    """
+    Import processed media IDs from an NDJSON or CSV request body.
+    
+    Query parameters app and instance fill in records that lack them; target_instance
+    imports everything under a new instance name, which is how a new instance is seeded.
+    """
+    app_type = request.args.get('app') or None
+    instance_name = request.args.get('instance') or None
+    target_instance = request.args.get('target_instance') or None
+    fmt = resolve_format(request.args.get('format'), request.content_type)
+    if fmt is None:
+        return _json_response({"success": False, "message": "Format must be ndjson or csv"}, 400)
+    if app_type and app_type not in APP_TYPES:
+        return _json_response({"success": False, "message": f"Invalid app type: {app_type}"}, 400)
+    
+    try:
+        result = import_processed_ids(parse_records(request.stream, fmt), app_type, instance_name, target_instance)
+        return _json_response(dict(result, success=True))
+    except ValueError as e:
+        # Batches committed before the malformed line are kept; re-importing is idempotent
+        stateful_logger.warning(f"Rejected processed ID import: {e}")
+        return _json_response({"success": False, "message": str(e)}, 400)
+    except Exception as e:
+        stateful_logger.error(f"Error importing processed IDs: {e}")
+        return _json_response({"success": False, "message": f"Error importing processed IDs: {str(e)}"}, 500)
@@ -24,6 +24,22 @@ last_hour_checked = None
 # Schedule the next hourly reset check
 next_reset_check = None
 
+# Bumped on every write so API responses can be cached per version
+_versions = {"stats": 0, "hourly_caps": 0}
+_version_lock = threading.Lock()
+
+def _bump_version(kind: str) -> None:
+    with _version_lock:
+        _versions[kind] += 1
+
+def get_stats_version() -> int:
+    """Return the current statistics version (bumped on every change)."""
+    return _versions["stats"]
+
+def get_hourly_caps_version() -> int:
+    """Return the current hourly caps version (bumped on every change)."""
+    return _versions["hourly_caps"]
+
 def load_stats() -> Dict[str, Dict[str, int]]:
     """
     Load statistics from the database
@@ -112,6 +128,7 @@ def save_hourly_caps(caps: Dict[str, Dict[str, int]]) -> bool:
             api_hits = app_caps.get("api_hits", 0)
             last_reset_hour = app_caps.get("last_reset_hour", datetime.datetime.now().hour)
             db.set_hourly_cap(app_type, api_hits, last_reset_hour)
+        _bump_version("hourly_caps")
         
         logger.debug(f"Saved hourly caps to database: {caps}")
         return True
@@ -166,11 +183,12 @@ def increment_hourly_cap(app_type: str, count: int = 1) -> bool:
             
             # Increment in database
             db.increment_hourly_cap(app_type, count)
+            _bump_version("hourly_caps")
             new_value = prev_value + count
             
             # Get the hourly cap from the app's specific configuration
-            from src.primary.settings_manager import load_settings
-            app_settings = load_settings(app_type)
+            from src.primary.settings_manager import get_settings_snapshot
+            app_settings = get_settings_snapshot(app_type)
             hourly_limit = app_settings.get("hourly_cap", 20)  # Default to 20 if not set
             
             # Log current usage vs limit
@@ -208,8 +226,8 @@ def get_hourly_cap_status(app_type: str) -> Dict[str, Any]:
             caps = db.get_hourly_caps()
             
             # Get the hourly cap from the app's specific configuration
-            from src.primary.settings_manager import load_settings
-            app_settings = load_settings(app_type)
+            from src.primary.settings_manager import get_settings_snapshot
+            app_settings = get_settings_snapshot(app_type)
             hourly_limit = app_settings.get("hourly_cap", 20)  # Default to 20 if not set
             
             current_usage = caps.get(app_type, {}).get("api_hits", 0)
@@ -238,10 +256,10 @@ def _calculate_per_instance_hourly_limit(app_type: str) -> int:
     """
     try:
         # Import here to avoid circular imports
-        from src.primary.settings_manager import load_settings
+        from src.primary.settings_manager import get_settings_snapshot
         
         # Load app settings to get instances
-        app_settings = load_settings(app_type)
+        app_settings = get_settings_snapshot(app_type)
         if not app_settings:
             logger.warning(f"No settings found for {app_type}, using default limit 20")
             return 20
@@ -320,6 +338,7 @@ def save_stats(stats: Dict[str, Dict[str, int]]) -> bool:
         for app_type, app_stats in stats.items():
             for stat_type, value in app_stats.items():
                 db.set_media_stat(app_type, stat_type, value)
+        _bump_version("stats")
         
         logger.debug(f"Saved stats to database: {stats}")
         return True
@@ -354,6 +373,7 @@ def increment_stat(app_type: str, stat_type: str, count: int = 1) -> bool:
         try:
             db = get_database()
             db.increment_media_stat(app_type, stat_type, count)
+            _bump_version("stats")
             logger.debug(f"*** STATS INCREMENT *** {app_type} {stat_type} by {count}")
             return True
         except Exception as e:
@@ -390,6 +410,7 @@ def increment_stat_only(app_type: str, stat_type: str, count: int = 1) -> bool:
         try:
             db = get_database()
             db.increment_media_stat(app_type, stat_type, count)
+            _bump_version("stats")
             logger.debug(f"*** STATS ONLY INCREMENT *** {app_type} {stat_type} by {count} (API cap NOT incremented)")
             return True
         except Exception as e:
@@ -445,6 +466,7 @@ def reset_stats(app_type: Optional[str] = None) -> bool:
                 db.set_media_stat(app_type, "hunted", 0)
                 db.set_media_stat(app_type, "upgraded", 0)
             
+            _bump_version("stats")
             return True
         except Exception as e:
             logger.error(f"Error resetting stats: {e}")
@@ -461,6 +483,7 @@ def reset_hourly_caps() -> bool:
         try:
             db = get_database()
             db.reset_hourly_caps()
+            _bump_version("hourly_caps")
             logger.debug("Reset all hourly API caps")
             return True
         except Exception as e:
@@ -1,6 +1,7 @@
 import socket
 from urllib.parse import urlparse
 from src.primary.config import API_URL
+from src.primary.utils.timezone_utils import get_user_timezone
 
 def get_ip_address():
     try:
@@ -17,20 +18,11 @@ def get_ip_address():
         except:
             return "localhost"
 
-def _get_user_timezone():
-    """Get the user's selected timezone from general settings"""
-    try:
-        from src.primary.utils.timezone_utils import get_user_timezone
-        return get_user_timezone()
-    except Exception:
-        import pytz
-        return pytz.UTC
-
 def write_log(log_file, message):
     from datetime import datetime
     
     # Use user's selected timezone
-    user_tz = _get_user_timezone()
+    user_tz = get_user_timezone()
     now = datetime.now(user_tz)
     timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
     
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bulk Transfer Utilities for Huntarr
+Streams records to and from NDJSON or CSV for export/import endpoints
+"""
+
+import io
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+MIME_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def resolve_format(requested: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Work out the transfer format from a query parameter or request content type.
+
+    Args:
+        requested: Explicit format name (ndjson or csv), may be empty
+        content_type: Request Content-Type header, used when no format was requested
+
+    Returns:
+        The format name, or None if the requested format is not supported
+    """
+    if requested:
+        requested = requested.lower()
+        return requested if requested in EXPORT_FORMATS else None
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "ndjson"
+
+
+def serialize_records(records: Iterable[Dict[str, Any]], fields: List[str], fmt: str) -> Iterator[str]:
+    """
+    Serialize records lazily, one chunk of text per record.
+
+    Args:
+        records: Iterable of dicts, typically a database generator
+        fields: Field names to emit, in column order for CSV
+        fmt: 'ndjson' or 'csv'
+
+    Returns:
+        Iterator of text chunks suitable for a streaming response
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        yield buffer.getvalue()
+        for record in records:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(record)
+            yield buffer.getvalue()
+    else:
+        for record in records:
+            yield json.dumps({field: record.get(field) for field in fields}) + "\n"
+
+
+def parse_records(stream, fmt: str) -> Iterator[Dict[str, Any]]:
+    """
+    Parse records lazily from a binary stream such as a Flask request body.
+
+    Args:
+        stream: Binary file-like object
+        fmt: 'ndjson' or 'csv'
+
+    Returns:
+        Iterator of dicts; raises ValueError on a malformed NDJSON line
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(text):
+            yield row
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        yield record
@@ -11,7 +11,21 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional
-import pytz
+from src.primary.utils.timezone_utils import get_user_timezone
+
+
+# Patterns used by CleanLogFormatter, compiled once
+_ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_WHITESPACE = re.compile(r'\s+')
+_NOISE_PREFIXES = [re.compile(pattern) for pattern in (
+    r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ',  # Timestamp prefixes
+    r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] ',     # Bracketed timestamps
+    r'^INFO:',
+    r'^DEBUG:',
+    r'^WARNING:',
+    r'^ERROR:',
+    r'^CRITICAL:',
+)]
 
 
 class CleanLogFormatter(logging.Formatter):
@@ -21,16 +35,19 @@ class CleanLogFormatter(logging.Formatter):
     
     def __init__(self):
         super().__init__()
-        self.timezone = self._get_timezone()
+        # Records logged within the same second share one formatted timestamp
+        self._last_time = (None, None)  # (time key, formatted string), swapped as one tuple
     
-    def _get_timezone(self):
-        """Get the configured timezone"""
-        try:
-            from src.primary.utils.timezone_utils import get_user_timezone
-            return get_user_timezone()
-        except ImportError:
-            # Fallback to UTC if timezone utils not available
-            return pytz.UTC
+    def _format_timestamp(self, created: float) -> str:
+        """Timestamp in the user's timezone (cached service; follows timezone changes)"""
+        user_tz = get_user_timezone()
+        time_key = (int(created), user_tz)
+        last_key, last_str = self._last_time
+        if time_key == last_key:
+            return last_str
+        timestamp_str = datetime.fromtimestamp(time_key[0], tz=user_tz).strftime('%Y-%m-%d %H:%M:%S')
+        self._last_time = (time_key, timestamp_str)
+        return timestamp_str
     
     def _get_app_type_from_logger_name(self, logger_name: str) -> str:
         """Extract app type from logger name"""
@@ -60,33 +77,21 @@ class CleanLogFormatter(logging.Formatter):
             return ""
         
         # Remove ANSI color codes
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        message = ansi_escape.sub('', message)
+        message = _ANSI_ESCAPE.sub('', message)
         
         # Remove excessive whitespace
-        message = re.sub(r'\s+', ' ', message).strip()
+        message = _WHITESPACE.sub(' ', message).strip()
         
         # Remove common prefixes that add noise
-        prefixes_to_remove = [
-            r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ',  # Timestamp prefixes
-            r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] ',     # Bracketed timestamps
-            r'^INFO:',
-            r'^DEBUG:',
-            r'^WARNING:',
-            r'^ERROR:',
-            r'^CRITICAL:',
-        ]
-        
-        for prefix_pattern in prefixes_to_remove:
-            message = re.sub(prefix_pattern, '', message)
+        for prefix_pattern in _NOISE_PREFIXES:
+            message = prefix_pattern.sub('', message)
         
         return message.strip()
     
     def format(self, record):
         """Format the log record into a clean message"""
         # Get timezone-aware timestamp
-        dt = datetime.fromtimestamp(record.created, tz=self.timezone)
-        timestamp_str = dt.strftime('%Y-%m-%d %H:%M:%S')
+        timestamp_str = self._format_timestamp(record.created)
         
         # Get app type from logger name
         app_type = self._get_app_type_from_logger_name(record.name)
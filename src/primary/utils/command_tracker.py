@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Shared Arr command-completion tracker.
+One tracker per Arr instance polls GET /command once per tick for every outstanding
+command ID and resolves a Future per command, so hunt loops can fire several
+searches and wait on them together instead of each blocking on its own
+command/{id} poll.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import requests
+
+from src.primary.utils.logger import get_logger
+from src.primary.settings_manager import get_ssl_verify_setting
+
+logger = get_logger("huntarr")
+
+API_VERSIONS = {
+    "sonarr": "v3",
+    "radarr": "v3",
+    "whisparr": "v3",
+    "eros": "v3",
+    "lidarr": "v1",
+    "readarr": "v1"
+}
+
+# Command statuses reported by the Arr apps
+COMPLETED_STATUSES = {"completed", "complete"}
+FAILED_STATUSES = {"failed", "aborted", "cancelled", "orphaned"}
+
+# The poller thread exits once nothing has been tracked for this long
+TRACKER_IDLE_TIMEOUT = 30
+
+# Shared session so trackers reuse connections
+session = requests.Session()
+
+
+class CommandTracker:
+    """Tracks outstanding commands on one Arr instance and resolves their futures"""
+
+    def __init__(self, app_type: str, api_url: str, api_key: str, api_timeout: int = 120, poll_interval: float = 1):
+        self.app_type = app_type
+        self.api_url = api_url.rstrip("/")
+        self.api_key = api_key
+        self.api_timeout = api_timeout
+        self.poll_interval = max(0.2, poll_interval)
+        self._waiters = {}  # command id -> (future, command name, deadline)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.polls = 0
+        self.queued_commands = 0  # Commands waiting in the Arr's own queue at the last poll
+
+    def update_connection(self, api_key: str, api_timeout: int, poll_interval: float):
+        """Pick up changed credentials or wait settings"""
+        self.api_key = api_key
+        self.api_timeout = api_timeout
+        self.poll_interval = max(0.2, poll_interval)
+
+    def track(self, command_id: Union[int, str], command_name: str = "Command", timeout: float = 600,
+              on_complete: Optional[Callable[[bool], None]] = None) -> Future:
+        """
+        Start tracking a command.
+
+        Args:
+            command_id: ID returned when the command was queued
+            command_name: Name used in log messages
+            timeout: Seconds before the command is given up on
+            on_complete: Optional callback(success) run when the command resolves
+
+        Returns:
+            Future resolving to True if the command completed, False if it failed,
+            was aborted, disappeared or timed out
+        """
+        future = Future()
+        if on_complete:
+            future.add_done_callback(lambda f: on_complete(f.result()))
+        with self._lock:
+            existing = self._waiters.get(command_id)
+            if existing:
+                # Already tracked; chain onto the existing future
+                existing[0].add_done_callback(lambda f: future.set_result(f.result()))
+                return future
+            self._waiters[command_id] = (future, command_name, time.time() + timeout)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"CommandTracker-{self.app_type}", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return future
+
+    def outstanding(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    def _run(self):
+        idle_since = None
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._lock:
+                if not self._waiters:
+                    idle_since = idle_since or time.time()
+                    if time.time() - idle_since >= TRACKER_IDLE_TIMEOUT:
+                        self._thread = None
+                        return
+                    continue
+            idle_since = None
+            try:
+                self._poll_once()
+            except Exception as e:
+                logger.error(f"Error polling {self.app_type} commands: {e}")
+            finally:
+                # Deadlines hold even while the instance cannot be polled
+                self._expire_overdue()
+
+    def _get(self, endpoint: str):
+        url = f"{self.api_url}/api/{API_VERSIONS.get(self.app_type, 'v3')}/{endpoint}"
+        response = session.get(url, headers={"X-Api-Key": self.api_key}, timeout=self.api_timeout,
+                               verify=get_ssl_verify_setting())
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def _poll_once(self):
+        """One GET /command for every outstanding ID, plus a direct lookup for any not listed"""
+        with self._lock:
+            command_ids = list(self._waiters)
+
+        self.polls += 1
+        statuses = {}
+        wanted = set(command_ids)
+        queued = 0
+        for command in self._get("command") or []:
+            if not isinstance(command, dict):
+                continue
+            status = (command.get("status") or command.get("state") or "").lower()
+            if status == "queued":
+                queued += 1
+            if command.get("id") in wanted:
+                statuses[command["id"]] = status
+        self.queued_commands = queued
+
+        for command_id in command_ids:
+            if command_id not in statuses:
+                # Finished commands can drop off the list; ask for this one directly
+                command = self._get(f"command/{command_id}")
+                statuses[command_id] = (command.get("status") or command.get("state") or "").lower() if command else None
+
+        resolved = []
+        with self._lock:
+            for command_id in command_ids:
+                future, command_name, _ = self._waiters[command_id]
+                status = statuses.get(command_id)
+                if status in COMPLETED_STATUSES:
+                    logger.debug(f"{self.app_type} {command_name} (ID: {command_id}) completed successfully")
+                    resolved.append((command_id, future, True))
+                elif status is None:
+                    logger.warning(f"{self.app_type} {command_name} (ID: {command_id}) is no longer known to the instance")
+                    resolved.append((command_id, future, False))
+                elif status in FAILED_STATUSES:
+                    logger.warning(f"{self.app_type} {command_name} (ID: {command_id}) {status}")
+                    resolved.append((command_id, future, False))
+            for command_id, _, _ in resolved:
+                del self._waiters[command_id]
+
+        # Resolve outside the lock; done callbacks may track new commands
+        for _, future, success in resolved:
+            future.set_result(success)
+
+    def _expire_overdue(self):
+        """Give up on every command past its deadline"""
+        now = time.time()
+        expired = []
+        with self._lock:
+            for command_id, (future, command_name, deadline) in list(self._waiters.items()):
+                if now >= deadline:
+                    logger.error(f"{self.app_type} command '{command_name}' (ID: {command_id}) timed out")
+                    expired.append(future)
+                    del self._waiters[command_id]
+
+        for future in expired:
+            future.set_result(False)
+
+
+_trackers: Dict[tuple, CommandTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_command_tracker(app_type: str, api_url: str, api_key: str, api_timeout: int = 120,
+                        poll_interval: float = 1) -> CommandTracker:
+    """Get the shared tracker for an Arr instance, creating it on first use"""
+    key = (app_type, api_url.rstrip("/"))
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = CommandTracker(app_type, api_url, api_key, api_timeout, poll_interval)
+        else:
+            tracker.update_connection(api_key, api_timeout, poll_interval)
+        return tracker
+
+
+def wait_for_commands(futures: Iterable[Future], stop_check: Callable[[], bool] = lambda: False) -> List[Optional[bool]]:
+    """
+    Wait for several tracked commands together.
+
+    Returns:
+        Result per future in the given order; None for any still pending when stop_check fired
+    """
+    futures = list(futures)
+    pending = set(futures)
+    while pending:
+        if stop_check():
+            logger.info(f"Stopping wait for {len(pending)} commands due to stop request")
+            break
+        _, pending = wait_futures(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+    return [future.result() if future.done() else None for future in futures]
+
+
+def track_command(app_type: str, api_url: str, api_key: str, api_timeout: int, command_id: Union[int, str],
+                  wait_delay: float, max_attempts: int, command_name: str = "Command") -> Future:
+    """
+    Track a command on the instance's shared tracker, with the command_wait_delay /
+    command_wait_attempts settings as tick and timeout.
+
+    Returns:
+        Future resolving to the command's success; already True when waiting is disabled
+    """
+    if wait_delay <= 0 or max_attempts <= 0:
+        logger.debug(f"Not waiting for command to complete (wait_delay={wait_delay}, max_attempts={max_attempts})")
+        future = Future()
+        future.set_result(True)  # Treat as successful since we're not checking
+        return future
+    tracker = get_command_tracker(app_type, api_url, api_key, api_timeout, wait_delay)
+    return tracker.track(command_id, command_name, wait_delay * max_attempts)
+
+
+def wait_for_command(app_type: str, api_url: str, api_key: str, api_timeout: int, command_id: Union[int, str],
+                     wait_delay: float, max_attempts: int, command_name: str = "Command",
+                     stop_check: Callable[[], bool] = lambda: False) -> bool:
+    """
+    Block until one command completes, via the instance's shared tracker.
+
+    Returns:
+        True if the command completed successfully (or waiting is disabled), False otherwise
+    """
+    future = track_command(app_type, api_url, api_key, api_timeout, command_id, wait_delay, max_attempts, command_name)
+    return bool(wait_for_commands([future], stop_check)[0])
@@ -8,13 +8,50 @@ import os
 import json
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Iterable, Iterator
+from datetime import datetime, timezone
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+# Rows read or written per transaction by bulk export/import of processed IDs
+BULK_BATCH_SIZE = 10000
+
+# Legacy Swaparr strike rows (not tied to an instance) that no instance's queue has matched
+# and that have not been struck for this long are dropped; strikes rebuild within a few cycles
+LEGACY_STRIKE_MAX_AGE = 86400
+
+# Callables invoked with no arguments after schedules are added, changed or deleted
+_schedule_listeners = []
+
+def register_schedule_listener(listener) -> None:
+    """Register a callable invoked whenever the schedules table changes."""
+    if listener not in _schedule_listeners:
+        _schedule_listeners.append(listener)
+
+def _notify_schedule_listeners():
+    for listener in list(_schedule_listeners):
+        try:
+            listener()
+        except Exception as e:
+            logger.warning(f"Schedule listener failed: {e}")
+
+# Callables invoked with no arguments after a user is created
+_user_listeners = []
+
+def register_user_listener(listener) -> None:
+    """Register a callable invoked whenever the users table changes."""
+    if listener not in _user_listeners:
+        _user_listeners.append(listener)
+
+def _notify_user_listeners():
+    for listener in list(_user_listeners):
+        try:
+            listener()
+        except Exception as e:
+            logger.warning(f"User listener failed: {e}")
+
 class HuntarrDatabase:
     """Database manager for all Huntarr configurations and settings"""
     
@@ -153,6 +190,15 @@ class HuntarrDatabase:
                 )
             ''')
             
+            # Trigger columns for cron/interval/one-shot schedules (for existing databases)
+            for column_def in ('trigger_config TEXT', "misfire_policy TEXT DEFAULT 'skip'", 'last_fired_at REAL'):
+                try:
+                    conn.execute(f'ALTER TABLE schedules ADD COLUMN {column_def}')
+                    logger.info(f"Added {column_def.split()[0]} column to schedules table")
+                except sqlite3.OperationalError:
+                    # Column already exists
+                    pass
+            
             # Create state_data table for state management (processed IDs and reset times)
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS state_data (
@@ -179,6 +225,47 @@ class HuntarrDatabase:
                 )
             ''')
             
+            # Create row-level Swaparr strike and removal tables (replace the per-app JSON blobs)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS swaparr_strikes (
+                    app_name TEXT NOT NULL,
+                    instance_name TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    item_name TEXT,
+                    strikes INTEGER NOT NULL DEFAULT 0,
+                    first_strike_time REAL,
+                    last_strike_time REAL,
+                    removed INTEGER NOT NULL DEFAULT 0,
+                    removed_time REAL,
+                    PRIMARY KEY (app_name, instance_name, item_id)
+                ) WITHOUT ROWID
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS swaparr_removed_items (
+                    app_name TEXT NOT NULL,
+                    instance_name TEXT NOT NULL,
+                    item_hash TEXT NOT NULL,
+                    item_name TEXT,
+                    size INTEGER,
+                    reason TEXT,
+                    removed_time REAL NOT NULL,
+                    PRIMARY KEY (app_name, instance_name, item_hash)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Lifetime Swaparr counters per app instance (totals stay in swaparr_stats)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS swaparr_instance_stats (
+                    app_name TEXT NOT NULL,
+                    instance_name TEXT NOT NULL,
+                    stat_key TEXT NOT NULL,
+                    stat_value INTEGER DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (app_name, instance_name, stat_key)
+                ) WITHOUT ROWID
+            ''')
+            
             # Create users table for authentication and user management
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS users (
@@ -195,6 +282,16 @@ class HuntarrDatabase:
                 )
             ''')
             
+            # Create sessions table for persisted login sessions (keyed by a hash of the session token)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_hash TEXT PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            
             # Create sponsors table for GitHub sponsors data
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS sponsors (
@@ -241,10 +338,17 @@ class HuntarrDatabase:
             conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_stats_key ON swaparr_stats(stat_key)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_app_type ON schedules(app_type)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_enabled ON schedules(enabled)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_time ON schedules(time_hour, time_minute)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_state_data_app_type ON state_data(app_type, state_type)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_state_app_name ON swaparr_state(app_name, state_type)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_removed_reason ON swaparr_removed_items(app_name, reason)')
+            # Expiry scans run across apps, so index removal time on its own
+            conn.execute('DROP INDEX IF EXISTS idx_swaparr_removed_time')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_removed_expiry ON swaparr_removed_items(removed_time)')
+            
+            self._migrate_swaparr_state_blobs(conn)
             
             conn.commit()
             logger.info(f"Database initialized at: {self.db_path}")
@@ -480,6 +584,80 @@ class HuntarrDatabase:
             logger.error(f"Error adding processed ID {media_id} for {app_type}/{instance_name}: {e}")
             return False
     
+    def iter_processed_ids(self, app_type: str = None, instance_name: str = None,
+                           batch_size: int = BULK_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield processed ID rows in insertion order, one batch per query, so exports
+        of large sets never hold the whole table in memory or keep a read open
+        """
+        conditions = ["id > ?"]
+        base_params = []
+        if app_type:
+            conditions.append("app_type = ?")
+            base_params.append(app_type)
+        if instance_name:
+            conditions.append("instance_name = ?")
+            base_params.append(instance_name)
+        query = f'''
+            SELECT id, app_type, instance_name, media_id, created_at
+            FROM stateful_processed_ids
+            WHERE {" AND ".join(conditions)}
+            ORDER BY id LIMIT ?
+        '''
+        
+        last_id = 0
+        while True:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute(query, [last_id] + base_params + [batch_size]).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield {
+                    "app_type": row["app_type"],
+                    "instance_name": row["instance_name"],
+                    "media_id": row["media_id"],
+                    "created_at": row["created_at"]
+                }
+            last_id = rows[-1]["id"]
+            if len(rows) < batch_size:
+                return
+    
+    def add_processed_ids_bulk(self, rows: Iterable[tuple], batch_size: int = BULK_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Insert (app_type, instance_name, media_id) tuples, committing once per batch.
+        Already known IDs are ignored, so an import can be re-run safely.
+        
+        Returns:
+            Dict with the number of rows received and actually inserted
+        """
+        received = 0
+        inserted = 0
+        batch = []
+        with sqlite3.connect(self.db_path) as conn:
+            def flush():
+                nonlocal inserted
+                before = conn.total_changes
+                conn.executemany('''
+                    INSERT OR IGNORE INTO stateful_processed_ids 
+                    (app_type, instance_name, media_id)
+                    VALUES (?, ?, ?)
+                ''', batch)
+                conn.commit()
+                inserted += conn.total_changes - before
+                batch.clear()
+            
+            for app_type, instance_name, media_id in rows:
+                batch.append((app_type, instance_name, str(media_id)))
+                received += 1
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        
+        logger.info(f"Bulk imported {inserted} of {received} processed IDs")
+        return {"received": received, "inserted": inserted}
+    
     def is_processed(self, app_type: str, instance_name: str, media_id: str) -> bool:
         """Check if a media ID has been processed for a specific app instance"""
         with sqlite3.connect(self.db_path) as conn:
@@ -654,6 +832,22 @@ class HuntarrDatabase:
             
             conn.commit()
     
+    def upsert_sleep_data(self, app_type: str, next_cycle_time: Optional[str], cycle_lock: bool,
+                          last_cycle_start: Optional[str], last_cycle_end: Optional[str]):
+        """Write an app's complete cycle state in one statement (no read-before-write)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO sleep_data (app_type, next_cycle_time, cycle_lock, last_cycle_start, last_cycle_end, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(app_type) DO UPDATE SET
+                    next_cycle_time = excluded.next_cycle_time,
+                    cycle_lock = excluded.cycle_lock,
+                    last_cycle_start = excluded.last_cycle_start,
+                    last_cycle_end = excluded.last_cycle_end,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (app_type, next_cycle_time, cycle_lock, last_cycle_start, last_cycle_end))
+            conn.commit()
+    
     def get_swaparr_stats(self) -> Dict[str, int]:
         """Get Swaparr statistics"""
         with sqlite3.connect(self.db_path) as conn:
@@ -669,13 +863,41 @@ class HuntarrDatabase:
             ''', (stat_key, value))
             conn.commit()
     
-    def increment_swaparr_stat(self, stat_key: str, increment: int = 1):
-        """Increment a Swaparr statistic"""
+    def apply_swaparr_stat_deltas(self, totals: Dict[str, int], instance_deltas: List[tuple]):
+        """
+        Add a batch of Swaparr counter increments in one transaction.
+
+        Args:
+            totals: stat_key -> increment for the overall totals
+            instance_deltas: (app_name, instance_name, stat_key, increment) tuples
+        """
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT OR REPLACE INTO swaparr_stats (stat_key, stat_value, updated_at)
-                VALUES (?, COALESCE((SELECT stat_value FROM swaparr_stats WHERE stat_key = ?), 0) + ?, CURRENT_TIMESTAMP)
-            ''', (stat_key, stat_key, increment))
+            conn.executemany('''
+                INSERT INTO swaparr_stats (stat_key, stat_value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(stat_key) DO UPDATE SET
+                    stat_value = stat_value + excluded.stat_value,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', list(totals.items()))
+            conn.executemany('''
+                INSERT INTO swaparr_instance_stats (app_name, instance_name, stat_key, stat_value, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(app_name, instance_name, stat_key) DO UPDATE SET
+                    stat_value = stat_value + excluded.stat_value,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', instance_deltas)
+            conn.commit()
+    
+    def get_swaparr_instance_stats(self) -> List[tuple]:
+        """Get per-instance Swaparr counters as (app_name, instance_name, stat_key, stat_value) rows"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('SELECT app_name, instance_name, stat_key, stat_value FROM swaparr_instance_stats')
+            return cursor.fetchall()
+    
+    def clear_swaparr_instance_stats(self):
+        """Delete all per-instance Swaparr counters"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM swaparr_instance_stats')
             conn.commit()
 
     # History methods moved to manager_database.py - Hunt Manager functionality
@@ -707,7 +929,11 @@ class HuntarrDatabase:
                     'days': json.loads(row['days']) if row['days'] else [],
                     'app': row['app_instance'],
                     'appType': row['app_type'],
-                    'enabled': bool(row['enabled'])
+                    'enabled': bool(row['enabled']),
+                    'trigger': json.loads(row['trigger_config']) if row['trigger_config'] else {'type': 'daily'},
+                    'misfirePolicy': row['misfire_policy'] or 'skip',
+                    'lastFired': row['last_fired_at'],
+                    'updatedAt': self._sqlite_timestamp(row['updated_at'])
                 }
                 
                 if row['app_type'] not in schedules:
@@ -724,6 +950,9 @@ class HuntarrDatabase:
     def save_schedules(self, schedules_data: Dict[str, List[Dict[str, Any]]]):
         """Save all schedules to database (replaces existing schedules)"""
         with sqlite3.connect(self.db_path) as conn:
+            # Keep last-fired state across the replace so saving never re-runs a schedule
+            last_fired = dict(conn.execute('SELECT id, last_fired_at FROM schedules').fetchall())
+            
             # Clear existing schedules
             conn.execute('DELETE FROM schedules')
             
@@ -747,23 +976,29 @@ class HuntarrDatabase:
                     # Convert days to JSON string
                     days_json = json.dumps(schedule.get('days', []))
                     
+                    schedule_id = schedule.get('id', f"{app_type}_{int(datetime.now().timestamp())}")
                     conn.execute('''
                         INSERT INTO schedules 
-                        (id, app_type, action, time_hour, time_minute, days, app_instance, enabled, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                        (id, app_type, action, time_hour, time_minute, days, app_instance, enabled,
+                         trigger_config, misfire_policy, last_fired_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                     ''', (
-                        schedule.get('id', f"{app_type}_{int(datetime.now().timestamp())}"),
+                        schedule_id,
                         app_type,
                         schedule.get('action', 'pause'),
                         time_hour,
                         time_minute,
                         days_json,
                         schedule.get('app', 'global'),
-                        schedule.get('enabled', True)
+                        schedule.get('enabled', True),
+                        self._trigger_config_json(schedule),
+                        schedule.get('misfirePolicy') or 'skip',
+                        last_fired.get(schedule_id)
                     ))
             
             conn.commit()
             logger.info("Saved all schedules to database")
+        _notify_schedule_listeners()
     
     def add_schedule(self, schedule_data: Dict[str, Any]) -> str:
         """Add a single schedule to database"""
@@ -787,10 +1022,12 @@ class HuntarrDatabase:
         days_json = json.dumps(schedule_data.get('days', []))
         
         with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('SELECT last_fired_at FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
             conn.execute('''
                 INSERT OR REPLACE INTO schedules 
-                (id, app_type, action, time_hour, time_minute, days, app_instance, enabled, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                (id, app_type, action, time_hour, time_minute, days, app_instance, enabled,
+                 trigger_config, misfire_policy, last_fired_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             ''', (
                 schedule_id,
                 schedule_data.get('appType', 'global'),
@@ -799,13 +1036,39 @@ class HuntarrDatabase:
                 time_minute,
                 days_json,
                 schedule_data.get('app', 'global'),
-                schedule_data.get('enabled', True)
+                schedule_data.get('enabled', True),
+                self._trigger_config_json(schedule_data),
+                schedule_data.get('misfirePolicy') or 'skip',
+                row[0] if row else None
             ))
             conn.commit()
             
         logger.info(f"Added/updated schedule {schedule_id}")
+        _notify_schedule_listeners()
         return schedule_id
     
+    @staticmethod
+    def _sqlite_timestamp(value) -> Optional[float]:
+        """Epoch seconds from a CURRENT_TIMESTAMP (UTC) column value"""
+        try:
+            return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _trigger_config_json(schedule: Dict[str, Any]) -> Optional[str]:
+        """Trigger dict as stored JSON; NULL for the classic daily schedule"""
+        trigger = schedule.get('trigger')
+        if not isinstance(trigger, dict) or trigger.get('type', 'daily') == 'daily':
+            return None
+        return json.dumps(trigger)
+    
+    def set_schedule_last_fired(self, schedule_id: str, fired_at: float):
+        """Record when a schedule last fired (scheduler state; does not notify schedule listeners)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('UPDATE schedules SET last_fired_at = ? WHERE id = ?', (fired_at, schedule_id))
+            conn.commit()
+    
     def delete_schedule(self, schedule_id: str):
         """Delete a schedule from database"""
         with sqlite3.connect(self.db_path) as conn:
@@ -816,6 +1079,7 @@ class HuntarrDatabase:
                 logger.info(f"Deleted schedule {schedule_id}")
             else:
                 logger.warning(f"Schedule {schedule_id} not found for deletion")
+        _notify_schedule_listeners()
     
     def update_schedule_enabled(self, schedule_id: str, enabled: bool):
         """Update the enabled status of a schedule"""
@@ -831,6 +1095,7 @@ class HuntarrDatabase:
                 logger.info(f"Updated schedule {schedule_id} enabled status to {enabled}")
             else:
                 logger.warning(f"Schedule {schedule_id} not found for update")
+        _notify_schedule_listeners()
 
     # State Management Methods
     def get_state_data(self, app_type: str, state_type: str) -> Any:
@@ -928,23 +1193,226 @@ class HuntarrDatabase:
             conn.commit()
             logger.debug(f"Set Swaparr state data for {app_name}/{state_type}")
 
-    def get_swaparr_strike_data(self, app_name: str) -> Dict[str, Any]:
-        """Get strike data for a specific Swaparr app"""
-        data = self.get_swaparr_state_data(app_name, "strikes")
-        return data if data is not None else {}
+    @staticmethod
+    def _iso_to_epoch(value: Any) -> Optional[float]:
+        """Convert a stored ISO timestamp (naive values are UTC) to epoch seconds"""
+        if not value:
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
 
-    def set_swaparr_strike_data(self, app_name: str, strike_data: Dict[str, Any]):
-        """Set strike data for a specific Swaparr app"""
-        self.set_swaparr_state_data(app_name, "strikes", strike_data)
+    def _migrate_swaparr_state_blobs(self, conn):
+        """Move legacy per-app strike/removed-item JSON blobs into the row-level tables"""
+        rows = conn.execute(
+            "SELECT app_name, state_type, state_data FROM swaparr_state WHERE state_type IN ('strikes', 'removed_items')"
+        ).fetchall()
+        if not rows:
+            return
+        
+        for app_name, state_type, state_data in rows:
+            try:
+                data = json.loads(state_data) or {}
+            except json.JSONDecodeError:
+                data = {}
+            
+            # Legacy blobs were not split per instance; an empty instance name marks them
+            if state_type == "strikes":
+                conn.executemany('''
+                    INSERT OR IGNORE INTO swaparr_strikes
+                    (app_name, instance_name, item_id, item_name, strikes, first_strike_time,
+                     last_strike_time, removed, removed_time)
+                    VALUES (?, '', ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (app_name, str(item_id), item.get("name"), item.get("strikes", 0),
+                     self._iso_to_epoch(item.get("first_strike_time")),
+                     self._iso_to_epoch(item.get("last_strike_time")),
+                     1 if item.get("removed") else 0,
+                     self._iso_to_epoch(item.get("removed_time")))
+                    for item_id, item in data.items() if isinstance(item, dict)
+                ])
+            else:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO swaparr_removed_items
+                    (app_name, instance_name, item_hash, item_name, size, reason, removed_time)
+                    VALUES (?, '', ?, ?, ?, ?, ?)
+                ''', [
+                    (app_name, item_hash, item.get("name"), item.get("size"), item.get("reason"),
+                     self._iso_to_epoch(item.get("removed_time")) or time.time())
+                    for item_hash, item in data.items() if isinstance(item, dict)
+                ])
+        
+        conn.execute("DELETE FROM swaparr_state WHERE state_type IN ('strikes', 'removed_items')")
+        logger.info(f"Migrated {len(rows)} Swaparr state blobs to row-level strike/removal tables")
 
-    def get_swaparr_removed_items(self, app_name: str) -> Dict[str, Any]:
-        """Get removed items data for a specific Swaparr app"""
-        data = self.get_swaparr_state_data(app_name, "removed_items")
-        return data if data is not None else {}
-    
-    def set_swaparr_removed_items(self, app_name: str, removed_items: Dict[str, Any]):
-        """Set removed items data for a specific Swaparr app"""
-        self.set_swaparr_state_data(app_name, "removed_items", removed_items)
+    def get_swaparr_strikes(self, app_name: str, instance_name: str,
+                            queue_ids: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get strike rows for a Swaparr app instance, keyed by queue item id.
+        Legacy rows (migrated under an empty instance name) are claimed only for item ids
+        in this instance's current queue (queue_ids), since queue ids are per instance.
+        Unclaimed legacy rows are dropped once they are LEGACY_STRIKE_MAX_AGE old.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            if instance_name and conn.execute(
+                "SELECT 1 FROM swaparr_strikes WHERE app_name = ? AND instance_name = '' LIMIT 1", (app_name,)
+            ).fetchone():
+                claimed = 0
+                if queue_ids:
+                    # Items the instance already tracks keep their own row
+                    claimed = conn.executemany('''
+                        UPDATE OR IGNORE swaparr_strikes SET instance_name = ?
+                        WHERE app_name = ? AND instance_name = '' AND item_id = ?
+                    ''', [(instance_name, app_name, str(item_id)) for item_id in queue_ids]).rowcount
+                dropped = conn.execute('''
+                    DELETE FROM swaparr_strikes
+                    WHERE app_name = ? AND instance_name = '' AND COALESCE(last_strike_time, 0) < ?
+                ''', (app_name, time.time() - LEGACY_STRIKE_MAX_AGE)).rowcount
+                conn.commit()
+                if claimed > 0:
+                    logger.info(f"Assigned {claimed} legacy Swaparr strikes for {app_name} to instance '{instance_name}'")
+                if dropped > 0:
+                    logger.info(f"Dropped {dropped} stale legacy Swaparr strikes for {app_name}")
+            cursor = conn.execute('''
+                SELECT item_id, item_name, strikes, first_strike_time, last_strike_time, removed, removed_time
+                FROM swaparr_strikes WHERE app_name = ? AND instance_name = ?
+            ''', (app_name, instance_name))
+            return {
+                row[0]: {
+                    "name": row[1],
+                    "strikes": row[2],
+                    "first_strike_time": row[3],
+                    "last_strike_time": row[4],
+                    "removed": bool(row[5]),
+                    "removed_time": row[6]
+                }
+                for row in cursor.fetchall()
+            }
+
+    def upsert_swaparr_strikes(self, app_name: str, instance_name: str, strikes: Dict[str, Dict[str, Any]]):
+        """Insert or update the given strike rows for a Swaparr app instance in one transaction"""
+        if not strikes:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''
+                INSERT INTO swaparr_strikes
+                (app_name, instance_name, item_id, item_name, strikes, first_strike_time,
+                 last_strike_time, removed, removed_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(app_name, instance_name, item_id) DO UPDATE SET
+                    item_name = excluded.item_name,
+                    strikes = excluded.strikes,
+                    first_strike_time = excluded.first_strike_time,
+                    last_strike_time = excluded.last_strike_time,
+                    removed = excluded.removed,
+                    removed_time = excluded.removed_time
+            ''', [
+                (app_name, instance_name, str(item_id), item.get("name"), item.get("strikes", 0),
+                 item.get("first_strike_time"), item.get("last_strike_time"),
+                 1 if item.get("removed") else 0, item.get("removed_time"))
+                for item_id, item in strikes.items()
+            ])
+            conn.commit()
+
+    def load_swaparr_removed_index(self, since: float) -> List[tuple]:
+        """Get (app_name, instance_name, item_hash, removed_time) for removals after `since`, oldest first"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('''
+                SELECT app_name, instance_name, item_hash, removed_time FROM swaparr_removed_items
+                WHERE removed_time >= ? ORDER BY removed_time
+            ''', (since,))
+            return cursor.fetchall()
+
+    def prune_swaparr_removed_items(self, before: float) -> int:
+        """Delete removed-item rows older than `before` and return how many were deleted"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('DELETE FROM swaparr_removed_items WHERE removed_time < ?', (before,))
+            conn.commit()
+            return cursor.rowcount
+
+    def upsert_swaparr_removed_item(self, app_name: str, instance_name: str, item_hash: str,
+                                    item_name: str, size: int, reason: str, removed_time: float):
+        """Record (or refresh) a removed download for a Swaparr app instance"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO swaparr_removed_items
+                (app_name, instance_name, item_hash, item_name, size, reason, removed_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(app_name, instance_name, item_hash) DO UPDATE SET
+                    removed_time = excluded.removed_time,
+                    reason = COALESCE(excluded.reason, swaparr_removed_items.reason)
+            ''', (app_name, instance_name, item_hash, item_name, size, reason, removed_time))
+            conn.commit()
+
+    def clear_swaparr_strikes(self, app_name: str = None):
+        """Delete strike rows for one Swaparr app, or for all apps"""
+        with sqlite3.connect(self.db_path) as conn:
+            if app_name:
+                conn.execute('DELETE FROM swaparr_strikes WHERE app_name = ?', (app_name,))
+            else:
+                conn.execute('DELETE FROM swaparr_strikes')
+            conn.commit()
+
+    def clear_swaparr_removed_items(self, app_name: str = None):
+        """Delete removed-item rows for one Swaparr app, or for all apps"""
+        with sqlite3.connect(self.db_path) as conn:
+            if app_name:
+                conn.execute('DELETE FROM swaparr_removed_items WHERE app_name = ?', (app_name,))
+            else:
+                conn.execute('DELETE FROM swaparr_removed_items')
+            conn.commit()
+
+    def get_swaparr_strike_summary(self, app_name: str) -> Dict[str, Any]:
+        """Aggregate strike and removal counts for a Swaparr app with SQL, overall and per instance"""
+        with sqlite3.connect(self.db_path) as conn:
+            strike_rows = conn.execute('''
+                SELECT instance_name, COUNT(*),
+                       SUM(CASE WHEN strikes > 0 AND removed = 0 THEN 1 ELSE 0 END),
+                       SUM(removed)
+                FROM swaparr_strikes WHERE app_name = ?
+                GROUP BY instance_name
+            ''', (app_name,)).fetchall()
+            reason_rows = conn.execute('''
+                SELECT instance_name, COALESCE(reason, 'Unknown'), COUNT(*)
+                FROM swaparr_removed_items WHERE app_name = ?
+                GROUP BY instance_name, reason
+            ''', (app_name,)).fetchall()
+        
+        summary = {
+            "total_tracked": 0,
+            "currently_striked": 0,
+            "removed_via_strikes": 0,
+            "total_removed": 0,
+            "removal_reasons": {},
+            "instances": {}
+        }
+        
+        def instance_entry(name):
+            return summary["instances"].setdefault(name or "legacy", {
+                "total_tracked": 0, "currently_striked": 0, "removed_via_strikes": 0, "total_removed": 0
+            })
+        
+        for instance_name, tracked, striked, removed in strike_rows:
+            entry = instance_entry(instance_name)
+            entry["total_tracked"] = tracked
+            entry["currently_striked"] = striked or 0
+            entry["removed_via_strikes"] = removed or 0
+            summary["total_tracked"] += tracked
+            summary["currently_striked"] += striked or 0
+            summary["removed_via_strikes"] += removed or 0
+        
+        for instance_name, reason, count in reason_rows:
+            instance_entry(instance_name)["total_removed"] += count
+            summary["total_removed"] += count
+            summary["removal_reasons"][reason] = summary["removal_reasons"].get(reason, 0) + count
+        
+        return summary
 
     # Reset Request Management Methods (replaces file-based reset system)
     
@@ -990,6 +1458,47 @@ class HuntarrDatabase:
             logger.error(f"Error marking reset request as processed for {app_type}: {e}")
             return False
 
+    # Session Methods
+    def save_session(self, session_hash: str, username: str, created_at: float, expires_at: float):
+        """Insert or refresh a persisted login session"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO sessions (session_hash, username, created_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(session_hash) DO UPDATE SET expires_at = excluded.expires_at
+            ''', (session_hash, username, created_at, expires_at))
+            conn.commit()
+    
+    def get_session(self, session_hash: str) -> Optional[Dict[str, Any]]:
+        """Get an unexpired persisted session"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''
+                SELECT username, created_at, expires_at FROM sessions
+                WHERE session_hash = ? AND expires_at > ?
+            ''', (session_hash, time.time())).fetchone()
+            if row:
+                return {"username": row[0], "created_at": row[1], "expires_at": row[2]}
+            return None
+    
+    def delete_session(self, session_hash: str):
+        """Delete a persisted session"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM sessions WHERE session_hash = ?', (session_hash,))
+            conn.commit()
+    
+    def prune_sessions(self, max_sessions: int) -> int:
+        """Delete expired sessions, then the oldest beyond max_sessions. Returns rows deleted."""
+        with sqlite3.connect(self.db_path) as conn:
+            deleted = conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (time.time(),)).rowcount
+            if max_sessions > 0:
+                deleted += conn.execute('''
+                    DELETE FROM sessions WHERE session_hash NOT IN (
+                        SELECT session_hash FROM sessions ORDER BY expires_at DESC LIMIT ?
+                    )
+                ''', (max_sessions,)).rowcount
+            conn.commit()
+            return deleted
+    
     # User Management Methods
     def user_exists(self) -> bool:
         """Check if any user exists in the database"""
@@ -1054,7 +1563,8 @@ class HuntarrDatabase:
                 ''', (username, password, two_fa_enabled, two_fa_secret, plex_token, plex_data_json))
                 conn.commit()
                 logger.info(f"Created user: {username}")
-                return True
+            _notify_user_listeners()
+            return True
         except Exception as e:
             logger.error(f"Error creating user {username}: {e}")
             return False
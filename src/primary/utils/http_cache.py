@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Conditional, compressed JSON responses for the endpoints the dashboard polls.
+Each endpoint names a version that changes whenever its data does (a write counter,
+or a time bucket where there is no change signal). The JSON body, its ETag and its
+compressed forms are built once per version and kept in memory, a poll that sends
+a matching If-None-Match gets an empty 304, and larger bodies go out gzip or brotli
+encoded when the client accepts it.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from flask import Response, current_app, request
+from werkzeug.http import quote_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Optional; gzip is used when it is not installed
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Snapshots kept across all endpoints and query variants (least recently used dropped)
+MAX_SNAPSHOTS = 128
+
+_snapshots = OrderedDict()  # key -> snapshot dict
+_lock = threading.Lock()
+
+
+def ttl_version(seconds: float) -> int:
+    """A version that changes every `seconds`, for data without a change counter"""
+    return int(time.time() // seconds)
+
+
+def _build_snapshot(version: Hashable, payload: Any, status: int) -> Dict[str, Any]:
+    body = current_app.json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return {
+        "version": version,
+        "status": status,
+        "body": body,
+        "etag": hashlib.sha1(body).hexdigest(),
+        "encoded": {}
+    }
+
+
+def _choose_encoding(size: int) -> str:
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    accept = request.accept_encodings
+    if brotli is not None and accept.quality("br") > 0:
+        return "br"
+    if accept.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def _encoded_body(snapshot: Dict[str, Any], encoding: str) -> bytes:
+    body = snapshot["encoded"].get(encoding)
+    if body is None:
+        if encoding == "br":
+            body = brotli.compress(snapshot["body"], quality=BROTLI_QUALITY)
+        else:
+            body = gzip.compress(snapshot["body"], compresslevel=GZIP_LEVEL, mtime=0)
+        snapshot["encoded"][encoding] = body
+    return body
+
+
+def cached_json_response(key: Hashable, version: Hashable,
+                         builder: Callable[[], Any], headers: Dict[str, str] = None) -> Response:
+    """
+    Serve a JSON payload from the snapshot for (key, version), building it on a miss.
+
+    Args:
+        key: Identifies the endpoint and any query arguments that shape the payload
+        version: Changes whenever the payload would; an unchanged version reuses the snapshot
+        builder: Returns the payload, or (payload, status). Only 200 responses are kept
+        headers: Extra headers for every response (including 304s)
+
+    Returns:
+        A 304 when the client's If-None-Match matches, otherwise the (possibly compressed) JSON
+    """
+    with _lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and snapshot["version"] == version:
+            _snapshots.move_to_end(key)
+        else:
+            snapshot = None
+
+    if snapshot is None:
+        result = builder()
+        payload, status = result if isinstance(result, tuple) else (result, 200)
+        snapshot = _build_snapshot(version, payload, status)
+        if status == 200:
+            with _lock:
+                _snapshots[key] = snapshot
+                _snapshots.move_to_end(key)
+                while len(_snapshots) > MAX_SNAPSHOTS:
+                    _snapshots.popitem(last=False)
+
+    response_headers = {
+        # Weak, so the same tag is valid for the identity and compressed forms
+        "ETag": quote_etag(snapshot["etag"], weak=True),
+        # Clients may keep the body but must revalidate before using it
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if headers:
+        response_headers.update(headers)
+
+    if snapshot["status"] == 200 and request.if_none_match.contains_weak(snapshot["etag"]):
+        return Response(status=304, headers=response_headers)
+
+    body = snapshot["body"]
+    encoding = _choose_encoding(len(body))
+    if encoding:
+        body = _encoded_body(snapshot, encoding)
+        response_headers["Content-Encoding"] = encoding
+    return Response(body, status=snapshot["status"], mimetype="application/json", headers=response_headers)
+
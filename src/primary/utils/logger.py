@@ -9,10 +9,12 @@ import sys
 import os
 import pathlib
 import time
+import datetime
 from typing import Dict, Optional
 
 # Use the centralized path configuration
 from src.primary.utils.config_paths import LOG_DIR
+from src.primary.utils.timezone_utils import get_user_timezone, get_timezone_name
 
 # Log directory is already created by config_paths module
 # LOG_DIR already exists as pathlib.Path object pointing to the correct location
@@ -41,34 +43,22 @@ class LocalTimeFormatter(logging.Formatter):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.converter = time.localtime  # Still use local time as fallback
-    
-    def _get_user_timezone(self):
-        """Get the user's selected timezone from general settings"""
-        try:
-            from src.primary.utils.timezone_utils import get_user_timezone
-            return get_user_timezone()
-        except Exception:
-            # Final fallback if timezone_utils can't be imported
-            import pytz
-            return pytz.UTC
+        # Records logged within the same second share one formatted timestamp
+        self._last_time = (None, None)  # (time key, formatted string), swapped as one tuple
     
     def formatTime(self, record, datefmt=None):
         try:
-            # Try to use user's selected timezone
-            user_tz = self._get_user_timezone()
-            import datetime
-            ct = datetime.datetime.fromtimestamp(record.created, tz=user_tz)
+            # Use the user's selected timezone (cached until settings change)
+            user_tz = get_user_timezone()
+            time_key = (int(record.created), user_tz, datefmt)
+            last_key, last_str = self._last_time
+            if time_key == last_key:
+                return last_str
             
-            if datefmt:
-                s = ct.strftime(datefmt)
-            else:
-                # Use timezone-aware format
-                s = ct.strftime("%Y-%m-%d %H:%M:%S")
-                
+            ct = datetime.datetime.fromtimestamp(time_key[0], tz=user_tz)
             # Add timezone information for clarity
-            timezone_name = str(user_tz)
-            s += f" {timezone_name}"
-            
+            s = f"{ct.strftime(datefmt or '%Y-%m-%d %H:%M:%S')} {get_timezone_name()}"
+            self._last_time = (time_key, s)
             return s
         except Exception:
             # Fallback to system local time if timezone handling fails
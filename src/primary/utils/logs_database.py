@@ -22,6 +22,9 @@ class LogsDatabase:
     
     def __init__(self):
         self.db_path = self._get_database_path()
+        # Bumped on every write so API responses can be cached per version
+        self.version = 0
+        self._version_lock = threading.Lock()
         self.ensure_database_exists()
     
     def _get_database_path(self) -> Path:
@@ -32,6 +35,10 @@ class LogsDatabase:
         db_path = Path(config_dir) / "logs.db"
         return db_path
     
+    def _bump_version(self):
+        with self._version_lock:
+            self.version += 1
+    
     def ensure_database_exists(self):
         """Create the logs database and tables if they don't exist"""
         try:
@@ -69,6 +76,7 @@ class LogsDatabase:
                     VALUES (?, ?, ?, ?, ?)
                 ''', (timestamp.isoformat(), level, app_type, message, logger_name))
                 conn.commit()
+            self._bump_version()
         except Exception as e:
             # Don't use logger here to avoid infinite recursion
             print(f"Error inserting log entry: {e}")
@@ -162,6 +170,7 @@ class LogsDatabase:
                 conn.commit()
                 
                 if deleted_by_age > 0 or total_deleted_by_count > 0:
+                    self._bump_version()
                     print(f"Cleaned up logs: {deleted_by_age} by age, {total_deleted_by_count} by count")
                 
                 return deleted_by_age + total_deleted_by_count
@@ -200,6 +209,7 @@ class LogsDatabase:
                 
                 deleted_count = cursor.rowcount
                 conn.commit()
+                self._bump_version()
                 
                 print(f"Cleared {deleted_count} logs" + (f" for {app_type}" if app_type else ""))
                 return deleted_count
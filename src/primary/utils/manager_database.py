@@ -7,18 +7,40 @@ import os
 import json
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator
 from datetime import datetime
 import logging
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+# Minimum search length served by the trigram full-text index; shorter queries fall back to LIKE
+FTS_TRIGRAM_MIN_QUERY = 3
+
+# Local-time readable timestamp, derived from date_time instead of being stored per row
+READABLE_DATE_SQL = "strftime('%Y-%m-%d %H:%M:%S', date_time, 'unixepoch', 'localtime')"
+# Columns read back from hunt_history; the stored date_time_readable is left out in favour of READABLE_DATE_SQL
+HISTORY_COLUMNS = "id, app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, created_at"
+
+# Rows rolled up and deleted per transaction when applying history retention
+RETENTION_CHUNK_SIZE = 5000
+# Free pages returned to the filesystem per incremental vacuum pass
+INCREMENTAL_VACUUM_PAGES = 2000
+# Rows read or written per transaction by bulk export/import of hunt history
+BULK_BATCH_SIZE = 5000
+
 class ManagerDatabase:
     """Database manager for Hunt Manager functionality"""
     
     def __init__(self):
         self.db_path = self._get_database_path()
+        self.fts_tokenizer = None  # 'trigram', 'unicode61' or None if FTS5 is unavailable
+        self._totals_cache = {}  # Format: {app_type or 'all': unfiltered row count}
+        self._totals_lock = threading.Lock()
+        self._totals_generation = 0  # Bumped on every insert or invalidation so a racing COUNT(*) is not cached
+        self.readable_column_required = False  # Legacy NOT NULL date_time_readable column must still be written
+        self.incremental_vacuum = False  # auto_vacuum = INCREMENTAL is in effect
         self.ensure_database_exists()
     
     def _get_database_path(self) -> Path:
@@ -42,7 +64,16 @@ class ManagerDatabase:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute('PRAGMA foreign_keys = ON')
             
-            # Create hunt_history table for tracking processed media history
+            # Incremental auto-vacuum lets retention cleanup hand space back without a full VACUUM.
+            # A new database takes the setting before its first table; existing ones are switched
+            # later by the retention thread (enable_incremental_vacuum).
+            if not conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+                conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            self.incremental_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+            
+            # Create hunt_history table for tracking processed media history.
+            # The readable timestamp is derived from date_time when reading; date_time_readable
+            # is kept (nullable, no longer written) so older releases can still use the table.
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS hunt_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -53,20 +84,182 @@ class ManagerDatabase:
                     operation_type TEXT DEFAULT 'missing',
                     discovered BOOLEAN DEFAULT FALSE,
                     date_time INTEGER NOT NULL,
-                    date_time_readable TEXT NOT NULL,
+                    date_time_readable TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            self._check_readable_column(conn)
+            
+            # Monthly roll-ups of entries removed by retention, so lifetime counts survive cleanup
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS hunt_history_monthly (
+                    app_type TEXT NOT NULL,
+                    instance_name TEXT NOT NULL,
+                    operation_type TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    entry_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (app_type, instance_name, operation_type, month)
+                ) WITHOUT ROWID
+            ''')
             
             # Create indexes for better performance
             conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_app_instance ON hunt_history(app_type, instance_name)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_date_time ON hunt_history(date_time)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_media_id ON hunt_history(media_id)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_operation_type ON hunt_history(operation_type)')
+            # Keyset pagination indexes: newest first, id as tie-breaker
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_keyset ON hunt_history(date_time DESC, id DESC)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_app_keyset ON hunt_history(app_type, date_time DESC, id DESC)')
+            
+            self._ensure_fts_index(conn)
             
             conn.commit()
             logger.info(f"Manager database initialized at: {self.db_path}")
 
+    def _check_readable_column(self, conn):
+        """Whether date_time_readable must still be written (NOT NULL in tables created by older versions)"""
+        # PRAGMA table_info rows: (cid, name, type, notnull, default, pk)
+        columns = {row[1]: row[3] for row in conn.execute("PRAGMA table_info(hunt_history)").fetchall()}
+        self.readable_column_required = bool(columns.get('date_time_readable'))
+
+    def _insert_history_row(self, conn, app_type: str, instance_name: str, media_id: str,
+                            processed_info: str, operation_type: str, discovered: bool,
+                            date_time: int) -> int:
+        """Insert one hunt_history row on an open connection and return its id"""
+        if self.readable_column_required:
+            date_time_readable = datetime.fromtimestamp(date_time).strftime('%Y-%m-%d %H:%M:%S')
+            cursor = conn.execute('''
+                INSERT INTO hunt_history 
+                (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable))
+        else:
+            cursor = conn.execute('''
+                INSERT INTO hunt_history 
+                (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time))
+        return cursor.lastrowid
+
+    def _ensure_fts_index(self, conn):
+        """Create the FTS5 search index over hunt_history, kept in sync by triggers"""
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='hunt_history_fts'"
+        ).fetchone()
+        if row:
+            self.fts_tokenizer = 'trigram' if 'trigram' in (row[0] or '') else 'unicode61'
+            return
+        
+        # Prefer the trigram tokenizer (SQLite 3.34+) which keeps substring-match semantics
+        for tokenizer in ('trigram', 'unicode61'):
+            try:
+                conn.execute(f'''
+                    CREATE VIRTUAL TABLE hunt_history_fts USING fts5(
+                        processed_info, instance_name, media_id,
+                        content='hunt_history', content_rowid='id',
+                        tokenize='{tokenizer}'
+                    )
+                ''')
+                self.fts_tokenizer = tokenizer
+                break
+            except sqlite3.OperationalError as e:
+                logger.debug(f"FTS5 tokenizer '{tokenizer}' unavailable: {e}")
+        
+        if not self.fts_tokenizer:
+            logger.warning("SQLite FTS5 is not available, hunt history search will use LIKE scans")
+            return
+        
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS hunt_history_fts_ai AFTER INSERT ON hunt_history BEGIN
+                INSERT INTO hunt_history_fts(rowid, processed_info, instance_name, media_id)
+                VALUES (new.id, new.processed_info, new.instance_name, new.media_id);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS hunt_history_fts_ad AFTER DELETE ON hunt_history BEGIN
+                INSERT INTO hunt_history_fts(hunt_history_fts, rowid, processed_info, instance_name, media_id)
+                VALUES ('delete', old.id, old.processed_info, old.instance_name, old.media_id);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS hunt_history_fts_au AFTER UPDATE ON hunt_history BEGIN
+                INSERT INTO hunt_history_fts(hunt_history_fts, rowid, processed_info, instance_name, media_id)
+                VALUES ('delete', old.id, old.processed_info, old.instance_name, old.media_id);
+                INSERT INTO hunt_history_fts(rowid, processed_info, instance_name, media_id)
+                VALUES (new.id, new.processed_info, new.instance_name, new.media_id);
+            END
+        ''')
+        # Index any rows that existed before the FTS table was created
+        conn.execute("INSERT INTO hunt_history_fts(hunt_history_fts) VALUES('rebuild')")
+        logger.info(f"Created hunt history full-text index (tokenizer: {self.fts_tokenizer})")
+
+    def _build_fts_query(self, search_query: str) -> Optional[str]:
+        """Translate a user search string into an FTS5 MATCH expression, or None to use LIKE"""
+        if not self.fts_tokenizer:
+            return None
+        
+        if self.fts_tokenizer == 'trigram':
+            if len(search_query) < FTS_TRIGRAM_MIN_QUERY:
+                return None
+            # Quote the whole string so it is matched as a literal substring
+            return '"' + search_query.replace('"', '""') + '"'
+        
+        # unicode61: prefix-match every word
+        terms = [term.replace('"', '""') for term in search_query.split()]
+        if not terms:
+            return None
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def _adjust_cached_total(self, app_type: str, delta: int):
+        """Keep the cached unfiltered totals in step with inserts"""
+        with self._totals_lock:
+            self._totals_generation += 1
+            for key in (app_type, 'all'):
+                if key in self._totals_cache:
+                    self._totals_cache[key] += delta
+
+    def invalidate_history_totals(self, app_type: str = None):
+        """Drop cached totals after bulk changes to hunt_history"""
+        with self._totals_lock:
+            self._totals_generation += 1
+            if app_type and app_type != "all":
+                self._totals_cache.pop(app_type, None)
+                self._totals_cache.pop('all', None)
+            else:
+                self._totals_cache.clear()
+
+    def _get_cached_total(self, conn, app_type: str = None) -> int:
+        """Get the unfiltered row count for an app type (or all), counting only on a cache miss"""
+        key = app_type if app_type and app_type != "all" else 'all'
+        with self._totals_lock:
+            if key in self._totals_cache:
+                return self._totals_cache[key]
+            generation = self._totals_generation
+        
+        if key == 'all':
+            total = conn.execute("SELECT COUNT(*) FROM hunt_history").fetchone()[0]
+        else:
+            total = conn.execute("SELECT COUNT(*) FROM hunt_history WHERE app_type = ?", (key,)).fetchone()[0]
+        
+        with self._totals_lock:
+            if generation == self._totals_generation:
+                self._totals_cache[key] = total
+        return total
+
+    @staticmethod
+    def encode_cursor(date_time: int, entry_id: int) -> str:
+        """Encode a keyset pagination cursor from the last row of a page"""
+        return f"{date_time}:{entry_id}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Optional[tuple]:
+        """Decode a keyset pagination cursor, returning (date_time, id) or None if invalid"""
+        try:
+            date_time, entry_id = str(cursor).split(':', 1)
+            return int(date_time), int(entry_id)
+        except (ValueError, AttributeError):
+            return None
+
     def add_hunt_history_entry(self, app_type: str, instance_name: str, media_id: str, 
                          processed_info: str, operation_type: str = "missing", 
                          discovered: bool = False, date_time: int = None) -> Dict[str, Any]:
@@ -77,14 +270,10 @@ class ManagerDatabase:
         date_time_readable = datetime.fromtimestamp(date_time).strftime('%Y-%m-%d %H:%M:%S')
         
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('''
-                INSERT INTO hunt_history 
-                (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable))
-            
-            entry_id = cursor.lastrowid
+            entry_id = self._insert_history_row(conn, app_type, instance_name, media_id, processed_info,
+                                                operation_type, discovered, date_time)
             conn.commit()
+            self._adjust_cached_total(app_type, 1)
             
             # Return the created entry
             entry = {
@@ -102,9 +291,44 @@ class ManagerDatabase:
             logger.info(f"Added hunt history entry for {app_type}-{instance_name}: {processed_info}")
             return entry
 
+    def add_hunt_history_entries(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert a batch of hunt history entries in a single transaction"""
+        if not entries:
+            return []
+        
+        created = []
+        with sqlite3.connect(self.db_path) as conn:
+            for entry_data in entries:
+                date_time = entry_data.get("date_time") or int(time.time())
+                entry_id = self._insert_history_row(
+                    conn,
+                    entry_data["app_type"],
+                    entry_data["instance_name"],
+                    entry_data["media_id"],
+                    entry_data["processed_info"],
+                    entry_data.get("operation_type", "missing"),
+                    entry_data.get("discovered", False),
+                    date_time
+                )
+                created.append(dict(entry_data, id=entry_id, date_time=date_time,
+                                    date_time_readable=datetime.fromtimestamp(date_time).strftime('%Y-%m-%d %H:%M:%S')))
+            conn.commit()
+        
+        for entry in created:
+            self._adjust_cached_total(entry["app_type"], 1)
+        
+        logger.debug(f"Added {len(created)} hunt history entries in one batch")
+        return created
+
     def get_hunt_history(self, app_type: str = None, search_query: str = None, 
-                   page: int = 1, page_size: int = 20) -> Dict[str, Any]:
-        """Get hunt history entries with pagination and filtering"""
+                   page: int = 1, page_size: int = 20, cursor: str = None) -> Dict[str, Any]:
+        """
+        Get hunt history entries with pagination and filtering
+        
+        Rows are returned newest first, ordered by (date_time, id). When a cursor
+        from a previous page's next_cursor is given, the page is fetched by keyset
+        (no OFFSET scan); otherwise the page number is used.
+        """
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             
@@ -116,24 +340,32 @@ class ManagerDatabase:
                 where_conditions.append("app_type = ?")
                 params.append(app_type)
             
-            if search_query and search_query.strip():
-                search_query = search_query.lower()
-                where_conditions.append("""
-                    (LOWER(processed_info) LIKE ? OR 
-                     LOWER(instance_name) LIKE ? OR 
-                     LOWER(media_id) LIKE ?)
-                """)
-                search_param = f"%{search_query}%"
-                params.extend([search_param, search_param, search_param])
+            search_query = search_query.strip() if search_query else ""
+            if search_query:
+                fts_query = self._build_fts_query(search_query)
+                if fts_query:
+                    where_conditions.append("id IN (SELECT rowid FROM hunt_history_fts WHERE hunt_history_fts MATCH ?)")
+                    params.append(fts_query)
+                else:
+                    search_query = search_query.lower()
+                    where_conditions.append("""
+                        (LOWER(processed_info) LIKE ? OR 
+                         LOWER(instance_name) LIKE ? OR 
+                         LOWER(media_id) LIKE ?)
+                    """)
+                    search_param = f"%{search_query}%"
+                    params.extend([search_param, search_param, search_param])
             
             where_clause = ""
             if where_conditions:
                 where_clause = "WHERE " + " AND ".join(where_conditions)
             
-            # Get total count
-            count_query = f"SELECT COUNT(*) FROM hunt_history {where_clause}"
-            cursor = conn.execute(count_query, params)
-            total_entries = cursor.fetchone()[0]
+            # Get total count - unfiltered totals are cached per app type
+            if search_query:
+                count_query = f"SELECT COUNT(*) FROM hunt_history {where_clause}"
+                total_entries = conn.execute(count_query, params).fetchone()[0]
+            else:
+                total_entries = self._get_cached_total(conn, app_type)
             
             # Calculate pagination
             total_pages = (total_entries + page_size - 1) // page_size if total_entries > 0 else 1
@@ -144,42 +376,301 @@ class ManagerDatabase:
             elif page > total_pages:
                 page = total_pages
             
-            # Get paginated entries
-            offset = (page - 1) * page_size
-            entries_query = f"""
-                SELECT * FROM hunt_history {where_clause}
-                ORDER BY date_time DESC
-                LIMIT ? OFFSET ?
-            """
-            cursor = conn.execute(entries_query, params + [page_size, offset])
+            keyset = self.decode_cursor(cursor) if cursor else None
+            if keyset:
+                keyset_condition = "(date_time, id) < (?, ?)"
+                keyset_where = f"{where_clause} AND {keyset_condition}" if where_clause else f"WHERE {keyset_condition}"
+                entries_query = f"""
+                    SELECT {HISTORY_COLUMNS}, {READABLE_DATE_SQL} AS date_time_readable FROM hunt_history {keyset_where}
+                    ORDER BY date_time DESC, id DESC
+                    LIMIT ?
+                """
+                query_params = params + [keyset[0], keyset[1], page_size]
+            else:
+                offset = (page - 1) * page_size
+                entries_query = f"""
+                    SELECT {HISTORY_COLUMNS}, {READABLE_DATE_SQL} AS date_time_readable FROM hunt_history {where_clause}
+                    ORDER BY date_time DESC, id DESC
+                    LIMIT ? OFFSET ?
+                """
+                query_params = params + [page_size, offset]
+            
+            rows = conn.execute(entries_query, query_params).fetchall()
             
             entries = []
             current_time = int(time.time())
             
-            for row in cursor.fetchall():
+            for row in rows:
                 entry = dict(row)
                 # Calculate "how long ago"
                 seconds_ago = current_time - entry["date_time"]
                 entry["how_long_ago"] = self._format_time_ago(seconds_ago)
                 entries.append(entry)
             
+            next_cursor = None
+            if len(entries) == page_size:
+                last_entry = entries[-1]
+                next_cursor = self.encode_cursor(last_entry["date_time"], last_entry["id"])
+            
             return {
                 "entries": entries,
                 "total_entries": total_entries,
                 "total_pages": total_pages,
-                "current_page": page
+                "current_page": page,
+                "next_cursor": next_cursor
             }
 
+    def iter_hunt_history(self, app_type: str = None, instance_name: str = None,
+                          batch_size: int = BULK_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield hunt history rows oldest first, one keyset batch per query, for streaming exports"""
+        conditions = ["id > ?"]
+        base_params = []
+        if app_type and app_type != "all":
+            conditions.append("app_type = ?")
+            base_params.append(app_type)
+        if instance_name:
+            conditions.append("instance_name = ?")
+            base_params.append(instance_name)
+        query = f'''
+            SELECT id, app_type, instance_name, media_id, processed_info,
+                   operation_type, discovered, date_time
+            FROM hunt_history
+            WHERE {" AND ".join(conditions)}
+            ORDER BY id LIMIT ?
+        '''
+        
+        last_id = 0
+        while True:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute(query, [last_id] + base_params + [batch_size]).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                entry = dict(row)
+                entry.pop("id")
+                entry["discovered"] = bool(entry["discovered"])
+                yield entry
+            last_id = rows[-1]["id"]
+            if len(rows) < batch_size:
+                return
+
+    def import_hunt_history(self, entries: Iterable[Dict[str, Any]], batch_size: int = BULK_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Insert exported hunt history entries, committing once per batch. An entry that
+        already exists (same app, instance, media, operation and timestamp) is skipped,
+        so the same file can be imported twice without duplicating history.
+        """
+        received = 0
+        inserted = 0
+        pending = 0
+        with sqlite3.connect(self.db_path) as conn:
+            for entry in entries:
+                received += 1
+                key = (entry["app_type"], entry["instance_name"], entry["media_id"],
+                       entry["operation_type"], entry["date_time"])
+                exists = conn.execute('''
+                    SELECT 1 FROM hunt_history
+                    WHERE app_type = ? AND instance_name = ? AND media_id = ?
+                      AND operation_type = ? AND date_time = ?
+                    LIMIT 1
+                ''', key).fetchone()
+                if exists:
+                    continue
+                self._insert_history_row(
+                    conn,
+                    entry["app_type"],
+                    entry["instance_name"],
+                    entry["media_id"],
+                    entry["processed_info"],
+                    entry["operation_type"],
+                    entry["discovered"],
+                    entry["date_time"]
+                )
+                inserted += 1
+                pending += 1
+                if pending >= batch_size:
+                    conn.commit()
+                    pending = 0
+            conn.commit()
+        
+        self.invalidate_history_totals()
+        logger.info(f"Bulk imported {inserted} of {received} hunt history entries")
+        return {"received": received, "inserted": inserted}
+
     def clear_hunt_history(self, app_type: str = None):
         """Clear hunt history entries"""
         with sqlite3.connect(self.db_path) as conn:
             if app_type and app_type != "all":
                 conn.execute("DELETE FROM hunt_history WHERE app_type = ?", (app_type,))
+                conn.execute("DELETE FROM hunt_history_monthly WHERE app_type = ?", (app_type,))
                 logger.info(f"Cleared hunt history for {app_type}")
             else:
                 conn.execute("DELETE FROM hunt_history")
+                conn.execute("DELETE FROM hunt_history_monthly")
                 logger.info("Cleared all hunt history")
             conn.commit()
+            conn.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+        self.invalidate_history_totals(app_type)
+
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Switch the database to incremental auto-vacuum, if it is not already.
+        
+        This takes one full VACUUM, which rewrites the whole file (needing as much free
+        disk space again) and locks the database while it runs, so the retention thread
+        only does it once a retention policy is enabled, never at startup.
+        
+        Returns:
+            True if incremental auto-vacuum is in effect
+        """
+        if self.incremental_vacuum:
+            return True
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                    conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                    conn.execute('VACUUM')
+                    logger.info("Enabled incremental auto-vacuum for manager.db")
+            self.incremental_vacuum = True
+        except sqlite3.Error as e:
+            logger.warning(f"Could not enable incremental auto-vacuum for manager.db, will retry later: {e}")
+        return self.incremental_vacuum
+
+    def _compact_history_rows(self, conn, app_type: str, upper_bound: tuple,
+                              before_time: int = None, chunk_size: int = RETENTION_CHUNK_SIZE) -> int:
+        """
+        Roll up and delete an app's rows at or below a (date_time, id) bound, oldest first,
+        committing one chunk at a time so writers are never blocked for long.
+        """
+        age_condition = " AND date_time < ?" if before_time is not None else ""
+        age_params = [before_time] if before_time is not None else []
+        removed = 0
+        
+        while True:
+            base_params = [app_type, upper_bound[0], upper_bound[1]] + age_params
+            # Find the (date_time, id) bound of the next chunk
+            row = conn.execute(f'''
+                SELECT date_time, id FROM hunt_history
+                WHERE app_type = ? AND (date_time, id) <= (?, ?){age_condition}
+                ORDER BY date_time, id
+                LIMIT 1 OFFSET ?
+            ''', base_params + [chunk_size - 1]).fetchone()
+            chunk_bound = (row[0], row[1]) if row else upper_bound
+            chunk_params = [app_type, chunk_bound[0], chunk_bound[1]] + age_params
+            chunk_where = f"app_type = ? AND (date_time, id) <= (?, ?){age_condition}"
+            
+            conn.execute(f'''
+                INSERT INTO hunt_history_monthly (app_type, instance_name, operation_type, month, entry_count)
+                SELECT app_type, instance_name, COALESCE(operation_type, 'missing'),
+                       strftime('%Y-%m', date_time, 'unixepoch'), COUNT(*)
+                FROM hunt_history
+                WHERE {chunk_where}
+                GROUP BY app_type, instance_name, COALESCE(operation_type, 'missing'), strftime('%Y-%m', date_time, 'unixepoch')
+                ON CONFLICT(app_type, instance_name, operation_type, month)
+                DO UPDATE SET entry_count = entry_count + excluded.entry_count
+            ''', chunk_params)
+            deleted = conn.execute(f"DELETE FROM hunt_history WHERE {chunk_where}", chunk_params).rowcount
+            conn.commit()
+            
+            removed += deleted
+            if deleted:
+                self._adjust_cached_total(app_type, -deleted)
+            if not row or deleted == 0:
+                break
+        
+        return removed
+
+    def apply_history_retention(self, app_type: str, max_age_days: int = 0, max_entries: int = 0,
+                                chunk_size: int = RETENTION_CHUNK_SIZE) -> Dict[str, int]:
+        """
+        Trim an app's hunt history by age and row count
+        
+        Removed rows are rolled into hunt_history_monthly first, so lifetime counts
+        are preserved. Deletes run in chunks followed by an incremental vacuum.
+        
+        Args:
+            app_type: The app type to trim
+            max_age_days: Remove entries older than this many days (0 = keep all)
+            max_entries: Keep at most this many of the newest entries (0 = unlimited)
+            chunk_size: Rows rolled up and deleted per transaction
+            
+        Returns:
+            Dict with the number of rows removed by age and by count
+        """
+        removed_by_age = 0
+        removed_by_count = 0
+        
+        with sqlite3.connect(self.db_path) as conn:
+            if max_age_days and max_age_days > 0:
+                cutoff = int(time.time()) - int(max_age_days) * 86400
+                newest = conn.execute('''
+                    SELECT date_time, id FROM hunt_history
+                    WHERE app_type = ? AND date_time < ?
+                    ORDER BY date_time DESC, id DESC LIMIT 1
+                ''', (app_type, cutoff)).fetchone()
+                if newest:
+                    removed_by_age = self._compact_history_rows(conn, app_type, (newest[0], newest[1]),
+                                                                before_time=cutoff, chunk_size=chunk_size)
+            
+            if max_entries and max_entries > 0:
+                # The newest row that falls outside the allowed count
+                boundary = conn.execute('''
+                    SELECT date_time, id FROM hunt_history
+                    WHERE app_type = ?
+                    ORDER BY date_time DESC, id DESC
+                    LIMIT 1 OFFSET ?
+                ''', (app_type, int(max_entries))).fetchone()
+                if boundary:
+                    removed_by_count = self._compact_history_rows(conn, app_type, (boundary[0], boundary[1]),
+                                                                  chunk_size=chunk_size)
+            
+            if removed_by_age or removed_by_count:
+                conn.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+                logger.info(f"Hunt history retention for {app_type}: removed {removed_by_age} by age, "
+                            f"{removed_by_count} by count (rolled into monthly summaries)")
+        
+        return {"removed_by_age": removed_by_age, "removed_by_count": removed_by_count}
+
+    def get_history_summary(self, app_type: str = None) -> Dict[str, Any]:
+        """
+        Get lifetime hunt counts per app and operation type, combining live rows
+        with the monthly roll-ups of rows removed by retention.
+        """
+        where_clause = ""
+        params = []
+        if app_type and app_type != "all":
+            where_clause = "WHERE app_type = ?"
+            params.append(app_type)
+        
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(f'''
+                SELECT app_type, operation_type, SUM(entry_count) FROM (
+                    SELECT app_type, COALESCE(operation_type, 'missing') AS operation_type, COUNT(*) AS entry_count
+                    FROM hunt_history {where_clause}
+                    GROUP BY app_type, COALESCE(operation_type, 'missing')
+                    UNION ALL
+                    SELECT app_type, operation_type, entry_count
+                    FROM hunt_history_monthly {where_clause}
+                )
+                GROUP BY app_type, operation_type
+            ''', params + params).fetchall()
+            
+            monthly_rows = conn.execute(f'''
+                SELECT app_type, month, SUM(entry_count) FROM hunt_history_monthly {where_clause}
+                GROUP BY app_type, month
+                ORDER BY month
+            ''', params).fetchall()
+        
+        summary = {}
+        for row_app, operation_type, count in rows:
+            app_summary = summary.setdefault(row_app, {"total": 0, "by_operation": {}, "archived_months": {}})
+            app_summary["by_operation"][operation_type] = count
+            app_summary["total"] += count
+        for row_app, month, count in monthly_rows:
+            app_summary = summary.setdefault(row_app, {"total": 0, "by_operation": {}, "archived_months": {}})
+            app_summary["archived_months"][month] = count
+        return summary
 
     def handle_instance_rename(self, app_type: str, old_instance_name: str, new_instance_name: str):
         """Handle renaming of an instance by updating hunt history entries"""
@@ -231,22 +722,19 @@ class ManagerDatabase:
                 # Insert into manager database
                 with sqlite3.connect(self.db_path) as dest_conn:
                     for entry in history_entries:
-                        dest_conn.execute('''
-                            INSERT INTO hunt_history 
-                            (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
+                        self._insert_history_row(
+                            dest_conn,
                             entry['app_type'],
                             entry['instance_name'],
                             entry['media_id'],
                             entry['processed_info'],
                             entry['operation_type'],
                             entry['discovered'],
-                            entry['date_time'],
-                            entry['date_time_readable']
-                        ))
+                            entry['date_time']
+                        )
                     
                     dest_conn.commit()
+                    self.invalidate_history_totals()
                     logger.info(f"Migrated {len(history_entries)} history entries to manager.db")
                 
                 # Drop the history table from huntarr.db
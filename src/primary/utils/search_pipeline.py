@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Pipelined search dispatch.
+Keeps up to a configurable number of search commands in flight per Arr instance:
+a new search is sent as soon as an earlier one completes, instead of firing every
+search at once or waiting for each in turn. Dispatch also holds back while the
+Arr's own command queue is backed up. Completion callbacks (processed IDs, history,
+stats, tags) run on the hunt thread as each command finishes, and for searches still
+running when a stop is requested, so nothing already sent is lost. Items picked in a
+cycle can also be coalesced into multi-ID search commands (see chunk_items).
+"""
+
+from concurrent.futures import wait as wait_futures, FIRST_COMPLETED
+from typing import Any, Callable, List, Sequence, Union
+
+from src.primary.utils.logger import get_logger
+from src.primary.settings_manager import get_advanced_setting
+from src.primary.utils.command_tracker import get_command_tracker, track_command
+
+logger = get_logger("huntarr")
+
+# How often a blocked dispatch re-checks for completions, stop requests and queue depth
+SLOT_POLL_INTERVAL = 0.5
+
+
+def get_search_batch_size() -> int:
+    """IDs sent per search command (the search_batch_size setting, at least 1)"""
+    try:
+        return max(1, int(get_advanced_setting("search_batch_size", 10)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def chunk_items(items: Sequence[Any], batch_size: int = None) -> List[List[Any]]:
+    """
+    Split the items picked for a cycle into batches for multi-ID search commands.
+
+    Args:
+        items: Items in the order they should be searched
+        batch_size: Items per batch (defaults to the search_batch_size setting)
+
+    Returns:
+        List of batches, each a list of items
+    """
+    if batch_size is None:
+        batch_size = get_search_batch_size()
+    batch_size = max(1, batch_size)
+    items = list(items)
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+class SearchPipeline:
+    """Bounded window of in-flight search commands for one Arr instance"""
+
+    def __init__(self, app_type: str, api_url: str, api_key: str, api_timeout: int,
+                 wait_delay: float, wait_attempts: int, stop_check: Callable[[], bool] = lambda: False,
+                 window: int = None, max_queue_depth: int = None):
+        """
+        Args:
+            app_type: Arr app the searches run on
+            api_url, api_key, api_timeout: Instance connection details
+            wait_delay: command_wait_delay setting (seconds between command polls)
+            wait_attempts: command_wait_attempts setting (polls before a command times out)
+            stop_check: Returns True when the hunt should stop
+            window: Searches kept in flight (defaults to the search_pipeline_window setting)
+            max_queue_depth: Hold dispatch while the Arr has this many commands queued
+                (defaults to the max_arr_command_queue setting; 0 disables the check)
+        """
+        self.app_type = app_type
+        self.api_url = api_url
+        self.api_key = api_key
+        self.api_timeout = api_timeout
+        self.wait_delay = wait_delay
+        self.wait_attempts = wait_attempts
+        self.stop_check = stop_check
+        if window is None:
+            window = get_advanced_setting("search_pipeline_window", 3)
+        if max_queue_depth is None:
+            max_queue_depth = get_advanced_setting("max_arr_command_queue", 10)
+        self.window = max(1, int(window or 1))
+        self.max_queue_depth = max(0, int(max_queue_depth or 0))
+        self._in_flight = []  # (future, on_complete, context)
+        self.completed = 0
+        self.failed = 0
+
+    def _arr_queue_full(self) -> bool:
+        """True when the Arr reported at least max_queue_depth queued commands at its last poll"""
+        if not self.max_queue_depth or not self._in_flight:
+            # Nothing of ours is tracked, so there is no completion to wait for
+            return False
+        tracker = get_command_tracker(self.app_type, self.api_url, self.api_key, self.api_timeout, self.wait_delay)
+        return tracker.queued_commands >= self.max_queue_depth
+
+    def _drain(self):
+        """Run the callbacks of every finished command and free their slots"""
+        still_running = []
+        for future, on_complete, context in self._in_flight:
+            if not future.done():
+                still_running.append((future, on_complete, context))
+                continue
+            success = future.result()
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+            try:
+                on_complete(success, context)
+            except Exception as e:
+                logger.error(f"Error recording completed {self.app_type} search: {e}")
+        self._in_flight = still_running
+
+    def _record_pending(self):
+        """Hand searches that are still running to their callbacks as sent but unresolved"""
+        pending, self._in_flight = self._in_flight, []
+        for _, on_complete, context in pending:
+            try:
+                on_complete(None, context)
+            except Exception as e:
+                logger.error(f"Error recording dispatched {self.app_type} search: {e}")
+
+    def _wait_for_any(self):
+        wait_futures([future for future, _, _ in self._in_flight], timeout=SLOT_POLL_INTERVAL,
+                     return_when=FIRST_COMPLETED)
+
+    def wait_for_slot(self) -> bool:
+        """
+        Block until another search may be dispatched, handling completions meanwhile.
+
+        Returns:
+            True when a slot is free, False if a stop was requested
+        """
+        logged_backpressure = False
+        while True:
+            self._drain()
+            if self.stop_check():
+                return False
+            if len(self._in_flight) < self.window:
+                if not self._arr_queue_full():
+                    return True
+                if not logged_backpressure:
+                    logger.debug(f"{self.app_type} command queue is backed up; holding next search")
+                    logged_backpressure = True
+            self._wait_for_any()
+
+    def submit(self, command_id: Union[int, str], on_complete: Callable[[bool, Any], None],
+               context: Any = None, command_name: str = "Search"):
+        """
+        Track a dispatched search command.
+
+        Args:
+            command_id: ID returned when the search was queued
+            on_complete: Callback(success, context) run on the calling thread once the command resolves;
+                success is None when the hunt stopped before the command finished (the search was sent)
+            context: Item details handed back to on_complete
+            command_name: Name used in log messages
+        """
+        future = track_command(self.app_type, self.api_url, self.api_key, self.api_timeout, command_id,
+                               self.wait_delay, self.wait_attempts, command_name)
+        self._in_flight.append((future, on_complete, context))
+        self._drain()
+
+    def submit_batch(self, command_id: Union[int, str], on_item_complete: Callable[[bool, Any], None],
+                     items: Sequence[Any], command_name: str = "Search"):
+        """
+        Track a multi-ID search command; on_item_complete(success, item) runs once per item
+        when the command resolves, so per-item bookkeeping is unchanged by batching.
+        """
+        def complete_batch(success, batch):
+            for item in batch:
+                on_item_complete(success, item)
+        self.submit(command_id, complete_batch, list(items), command_name)
+
+    def finish(self) -> int:
+        """
+        Wait for the remaining searches and run their callbacks.
+
+        Returns:
+            Number of searches that completed successfully
+        """
+        while self._in_flight:
+            self._drain()
+            if not self._in_flight:
+                break
+            if self.stop_check():
+                logger.info(f"Stop requested; not waiting for {len(self._in_flight)} {self.app_type} searches still running")
+                self._record_pending()
+                break
+            self._wait_for_any()
+        return self.completed
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Login session store.
+Sessions live in memory with a sliding TTL and a hard cap (the least recently used
+session is evicted first), and a background thread sweeps expired entries. With
+persistence on, sessions are also kept in the sessions table, keyed by a SHA-256 of
+the token, so logins survive restarts and can be shared between processes. A token
+this process has not seen is looked up once; known sessions are re-checked against
+the table at most once per REVALIDATE_INTERVAL, so a logout elsewhere takes effect
+without a database hit on every request.
+"""
+
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.primary.utils.logger import get_logger
+from src.primary.utils.database import get_database
+from src.primary.settings_manager import get_advanced_setting
+
+logger = get_logger("huntarr")
+
+# How often the sweeper drops expired sessions (memory and database)
+SWEEP_INTERVAL = 300
+# A persisted session is re-read from the database at most this often per process
+REVALIDATE_INTERVAL = 60
+# Sliding expiry is written back once it has moved by at least this much
+PERSIST_TOUCH_INTERVAL = 300
+DEFAULT_MAX_SESSIONS = 1000
+
+# Returned by _db_call when the database could not be reached, as opposed to a missing row
+_DB_ERROR = object()
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    """Bounded TTL store of login sessions, optionally persisted to SQLite"""
+
+    def __init__(self, ttl: float, max_sessions: int = None, persist: bool = None):
+        """
+        Args:
+            ttl: Seconds a session stays valid after its last use
+            max_sessions: Hard cap on sessions (defaults to the max_sessions setting)
+            persist: Keep sessions in the database (defaults to the persist_sessions setting)
+        """
+        self.ttl = ttl
+        self._max_sessions = max_sessions
+        self._persist = persist
+        self._sessions = OrderedDict()  # token -> session dict, least recently used first
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    @property
+    def max_sessions(self) -> int:
+        if self._max_sessions is not None:
+            return self._max_sessions
+        try:
+            return max(1, int(get_advanced_setting("max_sessions", DEFAULT_MAX_SESSIONS)))
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_SESSIONS
+
+    @property
+    def persist(self) -> bool:
+        if self._persist is not None:
+            return self._persist
+        return bool(get_advanced_setting("persist_sessions", True))
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _ensure_sweeper(self):
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="SessionSweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(SWEEP_INTERVAL)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Error sweeping sessions: {e}")
+
+    def _db_call(self, method: str, *args):
+        """Run a database session method; failures return _DB_ERROR and leave the in-memory store in charge"""
+        try:
+            return getattr(get_database(), method)(*args)
+        except Exception as e:
+            logger.error(f"Session store database error ({method}): {e}")
+            return _DB_ERROR
+
+    def _evict_over_cap(self):
+        """Drop least recently used sessions beyond the cap (caller holds the lock)"""
+        max_sessions = self.max_sessions
+        while len(self._sessions) > max_sessions:
+            token, session = self._sessions.popitem(last=False)
+            logger.debug(f"Session limit ({max_sessions}) reached; evicted the least recently used session of '{session['username']}'")
+
+    def create(self, username: str) -> str:
+        """Create a session and return its token"""
+        token = secrets.token_hex(32)
+        now = time.time()
+        session = {
+            "username": username,
+            "created_at": now,
+            "expires_at": now + self.ttl,
+            "checked_at": now,
+            "persisted_expiry": now + self.ttl
+        }
+        with self._lock:
+            self._sessions[token] = session
+            self._evict_over_cap()
+        if self.persist:
+            self._db_call("save_session", _hash_token(token), username, now, session["expires_at"])
+        self._ensure_sweeper()
+        return token
+
+    def _lookup(self, token: str, touch: bool) -> Optional[Dict[str, Any]]:
+        """The live session for a token, extending its expiry when touch is set"""
+        if not token:
+            return None
+        now = time.time()
+        persist = self.persist
+        with self._lock:
+            session = self._sessions.get(token)
+            if session and session["expires_at"] < now and not persist:
+                del self._sessions[token]
+                session = None
+            needs_check = persist and (session is None or session["expires_at"] < now
+                                       or now - session["checked_at"] >= REVALIDATE_INTERVAL)
+
+        if needs_check:
+            stored = self._db_call("get_session", _hash_token(token))
+            with self._lock:
+                if stored is _DB_ERROR:
+                    # Could not re-check; a live in-memory session stays valid until the next check
+                    session = self._sessions.get(token)
+                    if session is None or session["expires_at"] < now:
+                        return None
+                    session["checked_at"] = now
+                elif not stored:
+                    # Logged out, expired or evicted by some process
+                    self._sessions.pop(token, None)
+                    return None
+                else:
+                    session = self._sessions.get(token)
+                    if session is None:
+                        session = dict(stored, persisted_expiry=stored["expires_at"])
+                        self._sessions[token] = session
+                        self._evict_over_cap()
+                    session["expires_at"] = max(session["expires_at"], stored["expires_at"])
+                    session["checked_at"] = now
+            self._ensure_sweeper()
+
+        if session is None:
+            return None
+
+        persist_expiry = None
+        with self._lock:
+            if token not in self._sessions:
+                return None
+            if touch:
+                session["expires_at"] = now + self.ttl
+                self._sessions.move_to_end(token)
+                if persist and session["expires_at"] - session["persisted_expiry"] >= PERSIST_TOUCH_INTERVAL:
+                    persist_expiry = session["persisted_expiry"] = session["expires_at"]
+            result = dict(session)
+        if persist_expiry is not None:
+            self._db_call("save_session", _hash_token(token), result["username"], result["created_at"], persist_expiry)
+        return result
+
+    def verify(self, token: str) -> bool:
+        """True if the token belongs to a live session; extends the session's expiry"""
+        return self._lookup(token, touch=True) is not None
+
+    def get_username(self, token: str) -> Optional[str]:
+        """Username of a live session, or None"""
+        session = self._lookup(token, touch=False)
+        return session["username"] if session else None
+
+    def revoke(self, token: str):
+        """End a session in this process and, when persisted, everywhere"""
+        if not token:
+            return
+        with self._lock:
+            self._sessions.pop(token, None)
+        if self.persist:
+            self._db_call("delete_session", _hash_token(token))
+
+    def sweep(self) -> int:
+        """
+        Drop expired sessions from memory and the database.
+
+        Returns:
+            Number of in-memory sessions removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [token for token, session in self._sessions.items() if session["expires_at"] < now]
+            for token in expired:
+                del self._sessions[token]
+            self._evict_over_cap()
+        if self.persist:
+            self._db_call("prune_sessions", self.max_sessions)
+        if expired:
+            logger.debug(f"Swept {len(expired)} expired sessions")
+        return len(expired)
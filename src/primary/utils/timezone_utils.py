@@ -1,24 +1,31 @@
 #!/usr/bin/env python3
 """
 Timezone utilities for Huntarr
-Centralized timezone handling with proper fallbacks
+Centralized timezone handling with proper fallbacks.
+The resolved timezone is cached until clear_timezone_cache() is called, which
+happens when general settings are saved or apply_timezone changes TZ, so hot
+paths (log formatters, cycle and schedule timing) never read settings.
 """
 
 import os
+import threading
 import pytz
 from typing import Union
 
-# Cache for timezone to avoid repeated settings lookups
+# Resolved timezone and its name; None until the first lookup after an invalidation
 _timezone_cache = None
-_cache_timestamp = 0
-_cache_ttl = 5  # 5 seconds cache TTL
+_timezone_name_cache = None
+_cache_generation = 0  # Bumped on every invalidation so a lookup racing a clear is not cached
+_cache_lock = threading.Lock()
 
 
 def clear_timezone_cache():
     """Clear the timezone cache to force a fresh lookup."""
-    global _timezone_cache, _cache_timestamp
-    _timezone_cache = None
-    _cache_timestamp = 0
+    global _timezone_cache, _timezone_name_cache, _cache_generation
+    with _cache_lock:
+        _timezone_cache = None
+        _timezone_name_cache = None
+        _cache_generation += 1
 
 
 def validate_timezone(timezone_str: str) -> bool:
@@ -63,6 +70,28 @@ def safe_get_timezone(timezone_name: str) -> pytz.BaseTzInfo:
         return None
 
 
+def _resolve_user_timezone() -> pytz.BaseTzInfo:
+    """Look the timezone up from settings, then TZ, then UTC (uncached)"""
+    try:
+        from src.primary import settings_manager
+        general_settings = settings_manager.get_settings_snapshot("general")
+        timezone_name = general_settings.get("timezone")
+        if timezone_name and timezone_name != "UTC":
+            tz = safe_get_timezone(timezone_name)
+            if tz:
+                return tz
+    except Exception:
+        pass  # Fall through to TZ environment variable
+
+    tz_env = os.environ.get('TZ')
+    if tz_env:
+        tz = safe_get_timezone(tz_env)
+        if tz:
+            return tz
+
+    return pytz.UTC
+
+
 def get_user_timezone() -> pytz.BaseTzInfo:
     """
     Get the user's selected timezone with proper fallback handling.
@@ -75,56 +104,27 @@ def get_user_timezone() -> pytz.BaseTzInfo:
     2. TZ environment variable
     3. UTC as final fallback
     
+    The result is cached until clear_timezone_cache() is called.
+    
     Returns:
         pytz.BaseTzInfo: The timezone object to use (always valid)
     """
-    global _timezone_cache, _cache_timestamp
-    
-    # Check cache first
-    import time
-    current_time = time.time()
-    if _timezone_cache and (current_time - _cache_timestamp) < _cache_ttl:
-        return _timezone_cache
+    global _timezone_cache, _timezone_name_cache
+    tz = _timezone_cache
+    if tz is not None:
+        return tz
     
+    generation = _cache_generation
     try:
-        # First try to get timezone from user settings
-        try:
-            from src.primary import settings_manager
-            general_settings = settings_manager.load_settings("general", use_cache=False)  # Force fresh read
-            timezone_name = general_settings.get("timezone")
-            
-            if timezone_name and timezone_name != "UTC":
-                tz = safe_get_timezone(timezone_name)
-                if tz:
-                    # Cache the result
-                    _timezone_cache = tz
-                    _cache_timestamp = current_time
-                    return tz
-        except Exception:
-            pass  # Fall through to TZ environment variable
-        
-        # Second try TZ environment variable
-        tz_env = os.environ.get('TZ')
-        if tz_env:
-            tz = safe_get_timezone(tz_env)
-            if tz:
-                # Cache the result
-                _timezone_cache = tz
-                _cache_timestamp = current_time
-                return tz
-        
-        # Final fallback to UTC
-        tz = pytz.UTC
-        _timezone_cache = tz
-        _cache_timestamp = current_time
-        return tz
-        
+        tz = _resolve_user_timezone()
     except Exception:
         # Ultimate fallback if everything fails
         tz = pytz.UTC
-        _timezone_cache = tz
-        _cache_timestamp = current_time
-        return tz
+    with _cache_lock:
+        if generation == _cache_generation:
+            _timezone_cache = tz
+            _timezone_name_cache = str(tz)
+    return tz
 
 
 def get_timezone_name() -> str:
@@ -135,7 +135,9 @@ def get_timezone_name() -> str:
         str: The timezone name (e.g., 'Pacific/Honolulu', 'UTC')
     """
     try:
-        timezone = get_user_timezone()
-        return str(timezone)
+        name = _timezone_name_cache
+        if name is None:
+            name = str(get_user_timezone())
+        return name
     except Exception:
         return "UTC" 
\ No newline at end of file
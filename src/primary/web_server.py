@@ -27,6 +27,8 @@ from flask import Flask, render_template, request, jsonify, Response, send_from_
 # Use only settings_manager
 from src.primary import settings_manager
 from src.primary.utils.logger import setup_main_logger, get_logger, LOG_DIR, update_logging_levels # Import get_logger, LOG_DIR, and update_logging_levels
+from src.primary.utils.http_cache import cached_json_response
+from src.primary.connection_monitor import MONITORED_APPS, get_app_health
 # Clean logging is now database-only
 from src.primary.auth import (
     authenticate_request, user_exists, create_user, verify_user, create_session,
@@ -53,6 +55,9 @@ from src.primary.routes.scheduler_routes import scheduler_api
 # Import log routes blueprint
 from src.primary.routes.log_routes import log_routes_bp
 
+# Import dashboard blueprint
+from src.primary.routes.dashboard_routes import dashboard_bp
+
 # Import background module to trigger manual cycle resets
 from src.primary import background
 
@@ -273,6 +278,7 @@ app.register_blueprint(stateful_api, url_prefix='/api/stateful')
 app.register_blueprint(history_blueprint, url_prefix='/api/hunt-manager')
 app.register_blueprint(scheduler_api)
 app.register_blueprint(log_routes_bp)
+app.register_blueprint(dashboard_bp)
 
 # Register the authentication check to run before requests
 app.before_request(authenticate_request)
@@ -825,7 +831,7 @@ def api_configured_apps():
 # --- Add Status Endpoint --- #
 @app.route('/api/status/<app_name>', methods=['GET'])
 def api_app_status(app_name):
-    """Check connection status for a specific app."""
+    """Connection status for a specific app (*arr instances are read from the health monitor)."""
     web_logger = get_logger("web_server")
     response_data = {"configured": False, "connected": False} # Default for non-Sonarr apps
     status_code = 200
@@ -836,65 +842,13 @@ def api_app_status(app_name):
         return jsonify({"configured": False, "connected": False, "error": "Invalid app name"}), 400
     
     try:
-        if app_name in ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']:
-            # --- Multi-Instance Status Check --- # 
-            connected_count = 0
-            total_configured = 0
+        if app_name in MONITORED_APPS:
+            # --- Multi-Instance Status (from the background health monitor, no probing here) --- #
             try:
-                # Import app specific functions
-                module_name = f'src.primary.apps.{app_name}'
-                instances_module = importlib.import_module(module_name)
-                api_module = importlib.import_module(f'{module_name}.api')
-                
-                if hasattr(instances_module, 'get_configured_instances'):
-                    get_instances_func = getattr(instances_module, 'get_configured_instances')
-                    instances = get_instances_func()
-                    total_configured = len(instances)
-                    api_timeout = settings_manager.get_setting(app_name, "api_timeout", 10) # Get global timeout
-                    
-                    if total_configured > 0:
-                        web_logger.debug(f"Checking connection for {total_configured} {app_name.capitalize()} instances...")
-                        if hasattr(api_module, 'check_connection'):
-                            check_connection_func = getattr(api_module, 'check_connection')
-                            for instance in instances:
-                                inst_url = instance.get("api_url")
-                                inst_key = instance.get("api_key")
-                                inst_name = instance.get("instance_name", "Default")
-                                try:
-                                    # Use a short timeout per instance check
-                                    if check_connection_func(inst_url, inst_key, min(api_timeout, 5)):
-                                        web_logger.debug(f"{app_name.capitalize()} instance '{inst_name}' connected successfully.")
-                                        connected_count += 1
-                                    else:
-                                        web_logger.debug(f"{app_name.capitalize()} instance '{inst_name}' connection check failed.")
-                                except Exception as e:
-                                    web_logger.error(f"Error checking connection for {app_name.capitalize()} instance '{inst_name}': {str(e)}")
-                        else:
-                            web_logger.warning(f"check_connection function not found in {app_name} API module")
-                    else:
-                        web_logger.debug(f"No configured {app_name.capitalize()} instances found for status check.")
-                    
-                    # Prepare multi-instance response
-                    response_data = {"total_configured": total_configured, "connected_count": connected_count}
-                else:
-                    web_logger.warning(f"get_configured_instances function not found in {app_name} module")
-                    # Fall back to legacy status check
-                    api_url = settings_manager.get_api_url(app_name)
-                    api_key = settings_manager.get_api_key(app_name)
-                    is_configured = bool(api_url and api_key)
-                    is_connected = False
-                    if is_configured and hasattr(api_module, 'check_connection'):
-                        check_connection_func = getattr(api_module, 'check_connection')
-                        is_connected = check_connection_func(api_url, api_key, min(api_timeout, 5))
-                    response_data = {"total_configured": 1 if is_configured else 0, "connected_count": 1 if is_connected else 0}
-                                
-            except ImportError as e:
-                web_logger.error(f"Failed to import {app_name} modules for status check: {e}")
-                response_data = {"total_configured": 0, "connected_count": 0, "error": "Import Error"}
-                status_code = 500
+                response_data = get_app_health(app_name)
             except Exception as e:
-                web_logger.error(f"Error during {app_name} multi-instance status check: {e}", exc_info=True)
-                response_data = {"total_configured": total_configured, "connected_count": connected_count, "error": "Check Error"}
+                web_logger.error(f"Error reading {app_name} connection health: {e}", exc_info=True)
+                response_data = {"total_configured": 0, "connected_count": 0, "error": "Check Error"}
                 status_code = 500
                 
         else:
@@ -965,27 +919,30 @@ def api_get_hourly_caps():
     """Get hourly API usage caps for each app"""
     try:
         # Import necessary functions
-        from src.primary.stats_manager import load_hourly_caps
-        from src.primary.settings_manager import load_settings
-        
-        # Get the logger
-        web_logger = get_logger("web_server")
+        from src.primary.stats_manager import load_hourly_caps, get_hourly_caps_version
+        from src.primary.settings_manager import load_settings, get_settings_version
         
-        # Load the current hourly caps
-        caps = load_hourly_caps()
-        
-        # Get app-specific hourly cap limits
-        app_limits = {}
         apps = ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']
-        for app in apps:
-            app_settings = load_settings(app)
-            app_limits[app] = app_settings.get('hourly_cap', 20)  # Default to 20 if not set
         
-        return jsonify({
-            "success": True,
-            "caps": caps,
-            "limits": app_limits
-        })
+        def build():
+            # Load the current hourly caps
+            caps = load_hourly_caps()
+            
+            # Get app-specific hourly cap limits
+            app_limits = {}
+            for app in apps:
+                app_settings = load_settings(app)
+                app_limits[app] = app_settings.get('hourly_cap', 20)  # Default to 20 if not set
+            
+            return {
+                "success": True,
+                "caps": caps,
+                "limits": app_limits
+            }
+        
+        # Rebuilt only when usage or one of the apps' limits changes
+        version = (get_hourly_caps_version(),) + tuple(get_settings_version(app) for app in apps)
+        return cached_json_response("hourly-caps", version, build)
     except Exception as e:
         web_logger = get_logger("web_server")
         web_logger.error(f"Error retrieving hourly API caps: {e}")
@@ -1048,9 +1005,8 @@ def version_txt():
 def api_get_all_cycle_status():
     """API endpoint to get cycle status for all apps."""
     try:
-        from src.primary.cycle_tracker import get_cycle_status
-        status = get_cycle_status()
-        return jsonify(status), 200
+        from src.primary.cycle_tracker import get_cycle_status, get_cycle_version
+        return cached_json_response("cycle-status", get_cycle_version(), get_cycle_status)
     except Exception as e:
         web_logger = get_logger("web_server")
         web_logger.error(f"Error getting cycle status: {e}")
@@ -1060,9 +1016,9 @@ def api_get_all_cycle_status():
 def api_get_app_cycle_status(app_name):
     """API endpoint to get cycle status for a specific app."""
     try:
-        from src.primary.cycle_tracker import get_cycle_status
-        status = get_cycle_status(app_name)
-        return jsonify(status), 200
+        from src.primary.cycle_tracker import get_cycle_status, get_cycle_version
+        return cached_json_response(("cycle-status", app_name), get_cycle_version(),
+                                    lambda: get_cycle_status(app_name))
     except Exception as e:
         web_logger = get_logger("web_server")
         web_logger.error(f"Error getting cycle status for {app_name}: {e}")